@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 
 from PyQt6.QtWidgets import QApplication
@@ -7,6 +8,9 @@ from src.GoonerApp import GoonerApp
 from src.SplashScreen import SplashScreen
 
 if __name__ == "__main__":
+    # PerceptualHashScanner's worker processes re-launch this executable - in a PyInstaller
+    # build, this is what makes such a child run its task instead of a second app window.
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setPalette(theme.build_palette())
@@ -15,6 +19,7 @@ if __name__ == "__main__":
 
     def _reveal_main_window():
         window.showMaximized()
+        window.start_cache_warmer()
         window.maybe_show_whats_new_on_startup()
 
     if window.show_startup_splash:
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""Benchmark image decoding for display: a full-resolution decode followed by a smooth
+scale (what the picker thumbnails and GoonerApp.load_media used to do) vs
+image_loading.read_scaled, which has the reader decode at about the target size.
+
+Every (method, source size, target) combination runs in a fresh child process, so its peak
+RSS is its own and not a leftover from an earlier, bigger decode. Source JPEGs are
+generated once per size under --root and reused.
+
+Usage:
+    python scripts/bench_image_decode.py
+    python scripts/bench_image_decode.py --megapixels 12 50 --repeat 10 --root D:/bench-images
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PyQt6.QtCore import QCoreApplication, QSize, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QImage, QImageReader, QPainter  # noqa: E402
+
+from src import image_loading  # noqa: E402
+
+DEFAULT_MEGAPIXELS = (12, 50)
+# A picker thumbnail cell and a full-HD slideshow label.
+TARGETS = {"thumbnail": QSize(124, 124), "display": QSize(1920, 1080)}
+METHODS = ("full", "scaled")
+
+
+def full_decode(path, box: QSize) -> QImage:
+    """The previous path, as the baseline."""
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    return reader.read().scaled(box, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+def scaled_decode(path, box: QSize) -> QImage:
+    return image_loading.read_scaled(path, box)
+
+
+def peak_rss_mb() -> float:
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+    if sys.platform.startswith("linux"):
+        # VmHWM belongs to this process image - ru_maxrss would carry over the parent's
+        # high-water mark (including the source JPEGs it just built) across fork+exec.
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def build_source(root: Path, megapixels: int) -> Path:
+    path = root / f"source_{megapixels}mp.jpg"
+    if path.exists():
+        return path
+    width = int((megapixels * 1_000_000 * 3 / 2) ** 0.5)
+    height = width * 2 // 3
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    # Some structure for the encoder to chew on - a flat fill compresses to nothing.
+    painter = QPainter(image)
+    for i in range(0, width, 64):
+        painter.fillRect(i, 0, 64, height, QColor((i * 7) % 256, (i * 13) % 256, (i * 29) % 256))
+    painter.end()
+    image.save(str(path), "JPEG", 90)
+    print(f"  built {path} ({width}x{height})")
+    return path
+
+
+def run_child(method: str, path: str, target: str, repeat: int):
+    """Runs in the child process - prints one JSON line of results."""
+    QCoreApplication([])
+    decode = full_decode if method == "full" else scaled_decode
+    box = TARGETS[target]
+    baseline_mb = peak_rss_mb()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        image = decode(path, box)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert not image.isNull()
+    print(json.dumps({"median_ms": statistics.median(timings), "peak_delta_mb": peak_rss_mb() - baseline_mb}))
+
+
+def measure(method: str, path: Path, target: str, repeat: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", method, str(path), target, "--repeat", str(repeat)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megapixels", type=int, nargs="+", default=list(DEFAULT_MEGAPIXELS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--root", type=Path, default=Path(tempfile.gettempdir()) / "gooner-bench-images")
+    parser.add_argument("--child", nargs=3, metavar=("METHOD", "PATH", "TARGET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child, args.repeat)
+        return
+
+    args.root.mkdir(parents=True, exist_ok=True)
+    print(f"{'source':>8} {'target':>10} {'method':>7} {'median ms':>10} {'peak RSS +MB':>13}")
+    for megapixels in args.megapixels:
+        path = build_source(args.root, megapixels)
+        for target in TARGETS:
+            for method in METHODS:
+                result = measure(method, path, target, args.repeat)
+                print(
+                    f"{megapixels:>6}MP {target:>10} {method:>7} "
+                    f"{result['median_ms']:>10.1f} {result['peak_delta_mb']:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
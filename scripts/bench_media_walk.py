@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Benchmark media discovery: the old rglob walker vs media_kinds' parallel scandir walker
+(and a MediaIndex cold scan/warm rescan on top of it) over synthetic trees.
+
+Each tree holds FILES_PER_DIRECTORY files per directory (a quarter of them non-media, so
+the extension filter has something to reject) in a FANOUT-ary directory tree. Trees are
+built once per size under --root and reused on later runs - building the 1M-file tree
+takes a while and a few GB of inodes, so pass --sizes to skip it.
+
+Note the OS page/dentry cache is warm for every measured run after the tree is built, so
+this compares CPU + syscall overhead, not cold spinning-disk seeks.
+
+Usage:
+    python scripts/bench_media_walk.py
+    python scripts/bench_media_walk.py --sizes 10000 100000 --root D:/bench-trees
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import media_kinds  # noqa: E402
+from src.media_index import MediaIndex  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+FILES_PER_DIRECTORY = 100
+FANOUT = 10
+EXTENSIONS = (".jpg", ".png", ".mp4", ".txt")
+# MediaIndex sniffs content, so media files get a real signature - empty files would all
+# be dropped as "unknown" and the index rows would count nothing.
+HEADERS = {".jpg": b"\xff\xd8\xff\xe0", ".png": b"\x89PNG\r\n\x1a\n", ".mp4": b"\x00\x00\x00\x18ftypisom", ".txt": b""}
+
+
+def legacy_find_supported_files(folder: str) -> list[Path]:
+    """The pre-scandir implementation, verbatim, as the baseline."""
+    pfad = Path(folder)
+    gefundene_dateien = []
+    try:
+        for datei in pfad.rglob('*'):
+            if datei.is_file() and datei.suffix.lower() in media_kinds.SUPPORTED_EXTENSIONS:
+                gefundene_dateien.append(datei)
+    except OSError:
+        pass
+    return gefundene_dateien
+
+
+def build_tree(root: Path, file_count: int) -> Path:
+    tree = root / f"tree_{file_count}"
+    marker = tree / ".complete-v2"
+    if marker.exists():
+        return tree
+
+    directory_count = max(1, file_count // FILES_PER_DIRECTORY)
+    directories = [tree]
+    queue = [tree]
+    while len(directories) < directory_count:
+        parent = queue.pop(0)
+        for i in range(FANOUT):
+            if len(directories) >= directory_count:
+                break
+            child = parent / f"d{i}"
+            directories.append(child)
+            queue.append(child)
+
+    written = 0
+    for index, directory in enumerate(directories):
+        directory.mkdir(parents=True, exist_ok=True)
+        share = file_count // directory_count + (1 if index < file_count % directory_count else 0)
+        for i in range(share):
+            extension = EXTENSIONS[i % len(EXTENSIONS)]
+            (directory / f"f{i}{extension}").write_bytes(HEADERS[extension])
+        written += share
+    marker.touch()
+    print(f"  built {tree} ({written} files, {len(directories)} directories)")
+    return tree
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, len(result)
+
+
+def bench(tree: Path, workdir: Path):
+    folder = str(tree)
+    index = MediaIndex(workdir / f"{tree.name}.sqlite3")
+    rows = [
+        ("rglob + is_file (old)", *timed(lambda: legacy_find_supported_files(folder))),
+        ("scandir, 1 worker", *timed(lambda: [p for b in media_kinds.walk_directories(
+            folder, media_kinds._scan_directory, max_workers=1) for p in b])),
+        (f"scandir, {media_kinds.WALK_MAX_WORKERS} workers", *timed(lambda: media_kinds.find_supported_files(folder))),
+        ("MediaIndex, cold scan", *timed(lambda: index.scan(folder))),
+        ("MediaIndex, warm rescan", *timed(lambda: index.scan(folder))),
+    ]
+    index.close()
+    baseline = rows[0][1]
+    for name, seconds, found in rows:
+        print(f"  {name:<28} {seconds:9.3f}s  {found:>9} files  {baseline / seconds:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--root", type=Path, default=None, help="where to build/reuse the synthetic trees")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        root = args.root or Path(scratch)
+        for size in args.sizes:
+            print(f"{size} files:")
+            tree = build_tree(root, size)
+            bench(tree, Path(scratch))
+
+
+if __name__ == "__main__":
+    main()
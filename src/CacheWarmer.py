@@ -0,0 +1,217 @@
+from collections import deque
+from pathlib import Path
+
+from PyQt6.QtCore import QEvent, QObject, QThread, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+from src import media_kinds
+from src.FolderScanner import FolderScanner
+from src.MetadataProber import MetadataProber
+from src.thumbnail_sampling import sample_thumbnails_with_video_cap
+from src.ThumbnailLoader import ThumbnailLoader
+from src.VideoFrameGrabber import VideoFrameGrabber
+
+# How many thumbnails one warm-up renders, spread across the folders the way the picker
+# samples them, with the expensive video grabs capped separately. Enough that a first
+# picker grid on a typical library comes mostly or entirely out of the cache, without one
+# huge library pushing everything else out of a ThumbnailCache sized for a few thousand.
+PREWARM_MAX_THUMBNAILS = 1500
+PREWARM_MAX_VIDEOS = 150
+# The throttle: thumbnails are rendered one at a time, with this pause after each; the
+# walk lists one directory at a time (thread priority only covers the FolderScanner's own
+# thread, not the pool it walks with); the metadata probe gets a single worker process;
+# every thread runs at the lowest priority.
+PREWARM_STEP_INTERVAL_MS = 40
+PREWARM_WALK_WORKERS = 1
+PREWARM_PROBE_WORKERS = 1
+# After any mouse/keyboard input the warmer stops what it's doing and waits for this much
+# quiet before picking up where it left off.
+PREWARM_RESUME_IDLE_MS = 3000
+
+_INTERACTION_EVENTS = {
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonDblClick,
+    QEvent.Type.KeyPress,
+    QEvent.Type.Wheel,
+    QEvent.Type.TouchBegin,
+}
+
+
+class CacheWarmer(QObject):
+    """Fills the MediaIndex and ThumbnailCache for the picker's remembered folders while the
+    app is otherwise idle, so the first picker of the run opens on a warm cache - the
+    picker draws its first grid from files the cache has, so it shows these. Three
+    stages, one after the other: walk the folders (FolderScanner, which stores every
+    directory listing in the index), probe their metadata (MetadataProber), then render
+    thumbnails at the picker's size - images through a single-threaded ThumbnailLoader,
+    video frames through a single-grab VideoFrameGrabber.
+
+    Any user input pauses it at once - the running stage's thread is stopped and outstanding
+    renders withdrawn - and it resumes after PREWARM_RESUME_IDLE_MS without input. Every
+    stage writes its results to the index/cache as it goes, so restarting a stage only
+    re-checks what's already done instead of redoing it."""
+
+    finished = pyqtSignal()
+
+    def __init__(self, folders, index, cache, thumbnail_size: int, parent=None):
+        super().__init__(parent)
+        self.folders = [folder for folder in folders if Path(folder).is_dir()]
+        self.index = index
+        self.cache = cache
+        self.thumbnail_size = thumbnail_size
+        self._stage = "idle"
+        self._paused = False
+        self._folders_to_walk = deque(self.folders)
+        self._per_folder_files: dict[str, list[Path]] = {}
+        self._worker = None  # the running FolderScanner/MetadataProber
+        self._queue: deque[Path] = deque()
+        self._kinds: dict[Path, str] = {}  # sniffed by the walk - see media_kinds.media_kinds_of
+
+        self._loader = ThumbnailLoader(cache, max_threads=1, parent=self)
+        self._loader.loaded.connect(lambda _path, _image: self._thumbnail_done())
+        # Stores each frame in the cache itself - see VideoFrameGrabber.
+        self._grabber = VideoFrameGrabber(
+            index, max_concurrent=1, thumbnail_size=thumbnail_size, cache=cache, parent=self
+        )
+        self._grabber.frame_grabbed.connect(lambda _path, _image: self._thumbnail_done())
+        self._step_timer = QTimer(self)
+        self._step_timer.setSingleShot(True)
+        self._step_timer.timeout.connect(self._next_thumbnail)
+        self._resume_timer = QTimer(self)
+        self._resume_timer.setSingleShot(True)
+        self._resume_timer.timeout.connect(self._resume)
+
+    def start(self):
+        if self._stage != "idle":
+            return
+        QApplication.instance().installEventFilter(self)
+        self._stage = "walk"
+        self._run_stage()
+
+    def stop(self):
+        """Abandons the warm-up for good - joins any running thread, like FolderScanner.stop."""
+        if self._stage == "done":
+            return
+        self._stage = "done"
+        QApplication.instance().removeEventFilter(self)
+        self._resume_timer.stop()
+        self._halt()
+        self._loader.shutdown()
+
+    def is_running(self) -> bool:
+        return self._stage not in ("idle", "done")
+
+    def is_paused(self) -> bool:
+        return self._paused
+
+    def eventFilter(self, watched, event):
+        if event.type() in _INTERACTION_EVENTS and self.is_running():
+            self.pause()
+        return False
+
+    def pause(self):
+        """Stops all work until PREWARM_RESUME_IDLE_MS pass without another pause()."""
+        if not self._paused:
+            self._paused = True
+            self._halt()
+        self._resume_timer.start(PREWARM_RESUME_IDLE_MS)
+
+    def _resume(self):
+        self._paused = False
+        if self.is_running():
+            self._run_stage()
+
+    def _halt(self):
+        self._step_timer.stop()
+        if self._worker is not None:
+            worker, self._worker = self._worker, None
+            worker.stop()
+            worker.deleteLater()
+        self._loader.cancel_all()
+        self._grabber.cancel_all()
+
+    def _run_stage(self):
+        if self._paused:
+            return
+        if self._stage == "walk":
+            self._walk_next_folder()
+        elif self._stage == "probe":
+            self._probe()
+        elif self._stage == "thumbnails":
+            self._next_thumbnail()
+
+    # --- walk ---
+
+    def _walk_next_folder(self):
+        if not self._folders_to_walk:
+            self._stage = "probe"
+            self._run_stage()
+            return
+        folder = self._folders_to_walk[0]
+        self._per_folder_files[folder] = []  # a walk cut short by a pause starts over
+        scanner = FolderScanner(folder, index=self.index, max_workers=PREWARM_WALK_WORKERS, parent=self)
+        scanner.batch_found.connect(lambda _folder, batch: self._per_folder_files[folder].extend(batch))
+        scanner.finished.connect(lambda: self._on_worker_finished(scanner))
+        self._worker = scanner
+        scanner.start(QThread.Priority.LowestPriority)
+
+    def _on_worker_finished(self, worker):
+        if self._worker is not worker:
+            return  # stopped by a pause - its stage is restarted on resume
+        self._worker = None
+        worker.deleteLater()
+        if self._stage == "walk":
+            self._folders_to_walk.popleft()
+            self._walk_next_folder()
+        elif self._stage == "probe":
+            self._queue_thumbnails()
+
+    # --- metadata ---
+
+    def _probe(self):
+        files = [path for files in self._per_folder_files.values() for path in files]
+        prober = MetadataProber(files, index=self.index, max_workers=PREWARM_PROBE_WORKERS, parent=self)
+        prober.finished.connect(lambda: self._on_worker_finished(prober))
+        self._worker = prober
+        prober.start(QThread.Priority.LowestPriority)
+
+    # --- thumbnails ---
+
+    def _queue_thumbnails(self):
+        files = [path for files in self._per_folder_files.values() for path in files]
+        self._kinds = media_kinds.media_kinds_of(files, self.index)
+        self._queue = deque(
+            sample_thumbnails_with_video_cap(
+                self._per_folder_files,
+                PREWARM_MAX_THUMBNAILS,
+                PREWARM_MAX_VIDEOS,
+                is_video=lambda path: self._kinds.get(path) == "video",
+            )
+        )
+        self._stage = "thumbnails"
+        self._run_stage()
+
+    def _next_thumbnail(self):
+        if self._paused or self._stage != "thumbnails":
+            return
+        while self._queue:
+            path = self._queue[0]
+            kind = self._kinds.get(path)
+            if kind == "image":
+                # The loader answers from the cache itself when it can.
+                self._loader.request(path, self.thumbnail_size)
+                return
+            if kind == "video" and self.cache.get(path, self.thumbnail_size) is None:
+                self._grabber.request(path)
+                return
+            self._queue.popleft()  # a GIF (animated live in the picker), or a cached video
+        self._finish()
+
+    def _thumbnail_done(self):
+        if self._queue:
+            self._queue.popleft()
+        self._step_timer.start(PREWARM_STEP_INTERVAL_MS)
+
+    def _finish(self):
+        self.stop()
+        self.finished.emit()
@@ -0,0 +1,94 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer
+
+# How long to wait for the media to report it's loaded before seeking anyway.
+CLIP_LOAD_WAIT_TIMEOUT_MS = 1000
+# How long a seek gets to show up in the player's position before it's issued again.
+CLIP_SEEK_WAIT_TIMEOUT_MS = 500
+# setPosition() calls before giving up and playing from wherever the player is.
+CLIP_SEEK_ATTEMPTS = 3
+# The position counts as the one seeked to if it's at most this far from the target.
+CLIP_POSITION_TOLERANCE_MS = 500
+
+_LOADED_STATUSES = (
+    QMediaPlayer.MediaStatus.LoadedMedia,
+    QMediaPlayer.MediaStatus.BufferingMedia,
+    QMediaPlayer.MediaStatus.BufferedMedia,
+)
+
+
+class ClipSeeker(QObject):
+    """Puts a QMediaPlayer at a clip's start. A setPosition() right after setSource() is
+    silently dropped by the backend while the media is still loading, so the seek waits
+    for the player to report LoadedMedia (or Buffering/BufferedMedia) - or for
+    CLIP_LOAD_WAIT_TIMEOUT_MS - and is issued again until the player's position is there,
+    at most CLIP_SEEK_ATTEMPTS times. `ready` then says the clip can start; it comes too
+    when the attempts run out or the media turns out invalid, so the slideshow never
+    stalls on a video that won't seek."""
+
+    ready = pyqtSignal()
+
+    def __init__(self, player, parent=None):
+        super().__init__(parent)
+        self.player = player
+        self._target_ms = None  # None when not seeking
+        self._seeks_left = 0
+        self._state = "idle"
+        player.mediaStatusChanged.connect(self._on_media_status_changed)
+        player.positionChanged.connect(self._on_position_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def seek(self, start_ms: int):
+        """Seeks the player to `start_ms` as soon as its current source is loaded."""
+        self._target_ms = start_ms
+        self._seeks_left = CLIP_SEEK_ATTEMPTS
+        if self.player.mediaStatus() in _LOADED_STATUSES:
+            self._seek()
+        else:
+            self._state = "loading"
+            self._timer.start(CLIP_LOAD_WAIT_TIMEOUT_MS)
+
+    def cancel(self):
+        self._state = "idle"
+        self._target_ms = None
+        self._timer.stop()
+
+    def is_seeking(self) -> bool:
+        return self._state != "idle"
+
+    def _seek(self):
+        self._state = "seeking"
+        self._seeks_left -= 1
+        self.player.setPosition(self._target_ms)
+        if self._state != "seeking":
+            return  # positionChanged already said it's there
+        if self._is_at_target(self.player.position()):
+            self._finish()
+        else:
+            self._timer.start(CLIP_SEEK_WAIT_TIMEOUT_MS)
+
+    def _is_at_target(self, position_ms):
+        return abs(position_ms - self._target_ms) <= CLIP_POSITION_TOLERANCE_MS
+
+    def _on_media_status_changed(self, status):
+        if self._state == "loading" and status in _LOADED_STATUSES:
+            self._timer.stop()
+            self._seek()
+        elif self._state != "idle" and status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self._finish()
+
+    def _on_position_changed(self, position_ms):
+        if self._state == "seeking" and self._is_at_target(position_ms):
+            self._finish()
+
+    def _on_timeout(self):
+        if self._state == "loading" or (self._state == "seeking" and self._seeks_left > 0):
+            self._seek()
+        elif self._state == "seeking":
+            self._finish()
+
+    def _finish(self):
+        self.cancel()
+        self.ready.emit()
@@ -0,0 +1,75 @@
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class DuplicateFilter(QThread):
+    """Runs a ContentDeduplicator on a background thread - filter() hashes file content,
+    which has no business on the GUI thread when a library is large or on a slow disk.
+
+    Work is queued and done one item at a time in submission order, so "first occurrence
+    wins" still means first submitted, and forget() goes through the same queue - the
+    deduplicator is only ever touched from this thread. Each submit() comes back as one
+    `filtered` signal carrying the caller's `tag` and the files let through. The thread
+    only runs while there's work queued, and is started again by the next submit()."""
+
+    filtered = pyqtSignal(object, list)  # tag, list[Path]
+
+    def __init__(self, deduplicator, parent=None):
+        super().__init__(parent)
+        self.deduplicator = deduplicator
+        self._lock = threading.Lock()
+        self._queue = deque()  # (action, files, tag)
+        self._active = False  # run() is working through the queue
+        self._pending = 0  # submits not delivered yet - GUI thread only
+        self._stopped = False
+        # Connected before anyone else, so is_busy() is already current in their slots.
+        self.filtered.connect(self._on_filtered)
+
+    def submit(self, files, tag=None):
+        if self._stopped:
+            return
+        self._pending += 1
+        self._enqueue(("filter", list(files), tag))
+
+    def forget(self, files):
+        if not self._stopped:
+            self._enqueue(("forget", list(files), None))
+
+    def is_busy(self) -> bool:
+        return self._pending > 0
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            with self._lock:
+                if not self._queue:
+                    self._active = False
+                    return
+                action, files, tag = self._queue.popleft()
+            if action == "forget":
+                self.deduplicator.forget(files)
+                continue
+            kept = self.deduplicator.filter(files, interrupted=self.isInterruptionRequested)
+            if not self.isInterruptionRequested():
+                self.filtered.emit(tag, kept)
+
+    def stop(self):
+        """Abandons queued work, interrupts the batch being filtered and joins the thread."""
+        self._stopped = True
+        with self._lock:
+            self._queue.clear()
+        self.requestInterruption()
+        self.wait()
+
+    def _enqueue(self, item):
+        with self._lock:
+            self._queue.append(item)
+            start = not self._active
+            self._active = True
+        if start:
+            self.wait()  # a run() that just found the queue empty may not have returned yet
+            self.start()
+
+    def _on_filtered(self, _tag, _kept):
+        self._pending -= 1
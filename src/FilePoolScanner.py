@@ -0,0 +1,99 @@
+import multiprocessing
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from src import media_kinds
+
+# Decoding/parsing is CPU-bound Python+Qt work, so threads would serialize on the GIL - it
+# runs in worker processes instead. Files go out in chunks so the per-task pickling/IPC
+# overhead is paid per chunk, not per file.
+POOL_MAX_WORKERS = 4
+POOL_CHUNK_SIZE = 32
+_POLL_INTERVAL_S = 0.1
+
+
+class _QThreadABCMeta(type(QThread), ABCMeta):
+    """QThread's sip metaclass and ABCMeta combined - a class can't have both otherwise."""
+
+
+class FilePoolScanner(QThread, metaclass=_QThreadABCMeta):
+    """Runs a per-file worker function over a list of files on a process pool, driven from
+    a background thread so the GUI stays responsive, and emits results in batches as chunks
+    complete. Results already cached in the MediaIndex are emitted straight away and never
+    sent to the pool; fresh ones are written back to it.
+
+    An abstract base - subclasses fill in what's computed: KINDS (which media kinds are
+    handed to the pool at all), `worker` - a module-level function (so it pickles) taking a
+    list of str paths and returning (path, size, mtime_ns, value) rows - and the index cache
+    accessors. One that leaves any of those out can't be instantiated."""
+
+    results_found = pyqtSignal(dict)  # {Path: value}
+    progress = pyqtSignal(int, int)  # done so far, total
+
+    KINDS: tuple[str, ...] = ()
+
+    def __init__(self, files, index=None, max_workers: int = POOL_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.files = [Path(path) for path in files]
+        self.index = index
+        self.max_workers = max_workers
+
+    @staticmethod
+    @abstractmethod
+    def worker(paths) -> list[tuple]:
+        """(path, size, mtime_ns, value) per path - runs in a worker process."""
+
+    @abstractmethod
+    def _cached(self, files) -> dict:
+        """{str(path): value} for whatever the index already holds for `files`."""
+
+    @abstractmethod
+    def _store(self, rows):
+        """Writes worker rows back to the index."""
+
+    def run(self):
+        kinds = media_kinds.media_kinds_of(self.files, self.index)
+        files = [path for path in self.files if kinds[path] in self.KINDS]
+        cached = self._cached(files) if self.index is not None else {}
+        if cached:
+            self.results_found.emit({Path(path): value for path, value in cached.items()})
+        missing = [str(path) for path in files if str(path) not in cached]
+        done = len(files) - len(missing)
+        self.progress.emit(done, len(files))
+        if not missing or self.isInterruptionRequested():
+            return
+
+        # spawn, not fork - forking a process that has Qt's threads running is unsafe, and
+        # spawn is what Windows/macOS use anyway, so every platform behaves the same.
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            pending = {}
+            for start in range(0, len(missing), POOL_CHUNK_SIZE):
+                chunk = missing[start : start + POOL_CHUNK_SIZE]
+                pending[pool.submit(self.worker, chunk)] = len(chunk)
+            while pending:
+                finished, _ = wait(pending, timeout=_POLL_INTERVAL_S, return_when=FIRST_COMPLETED)
+                if self.isInterruptionRequested():
+                    return
+                for future in finished:
+                    done += pending.pop(future)
+                    try:
+                        rows = future.result()
+                    except Exception:
+                        # A worker that crashed on a pathological file (or a broken pool)
+                        # just leaves that chunk without results - nothing depends on them.
+                        continue
+                    if self.index is not None:
+                        self._store(rows)
+                    self.results_found.emit({Path(path): value for path, _size, _mtime, value in rows})
+                self.progress.emit(done, len(files))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        """Same contract as FolderScanner.stop - interrupts at the next poll and joins."""
+        self.requestInterruption()
+        self.wait()
@@ -0,0 +1,64 @@
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from src import media_kinds
+
+SCAN_BATCH_SIZE = 500
+# A batch is also flushed once this long has passed since the last one, however small it
+# is - on a slow disk a folder can trickle in far below SCAN_BATCH_SIZE per second, and the
+# picker's counts/thumbnails (and a session already started from them) shouldn't wait for it.
+SCAN_BATCH_MAX_DELAY_S = 0.25
+
+
+class FolderScanner(QThread):
+    """Walks one folder on a background thread (via media_kinds.iter_supported_files, so it
+    goes through the MediaIndex when one is given) and emits what it finds in batches.
+
+    The very first file found is flushed as a batch of its own right away - that's what
+    lets a streaming session start before the rest of the folder has been walked."""
+
+    batch_found = pyqtSignal(str, list)  # folder, list[Path]
+
+    def __init__(
+        self,
+        folder: str,
+        index=None,
+        batch_size: int = SCAN_BATCH_SIZE,
+        max_workers: int = media_kinds.WALK_MAX_WORKERS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.folder = folder
+        self.index = index
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    def run(self):
+        batch = []
+        emitted_any = False
+        last_emit = time.monotonic()
+        walk = media_kinds.iter_supported_files(self.folder, index=self.index, max_workers=self.max_workers)
+        try:
+            for directory_files in walk:
+                if self.isInterruptionRequested():
+                    return
+                batch.extend(directory_files)
+                if not batch:
+                    continue
+                now = time.monotonic()
+                if not emitted_any or len(batch) >= self.batch_size or now - last_emit >= SCAN_BATCH_MAX_DELAY_S:
+                    self.batch_found.emit(self.folder, batch)
+                    batch = []
+                    emitted_any = True
+                    last_emit = now
+        finally:
+            walk.close()
+        if batch and not self.isInterruptionRequested():
+            self.batch_found.emit(self.folder, batch)
+
+    def stop(self):
+        """Asks the walk to stop at the next directory boundary and waits for it to exit -
+        a QThread destroyed while still running aborts the whole process."""
+        self.requestInterruption()
+        self.wait()
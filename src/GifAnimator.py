@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QImageReader, QPixmap
+
+# Decoded, scaled frames are kept per file up to this many bytes in total, least recently
+# shown file dropped first - so scrolling back to a GIF, or a picker resample landing on
+# it again, doesn't decode it all over.
+GIF_FRAME_CACHE_BYTES = 128 * 1024 * 1024
+# A single file's frames stop being decoded past this - a 2000-frame GIF animates the
+# frames that fit and loops back early, rather than taking the whole budget for itself.
+GIF_MAX_FILE_BYTES = 16 * 1024 * 1024
+# The shared clock. Fine enough for any GIF's own frame delays (which come in steps of
+# 10 ms, and are hardly ever under 20).
+GIF_TICK_MS = 20
+# What browsers show a frame with a delay under 20 ms for - such delays are almost always
+# meant as "no delay given", and taking them literally spins the animation.
+GIF_DEFAULT_FRAME_DELAY_MS = 100
+GIF_DECODER_MAX_THREADS = 2
+
+
+def decode_gif_frames(path, size: int, max_bytes: int = GIF_MAX_FILE_BYTES):
+    """Every frame of `path` scaled to fit a `size` x `size` box, with how long each is
+    shown: ([QImage], [delay ms]), or ([], []) if it can't be decoded. Stops early once the
+    frames reach `max_bytes`. QImage work only, so safe on any thread."""
+    reader = QImageReader(str(path))
+    source_size = reader.size()
+    if source_size.isValid() and not source_size.isEmpty():
+        reader.setScaledSize(source_size.scaled(QSize(size, size), Qt.AspectRatioMode.KeepAspectRatio))
+    frames, delays = [], []
+    total_bytes = 0
+    while total_bytes < max_bytes:
+        image = reader.read()
+        if image.isNull():
+            break
+        delay_ms = reader.nextImageDelay()
+        frames.append(image)
+        delays.append(delay_ms if delay_ms >= GIF_TICK_MS else GIF_DEFAULT_FRAME_DELAY_MS)
+        total_bytes += image.sizeInBytes()
+        if not reader.supportsAnimation() or not reader.canRead():
+            break
+    return frames, delays
+
+
+class _DecodeJob(QRunnable):
+    def __init__(self, animator, path, size):
+        super().__init__()
+        self.animator = animator
+        self.path = path
+        self.size = size
+
+    def run(self):
+        self.animator._run_job(self.path, self.size)
+
+
+class _Frames:
+    def __init__(self, pixmaps, delays, size_bytes):
+        self.pixmaps = pixmaps
+        self.delays = delays
+        self.size_bytes = size_bytes
+
+
+class GifAnimator(QObject):
+    """Animates every GIF thumbnail cell off one shared QTimer, the GIF counterpart of
+    PreviewAnimator - instead of a QMovie per cell, each with its own timer and its own
+    full-size decoder. A file's frames are decoded once, already scaled to the cell, on a
+    small thread pool, then kept in a byte-budgeted cache (see GIF_FRAME_CACHE_BYTES).
+
+    Each tick advances every cell whose current frame has been up for its own delay, so
+    frame timing still follows the file. All the setPixmap calls of one tick land in the
+    same event loop pass, so Qt paints them in one go rather than one repaint per GIF."""
+
+    # Worker thread -> GUI thread hop; QPixmaps can only be made on the GUI thread.
+    _decoded = pyqtSignal(object, list, list)  # Path, [QImage], [delay ms]
+
+    def __init__(
+        self,
+        size: int,
+        max_bytes: int = GIF_FRAME_CACHE_BYTES,
+        tick_ms: int = GIF_TICK_MS,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.size = size
+        self.max_bytes = max_bytes
+        self._cache: OrderedDict[Path, _Frames] = OrderedDict()
+        self._cache_bytes = 0
+        self._cells = {}  # label -> [frames, index, ms left on the current frame]
+        self._waiting: dict[Path, list] = {}  # path -> labels waiting for its frames
+        self._lock = threading.Lock()
+        self._wanted: set[Path] = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(GIF_DECODER_MAX_THREADS)
+        self._decoded.connect(self._on_decoded)
+        self._paused = False
+        self._last_tick = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(tick_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, label, path):
+        """Animates `label` with `path`'s frames - at once if they're cached, otherwise
+        once they're decoded. A file that can't be decoded leaves its name on the label."""
+        path = Path(path)
+        frames = self._cache.get(path)
+        if frames is not None:
+            self._cache.move_to_end(path)
+            self._attach(label, frames)
+            return
+        self._waiting.setdefault(path, []).append(label)
+        if path not in self._wanted:
+            with self._lock:
+                self._wanted.add(path)
+            self._pool.start(_DecodeJob(self, path, self.size))
+
+    def remove(self, label):
+        self._cells.pop(label, None)
+        for path, labels in list(self._waiting.items()):
+            if label in labels:
+                labels.remove(label)
+                if not labels:
+                    del self._waiting[path]
+                    with self._lock:
+                        self._wanted.discard(path)  # not started yet -> skipped
+        self._update_timer()
+
+    def clear(self):
+        self._cells.clear()
+        self._waiting.clear()
+        with self._lock:
+            self._wanted.clear()
+        self._pool.clear()
+        self._update_timer()
+
+    def shutdown(self):
+        """Stops everything and waits for running decodes - call before the owner goes away."""
+        self.clear()
+        self._pool.waitForDone()
+
+    def set_paused(self, paused: bool):
+        """Freezes every cell on its current frame (e.g. while the grid is hidden)."""
+        self._paused = paused
+        self._update_timer()
+
+    def is_animating(self, label) -> bool:
+        return label in self._cells or any(label in labels for labels in self._waiting.values())
+
+    def cache_bytes(self) -> int:
+        return self._cache_bytes
+
+    def _run_job(self, path, size):
+        """Runs on a pool thread."""
+        with self._lock:
+            if path not in self._wanted:
+                return
+        frames, delays = decode_gif_frames(path, size)
+        self._decoded.emit(path, frames, delays)
+
+    def _on_decoded(self, path, images, delays):
+        with self._lock:
+            self._wanted.discard(path)
+        labels = self._waiting.pop(path, [])
+        if not images:
+            for label in labels:
+                label.setText(path.name)
+            return
+        frames = _Frames([QPixmap.fromImage(image) for image in images], delays, sum(i.sizeInBytes() for i in images))
+        self._store(path, frames)
+        for label in labels:
+            self._attach(label, frames)
+
+    def _store(self, path, frames):
+        self._cache[path] = frames
+        self._cache_bytes += frames.size_bytes
+        # Cells already showing an evicted file keep their own reference to its frames -
+        # eviction only means the next cell for it decodes it again.
+        while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+            _path, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.size_bytes
+
+    def _attach(self, label, frames):
+        label.setPixmap(frames.pixmaps[0])
+        if len(frames.pixmaps) > 1:
+            self._cells[label] = [frames, 0, frames.delays[0]]
+        self._update_timer()
+
+    def _update_timer(self):
+        if self._cells and not self._paused:
+            if not self._timer.isActive():
+                self._last_tick = time.monotonic()
+                self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _tick(self):
+        # Real elapsed time rather than the nominal interval - a busy GUI thread delivers
+        # ticks late, and the animations shouldn't slow down with it.
+        now = time.monotonic()
+        elapsed_ms = (now - self._last_tick) * 1000
+        self._last_tick = now
+        for label, cell in self._cells.items():
+            frames, index, remaining_ms = cell
+            remaining_ms -= elapsed_ms
+            if remaining_ms > 0:
+                cell[2] = remaining_ms
+                continue
+            while remaining_ms <= 0:
+                index = (index + 1) % len(frames.pixmaps)
+                remaining_ms += frames.delays[index]
+            cell[1], cell[2] = index, remaining_ms
+            label.setPixmap(frames.pixmaps[index])
@@ -2,9 +2,9 @@ import random
 import time
 from pathlib import Path
 
-from PyQt6.QtCore import QSettings, Qt, QTimer, QUrl, pyqtSignal
+from PyQt6.QtCore import QEvent, QSettings, QSize, Qt, QTimer, QUrl, pyqtSignal
 from PyQt6.QtGui import QAction, QColor, QDesktopServices, QIcon, QMovie, QPixmap
-from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+from PyQt6.QtMultimedia import QAudioOutput, QMediaMetaData, QMediaPlayer
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 from PyQt6.QtWidgets import (
     QDialog,
@@ -22,20 +22,36 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from src import changelog, media_kinds, theme
+from src import changelog, image_headers, image_loading, media_kinds, media_metadata, theme
 from src.BeatHandler import BeatHandler
+from src.CacheWarmer import CacheWarmer
 from src.CalloutHandler import CalloutHandler
 from src.ClimaxHandler import ClimaxHandler
+from src.ClipSeeker import ClipSeeker
 from src.HelpDialog import HelpDialog
+from src.KeyframeReader import KeyframeReader
 from src.LongTermStatisticsDialog import LongTermStatisticsDialog
-from src.MediaFolderPickerDialog import MediaFolderPickerDialog
+from src.media_index import MediaIndex
+from src.MediaFolderPickerDialog import THUMBNAIL_IMAGE_SIZE, MediaFolderPickerDialog, read_persisted_folders
+from src.MediaFolderWatcher import MediaFolderWatcher
+from src.MediaPrefetcher import MediaPrefetcher
+from src.MetadataProber import MetadataProber
 from src.ScoreTracker import ScoreTracker
 from src.SettingsDialog import SettingsDialog
 from src.StatisticsDialog import StatisticsDialog
+from src.thumbnail_cache import ThumbnailCache
 from src.UpdateChecker import UpdateChecker
 from src.utils import get_current_version, get_project_root
 from src.WhatsNewDialog import WhatsNewDialog
 
+# Images decoded ahead of time - this many upcoming playlist entries, plus the previous
+# one for show_prev. Enough to ride out a few very large photos back to back at min_dur.
+PREFETCH_AHEAD = 3
+PREFETCH_BEHIND = 1
+# How long the image label has to keep its size before the current image/GIF is scaled to
+# it - a splitter drag or a window resize sends dozens of resize events a second.
+RESCALE_DEBOUNCE_MS = 150
+
 
 class GoonerApp(QMainWindow):
     DISCORD_INVITE_URL = "https://discord.gg/qqkcxvq37Z"
@@ -54,12 +70,60 @@ class GoonerApp(QMainWindow):
         "vid_loudness": 1.0,
         "show_startup_splash": True,
         "show_record_chase": True,
+        "stream_folder_scan": True,
+        "skip_duplicate_files": True,
+        "thumbnail_cache_mb": 256,
+        "prewarm_caches": True,
+        "display_cache_mb": 256,
+        "video_clip_mode": False,
+        "video_clip_dur": 6.0,
     }
 
-    def __init__(self, settings: QSettings | None = None):
+    def __init__(
+        self,
+        settings: QSettings | None = None,
+        media_index: MediaIndex | None = None,
+        thumbnail_cache: ThumbnailCache | None = None,
+    ):
         super().__init__()
 
         self.settings = settings if settings is not None else QSettings("GoonerCock", "GoonerApp")
+        # Shared by every MediaFolderPickerDialog this window opens - see MediaIndex.
+        self.media_index = media_index if media_index is not None else MediaIndex(MediaIndex.default_path())
+        # Same for the picker's rendered thumbnails - see ThumbnailCache.
+        self.thumbnail_cache = (
+            thumbnail_cache if thumbnail_cache is not None else ThumbnailCache(ThumbnailCache.default_path())
+        )
+        # Follows the running session's folders, so files deleted/renamed/added on disk
+        # mid-session are dropped from / spliced into the playlist - see _apply_folder_changes.
+        self.folder_watcher = MediaFolderWatcher(self.media_index, parent=self)
+        self.folder_watcher.files_changed.connect(self._on_folder_files_changed)
+        self._session_folders: list[str] = []
+        # The picker's DuplicateFilter for the running session, if duplicates are skipped -
+        # files the watcher finds mid-session go through it before reaching the playlist.
+        self._duplicate_filter = None
+        # str(path) -> media kind the index sniffed from the file's content, for every
+        # playlist entry - load_media's lookup, so a .png that's really an mp4 still plays
+        # as a video. Paths missing here fall back to the extension.
+        self._media_kinds: dict[str, str] = {}
+        # str(path) -> media_metadata dict for playlist entries whose metadata is known -
+        # seeded from the index at session start and filled in by the session's
+        # MetadataProber as it gets through the rest.
+        self._metadata: dict[str, dict] = {}
+        self._metadata_prober = None
+        # Warms the index/thumbnail cache for the remembered folders until the first picker
+        # opens - see start_cache_warmer.
+        self._cache_warmer = None
+        # Decodes the images around the current playlist position - see _prefetch_neighbours.
+        self.prefetcher = MediaPrefetcher(parent=self)
+        self.prefetcher.ready.connect(self._on_prefetched)
+        # Reads the keyframes clip mode snaps to - see _preload_next_video.
+        self.keyframe_reader = KeyframeReader(parent=self)
+        self.keyframe_reader.read.connect(self._on_keyframes_read)
+        # (path, box, dpr) of the pixmap on image_label, and the unscaled size of the GIF
+        # playing there - what _rescale_current fits to the label's new size.
+        self._shown_image = None
+        self._current_movie_size = None
 
         self.setWindowTitle("Auto Hero Generation")
 
@@ -100,14 +164,20 @@ class GoonerApp(QMainWindow):
         )
         self.media_stack.addWidget(self.image_label)
 
-        self.video_widget = QVideoWidget()
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
-        self.media_player.setVideoOutput(self.video_widget)
-        self.media_stack.addWidget(self.video_widget)
-
-        self.media_player.mediaStatusChanged.connect(self.video_status_changed)
+        # Two players, double-buffered: the active one (media_player/video_widget/
+        # audio_output) is what's on screen, while the standby one already has the next
+        # playlist entry loaded and paused on its first frame if that's a video (see
+        # _preload_next_video). load_media then swaps the two instead of starting a cold
+        # setSource() behind a black widget. Each has a ClipSeeker for clip mode's start.
+        self.media_player, self.audio_output, self.video_widget, self._clip_seeker = self._make_video_player()
+        (
+            self._standby_player,
+            self._standby_audio_output,
+            self._standby_video_widget,
+            self._standby_clip_seeker,
+        ) = self._make_video_player()
+        self._standby_path = None
+        self._standby_start_ms = None  # where clip mode starts the preloaded video
 
         self.callout_label = QLabel("")
         self.callout_label.setWordWrap(True)
@@ -215,15 +285,43 @@ class GoonerApp(QMainWindow):
         self.auto_play_timer = QTimer()
         self.auto_play_timer.timeout.connect(self.next_img_timer)
 
+        self._rescale_timer = QTimer(self)
+        self._rescale_timer.setSingleShot(True)
+        self._rescale_timer.setInterval(RESCALE_DEBOUNCE_MS)
+        self._rescale_timer.timeout.connect(self._rescale_current)
+        self.image_label.installEventFilter(self)
+
         self.max_dur = float(self.settings.value("GoonerApp/max_dur", 4.0))
         self.min_dur = float(self.settings.value("GoonerApp/min_dur", 0.5))
         self.video_min_dur = float(self.settings.value("GoonerApp/video_min_dur", 1.5))
+        self.video_clip_mode = bool(
+            self.settings.value("GoonerApp/video_clip_mode", self.DEFAULTS["video_clip_mode"], type=bool)
+        )
+        self.video_clip_dur = float(self.settings.value("GoonerApp/video_clip_dur", self.DEFAULTS["video_clip_dur"]))
         self.show_startup_splash = bool(
             self.settings.value("GoonerApp/show_startup_splash", self.DEFAULTS["show_startup_splash"], type=bool)
         )
         self.show_record_chase = bool(
             self.settings.value("GoonerApp/show_record_chase", self.DEFAULTS["show_record_chase"], type=bool)
         )
+        self.stream_folder_scan = bool(
+            self.settings.value("GoonerApp/stream_folder_scan", self.DEFAULTS["stream_folder_scan"], type=bool)
+        )
+        self.skip_duplicate_files = bool(
+            self.settings.value("GoonerApp/skip_duplicate_files", self.DEFAULTS["skip_duplicate_files"], type=bool)
+        )
+        self.thumbnail_cache_mb = int(
+            float(self.settings.value("GoonerApp/thumbnail_cache_mb", self.DEFAULTS["thumbnail_cache_mb"]))
+        )
+        self.display_cache_mb = int(
+            float(self.settings.value("GoonerApp/display_cache_mb", self.DEFAULTS["display_cache_mb"]))
+        )
+        self.prewarm_caches = bool(
+            self.settings.value("GoonerApp/prewarm_caches", self.DEFAULTS["prewarm_caches"], type=bool)
+        )
+        # The picker of the running session while its folder scan is still going - see
+        # _follow_streaming_picker.
+        self._streaming_picker = None
 
         media_layout.addWidget(self.controls_container)
         self.main_splitter.addWidget(media_container)
@@ -293,6 +391,23 @@ class GoonerApp(QMainWindow):
 
         self._setup_signal_handler()
 
+    @property
+    def thumbnail_cache_mb(self) -> int:
+        return self.thumbnail_cache.max_bytes // (1024 * 1024)
+
+    @thumbnail_cache_mb.setter
+    def thumbnail_cache_mb(self, megabytes):
+        # A property so SettingsDialog's generic setattr applies a new budget right away.
+        self.thumbnail_cache.max_bytes = int(megabytes) * 1024 * 1024
+
+    @property
+    def display_cache_mb(self) -> int:
+        return self.prefetcher.cache.max_bytes // (1024 * 1024)
+
+    @display_cache_mb.setter
+    def display_cache_mb(self, megabytes):
+        self.prefetcher.cache.max_bytes = int(megabytes) * 1024 * 1024
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_F or event.key() == Qt.Key.Key_F11:
             self._toggle_fullscreen()
@@ -311,6 +426,14 @@ class GoonerApp(QMainWindow):
         else:
             self._enter_fullscreen()
 
+    def eventFilter(self, watched, event):
+        if watched is self.image_label and event.type() in (
+            QEvent.Type.Resize,
+            QEvent.Type.DevicePixelRatioChange,
+        ):
+            self._rescale_timer.start()
+        return super().eventFilter(watched, event)
+
     def _enter_fullscreen(self):
         if not self.isFullScreen():
             self._was_maximized_before_fullscreen = self.isMaximized()
@@ -325,6 +448,37 @@ class GoonerApp(QMainWindow):
             else:
                 self.showNormal()
 
+    def _make_video_player(self):
+        player = QMediaPlayer()
+        audio_output = QAudioOutput()
+        video_widget = QVideoWidget()
+        player.setAudioOutput(audio_output)
+        player.setVideoOutput(video_widget)
+        self.media_stack.addWidget(video_widget)
+        # Both players stay connected; only the active one's signals are acted on - the
+        # standby one reports its preload's status and duration too.
+        player.mediaStatusChanged.connect(lambda status: self._on_player_status_changed(player, status))
+        player.durationChanged.connect(lambda duration_ms: self._on_player_duration_changed(player, duration_ms))
+        return player, audio_output, video_widget, self._make_clip_seeker(player)
+
+    def _make_clip_seeker(self, player):
+        seeker = ClipSeeker(player, parent=self)
+        seeker.ready.connect(lambda: self._on_clip_seeked(seeker))
+        return seeker
+
+    def _on_player_status_changed(self, player, status):
+        if player is self.media_player:
+            self.video_status_changed(status)
+
+    def _on_player_duration_changed(self, player, duration_ms):
+        if player is self.media_player:
+            self._on_video_duration_changed(duration_ms)
+
+    def _on_clip_seeked(self, seeker):
+        # The standby player's clip starts once load_media swaps it in.
+        if seeker is self._clip_seeker:
+            self._start_clip()
+
     def panic(self):
         """Instant hide-and-silence: minimizes the window and mutes audio in one keypress.
         Deliberately does not stop/pause the session (see Ctrl+Space) or auto-unmute on
@@ -335,6 +489,7 @@ class GoonerApp(QMainWindow):
     def set_muted(self, muted: bool):
         self.is_muted = muted
         self.audio_output.setMuted(muted)
+        self._standby_audio_output.setMuted(muted)
         self.beat_handler.set_muted(muted)
         self.btn_mute.setChecked(muted)
         self.btn_mute.setText("Unmute" if muted else "Mute")
@@ -527,22 +682,226 @@ class GoonerApp(QMainWindow):
         self.auto_play_timer.start(int(random.uniform(self.min_dur, self.max_dur) * 1000))
 
     def finde_unterstützte_dateien(self, verzeichnis_pfad: str) -> list[Path]:
-        return media_kinds.find_supported_files(verzeichnis_pfad)
+        return media_kinds.find_supported_files(verzeichnis_pfad, index=self.media_index)
+
+    def start_cache_warmer(self):
+        """Starts warming the index and thumbnail cache for the folders the picker was last
+        started with (see CacheWarmer) - called once the window is up. The picker does the
+        same work itself once it's open, so the warm-up ends with the first one."""
+        if not self.prewarm_caches or self._cache_warmer is not None or self.playlist:
+            return
+        folders = read_persisted_folders(self.settings)
+        if not folders:
+            return
+        warmer = CacheWarmer(folders, self.media_index, self.thumbnail_cache, THUMBNAIL_IMAGE_SIZE, parent=self)
+        warmer.finished.connect(self._stop_cache_warmer)
+        self._cache_warmer = warmer
+        warmer.start()
+
+    def _stop_cache_warmer(self):
+        if self._cache_warmer is None:
+            return
+        self._cache_warmer.stop()
+        self._cache_warmer.deleteLater()
+        self._cache_warmer = None
 
     def open_folder(self):
-        dialog = MediaFolderPickerDialog(parent=self)
+        self._stop_cache_warmer()
+        dialog = MediaFolderPickerDialog(
+            parent=self, stream_scan=self.stream_folder_scan, skip_duplicates=self.skip_duplicate_files
+        )
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            self._stop_streaming_picker()
             self._update_climax_status_label("neutral")
             files = dialog.selected_files
             if files:
                 random.shuffle(files)
                 self.playlist = files
+                self.prefetcher.cancel_all()
                 self.current_index = 0
+                self._media_kinds = self.media_index.kinds(files)
+                self._metadata = self.media_index.metadata(files)
+                self._adopt_duplicate_filter(getattr(dialog, "duplicate_filter", None))
+                self._follow_streaming_picker(dialog)
+                self._probe_playlist_metadata()
+                self._watch_session_folders(dialog)
                 self.start()
             else:
                 self.image_label.setText("Keine Dateien gefunden.")
+                self._discard_picker(dialog)
                 self.stop()
 
+    def _discard_picker(self, dialog):
+        """Stops what an accepted picker hands over when there's no session to take it: the
+        duplicate filter and any scans still in flight would otherwise keep running (and
+        the scanner threads outlive their owner) with nobody listening."""
+        duplicate_filter = getattr(dialog, "duplicate_filter", None)
+        if duplicate_filter is not None:
+            duplicate_filter.filtered.disconnect(dialog._on_duplicates_filtered)
+            duplicate_filter.stop()
+        if getattr(dialog, "late_files", None) is None:
+            return
+        # As in _stop_streaming_picker(): join the scanner threads before the picker goes.
+        dialog.stop_scans()
+        dialog.deleteLater()
+
+    def _adopt_duplicate_filter(self, duplicate_filter):
+        self._stop_duplicate_filter()
+        if duplicate_filter is not None:
+            duplicate_filter.filtered.connect(self._on_duplicates_filtered)
+        self._duplicate_filter = duplicate_filter
+
+    def _stop_duplicate_filter(self):
+        if self._duplicate_filter is None:
+            return
+        self._duplicate_filter.filtered.disconnect(self._on_duplicates_filtered)
+        self._duplicate_filter.stop()
+        self._duplicate_filter = None
+
+    def _on_duplicates_filtered(self, tag, kept):
+        # The picker's own batches come back on the same signal - only ours are tagged self.
+        if tag is not self:
+            return
+        if kept:
+            self.splice_into_playlist(kept)
+        if not self.playlist and not self._duplicate_filter.is_busy():
+            self.stop()
+
+    def _follow_streaming_picker(self, dialog):
+        """Keeps splicing a still-scanning picker's late batches into the playlist. Batches
+        that landed between Start and this call were emitted before anything was connected,
+        so they're picked up from dialog.late_files first - nothing can arrive in between,
+        since both this and batch delivery run on the GUI thread."""
+        late_files = getattr(dialog, "late_files", None)
+        if late_files is None:
+            return
+        self.splice_into_playlist(late_files)
+        if dialog.is_scanning():
+            dialog.files_discovered.connect(self.splice_into_playlist)
+            dialog.scan_finished.connect(self._on_streaming_scan_finished)
+            self._streaming_picker = dialog
+
+    def _watch_session_folders(self, dialog):
+        """Points the folder watcher at the new session's folders - right away, or once a
+        still-running streaming scan finishes (until then, its own batches are what keep
+        the playlist growing, and the index doesn't know the folder's directories yet)."""
+        self.folder_watcher.release(self)
+        self._session_folders = list(getattr(dialog, "folders", []))
+        if self._streaming_picker is not dialog:
+            self._start_folder_watcher()
+
+    def _start_folder_watcher(self):
+        for folder in self._session_folders:
+            if Path(folder).is_dir():
+                self.folder_watcher.watch(folder, owner=self)
+
+    def _on_folder_files_changed(self, folder, added, removed):
+        # The watcher is shared with an open picker - its folders aren't the session's.
+        if folder in self.folder_watcher.folders(self):
+            self._apply_folder_changes(folder, added, removed)
+
+    def _apply_folder_changes(self, _folder, added, removed):
+        """Drops files that vanished from disk from the playlist (so playback never lands on
+        a deleted file) and splices newly-appeared ones into the unplayed part. A rename is
+        just both at once. With duplicates skipped, the additions are spliced in later by
+        _on_duplicates_filtered, once the DuplicateFilter has hashed them off the GUI thread."""
+        if self._duplicate_filter is not None:
+            self._duplicate_filter.forget(removed)
+            if added:
+                self._duplicate_filter.submit(added, tag=self)
+            added = []
+        if removed:
+            gone = set(removed)
+            current = self.playlist[self.current_index] if self.playlist else None
+            kept_before = sum(1 for path in self.playlist[: self.current_index] if path not in gone)
+            self.playlist = [path for path in self.playlist if path not in gone]
+            # If the file on screen was the one removed, step back one so show_next()
+            # lands on whatever followed it rather than skipping that too.
+            self.current_index = kept_before - 1 if current in gone else kept_before
+            if self.current_index < 0:
+                self.current_index = len(self.playlist) - 1 if self.playlist else 0
+        if added:
+            self.splice_into_playlist(added)
+        # Files still being checked for duplicates may yet refill it - _on_duplicates_filtered decides then.
+        if not self.playlist and not (self._duplicate_filter is not None and self._duplicate_filter.is_busy()):
+            self.stop()
+
+    def _on_streaming_scan_finished(self):
+        self._stop_streaming_picker()
+        self._start_folder_watcher()
+        # The prober started with the session only saw the first batches.
+        self._probe_playlist_metadata()
+
+    def _probe_playlist_metadata(self):
+        """(Re)starts a MetadataProber over the whole playlist. Files it already probed are
+        answered from the index without touching the pool, so restarting is cheap."""
+        self._stop_metadata_prober()
+        prober = MetadataProber(self.playlist, index=self.media_index, parent=self)
+        prober.results_found.connect(self._on_metadata_found)
+        self._metadata_prober = prober
+        prober.start()
+
+    def _stop_metadata_prober(self):
+        if self._metadata_prober is None:
+            return
+        self._metadata_prober.results_found.disconnect(self._on_metadata_found)
+        # Joins the thread - same reason as _stop_streaming_picker's stop_scans().
+        self._metadata_prober.stop()
+        self._metadata_prober.deleteLater()
+        self._metadata_prober = None
+
+    def _on_metadata_found(self, results):
+        self._metadata.update((str(path), metadata) for path, metadata in results.items())
+
+    def _on_video_duration_changed(self, duration_ms):
+        """Records a playing video's duration the first time it's learned, so the next
+        time it comes up load_media can set its loop count up front."""
+        if duration_ms <= 0 or not self.playlist:
+            return
+        file_path = str(self.playlist[self.current_index])
+        if (self._metadata.get(file_path) or {}).get("duration_ms"):
+            return
+        resolution = self.media_player.metaData().value(QMediaMetaData.Key.Resolution)
+        media_metadata.store_video_metadata(self.media_index, file_path, duration_ms, resolution)
+        metadata = self._metadata.setdefault(file_path, media_metadata.empty_metadata())
+        metadata["duration_ms"] = duration_ms
+
+    def _stop_streaming_picker(self):
+        if self._streaming_picker is None:
+            return
+        # A picker replaced mid-scan can still have its last finished/batch signals queued -
+        # they must not reach the next session's playlist or watcher.
+        self._streaming_picker.files_discovered.disconnect(self.splice_into_playlist)
+        self._streaming_picker.scan_finished.disconnect(self._on_streaming_scan_finished)
+        # stop_scans() joins the scanner threads - deleting their owner with one still
+        # running would abort the whole process.
+        self._streaming_picker.stop_scans()
+        self._streaming_picker.deleteLater()
+        self._streaming_picker = None
+
+    def splice_into_playlist(self, files):
+        """Adds `files` at uniformly random positions in the not-yet-played part of the
+        playlist (everything after current_index). Each file is appended and then swapped
+        with a random unplayed slot - an inside-out Fisher-Yates step, so the unplayed tail
+        stays a uniform shuffle at O(1) per file instead of a list.insert() shifting up to
+        the whole playlist every time."""
+        self._media_kinds.update(self.media_index.kinds(files))
+        for path in files:
+            self.playlist.append(path)
+            last = len(self.playlist) - 1
+            target = random.randint(min(self.current_index + 1, last), last)
+            self.playlist[target], self.playlist[last] = self.playlist[last], self.playlist[target]
+
+    def closeEvent(self, event):
+        self._stop_cache_warmer()
+        self.prefetcher.shutdown()
+        self.keyframe_reader.shutdown()
+        self._stop_streaming_picker()
+        self._stop_metadata_prober()
+        self._stop_duplicate_filter()
+        self.folder_watcher.stop()
+        super().closeEvent(event)
+
     def show_next(self):
         if not self.playlist:
             return
@@ -560,36 +919,200 @@ class GoonerApp(QMainWindow):
             return
         file_path = str(self.playlist[self.current_index])
         self.load_media(file_path)
+        self._prefetch_neighbours()
+        self._preload_next_video()
+
+    def _prefetch_neighbours(self):
+        """Queues decodes for the current image and the ones the next show_next()/show_prev()
+        calls will load, at the size load_media will ask for them - nearest first. Right
+        after load_media the current one is cached already; after a resize it isn't."""
+        count = len(self.playlist)
+        offsets = [0, *range(1, PREFETCH_AHEAD + 1), *(-i for i in range(1, PREFETCH_BEHIND + 1))]
+        paths = []
+        for offset in offsets:
+            path = str(self.playlist[(self.current_index + offset) % count])
+            kind = self._media_kinds.get(path) or media_kinds.media_kind(path)
+            if kind == "image" and path not in paths:
+                paths.append(path)
+        self.prefetcher.prefetch(paths, *self._display_box())
+
+    def _display_box(self):
+        """The image label's size in device pixels, and its device pixel ratio - what images
+        are decoded for, so a HiDPI screen gets every physical pixel rather than a frame
+        scaled up from the logical size."""
+        dpr = self.image_label.devicePixelRatioF()
+        size = self.image_label.size()
+        return QSize(round(size.width() * dpr), round(size.height() * dpr)), dpr
+
+    def _show_image(self, file_path, box, dpr, pixmap):
+        self.image_label.setPixmap(pixmap)
+        self._shown_image = (file_path, box, dpr)
+
+    def _rescale_current(self):
+        """Fits what's on image_label to its size once resizing has settled (see
+        RESCALE_DEBOUNCE_MS). A GIF's QMovie just gets a new scaled size. An image is decoded
+        again for the new size on the prefetcher's threads and swapped in by _on_prefetched -
+        re-reading the file at reduced size (see image_loading.read_scaled) rather than
+        keeping a full-resolution copy of every image shown in memory."""
+        if self.current_movie is not None:
+            if self._current_movie_size is not None:
+                self.current_movie.setScaledSize(
+                    self._current_movie_size.scaled(self.image_label.size(), Qt.AspectRatioMode.KeepAspectRatio)
+                )
+            return
+        if self._shown_image is None:
+            return
+        file_path = self._shown_image[0]
+        box, dpr = self._display_box()
+        if self._shown_image == (file_path, box, dpr):
+            return
+        pixmap = self.prefetcher.take(file_path, box, dpr)
+        if pixmap is not None:
+            self._show_image(file_path, box, dpr, pixmap)
+        elif self.playlist:
+            self._prefetch_neighbours()
+        else:
+            self.prefetcher.prefetch([file_path], box, dpr)
+
+    def _on_prefetched(self, path, box, dpr):
+        """Swaps in the current image once it's decoded for the label's size after a resize."""
+        if self._shown_image is None:
+            return
+        file_path, shown_box, shown_dpr = self._shown_image
+        if Path(file_path) != Path(path) or (shown_box, shown_dpr) == (box, dpr):
+            return
+        if (box, dpr) != self._display_box():
+            return  # resized again meanwhile - the next decode is on its way
+        pixmap = self.prefetcher.take(path, box, dpr)
+        if pixmap is not None:  # None only if it didn't even fit the cache's budget
+            self._show_image(file_path, box, dpr, pixmap)
+
+    def _preload_next_video(self):
+        """Loads the next playlist entry into the standby player and pauses it on its first
+        frame, if it's a video - so the show_next() that reaches it only swaps players.
+        Anything else leaves the standby player empty, without holding a file open."""
+        next_path = str(self.playlist[(self.current_index + 1) % len(self.playlist)])
+        kind = self._media_kinds.get(next_path) or media_kinds.media_kind(next_path)
+        wanted = next_path if kind == "video" else None
+        if wanted == self._standby_path:
+            return
+        self._standby_player.stop()
+        self._standby_clip_seeker.cancel()
+        self._standby_path = wanted
+        self._standby_start_ms = None
+        if wanted is None:
+            self._standby_player.setSource(QUrl())
+            return
+        self._standby_player.setSource(QUrl.fromLocalFile(wanted))
+        self._standby_player.pause()
+        if self.video_clip_mode:
+            # Its keyframes are read off the GUI thread; once they're in, the paused frame
+            # becomes the clip's first one (see _on_keyframes_read).
+            self.keyframe_reader.request(wanted)
+
+    def _on_keyframes_read(self, path):
+        if path != self._standby_path:
+            return
+        self._standby_start_ms = self._clip_start_ms(path)
+        if self._standby_start_ms is not None:
+            self._standby_clip_seeker.seek(self._standby_start_ms)
+
+    def _clip_start_ms(self, file_path):
+        """Where clip mode starts `file_path` (see media_metadata.clip_start_ms), or None to
+        play it from the top - clip mode off, or a video no longer than one clip. An
+        MP4/MOV's moov box supplies the keyframes, and the duration if it isn't known yet -
+        from the KeyframeReader's cache, read here only for a video that wasn't preloaded."""
+        if not self.video_clip_mode:
+            return None
+        duration_ms = (self._metadata.get(file_path) or {}).get("duration_ms")
+        mp4_info = self.keyframe_reader.info(file_path)
+        if mp4_info is not None and not duration_ms:
+            duration_ms = mp4_info.duration_ms
+        return media_metadata.clip_start_ms(duration_ms, self.video_clip_dur * 1000, mp4_info)
+
+    def _swap_video_players(self):
+        """Makes the standby player the active one (and the other way round)."""
+        self.media_player, self._standby_player = self._standby_player, self.media_player
+        self.audio_output, self._standby_audio_output = self._standby_audio_output, self.audio_output
+        self.video_widget, self._standby_video_widget = self._standby_video_widget, self.video_widget
+        self._clip_seeker, self._standby_clip_seeker = self._standby_clip_seeker, self._clip_seeker
+        # Emptied rather than left holding the old video open - _standby_path None means an
+        # empty standby player, and _preload_next_video keeps it that way when the next
+        # entry is no video.
+        self._standby_player.setSource(QUrl())
+        self._standby_path = None
+        self._standby_start_ms = None
 
     def load_media(self, file_path):
-        kind = media_kinds.media_kind(file_path)
+        kind = self._media_kinds.get(file_path) or media_kinds.media_kind(file_path)
+        metadata = self._metadata.get(file_path) or media_metadata.empty_metadata()
 
         self.media_player.stop()
+        self._clip_seeker.cancel()
+        self._shown_image = None
         if self.current_movie:
             self.current_movie.stop()
             self.image_label.setMovie(None)
             self.current_movie = None
+            self._current_movie_size = None
 
         if kind == "video":
             self.auto_play_timer.stop()
 
+            if file_path == self._standby_path:
+                # Already loaded and showing its first frame - no setup to wait for, and in
+                # clip mode already seeked (or seeking) to the clip's start, unless its
+                # keyframes are still being read.
+                still_reading = self.keyframe_reader.is_pending(file_path)
+                start_ms = self._standby_start_ms
+                self._swap_video_players()
+                # Its durationChanged came while it was still the standby player.
+                self._on_video_duration_changed(self.media_player.duration())
+                if still_reading:
+                    start_ms = self._clip_start_ms(file_path)
+                    if start_ms is not None:
+                        self._clip_seeker.seek(start_ms)
+            else:
+                self.media_player.setSource(QUrl.fromLocalFile(file_path))
+                start_ms = self._clip_start_ms(file_path)
+                if start_ms is not None:
+                    self._clip_seeker.seek(start_ms)
             self.media_stack.setCurrentWidget(self.video_widget)
-            self.media_player.setSource(QUrl.fromLocalFile(file_path))
-            self.media_player.play()
-            self.video_start_time = time.time()
+            if start_ms is not None:
+                # Clip mode: played (and timed) from the clip's start once the seek there has
+                # stuck - see _start_clip.
+                self.media_player.setLoops(1)
+                if not self._clip_seeker.is_seeking():
+                    self._start_clip()
+            else:
+                # With the duration known, the player loops the clip natively for as long as
+                # video_min_dur asks - no stall while video_status_changed restarts it on every
+                # EndOfMedia, which stays as the fallback for clips not probed yet.
+                loops = media_metadata.loops_for_min_duration(metadata["duration_ms"], self.video_min_dur)
+                self.media_player.setLoops(loops)
+                self.media_player.play()
+                self.video_start_time = time.time()
             self.audio_output.setVolume(self.vid_loudness)
 
         elif kind == "gif":
             self.media_stack.setCurrentWidget(self.image_label)
 
             movie = QMovie(file_path)
-            movie.jumpToFrame(0)
 
             available_size = self.image_label.size()
             if available_size.isValid():
-                original_size = movie.currentImage().size()
+                width, height = metadata["width"], metadata["height"]
+                if not (width and height) and (header := image_headers.read_header(file_path)):
+                    width, height = header.width, header.height
+                if width and height:
+                    original_size = QSize(width, height)
+                else:
+                    # Not a GIF header we could read - decode the first frame to learn its size.
+                    movie.jumpToFrame(0)
+                    original_size = movie.currentImage().size()
                 scaled_size = original_size.scaled(available_size, Qt.AspectRatioMode.KeepAspectRatio)
                 movie.setScaledSize(scaled_size)
+                self._current_movie_size = original_size
 
             self.image_label.setMovie(movie)
             movie.start()
@@ -599,13 +1122,27 @@ class GoonerApp(QMainWindow):
 
         elif kind == "image":
             self.media_stack.setCurrentWidget(self.image_label)
-            pixmap = QPixmap(file_path)
-            scaled_pixmap = pixmap.scaled(self.image_label.size(),
-                                          Qt.AspectRatioMode.KeepAspectRatio,
-                                          Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+            # Usually already in the prefetcher's display cache, or being decoded for it right
+            # now; if not (the first image, a jump, a resize), decoded straight at (about) the
+            # label's size and cached then.
+            box, dpr = self._display_box()
+            pixmap = self.prefetcher.take(file_path, box, dpr)
+            if pixmap is None:
+                pixmap = self.prefetcher.wait_for(file_path, box, dpr)
+            if pixmap is None:
+                image = image_loading.read_scaled(file_path, box)
+                pixmap = self.prefetcher.store(file_path, box, image, dpr) if image is not None else QPixmap()
+            self._show_image(file_path, box, dpr, pixmap)
             self.recalc_autoplay_timer()
 
+    def _start_clip(self):
+        """Clip mode: plays the active player for one window from the clip start it's at,
+        then on to the next file on the slideshow's own timer - the rest of a long video is
+        never decoded."""
+        self.media_player.play()
+        self.video_start_time = time.time()
+        self.auto_play_timer.start(int(self.video_clip_dur * 1000))
+
     # Neue Methode zur GoonerApp-Klasse hinzufügen
     def open_settings(self):
         settings_dialog = SettingsDialog(parent=self)
@@ -617,6 +1154,8 @@ class GoonerApp(QMainWindow):
             self.beat_handler.stop()
             self.btn_load.setText("Set Gooning Folder and Start.")
             self.is_running = False
+            self.prefetcher.cancel_all()
+            self._clip_seeker.cancel()
             self.btn_next.setEnabled(False)
             self.btn_prev.setEnabled(False)
             self.btn_stop.setEnabled(False)
@@ -633,8 +1172,9 @@ class GoonerApp(QMainWindow):
             self.beat_handler.start_beat()
             self.is_running = True
             self.btn_load.setText("Change Gooning Folder.")
+        # load_media sets the auto-play timer for whatever it loaded - an image's random
+        # duration, a clip's window, or none for a video that plays to its end.
         self.load_current_index()
-        self.recalc_autoplay_timer()
 
     def _on_climax_outcome(self, outcome):
         if outcome == "denied":
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src import mp4_boxes
+
+# Mp4Infos kept - the current video, the preloaded next one and whatever going back a few
+# entries brings round again. A keyframe table is one int per keyframe.
+KEYFRAME_CACHE_ENTRIES = 16
+
+
+class _ReadJob(QRunnable):
+    def __init__(self, reader, path):
+        super().__init__()
+        self.reader = reader
+        self.path = path
+
+    def run(self):
+        self.reader._run_job(self.path)
+
+
+class KeyframeReader(QObject):
+    """Reads videos' keyframe tables (mp4_boxes.parse) for clip mode off the GUI thread,
+    into a small LRU cache - a long MP4's moov box can take a while to read from a slow
+    disk, and the same video comes round again when going back and forth.
+
+    request() reads a file on a pool thread and says when it's cached with `read`; info()
+    returns the cached Mp4Info, reading the file right there only if it isn't cached yet
+    (a jump to a video nobody preloaded)."""
+
+    read = pyqtSignal(str)  # path, its info() now cached
+
+    # Worker thread -> GUI thread hop; the cache is only touched on the GUI thread.
+    _finished = pyqtSignal(str, object)  # path, Mp4Info | None
+
+    def __init__(self, max_entries: int = KEYFRAME_CACHE_ENTRIES, parent=None):
+        super().__init__(parent)
+        self.max_entries = max_entries
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._infos: OrderedDict[str, mp4_boxes.Mp4Info | None] = OrderedDict()
+        self._pending: set[str] = set()
+        self._finished.connect(self._deliver)
+
+    def request(self, path: str):
+        """Reads `path` in the background - or, if it's cached already, emits `read` at once."""
+        if path in self._infos:
+            self.read.emit(path)
+        elif path not in self._pending:
+            self._pending.add(path)
+            self._pool.start(_ReadJob(self, path))
+
+    def is_pending(self, path: str) -> bool:
+        return path in self._pending
+
+    def info(self, path: str) -> mp4_boxes.Mp4Info | None:
+        if path in self._infos:
+            self._infos.move_to_end(path)
+            return self._infos[path]
+        info = mp4_boxes.parse(path)
+        self._remember(path, info)
+        return info
+
+    def shutdown(self):
+        """Withdraws queued reads and waits for the running one - call before the owner goes away."""
+        self._pool.clear()
+        self._pending.clear()
+        self._pool.waitForDone()
+
+    def _remember(self, path, info):
+        self._infos[path] = info
+        self._infos.move_to_end(path)
+        while len(self._infos) > self.max_entries:
+            self._infos.popitem(last=False)
+
+    def _run_job(self, path):
+        """Runs on a pool thread."""
+        self._finished.emit(path, mp4_boxes.parse(path))
+
+    def _deliver(self, path, info):
+        if path not in self._pending:
+            return  # shut down meanwhile
+        self._pending.discard(path)
+        self._remember(path, info)
+        self.read.emit(path)
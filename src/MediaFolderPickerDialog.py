@@ -1,12 +1,8 @@
 import json
-import random
-import time
 from pathlib import Path
 
-from PyQt6.QtCore import QSize, Qt, QTimer, QUrl
-from PyQt6.QtGui import QMovie, QPixmap
-from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer, QVideoSink
-from PyQt6.QtMultimediaWidgets import QVideoWidget
+from PyQt6.QtCore import QSize, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -20,15 +16,30 @@ from PyQt6.QtWidgets import (
     QListWidgetItem,
     QPushButton,
     QScrollArea,
+    QStackedWidget,
     QStyle,
     QVBoxLayout,
     QWidget,
 )
 
-from src import media_kinds, theme
-from src.thumbnail_sampling import compute_thumbnail_grid, sample_thumbnails_with_video_cap
+from src import media_kinds, perceptual_hash, preview_strips, theme
+from src.content_dedup import ContentDeduplicator
+from src.DuplicateFilter import DuplicateFilter
+from src.FolderScanner import FolderScanner
+from src.GifAnimator import GifAnimator
+from src.MediaFolderWatcher import MediaFolderWatcher
+from src.PerceptualHashScanner import PerceptualHashScanner
+from src.PreviewAnimator import PreviewAnimator
+from src.thumbnail_sampling import SamplingIndex, compute_thumbnail_grid
+from src.ThumbnailBrowser import ThumbnailBrowser
+from src.ThumbnailLoader import ThumbnailLoader
+from src.VideoFrameGrabber import VideoFrameGrabber
+from src.VideoHashScanner import VideoHashScanner
 
 THUMBNAIL_CELL_SIZE = (140, 140)
+# What a cell's image is scaled to fit, inside the cell's padding - also the ThumbnailCache
+# key size, so anything warming the cache for the picker has to render at exactly this.
+THUMBNAIL_IMAGE_SIZE = THUMBNAIL_CELL_SIZE[0] - 8
 GRID_SPACING = 8
 GRID_MARGIN = 8
 # Fallback only - _scrollbar_width_reserve() queries the real metric from the active style
@@ -40,44 +51,111 @@ GRID_MARGIN = 8
 SCROLLBAR_WIDTH_RESERVE = 24
 RESIZE_DEBOUNCE_MS = 150
 
-# Videos are far heavier to thumbnail/animate than images or gifs (each animated one needs
-# its own live QMediaPlayer), so the sampling itself never picks more than this many across
-# the whole grid, regardless of grid size.
-MAX_VIDEO_THUMBNAILS = 4
-VIDEO_LOOP_DURATION_MS = 5000
-INITIAL_SEEK_RETRY_MS = 300
+# Videos are far heavier to thumbnail than images or gifs (every one is a QMediaPlayer
+# frame grab, a dozen of them for an animated preview strip, until the ThumbnailCache has
+# it), so the sampling itself never picks more than this many across the whole grid,
+# regardless of grid size.
+MAX_VIDEO_THUMBNAILS = 24
 
 # A plain-image rebuild is near-instant (tens of ms) - only show the busy cursor/disabled
 # buttons if a rebuild is still running after this long, so the common fast case stays
-# exactly as unobtrusive as before this feedback existed. Video frame-grabbing is what
-# actually crosses this threshold in practice.
+# exactly as unobtrusive as before this feedback existed.
 BUSY_INDICATOR_DELAY_MS = 250
 
-VIDEO_METADATA_WAIT_TIMEOUT_S = 1.0
-VIDEO_FRAME_WAIT_TIMEOUT_S = 1.0
-VIDEO_FRAME_GRAB_ATTEMPTS = 3
-VIDEO_BLACK_FRAME_BRIGHTNESS_THRESHOLD = 20
+
+def read_persisted_folders(settings) -> list[str]:
+    """The folders the picker was last started with, as saved in `settings`."""
+    raw = settings.value("GoonerApp/last_selected_folders", "[]")
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return []
 
 
 class MediaFolderPickerDialog(QDialog):
-    def __init__(self, parent=None, initial_folders=None):
+    # Streaming mode only: once Start was pressed while a scan was still running, every
+    # batch that arrives afterwards is re-emitted here for GoonerApp to splice into the
+    # running playlist, and scan_finished fires when the last folder is done.
+    files_discovered = pyqtSignal(list)
+    scan_finished = pyqtSignal()
+
+    def __init__(self, parent=None, initial_folders=None, stream_scan=False, skip_duplicates=False):
         super().__init__(parent)
         self.setWindowTitle("Select Gooning Folders")
         self.setModal(True)
         self.resize(900, 650)
 
         self.main_app = parent
+        self.media_index = getattr(self.main_app, "media_index", None)
+        self.thumbnail_cache = getattr(self.main_app, "thumbnail_cache", None)
+        # Still-image cells are decoded on the loader's thread pool, static video cells are
+        # grabbed by the VideoFrameGrabber - either way a cell shows as an empty placeholder
+        # until its image arrives (see _on_thumbnail_loaded/_on_video_frame_grabbed).
+        self._thumbnail_loader = ThumbnailLoader(self.thumbnail_cache, parent=self)
+        self._thumbnail_loader.loaded.connect(self._on_thumbnail_loaded)
+        self._frame_grabber = VideoFrameGrabber(
+            self.media_index, thumbnail_size=THUMBNAIL_IMAGE_SIZE, cache=self.thumbnail_cache, parent=self
+        )
+        self._frame_grabber.frame_grabbed.connect(self._on_video_frame_grabbed)
+        self._frame_grabber.strip_grabbed.connect(self._on_preview_strip_grabbed)
+        self._pending_cells: dict[Path, QLabel] = {}
+        # Animated video cells flip through a pre-rendered strip of frames, all of them off
+        # this one shared timer.
+        self._preview_animator = PreviewAnimator(parent=self)
+        # GIF cells likewise - frames decoded once at cell size, then all played off one clock.
+        self._gif_animator = GifAnimator(THUMBNAIL_IMAGE_SIZE, parent=self)
         self.folders: list[str] = []
         self._per_folder_files: dict[str, list[Path]] = {}
+        # The same files split by folder and kind, kept in step with _per_folder_files, so
+        # drawing a grid's worth of thumbnails never walks the whole library.
+        # Sniffed media kind of every file above (see media_kinds.media_kinds_of) - what
+        # decides which decoder a cell gets, rather than the extension.
+        self._kinds: dict[Path, str] = {}
+        self._sampling_index = SamplingIndex(self._is_video)
         self.selected_files: list[Path] = []
+        # stream_scan walks newly-added folders on FolderScanner threads instead of blocking
+        # here - Start unlocks as soon as the first file arrives, and a scan still running at
+        # that point is handed over to the session rather than stopped (see _on_start).
+        self.stream_scan = stream_scan
+        self._scanners: dict[str, FolderScanner] = {}
+        self._handed_over = False
+        # Everything a handed-over scan found after Start, in arrival order - see
+        # GoonerApp._follow_streaming_picker for why this is kept alongside the signal.
+        self.late_files: list[Path] = []
+        # skip_duplicates runs the Start selection (and every handed-over batch after it)
+        # through a ContentDeduplicator on a DuplicateFilter thread, so a file sitting in
+        # several picked folders plays once. Kept public - the session goes on using the
+        # filter for watcher additions.
+        self.skip_duplicates = skip_duplicates
+        self.deduplicator = None
+        self.duplicate_filter = None
+        # dHash per file (a combined one per video), filled in the background while
+        # "collapse near-duplicates" is ticked - see _update_near_duplicate_hashing.
+        self._perceptual_hashes: dict[Path, int | None] = {}
+        # The running PerceptualHashScanner (images/gifs) and VideoHashScanner, if any.
+        self._hash_scanners = []
+        self._hash_progress = {}  # scanner -> (done, total)
+        # Keeps each scanned folder's cached file list (and the grid) current while the
+        # dialog stays open - needs the index, which is what it diffs changes against. The
+        # app's watcher when there is one: a second watcher on the same index would race the
+        # session's for every change (see MediaFolderWatcher).
+        self._watcher = getattr(self.main_app, "folder_watcher", None)
+        if self._watcher is None and self.media_index is not None:
+            self._watcher = MediaFolderWatcher(self.media_index, parent=self)
+        if self._watcher is not None:
+            self._watcher.files_changed.connect(self._on_folder_files_changed)
         self._current_thumbnails: list[Path] = []
         self._thumbnail_cells: list[QWidget] = []
         self._last_grid_count = 0
-        # _grab_video_frame blocks for up to several seconds pumping app.processEvents(),
-        # which lets a pending resize-debounce timeout (or a button click) get dispatched
-        # *while* a rebuild is still mid-flight, mutating these same lists reentrantly -
-        # this guards _refresh_thumbnails/_adjust_thumbnail_count/_rebuild_cells_in_place
-        # against running inside one another.
+        # The first grid is drawn from files the ThumbnailCache already has (what a
+        # CacheWarmer rendered, or an earlier picker showed), so it opens without decoding;
+        # later resamples go back to drawing from everything.
+        self._prefer_cached_thumbnails = self.thumbnail_cache is not None
+        # Cell construction must never re-enter itself: anything that pumps the event loop
+        # mid-rebuild (a QMessageBox, a nested dialog) lets a pending resize-debounce
+        # timeout (or a button click) get dispatched *while* a rebuild is still mid-flight,
+        # mutating these same lists reentrantly - this guards _refresh_thumbnails/
+        # _adjust_thumbnail_count/_rebuild_cells_in_place against running inside one another.
         self._is_rebuilding = False
         self._busy_indicators_shown = False
 
@@ -116,10 +194,19 @@ class MediaFolderPickerDialog(QDialog):
 
         # Always starts unchecked and is never persisted - a deliberate choice so a real
         # thumbnail (not a live decode) is the default every time the dialog opens.
-        self.animate_videos_checkbox = QCheckBox("Animate video clips (5s loop)")
+        self.animate_videos_checkbox = QCheckBox("Animate video previews")
         self.animate_videos_checkbox.setChecked(False)
         self.animate_videos_checkbox.toggled.connect(self._on_animate_videos_toggled)
-        layout.addWidget(self.animate_videos_checkbox)
+        # The grid above only ever shows a sample that fits the window - this swaps it for
+        # a scrollable ThumbnailBrowser over every file of every picked folder.
+        self.browse_all_checkbox = QCheckBox("Browse all files")
+        self.browse_all_checkbox.setChecked(False)
+        self.browse_all_checkbox.toggled.connect(self._on_browse_all_toggled)
+        preview_options = QHBoxLayout()
+        preview_options.addWidget(self.animate_videos_checkbox)
+        preview_options.addWidget(self.browse_all_checkbox)
+        preview_options.addStretch(1)
+        layout.addLayout(preview_options)
 
         self.thumbnail_grid_widget = QWidget()
         self.thumbnail_grid_layout = QGridLayout(self.thumbnail_grid_widget)
@@ -129,7 +216,26 @@ class MediaFolderPickerDialog(QDialog):
         self.thumbnail_scroll = QScrollArea()
         self.thumbnail_scroll.setWidgetResizable(True)
         self.thumbnail_scroll.setWidget(self.thumbnail_grid_widget)
-        layout.addWidget(self.thumbnail_scroll, stretch=1)
+
+        self.thumbnail_browser = ThumbnailBrowser(
+            QSize(*THUMBNAIL_CELL_SIZE), GRID_SPACING, self.thumbnail_cache, self.media_index
+        )
+        self.preview_stack = QStackedWidget()
+        self.preview_stack.addWidget(self.thumbnail_scroll)
+        self.preview_stack.addWidget(self.thumbnail_browser)
+        layout.addWidget(self.preview_stack, stretch=1)
+
+        near_duplicates_row = QHBoxLayout()
+        self.collapse_near_duplicates_checkbox = QCheckBox("Collapse near-duplicate files")
+        self.collapse_near_duplicates_checkbox.setToolTip(
+            "Re-encoded or resized copies of the same picture or video play only once - the largest copy is kept."
+        )
+        self.collapse_near_duplicates_checkbox.setChecked(self._read_persisted_collapse_near_duplicates())
+        self.collapse_near_duplicates_checkbox.toggled.connect(self._on_collapse_near_duplicates_toggled)
+        self.near_duplicates_label = QLabel()
+        near_duplicates_row.addWidget(self.collapse_near_duplicates_checkbox)
+        near_duplicates_row.addWidget(self.near_duplicates_label, stretch=1)
+        layout.addLayout(near_duplicates_row)
 
         action_buttons = QHBoxLayout()
         self.btn_cancel = QPushButton("Cancel")
@@ -153,11 +259,13 @@ class MediaFolderPickerDialog(QDialog):
         settings = getattr(self.main_app, "settings", None)
         if settings is None:
             return []
-        raw = settings.value("GoonerApp/last_selected_folders", "[]")
-        try:
-            return json.loads(raw)
-        except (TypeError, ValueError):
-            return []
+        return read_persisted_folders(settings)
+
+    def _read_persisted_collapse_near_duplicates(self):
+        settings = getattr(self.main_app, "settings", None)
+        if settings is None:
+            return False
+        return bool(settings.value("GoonerApp/collapse_near_duplicates", False, type=bool))
 
     def _update_remove_button_enabled(self):
         self.btn_remove_folder.setEnabled(bool(self.folder_list.selectedItems()))
@@ -181,23 +289,42 @@ class MediaFolderPickerDialog(QDialog):
         # Only newly-added folders get walked - a folder already in the cache keeps its
         # scanned file list as-is (dropping it entirely on every add/remove elsewhere was
         # forcing a full recursive re-walk of every OTHER folder too, on every single
-        # change, however large the library). This does mean an external change to an
-        # already-added folder's contents won't be picked up until it's removed and
-        # re-added - an acceptable trade-off for a dialog that's opened fresh each session.
+        # change, however large the library). External changes to an already-added
+        # folder's contents are applied incrementally by the MediaFolderWatcher instead -
+        # see _on_folder_files_changed. The walk itself goes through the shared MediaIndex
+        # when there is one, so reopening the dialog on a known folder only re-lists
+        # directories whose mtime changed.
         self._per_folder_files = {
             folder: files
             for folder, files in self._per_folder_files.items()
             if folder in self.folders and Path(folder).exists()
         }
+        for folder in self._sampling_index.folders():
+            if folder not in self._per_folder_files:
+                self._sampling_index.drop_folder(folder)
+        for folder in list(self._scanners):
+            if folder not in self._per_folder_files:
+                self._scanners.pop(folder).stop()
+        if self._watcher is not None:
+            for folder in self._watcher.folders(self) - set(self._per_folder_files):
+                self._watcher.unwatch(folder, owner=self)
         self.folder_list.clear()
         for folder in self.folders:
             exists = Path(folder).exists()
             if folder not in self._per_folder_files:
-                self._per_folder_files[folder] = media_kinds.find_supported_files(folder) if exists else []
-            files = self._per_folder_files[folder]
-
-            label = f"{folder}  ({len(files)} files)" if exists else f"{folder}  (folder not found)"
-            item = QListWidgetItem(label)
+                if exists and self.stream_scan:
+                    self._per_folder_files[folder] = []
+                    self._start_scan(folder)
+                else:
+                    self._per_folder_files[folder] = (
+                        media_kinds.find_supported_files(folder, index=self.media_index) if exists else []
+                    )
+                    if exists:
+                        self._watch(folder)
+                self._remember_kinds(self._per_folder_files[folder])
+                self._sampling_index.set_folder(folder, self._per_folder_files[folder])
+
+            item = QListWidgetItem(self._folder_label(folder, exists))
             item.setData(Qt.ItemDataRole.UserRole, folder)
             self.folder_list.addItem(item)
 
@@ -205,15 +332,235 @@ class MediaFolderPickerDialog(QDialog):
         self.btn_start.setEnabled(has_any_files)
 
         self._refresh_thumbnails()
+        self._refresh_browser()
+        self._update_near_duplicate_hashing()
+
+    def _folder_label(self, folder, exists=True):
+        if not exists:
+            return f"{folder}  (folder not found)"
+        count = len(self._per_folder_files.get(folder, []))
+        if folder in self._scanners:
+            return f"{folder}  ({count} files, scanning...)"
+        return f"{folder}  ({count} files)"
+
+    def _update_folder_item(self, folder):
+        for row in range(self.folder_list.count()):
+            item = self.folder_list.item(row)
+            if item.data(Qt.ItemDataRole.UserRole) == folder:
+                item.setText(self._folder_label(folder))
+
+    # --- streaming scan ---
+
+    def _start_scan(self, folder):
+        scanner = FolderScanner(folder, index=self.media_index, parent=self)
+        # Routed by scanner identity, not just folder name - a folder removed and re-added
+        # gets a fresh scanner, and the old one's already-queued batches must not count twice.
+        scanner.batch_found.connect(lambda _folder, batch: self._on_batch_found(scanner, batch))
+        scanner.finished.connect(lambda: self._on_scan_finished(scanner))
+        self._scanners[folder] = scanner
+        scanner.start()
+
+    def _on_batch_found(self, scanner, batch):
+        folder = scanner.folder
+        if self._scanners.get(folder) is not scanner:
+            return  # a late batch from a scan that was stopped meanwhile
+        self._per_folder_files[folder].extend(batch)
+        self._remember_kinds(batch)
+        self._sampling_index.add(folder, batch)
+        if self._handed_over:
+            if self.duplicate_filter is not None:
+                self.duplicate_filter.submit(batch, tag="late")
+            else:
+                self._hand_over_late_files(batch)
+            return
+        self._update_folder_item(folder)
+        if not self._is_rebuilding:
+            self.btn_start.setEnabled(True)
+        if self.browse_all_checkbox.isChecked():
+            self.thumbnail_browser.browser_model.append_files(batch)
+        # Fill the grid while it still has empty slots - a plain grow, so cells that are
+        # already showing stay put instead of reshuffling on every batch.
+        columns, _rows, count = self._current_grid_dimensions()
+        if len(self._current_thumbnails) < count:
+            self._adjust_thumbnail_count(count, columns)
+
+    def _on_scan_finished(self, scanner):
+        if self._scanners.get(scanner.folder) is scanner:
+            del self._scanners[scanner.folder]
+            if not self._handed_over:
+                self._update_folder_item(scanner.folder)
+                self._watch(scanner.folder)
+                self._update_near_duplicate_hashing()
+        if self._handed_over and not self._scanners:
+            if self.duplicate_filter is not None:
+                # Behind the batches still being filtered - scan_finished must come last.
+                self.duplicate_filter.submit([], tag="scan_finished")
+            else:
+                self.scan_finished.emit()
+
+    def is_scanning(self):
+        """Also True while handed-over batches are still going through the duplicate filter."""
+        return bool(self._scanners) or (self.duplicate_filter is not None and self.duplicate_filter.is_busy())
+
+    def _hand_over_late_files(self, batch):
+        if batch:
+            self.late_files.extend(batch)
+            self.files_discovered.emit(list(batch))
+
+    def _on_duplicates_filtered(self, tag, kept):
+        if tag == "start":
+            self.selected_files = kept
+            self._finish_start()
+        elif tag == "late":
+            self._hand_over_late_files(kept)
+        elif tag == "scan_finished":
+            self.scan_finished.emit()
+
+    def stop_scans(self):
+        for scanner in self._scanners.values():
+            scanner.stop()
+        self._scanners = {}
+
+    # --- live folder watching ---
+
+    def _watch(self, folder):
+        if self._watcher is not None:
+            self._watcher.watch(folder, owner=self)
+
+    def _on_folder_files_changed(self, folder, added, removed):
+        files = self._per_folder_files.get(folder)
+        if files is None:
+            return
+        if removed:
+            gone = set(removed)
+            files[:] = [path for path in files if path not in gone]
+            self._sampling_index.remove(folder, removed)
+        files.extend(added)
+        self._remember_kinds(added)
+        self._sampling_index.add(folder, added)
+        self._update_folder_item(folder)
+        self._update_near_duplicate_hashing()
+        if removed:
+            self._refresh_browser()
+        elif self.browse_all_checkbox.isChecked():
+            self.thumbnail_browser.browser_model.append_files(added)
+        if self._is_rebuilding:
+            return  # the running rebuild reads the updated lists; nothing to patch up here
+        if removed:
+            # Drop just the cells showing a removed file - the rest of the grid stays put.
+            for index in reversed(range(len(self._current_thumbnails))):
+                if self._current_thumbnails[index] in gone:
+                    del self._current_thumbnails[index]
+                    self._discard_cell(self._thumbnail_cells.pop(index))
+        columns, _rows, count = self._current_grid_dimensions()
+        self._adjust_thumbnail_count(count, columns)
+
+    # --- near-duplicate collapsing ---
+
+    def _on_collapse_near_duplicates_toggled(self, _checked):
+        self._update_near_duplicate_hashing()
+
+    def _update_near_duplicate_hashing(self):
+        """Starts hashing every file that has no perceptual hash yet, if collapsing is on
+        and no hash scan is already running - videos on a VideoHashScanner, everything else
+        on a PerceptualHashScanner. The last running one to end calls this again, which
+        picks up whatever was added meanwhile."""
+        if not self.collapse_near_duplicates_checkbox.isChecked():
+            self.near_duplicates_label.clear()
+            return
+        if self._hash_scanners:
+            return
+        unhashed = [
+            path
+            for files in self._per_folder_files.values()
+            for path in files
+            if path not in self._perceptual_hashes
+        ]
+        if not unhashed:
+            self._update_near_duplicates_label()
+            return
+        videos = [path for path in unhashed if self._is_video(path)]
+        others = [path for path in unhashed if not self._is_video(path)]
+        scanners = [
+            scanner_class(files, index=self.media_index, parent=self)
+            for scanner_class, files in ((PerceptualHashScanner, others), (VideoHashScanner, videos))
+            if files
+        ]
+        for scanner in scanners:
+            scanner.results_found.connect(lambda hashes, scanner=scanner: self._on_hashes_found(scanner, hashes))
+            scanner.progress.connect(lambda done, total, scanner=scanner: self._on_hash_progress(scanner, done, total))
+            scanner.finished.connect(lambda scanner=scanner: self._on_hash_scan_finished(scanner))
+        # All registered before any starts - a VideoHashScanner with every hash cached
+        # finishes inside start(), and mustn't look like the last one running.
+        self._hash_scanners = scanners
+        self._hash_progress = {}
+        for scanner in scanners:
+            scanner.start()
+
+    def _on_hashes_found(self, scanner, hashes):
+        if scanner in self._hash_scanners:
+            self._perceptual_hashes.update(hashes)
+
+    def _on_hash_progress(self, scanner, done, total):
+        if scanner not in self._hash_scanners:
+            return
+        self._hash_progress[scanner] = (done, total)
+        done, total = (sum(counts) for counts in zip(*self._hash_progress.values(), strict=True))
+        self.near_duplicates_label.setText(f"Looking for near-duplicates... ({done}/{total})")
+
+    def _on_hash_scan_finished(self, scanner):
+        if scanner not in self._hash_scanners:
+            return
+        self._hash_scanners.remove(scanner)
+        # Files that couldn't be hashed never get one - mark them done so they aren't
+        # handed to another scan on every folder change.
+        for path in scanner.files:
+            self._perceptual_hashes.setdefault(path, None)
+        if not self._hash_scanners:
+            self._update_near_duplicate_hashing()
+
+    def _update_near_duplicates_label(self):
+        skipped = len(self._near_duplicates_to_skip(self._all_files()))
+        self.near_duplicates_label.setText(f"{skipped} near-duplicate files will be skipped" if skipped else "")
+
+    def _all_files(self):
+        return [path for files in self._per_folder_files.values() for path in files]
+
+    def _near_duplicates_to_skip(self, files):
+        """Every file in a near-duplicate group except the group's largest file - the copy
+        most likely to be the original rather than a downscaled re-encode. Videos are only
+        grouped with videos - a video's signature and a picture's are different things."""
+        groups = []
+        for is_video in (False, True):
+            hashes = {path: self._perceptual_hashes.get(path) for path in files if self._is_video(path) == is_video}
+            groups.extend(perceptual_hash.group_near_duplicates(hashes))
+        if not groups:
+            return set()
+        sizes = self.media_index.file_sizes([p for g in groups for p in g]) if self.media_index is not None else {}
+        skip = set()
+        for group in groups:
+            keep = max(group, key=lambda path: sizes.get(str(path), 0))
+            skip.update(path for path in group if path != keep)
+        return skip
+
+    def stop_hash_scan(self):
+        scanners, self._hash_scanners = self._hash_scanners, []
+        for scanner in scanners:
+            scanner.stop()
 
     # --- thumbnail grid ---
 
-    @staticmethod
-    def _is_video(path):
-        return media_kinds.media_kind(path) == "video"
+    def _remember_kinds(self, files):
+        self._kinds.update(media_kinds.media_kinds_of(files, self.media_index))
+
+    def _kind(self, path):
+        return self._kinds.get(path) or media_kinds.media_kind(path)
 
-    def _sample_thumbnails(self, folder_files, count, video_budget):
-        return sample_thumbnails_with_video_cap(folder_files, count, video_budget, is_video=self._is_video)
+    def _is_video(self, path):
+        return self._kind(path) == "video"
+
+    def _sample_thumbnails(self, count, video_budget, exclude=(), prefer=None):
+        return self._sampling_index.sample(count, video_budget, exclude, prefer=prefer)
 
     def _viewport_size(self):
         viewport = self.thumbnail_scroll.viewport()
@@ -250,6 +597,8 @@ class MediaFolderPickerDialog(QDialog):
             return
         self._begin_rebuild()
         try:
+            self._thumbnail_loader.cancel_all()
+            self._frame_grabber.cancel_all()
             for widget in self._thumbnail_cells:
                 self._discard_cell(widget)
             self._thumbnail_cells = []
@@ -258,8 +607,13 @@ class MediaFolderPickerDialog(QDialog):
             columns, _rows, count = self._current_grid_dimensions()
             self._last_grid_count = count
 
-            for path in self._sample_thumbnails(self._per_folder_files, count, MAX_VIDEO_THUMBNAILS):
+            prefer = None
+            if self._prefer_cached_thumbnails:
+                prefer = {Path(path) for path in self.thumbnail_cache.paths(THUMBNAIL_IMAGE_SIZE)}
+            for path in self._sample_thumbnails(count, MAX_VIDEO_THUMBNAILS, prefer=prefer):
                 self._add_thumbnail_cell(path)
+            if self._current_thumbnails:
+                self._prefer_cached_thumbnails = False
             self._reflow_grid_layout(columns)
         finally:
             self._end_rebuild()
@@ -277,14 +631,9 @@ class MediaFolderPickerDialog(QDialog):
             current_count = len(self._current_thumbnails)
             if target_count > current_count:
                 additional = target_count - current_count
-                existing_set = set(self._current_thumbnails)
-                remaining = {
-                    folder: [f for f in files if f not in existing_set]
-                    for folder, files in self._per_folder_files.items()
-                }
                 current_video_count = sum(1 for p in self._current_thumbnails if self._is_video(p))
                 video_budget = max(0, MAX_VIDEO_THUMBNAILS - current_video_count)
-                for path in self._sample_thumbnails(remaining, additional, video_budget):
+                for path in self._sample_thumbnails(additional, video_budget, set(self._current_thumbnails)):
                     self._add_thumbnail_cell(path)
             elif target_count < current_count:
                 for _ in range(current_count - target_count):
@@ -302,22 +651,20 @@ class MediaFolderPickerDialog(QDialog):
         self._thumbnail_cells.append(cell)
 
     def _discard_cell(self, widget):
-        """Stops any live QMovie/QMediaPlayer a cell owns before hiding/deleting it - without
-        this, a discarded animated cell keeps decoding/ticking in the background even though
-        it's no longer shown."""
-        movie = getattr(widget, "_movie", None)
-        if movie is not None:
-            movie.stop()
-        loop_timer = getattr(widget, "_loop_timer", None)
-        if loop_timer is not None:
-            loop_timer.stop()
-        player = getattr(widget, "_player", None)
-        if player is not None:
-            # Measured against a real file: calling stop() while a QVideoWidget output is
-            # still attached to an actively-playing source hangs indefinitely - clearing
-            # the source first (which itself halts playback) avoids that entirely.
-            player.setSource(QUrl())
-            player.stop()
+        """Takes a cell off the PreviewAnimator/GifAnimator before hiding/deleting it -
+        without this, a discarded animated cell keeps ticking in the background even though
+        it's no longer shown. A cell still waiting on the ThumbnailLoader/VideoFrameGrabber/
+        GifAnimator has its request cancelled, so resizes and folder removals don't leave
+        decodes or grabs running for nothing."""
+        pending_path = getattr(widget, "_pending_path", None)
+        # Only if the pending request is still this cell's - _rebuild_cells_in_place builds
+        # the replacement cell (and its request) before discarding the old one.
+        if pending_path is not None and self._pending_cells.get(pending_path) is widget:
+            del self._pending_cells[pending_path]
+            self._thumbnail_loader.cancel([pending_path])
+            self._frame_grabber.cancel([pending_path])
+        self._preview_animator.remove(widget)
+        self._gif_animator.remove(widget)
         # hide() synchronously - deleteLater()'s actual destruction is deferred to the next
         # event loop pass, and a widget removed from a layout stays visible at its last
         # position until then, so without this it briefly renders as a stale/overlapping
@@ -337,6 +684,19 @@ class MediaFolderPickerDialog(QDialog):
     def _on_animate_videos_toggled(self, _checked):
         self._rebuild_cells_in_place()
 
+    def _on_browse_all_toggled(self, checked):
+        self.preview_stack.setCurrentWidget(self.thumbnail_browser if checked else self.thumbnail_scroll)
+        self.animate_videos_checkbox.setEnabled(not checked)
+        # Hidden GIF cells would otherwise keep flipping frames nobody sees.
+        self._gif_animator.set_paused(checked)
+        self._refresh_browser()
+
+    def _refresh_browser(self):
+        """Reloads the browser's file list while it's shown - and empties it while it isn't,
+        which also withdraws any thumbnail requests it still had out."""
+        files = self._all_files() if self.browse_all_checkbox.isChecked() else []
+        self.thumbnail_browser.browser_model.set_files(files)
+
     def _rebuild_cells_in_place(self):
         """Re-renders the *same* sampled paths (no resampling) - used when the animate-
         videos toggle changes, so switching it doesn't also shuffle in a fresh random set.
@@ -361,8 +721,10 @@ class MediaFolderPickerDialog(QDialog):
         BUSY_INDICATOR_DELAY_MS via _show_busy_indicators, not shown here. A plain-image
         rebuild finishes in tens of ms with no event-loop pumping in between, so an
         immediate cursor/disable would flicker on and off for every dialog open even when
-        nothing is actually slow - only _grab_video_frame's processEvents() spin-wait runs
-        long enough to let this delay timer's tick actually land."""
+        nothing is actually slow - still images and static video frames only queue work for
+        the ThumbnailLoader/VideoFrameGrabber, so in practice only a folder full of GIF/live
+        video cells (each constructing its own decoder) runs long enough for this delay
+        timer's tick to land."""
         self._is_rebuilding = True
         self._busy_delay_timer.start(BUSY_INDICATOR_DELAY_MS)
 
@@ -388,17 +750,17 @@ class MediaFolderPickerDialog(QDialog):
     # --- cell construction ---
 
     def _make_thumbnail_cell(self, path) -> QWidget:
-        kind = media_kinds.media_kind(path)
+        kind = self._kind(path)
 
         if kind == "gif":
             return self._make_gif_cell(path)
 
         if kind == "video":
             if self.animate_videos_checkbox.isChecked():
-                return self._make_video_loop_cell(path)
-            return self._make_static_cell(path, self._grab_video_frame(path))
+                return self._make_video_preview_cell(path)
+            return self._make_video_frame_cell(path)
 
-        return self._make_static_cell(path, self._make_thumbnail_pixmap(path))
+        return self._make_loading_cell(path)
 
     def _make_static_cell(self, path, pixmap) -> QWidget:
         label = QLabel()
@@ -414,189 +776,95 @@ class MediaFolderPickerDialog(QDialog):
             label.setText(Path(path).name)
         return label
 
-    def _make_thumbnail_pixmap(self, path):
-        size = THUMBNAIL_CELL_SIZE[0] - 8
-        try:
-            pixmap = QPixmap(str(path))
-            if pixmap.isNull():
-                return None
-            return pixmap.scaled(
-                size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-            )
-        except Exception:
-            return None
-
-    def _make_gif_cell(self, path) -> QWidget:
-        label = QLabel()
-        label.setFixedSize(*THUMBNAIL_CELL_SIZE)
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setWordWrap(True)
-        label.setStyleSheet(
-            f"background-color: {theme.SURFACE_DARK}; border-radius: 8px; color: {theme.TEXT};"
-        )
+    def _make_pending_cell(self, path) -> QLabel:
+        """Empty placeholder, filled in by _fill_pending_cell once its image arrives."""
+        label = self._make_static_cell(path, None)
+        label.setText("")
+        label._pending_path = path
+        self._pending_cells[path] = label
+        return label
 
-        try:
-            movie = QMovie(str(path))
-            movie.jumpToFrame(0)
-            first_frame = movie.currentImage()
-            if first_frame.isNull():
-                label.setText(Path(path).name)
-                return label
+    def _fill_pending_cell(self, path, image):
+        label = self._pending_cells.pop(path, None)
+        if label is None:
+            return
+        if image is None:
+            label.setText(path.name)
+        else:
+            label.setPixmap(QPixmap.fromImage(image))
 
-            size = THUMBNAIL_CELL_SIZE[0] - 8
-            scaled_size = first_frame.size().scaled(QSize(size, size), Qt.AspectRatioMode.KeepAspectRatio)
-            movie.setScaledSize(scaled_size)
-            label.setMovie(movie)
-            movie.start()
-            label._movie = movie  # keep alive - see _discard_cell
-        except Exception:
-            label.setText(Path(path).name)
+    def _make_loading_cell(self, path) -> QWidget:
+        path = Path(path)
+        label = self._make_pending_cell(path)
+        self._thumbnail_loader.request(path, THUMBNAIL_IMAGE_SIZE)
         return label
 
-    def _wait_for(self, predicate, timeout_s):
-        """Spins the event loop until `predicate()` is true or `timeout_s` elapses."""
-        app = QApplication.instance()
-        deadline = time.monotonic() + timeout_s
-        while not predicate() and time.monotonic() < deadline:
-            app.processEvents()
-        return predicate()
-
-    @staticmethod
-    def _average_brightness(image):
-        """Cheap average-brightness check on a downscaled copy - used to catch black
-        leader frames/fades so the static thumbnail doesn't randomly land on one."""
-        sample = image.scaled(16, 16)
-        total = 0
-        count = 0
-        for y in range(sample.height()):
-            for x in range(sample.width()):
-                color = sample.pixelColor(x, y)
-                total += (color.red() + color.green() + color.blue()) / 3
-                count += 1
-        return total / count if count > 0 else 0
-
-    @classmethod
-    def _is_mostly_black(cls, image, threshold=VIDEO_BLACK_FRAME_BRIGHTNESS_THRESHOLD):
-        return cls._average_brightness(image) < threshold
+    def _on_thumbnail_loaded(self, path, image):
+        self._fill_pending_cell(path, image)
+
+    def _make_video_frame_cell(self, path) -> QWidget:
+        """A still frame of the video - straight from the ThumbnailCache when it has one,
+        otherwise a placeholder until the VideoFrameGrabber delivers."""
+        path = Path(path)
+        if self.thumbnail_cache is not None:
+            image = self.thumbnail_cache.get(path, THUMBNAIL_IMAGE_SIZE)
+            if image is not None:
+                return self._make_static_cell(path, QPixmap.fromImage(image))
+        label = self._make_pending_cell(path)
+        self._grab_video_frame(path)
+        return label
 
     def _grab_video_frame(self, path):
-        """Synchronous frame grab via QMediaPlayer+QVideoSink - deliberately seeks to a
-        random position in the middle portion of the clip (never frame 0, which is prone
-        to black leaders/fades) and retries a few times if the grabbed frame turns out
-        mostly black, rather than settling for the first frame that arrives.
-
-        The QVideoFrame must be converted to a QImage immediately inside the
-        videoFrameChanged callback - doing it later (even a moment after the signal fires)
-        reliably yields a null image."""
-        player = QMediaPlayer()
-        sink = QVideoSink()
-        player.setVideoSink(sink)
-        holder = {}
-
-        def on_frame(frame):
-            if frame.isValid():
-                image = frame.toImage()
-                if not image.isNull():
-                    holder["image"] = image
-
-        sink.videoFrameChanged.connect(on_frame)
-
-        best_image = None
-        best_brightness = -1
-        try:
-            player.setSource(QUrl.fromLocalFile(str(path)))
-            player.play()
-
-            self._wait_for(lambda: player.duration() > 0, VIDEO_METADATA_WAIT_TIMEOUT_S)
-            duration_ms = player.duration()
-
-            attempts = VIDEO_FRAME_GRAB_ATTEMPTS if duration_ms > 0 else 1
-            for _ in range(attempts):
-                holder.pop("image", None)
-                if duration_ms > 0:
-                    margin = duration_ms * 0.1
-                    low, high = margin, max(margin, duration_ms - margin)
-                    target_ms = int(random.uniform(low, high)) if high > low else int(duration_ms / 2)
-                    player.setPosition(target_ms)
-
-                self._wait_for(lambda: "image" in holder, VIDEO_FRAME_WAIT_TIMEOUT_S)
-                image = holder.get("image")
-                if image is None:
-                    continue
-                # keep the least-black frame seen across attempts, not just the first
-                # successful grab - a later attempt can be dark-but-less-dark than an
-                # earlier one without ever passing the "not mostly black" threshold
-                brightness = self._average_brightness(image)
-                if brightness > best_brightness:
-                    best_image = image
-                    best_brightness = brightness
-                if brightness >= VIDEO_BLACK_FRAME_BRIGHTNESS_THRESHOLD:
-                    break
-        except Exception:
-            return None
-        finally:
-            player.stop()
+        self._frame_grabber.request(path)
 
-        if best_image is None:
-            return None
+    def _on_video_frame_grabbed(self, path, image):
+        # Already scaled to THUMBNAIL_IMAGE_SIZE and cached by the grabber.
+        self._fill_pending_cell(path, image)
 
-        size = THUMBNAIL_CELL_SIZE[0] - 8
-        return QPixmap.fromImage(best_image).scaled(
-            size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-        )
+    def _make_gif_cell(self, path) -> QWidget:
+        """Blank until the GifAnimator has the GIF's frames, then animated by it."""
+        label = self._make_static_cell(path, None)
+        label.setText("")
+        self._gif_animator.add(label, path)
+        return label
 
-    def _make_video_loop_cell(self, path) -> QWidget:
-        video_widget = QVideoWidget()
-        video_widget.setFixedSize(*THUMBNAIL_CELL_SIZE)
-        video_widget.setStyleSheet(f"background-color: {theme.SURFACE_DARK}; border-radius: 8px;")
-
-        player = QMediaPlayer()
-        # Infinite native looping is just a safety net for when the 5s window runs past
-        # the end of a short clip - the wall-clock timer below is what actually enforces
-        # the 5s segment, so this never causes the clip to play beyond that on its own.
-        player.setLoops(QMediaPlayer.Loops.Infinite)
-        audio_output = QAudioOutput()
-        audio_output.setVolume(0.0)
-        player.setAudioOutput(audio_output)
-        player.setVideoOutput(video_widget)
-
-        # Looping an arbitrary sub-window isn't a QMediaPlayer feature - a single timer does
-        # double duty here. While start_ms is still unknown it retries the initial seek every
-        # INITIAL_SEEK_RETRY_MS (duration()/isSeekable() turning true doesn't reliably mean a
-        # setPosition() right then will actually stick - measured against a real file, seeking
-        # immediately when durationChanged/mediaStatusChanged first fire was sometimes silently
-        # dropped, while retrying a tick later always worked). Once the seek sticks, the same
-        # timer's interval switches to VIDEO_LOOP_DURATION_MS and every tick after that just
-        # jumps back to start_ms. A start position anywhere in the clip works, including near
-        # the end, since native infinite looping (above) transparently wraps play-back to 0:00
-        # if the 5s window would otherwise run past the end.
-        state = {"start_ms": None}
-
-        def on_tick():
-            if state["start_ms"] is None:
-                duration_ms = player.duration()
-                if duration_ms <= 0 or not player.isSeekable():
-                    return  # not ready yet - retry on the next tick
-                # anywhere in the clip, not just early enough to leave 5s of runway after
-                start_ms = random.randint(1, duration_ms - 1) if duration_ms > 1 else 0
-                state["start_ms"] = start_ms
-                player.setPosition(start_ms)
-                loop_timer.setInterval(VIDEO_LOOP_DURATION_MS)
-            else:
-                player.setPosition(state["start_ms"])
+    def _make_video_preview_cell(self, path) -> QWidget:
+        """An animated preview - a strip of frames sampled across the video, flipped through
+        by the PreviewAnimator. Straight from the ThumbnailCache's sprite sheet when it has
+        one, otherwise a placeholder until the VideoFrameGrabber delivers the strip."""
+        path = Path(path)
+        size = THUMBNAIL_IMAGE_SIZE
+        if self.thumbnail_cache is not None:
+            sheet = self.thumbnail_cache.get(path, size, preview_strips.SPRITE_SHEET_VARIANT)
+            frames = preview_strips.split_sprite_sheet(sheet) if sheet is not None else []
+            if frames:
+                label = self._make_static_cell(path, None)
+                self._animate_preview(label, frames)
+                return label
+        label = self._make_pending_cell(path)
+        self._grab_preview_strip(path)
+        return label
 
-        loop_timer = QTimer()
-        loop_timer.setInterval(INITIAL_SEEK_RETRY_MS)
-        loop_timer.timeout.connect(on_tick)
+    def _grab_preview_strip(self, path):
+        self._frame_grabber.request_strip(path, preview_strips.PREVIEW_STRIP_FRAMES, THUMBNAIL_IMAGE_SIZE)
 
-        player.setSource(QUrl.fromLocalFile(str(path)))
-        player.play()
-        loop_timer.start()
+    def _on_preview_strip_grabbed(self, path, frames):
+        if not frames:
+            # No duration to spread frames across (or nothing decodable) - a still frame is
+            # the next best thing, and fills the same pending cell.
+            if path in self._pending_cells:
+                self._grab_video_frame(path)
+            return
+        if self.thumbnail_cache is not None:
+            sheet = preview_strips.make_sprite_sheet(frames)
+            self.thumbnail_cache.put(path, THUMBNAIL_IMAGE_SIZE, sheet, preview_strips.SPRITE_SHEET_VARIANT)
+        label = self._pending_cells.pop(path, None)
+        if label is not None:
+            self._animate_preview(label, frames)
 
-        video_widget._player = player  # keep alive - see _discard_cell
-        video_widget._audio_output = audio_output
-        video_widget._loop_timer = loop_timer  # keep alive + stopped in _discard_cell
-        return video_widget
+    def _animate_preview(self, label, frames):
+        label.setText("")
+        self._preview_animator.add(label, [QPixmap.fromImage(frame) for frame in frames])
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -617,17 +885,62 @@ class MediaFolderPickerDialog(QDialog):
     # --- start/cancel ---
 
     def _on_start(self):
+        if self.duplicate_filter is not None:
+            return  # already checking the selection for duplicates
         self.selected_files = [f for files in self._per_folder_files.values() for f in files]
+        if not self.skip_duplicates:
+            self._handed_over = self.is_scanning()
+            self._finish_start()
+            return
+        self.deduplicator = ContentDeduplicator(self.media_index)
+        self.duplicate_filter = DuplicateFilter(self.deduplicator)
+        self.duplicate_filter.filtered.connect(self._on_duplicates_filtered)
+        # Scans still in flight are handed over right away: their batches queue up behind
+        # the selection, so they're still checked against it as later arrivals.
+        self._handed_over = self.is_scanning()
+        self.btn_start.setEnabled(False)
+        self.btn_start.setText("Checking for duplicates...")
+        self.duplicate_filter.submit(self.selected_files, tag="start")
+
+    def _finish_start(self):
+        collapse = self.collapse_near_duplicates_checkbox.isChecked()
+        if collapse:
+            # Whatever has been hashed by now - a file whose hash is still pending is kept.
+            skip = self._near_duplicates_to_skip(self.selected_files)
+            self.selected_files = [path for path in self.selected_files if path not in skip]
         settings = getattr(self.main_app, "settings", None)
         if settings is not None:
             settings.setValue("GoonerApp/last_selected_folders", json.dumps(self.folders))
+            settings.setValue("GoonerApp/collapse_near_duplicates", collapse)
+        # From here on (set by _on_start), scans still in flight feed files_discovered
+        # instead of this dialog's own list/grid - see done() for why they're not stopped.
         self.accept()
 
     def done(self, result):
         """accept(), reject(), and the native window-close button all funnel through this -
         without stopping cells here, any live GIF/video cell just keeps decoding/looping in
-        the background indefinitely after the dialog closes."""
+        the background indefinitely after the dialog closes.
+
+        Running scans are stopped too, unless _on_start just handed them over to the
+        session - those keep going and report through files_discovered/scan_finished."""
         for widget in self._thumbnail_cells:
             self._discard_cell(widget)
         self._thumbnail_cells = []
+        self._thumbnail_loader.shutdown()
+        self._gif_animator.shutdown()
+        self._frame_grabber.cancel_all()
+        self.thumbnail_browser.shutdown()
+        if result != QDialog.DialogCode.Accepted.value:  # done() gets a plain int
+            # Cancelled while the selection was still being checked - nothing is handed over.
+            self._handed_over = False
+            if self.duplicate_filter is not None:
+                # A result emitted just before stop() is still queued - it mustn't accept().
+                self.duplicate_filter.filtered.disconnect(self._on_duplicates_filtered)
+                self.duplicate_filter.stop()
+        if not self._handed_over:
+            self.stop_scans()
+        if self._watcher is not None:
+            self._watcher.files_changed.disconnect(self._on_folder_files_changed)
+            self._watcher.release(self)
+        self.stop_hash_scan()
         super().done(result)
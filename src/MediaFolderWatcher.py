@@ -0,0 +1,134 @@
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# A copy/extract/sync into a watched folder fires a burst of directoryChanged signals, one
+# per entry - they're collected into one pending set and only acted on once the burst has
+# been quiet for this long, so each touched directory is re-listed once, not once per file.
+WATCH_DEBOUNCE_MS = 500
+
+
+class MediaFolderWatcher(QObject):
+    """Watches every directory of the picked folders (as known to the MediaIndex) with a
+    QFileSystemWatcher and reports what changed per folder - added/removed media files,
+    with a rename being one of each.
+
+    QFileSystemWatcher only says *which directory* changed, not what happened in it, so a
+    debounced flush hands each changed directory to MediaIndex.rescan_directory, which
+    diffs a fresh listing against the stored one. The index stays current as a side effect,
+    and directories that appear or vanish are added to / dropped from the watch list. The
+    flush runs on the GUI thread - it only re-lists directories that actually changed, and
+    only opens files in them that are new or changed (see media_index._list_directory), so
+    it's a handful of scandir calls, not a folder walk.
+
+    rescan_directory consumes the change it finds - a second watcher on the same index
+    would see nothing once this one has flushed. So there is one watcher per index (the
+    app's), shared by everyone interested: each watch() is registered under an `owner`,
+    a folder stays watched while any owner still wants it, and files_changed goes to every
+    subscriber, each picking out the folders it cares about (see folders(owner))."""
+
+    files_changed = pyqtSignal(str, list, list)  # folder, added list[Path], removed list[Path]
+
+    def __init__(self, index, debounce_ms: int = WATCH_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.index = index
+        # directory -> every watched folder it belongs to (two picked folders can nest)
+        self._folders_by_directory: dict[str, set[str]] = {}
+        # folder -> every owner that asked for it
+        self._owners_by_folder: dict[str, set] = {}
+        self._pending: set[str] = set()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self._flush)
+
+    def folders(self, owner=None) -> set[str]:
+        """Every watched folder, or only those `owner` asked for."""
+        if owner is None:
+            return set(self._owners_by_folder)
+        return {folder for folder, owners in self._owners_by_folder.items() if owner in owners}
+
+    def watch(self, folder, owner=None):
+        """Starts watching `folder` for `owner` - call it once the folder has been scanned
+        through the index, since only directories the index already knows about get
+        watched."""
+        folder = str(folder)
+        owners = self._owners_by_folder.setdefault(folder, set())
+        already_watched = bool(owners)
+        owners.add(owner)
+        if not already_watched:
+            directories = self.index.directories(folder) or [folder]
+            self._add_directories(folder, directories)
+
+    def unwatch(self, folder, owner=None):
+        """Drops `owner`'s interest in `folder` - it's only unwatched once nobody wants it."""
+        folder = str(folder)
+        owners = self._owners_by_folder.get(folder)
+        if owners is None or owner not in owners:
+            return
+        owners.discard(owner)
+        if owners:
+            return
+        del self._owners_by_folder[folder]
+        for directory in list(self._folders_by_directory):
+            self._remove_directory(folder, directory)
+
+    def release(self, owner=None):
+        """unwatch() for every folder `owner` asked for."""
+        for folder in self.folders(owner):
+            self.unwatch(folder, owner)
+
+    def stop(self):
+        self._debounce_timer.stop()
+        self._pending.clear()
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._folders_by_directory.clear()
+        self._owners_by_folder.clear()
+
+    def _add_directories(self, folder, directories):
+        new_paths = []
+        for directory in directories:
+            folders = self._folders_by_directory.setdefault(directory, set())
+            if not folders:
+                new_paths.append(directory)
+            folders.add(folder)
+        if new_paths:
+            # Paths the OS refuses (inotify watch limit, permissions) come back as failures
+            # - those directories just don't get live updates, nothing else breaks.
+            self._watcher.addPaths(new_paths)
+
+    def _remove_directory(self, folder, directory):
+        folders = self._folders_by_directory.get(directory)
+        if folders is None or folder not in folders:
+            return
+        folders.discard(folder)
+        if not folders:
+            del self._folders_by_directory[directory]
+            self._pending.discard(directory)
+            self._watcher.removePath(directory)
+
+    def _on_directory_changed(self, directory):
+        self._pending.add(directory)
+        self._debounce_timer.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        changed: dict[str, tuple[list, list]] = {}
+        for directory in sorted(pending):
+            for folder in sorted(self._folders_by_directory.get(directory, ())):
+                changes = self.index.rescan_directory(folder, directory)
+                if not changes:
+                    continue
+                for gone in changes.directories_removed:
+                    self._remove_directory(folder, gone)
+                self._add_directories(folder, changes.directories_added)
+                added, removed = changed.setdefault(folder, ([], []))
+                added.extend(changes.added)
+                removed.extend(changes.removed)
+        for folder, (added, removed) in changed.items():
+            if added or removed:
+                self.files_changed.emit(folder, added, removed)
@@ -0,0 +1,158 @@
+import threading
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap
+
+from src import image_loading
+from src.display_cache import DisplayCache
+
+# Two decodes side by side keep up with even the shortest min_dur without competing with
+# the GUI thread (and the beat) for every core.
+PREFETCH_MAX_THREADS = 2
+
+
+class _PrefetchJob(QRunnable):
+    def __init__(self, prefetcher, path, box, dpr):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.path = path
+        self.box = box
+        self.dpr = dpr
+        self.started = False  # set under the prefetcher's lock - until then wait_for() may tryTake() it
+        self.image = None
+        self.done = threading.Event()
+
+    def run(self):
+        self.prefetcher._run_job(self)
+
+
+class MediaPrefetcher(QObject):
+    """Decodes the images the slideshow is about to show on a QThreadPool, already scaled
+    for the display (see image_loading.read_scaled), into a DisplayCache of QPixmaps - so
+    showing one is a lookup and a pixmap swap instead of a decode on the GUI thread, and
+    going back and forth over the same files (or round a short playlist) never decodes
+    anything twice while it fits the cache's budget.
+
+    prefetch() sets the window of files wanted next: queued decodes outside it are
+    withdrawn, and whatever in it isn't cached or decoding yet is queued, in the order
+    given. Entries are keyed by the box they were decoded for, in device pixels, and the
+    device pixel ratio they're shown at - after a resize (or a move to a screen with a
+    different ratio), take() misses until the window is prefetched again at the new size,
+    and `ready` says when each file is there.
+
+    Files that failed to decode aren't queued again until cancel_all() - which the owner
+    calls whenever the playlist changes - so the record of them never outgrows one
+    playlist, and a file fixed on disk meanwhile gets another try with the next."""
+
+    ready = pyqtSignal(object, object, float)  # Path, QSize, device pixel ratio
+
+    # Worker thread -> GUI thread hop; the store is only touched on the GUI thread.
+    _finished = pyqtSignal(object)  # _PrefetchJob
+
+    def __init__(self, cache: DisplayCache | None = None, max_threads: int = PREFETCH_MAX_THREADS, parent=None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else DisplayCache()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._wanted: dict[tuple[Path, tuple[int, int], float], _PrefetchJob] = {}
+        # Files that failed to decode - not queued again on every prefetch.
+        self._failed: set[tuple[Path, tuple[int, int], float]] = set()
+        self._finished.connect(self._deliver)
+
+    def prefetch(self, paths, box: QSize, dpr: float = 1.0):
+        keys = [DisplayCache.key(path, box, dpr) for path in paths]
+        window = set(keys)
+        with self._lock:
+            self._wanted = {key: job for key, job in self._wanted.items() if key in window}
+            queued = []
+            for key in keys:
+                if key in self.cache or key in self._wanted or key in self._failed:
+                    continue
+                job = _PrefetchJob(self, key[0], QSize(box), float(dpr))
+                self._wanted[key] = job
+                queued.append(job)
+        for job in queued:
+            self._pool.start(job)
+
+    def take(self, path, box: QSize, dpr: float = 1.0) -> QPixmap | None:
+        """The cached pixmap for `path` at `box`, or None if there isn't one yet - decode it
+        directly then, and store() the result."""
+        return self.cache.get(path, box, dpr)
+
+    def wait_for(self, path, box: QSize, dpr: float = 1.0) -> QPixmap | None:
+        """For a take() miss: the pixmap from the decode of `path` at `box` that's already
+        running, once it's done, rather than decoding the file a second time alongside it.
+        A decode still queued is withdrawn instead - decoding it directly is quicker than
+        waiting behind the others. None if there's nothing to wait for (or it failed):
+        decode it directly then, as after a plain miss."""
+        key = DisplayCache.key(path, box, dpr)
+        with self._lock:
+            job = self._wanted.get(key)
+            if job is None:
+                return None
+            if not job.started and self._pool.tryTake(job):
+                del self._wanted[key]
+                return None
+        job.done.wait()
+        with self._lock:
+            if self._wanted.get(key) is job:
+                del self._wanted[key]  # the queued _deliver() drops it then
+        if job.image is None:
+            self._failed.add(key)
+            return None
+        return self.store(job.path, job.box, job.image, job.dpr)
+
+    def store(self, path, box: QSize, image, dpr: float = 1.0) -> QPixmap:
+        """Caches an image decoded outside the prefetcher, and returns it as a pixmap set to
+        be drawn at `dpr` (so `box` device pixels fill `box / dpr` logical ones)."""
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        self.cache.put(path, box, pixmap, image.sizeInBytes(), dpr)
+        return pixmap
+
+    def is_ready(self, path, box: QSize, dpr: float = 1.0) -> bool:
+        key = DisplayCache.key(path, box, dpr)
+        return key in self.cache or key in self._failed
+
+    def is_pending(self, path, box: QSize, dpr: float = 1.0) -> bool:
+        with self._lock:
+            return DisplayCache.key(path, box, dpr) in self._wanted
+
+    def cancel_all(self):
+        """Withdraws every queued decode and forgets which files failed to decode - the cache
+        itself stays."""
+        with self._lock:
+            self._wanted.clear()
+        self._pool.clear()
+        self._failed.clear()
+
+    def shutdown(self):
+        """Withdraws everything and waits for running decodes - call before the owner goes away."""
+        self.cancel_all()
+        self._pool.waitForDone()
+
+    def _run_job(self, job):
+        """Runs on a pool thread."""
+        try:
+            with self._lock:
+                if self._wanted.get(DisplayCache.key(job.path, job.box, job.dpr)) is not job:
+                    return
+                job.started = True
+            job.image = image_loading.read_scaled(job.path, job.box)
+        finally:
+            job.done.set()
+        self._finished.emit(job)
+
+    def _deliver(self, job):
+        key = DisplayCache.key(job.path, job.box, job.dpr)
+        with self._lock:
+            if self._wanted.get(key) is not job:
+                return  # left the window meanwhile, or wait_for() took it
+            del self._wanted[key]
+        if job.image is None:
+            self._failed.add(key)
+            return
+        self.store(job.path, job.box, job.image, job.dpr)
+        self.ready.emit(job.path, job.box, job.dpr)
@@ -0,0 +1,19 @@
+from src import media_metadata
+from src.FilePoolScanner import FilePoolScanner
+
+
+class MetadataProber(FilePoolScanner):
+    """Probes media_metadata for a list of files on a process pool (see FilePoolScanner)
+    and persists it in the MediaIndex. results_found carries {Path: metadata dict}.
+
+    Videos other than MP4/MOV come back without a duration - theirs is recorded as a side
+    effect wherever a QMediaPlayer learns it anyway (the picker's frame grab, playback)."""
+
+    KINDS = ("image", "gif", "video")
+    worker = staticmethod(media_metadata.probe_files)
+
+    def _cached(self, files):
+        return self.index.metadata(files)
+
+    def _store(self, rows):
+        self.index.store_metadata(rows)
@@ -0,0 +1,19 @@
+from src import perceptual_hash
+from src.FilePoolScanner import FilePoolScanner
+
+
+class PerceptualHashScanner(FilePoolScanner):
+    """Computes perceptual_hash dHashes on a process pool (see FilePoolScanner) and caches
+    them in the MediaIndex. results_found carries {Path: int | None}.
+
+    Only images and GIFs (first frame) are hashed here - a video's frames need a
+    QMediaPlayer on the GUI thread, so videos go to VideoHashScanner instead."""
+
+    KINDS = ("image", "gif")
+    worker = staticmethod(perceptual_hash.hash_files)
+
+    def _cached(self, files):
+        return self.index.perceptual_hashes(files)
+
+    def _store(self, rows):
+        self.index.store_perceptual_hashes(rows)
@@ -0,0 +1,46 @@
+import random
+
+from PyQt6.QtCore import QObject, QTimer
+
+from src.preview_strips import PREVIEW_FRAME_INTERVAL_MS
+
+
+class PreviewAnimator(QObject):
+    """Flips every registered label to its next pre-rendered frame off one shared QTimer -
+    a grid of animated previews costs one timer tick and a setPixmap per cell, not a live
+    decoder per cell. Each label starts at a random frame so the grid doesn't change in
+    lockstep. The timer only runs while there's something to animate."""
+
+    def __init__(self, interval_ms: int = PREVIEW_FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self._cells = {}  # label -> [pixmaps, current index]
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def add(self, label, pixmaps):
+        if not pixmaps:
+            return
+        index = random.randrange(len(pixmaps))
+        label.setPixmap(pixmaps[index])
+        self._cells[label] = [pixmaps, index]
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def remove(self, label):
+        self._cells.pop(label, None)
+        if not self._cells:
+            self._timer.stop()
+
+    def clear(self):
+        self._cells.clear()
+        self._timer.stop()
+
+    def is_animating(self, label) -> bool:
+        return label in self._cells
+
+    def _tick(self):
+        for label, cell in self._cells.items():
+            pixmaps, index = cell
+            cell[1] = (index + 1) % len(pixmaps)
+            label.setPixmap(pixmaps[cell[1]])
@@ -41,20 +41,48 @@ class SettingsDialog(QDialog):
         self.add_setting("Min. duration (s):", "min_dur", self.main_app, float, 0.1, 60.0, 0.1)
         self.add_setting("Max. duration (s):", "max_dur", self.main_app, float, 0.1, 60.0, 0.1)
         self.add_setting("Video Min. duration (s):", "video_min_dur", self.main_app, float, 0.5, 30.0, 0.1)
+        self.video_clip_mode_checkbox = QCheckBox("Play long videos as short clips from a random point")
+        self.video_clip_mode_checkbox.setChecked(self.main_app.video_clip_mode)
+        self._current_layout.addWidget(self.video_clip_mode_checkbox)
+        self.add_setting("Video clip length (s):", "video_clip_dur", self.main_app, float, 1.0, 120.0, 0.5)
         self.add_section_header("General Settings")
         self.add_setting("Beat Volume", "beat_loudness", self.beat_handler, float, 0.0, 1.0, 0.1)
         self.add_setting("Video Volume", "vid_loudness", self.main_app, float, 0.0, 1.0, 0.1)
+        self.add_setting("Thumbnail cache size (MB)", "thumbnail_cache_mb", self.main_app, int, 16, 4096, 64)
+        self.add_setting("Display cache size (MB)", "display_cache_mb", self.main_app, int, 32, 4096, 64)
         self.show_startup_splash_checkbox = QCheckBox("Show startup splash animation")
         self.show_startup_splash_checkbox.setChecked(self.main_app.show_startup_splash)
         self._current_layout.addWidget(self.show_startup_splash_checkbox)
         self.show_record_chase_checkbox = QCheckBox("Show live personal-record chase")
         self.show_record_chase_checkbox.setChecked(self.main_app.show_record_chase)
         self._current_layout.addWidget(self.show_record_chase_checkbox)
+        self.stream_folder_scan_checkbox = QCheckBox("Start while folders are still being scanned")
+        self.stream_folder_scan_checkbox.setChecked(self.main_app.stream_folder_scan)
+        self._current_layout.addWidget(self.stream_folder_scan_checkbox)
+        self.skip_duplicate_files_checkbox = QCheckBox("Play files found in several folders only once")
+        self.skip_duplicate_files_checkbox.setChecked(self.main_app.skip_duplicate_files)
+        self._current_layout.addWidget(self.skip_duplicate_files_checkbox)
+        self.prewarm_caches_checkbox = QCheckBox("Prepare the last used folders' thumbnails in the background")
+        self.prewarm_caches_checkbox.setChecked(self.main_app.prewarm_caches)
+        self._current_layout.addWidget(self.prewarm_caches_checkbox)
         self.playback_reset_button = self.add_reset_button(
-            ["min_dur", "max_dur", "video_min_dur", "beat_loudness", "vid_loudness"],
+            [
+                "min_dur",
+                "max_dur",
+                "video_min_dur",
+                "video_clip_dur",
+                "beat_loudness",
+                "vid_loudness",
+                "thumbnail_cache_mb",
+                "display_cache_mb",
+            ],
             checkbox_defaults=[
+                (self.video_clip_mode_checkbox, self.main_app.DEFAULTS["video_clip_mode"]),
                 (self.show_startup_splash_checkbox, self.main_app.DEFAULTS["show_startup_splash"]),
                 (self.show_record_chase_checkbox, self.main_app.DEFAULTS["show_record_chase"]),
+                (self.stream_folder_scan_checkbox, self.main_app.DEFAULTS["stream_folder_scan"]),
+                (self.skip_duplicate_files_checkbox, self.main_app.DEFAULTS["skip_duplicate_files"]),
+                (self.prewarm_caches_checkbox, self.main_app.DEFAULTS["prewarm_caches"]),
             ],
         )
         self._current_layout.addStretch()
@@ -248,6 +276,9 @@ class SettingsDialog(QDialog):
 
         self.beat_handler.sound_effect.setVolume(self.settings_fields['beat_loudness']['widget'].value())
 
+        settings.setValue("GoonerApp/video_clip_mode", self.video_clip_mode_checkbox.isChecked())
+        self.main_app.video_clip_mode = self.video_clip_mode_checkbox.isChecked()
+
         settings.setValue("GoonerApp/show_startup_splash", self.show_startup_splash_checkbox.isChecked())
         self.main_app.show_startup_splash = self.show_startup_splash_checkbox.isChecked()
 
@@ -255,6 +286,15 @@ class SettingsDialog(QDialog):
         self.main_app.show_record_chase = self.show_record_chase_checkbox.isChecked()
         self.main_app._update_record_chase()
 
+        settings.setValue("GoonerApp/stream_folder_scan", self.stream_folder_scan_checkbox.isChecked())
+        self.main_app.stream_folder_scan = self.stream_folder_scan_checkbox.isChecked()
+
+        settings.setValue("GoonerApp/skip_duplicate_files", self.skip_duplicate_files_checkbox.isChecked())
+        self.main_app.skip_duplicate_files = self.skip_duplicate_files_checkbox.isChecked()
+
+        settings.setValue("GoonerApp/prewarm_caches", self.prewarm_caches_checkbox.isChecked())
+        self.main_app.prewarm_caches = self.prewarm_caches_checkbox.isChecked()
+
         new_selected_patterns = []
         for name, checkbox in self.beat_checkboxes.items():
             if checkbox.isChecked():
@@ -0,0 +1,241 @@
+from collections import OrderedDict
+from pathlib import Path
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QPoint, QRect, QSize, Qt, QTimer
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPixmap
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+
+from src import media_kinds, theme
+from src.ThumbnailLoader import ThumbnailLoader
+from src.VideoFrameGrabber import VideoFrameGrabber
+
+# Decoded pixmaps kept in memory - a few screens' worth, least recently shown dropped
+# first. Anything scrolled further away than that comes back from the on-disk
+# ThumbnailCache, which is fast enough not to be noticed.
+BROWSER_PIXMAP_CACHE_ENTRIES = 1500
+# Requests for rows that have scrolled out of view are withdrawn once scrolling pauses for
+# this long, so a fling through 100k files doesn't leave thousands of decodes queued.
+SCROLL_SETTLE_MS = 100
+
+# True while a row's thumbnail has been requested but hasn't arrived - painted as an empty
+# tile, like the picker grid's placeholders, rather than flashing the file name.
+PENDING_ROLE = Qt.ItemDataRole.UserRole
+
+_FAILED = object()  # a file that couldn't be thumbnailed - shows its name instead
+
+
+class ThumbnailListModel(QAbstractListModel):
+    """Every file of the picked folders as one flat list, for ThumbnailBrowser. Thumbnails
+    are requested lazily - only when the view asks for a row's DecorationRole, i.e. when the
+    row is actually about to be painted - from the ThumbnailLoader (images, and a GIF's
+    first frame) or the VideoFrameGrabber (videos, through the ThumbnailCache)."""
+
+    def __init__(self, thumbnail_size: int, cache=None, index=None, parent=None):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+        self.cache = cache
+        self.media_index = index  # not `index` - that's QAbstractListModel.index()
+        self._files: list[Path] = []
+        self._rows: dict[Path, int] = {}
+        self._pixmaps: OrderedDict[Path, object] = OrderedDict()
+        self._requested: set[Path] = set()
+        self._loader = ThumbnailLoader(cache, parent=self)
+        self._loader.loaded.connect(self._on_image)
+        # Scales and caches each frame itself - see VideoFrameGrabber.
+        self._grabber = VideoFrameGrabber(index, thumbnail_size=thumbnail_size, cache=cache, parent=self)
+        self._grabber.frame_grabbed.connect(self._store)
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=None):
+        return 0 if parent is not None and parent.isValid() else len(self._files)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self._files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return path.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return str(path)
+        if role == PENDING_ROLE:
+            return path in self._requested
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(path)
+            if pixmap is None:
+                self._request(path)
+                return None
+            self._pixmaps.move_to_end(path)
+            return None if pixmap is _FAILED else pixmap
+        return None
+
+    # --- contents ---
+
+    def files(self) -> list[Path]:
+        return list(self._files)
+
+    def file_at(self, row) -> Path:
+        """The file in `row` - without files()'s copy of the whole list."""
+        return self._files[row]
+
+    def set_files(self, files):
+        self.beginResetModel()
+        self.cancel_pending()
+        self._files = list(files)
+        self._rows = {path: row for row, path in enumerate(self._files)}
+        self.endResetModel()
+
+    def append_files(self, files):
+        files = [path for path in files if path not in self._rows]
+        if not files:
+            return
+        first = len(self._files)
+        self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+        for row, path in enumerate(files, start=first):
+            self._rows[path] = row
+        self._files.extend(files)
+        self.endInsertRows()
+
+    # --- lazy thumbnails ---
+
+    def is_pending(self, path) -> bool:
+        return Path(path) in self._requested
+
+    def cancel_pending(self, keep=()):
+        """Withdraws every outstanding request except those for `keep`."""
+        cancelled = self._requested - set(keep)
+        if not cancelled:
+            return
+        self._loader.cancel(cancelled)
+        self._grabber.cancel(cancelled)
+        self._requested -= cancelled
+
+    def shutdown(self):
+        self.cancel_pending()
+        self._loader.shutdown()
+        self._grabber.cancel_all()
+
+    def _request(self, path):
+        if path in self._requested:
+            return
+        self._requested.add(path)
+        kind = media_kinds.media_kinds_of([path], self.media_index)[path]
+        if kind == "unknown":
+            return
+        if kind == "video":
+            image = self.cache.get(path, self.thumbnail_size) if self.cache is not None else None
+            if image is not None:
+                # Delivered through the queue rather than straight from data(), which must
+                # not emit dataChanged for the row it's being asked about.
+                QTimer.singleShot(0, lambda: self._store(path, image))
+            else:
+                self._grabber.request(path)
+        else:
+            self._loader.request(path, self.thumbnail_size)
+
+    def _on_image(self, path, image):
+        self._store(path, image)
+
+    def _store(self, path, image):
+        if path not in self._requested:
+            return  # cancelled (scrolled away, or the file list was replaced) meanwhile
+        self._requested.discard(path)
+        self._pixmaps[path] = QPixmap.fromImage(image) if image is not None else _FAILED
+        self._pixmaps.move_to_end(path)
+        while len(self._pixmaps) > BROWSER_PIXMAP_CACHE_ENTRIES:
+            self._pixmaps.popitem(last=False)
+        row = self._rows.get(path)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paints a cell the way the picker grid's QLabel cells look - rounded dark tile, the
+    thumbnail centred, or the file name until (or instead of) one - with no widget behind
+    it. Painting only draws an already-decoded pixmap, so scrolling stays cheap."""
+
+    def __init__(self, cell_size: QSize, parent=None):
+        super().__init__(parent)
+        self.cell_size = cell_size
+
+    def sizeHint(self, option, index):
+        return self.cell_size
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = QRect(option.rect.topLeft(), self.cell_size)
+        tile = QPainterPath()
+        tile.addRoundedRect(rect.toRectF(), 8, 8)
+        painter.fillPath(tile, QColor(theme.SURFACE_DARK))
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None:
+            offset = QPoint((rect.width() - pixmap.width()) // 2, (rect.height() - pixmap.height()) // 2)
+            painter.drawPixmap(rect.topLeft() + offset, pixmap)
+        elif not index.data(PENDING_ROLE):
+            painter.setPen(QColor(theme.TEXT))
+            text_rect = rect.adjusted(6, 6, -6, -6)
+            name = option.fontMetrics.elidedText(
+                index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideMiddle, text_rect.width() * 3
+            )
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWrapAnywhere, name)
+        painter.restore()
+
+
+class ThumbnailBrowser(QListView):
+    """Scrollable grid of every file, however many - a QListView in icon mode over a
+    ThumbnailListModel, so only the rows in view are ever painted or thumbnailed, and a
+    100k-file library costs 100k list entries rather than 100k widgets."""
+
+    def __init__(self, cell_size: QSize, spacing: int, cache=None, index=None, parent=None):
+        super().__init__(parent)
+        self.browser_model = ThumbnailListModel(cell_size.width() - 8, cache, index, parent=self)
+        self.setModel(self.browser_model)
+        self.setItemDelegate(ThumbnailDelegate(cell_size, parent=self))
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)  # never asks every row for its size hint
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setSpacing(spacing)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setStyleSheet(f"QListView {{ background-color: {theme.BACKGROUND}; border: none; }}")
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._cancel_offscreen_requests)
+        self.verticalScrollBar().valueChanged.connect(lambda _value: self._settle_timer.start(SCROLL_SETTLE_MS))
+
+    def visible_files(self) -> list[Path]:
+        """The files of the rows currently (even partly) in the viewport."""
+        first = self._first_visible_index()
+        if first is None:
+            return []
+        viewport = self.viewport().rect()
+        visible = []
+        for row in range(first.row(), self.browser_model.rowCount()):
+            rect = self.visualRect(self.browser_model.index(row))
+            if rect.top() > viewport.bottom():
+                break
+            if rect.intersects(viewport):
+                visible.append(self.browser_model.file_at(row))
+        return visible
+
+    def _first_visible_index(self):
+        # The top edge may fall in the spacing between two rows of cells - probe downwards
+        # until a cell is hit, which takes at most one cell height.
+        x = self.spacing() + 1
+        for y in range(0, self.viewport().height(), 4):
+            index = self.indexAt(QPoint(x, y))
+            if index.isValid():
+                return index
+        return None
+
+    def _cancel_offscreen_requests(self):
+        self.browser_model.cancel_pending(keep=self.visible_files())
+
+    def shutdown(self):
+        self._settle_timer.stop()
+        self.browser_model.shutdown()
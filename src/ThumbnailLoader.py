@@ -0,0 +1,103 @@
+import threading
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src import image_loading
+
+# Image decoding releases the GIL inside Qt's codecs, so plain threads do run in parallel
+# here - unlike FilePoolScanner's Python-heavy work, which needs processes.
+THUMBNAIL_LOADER_MAX_THREADS = 4
+
+
+def render_thumbnail(path, size: int) -> QImage | None:
+    """`path` decoded and scaled to fit a `size` x `size` box, or None if it can't be
+    decoded - see image_loading.read_scaled."""
+    return image_loading.read_scaled(path, QSize(size, size))
+
+
+class _ThumbnailJob(QRunnable):
+    def __init__(self, loader, path, size, ticket):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+        self.size = size
+        self.ticket = ticket
+
+    def run(self):
+        self.loader._run_job(self.path, self.size, self.ticket)
+
+
+class ThumbnailLoader(QObject):
+    """Renders still-image thumbnails on a QThreadPool and hands them back to the GUI
+    thread through `loaded(path, QImage | None)` - None for a file that couldn't be decoded.
+    Results come from the ThumbnailCache when it has them and are stored there otherwise.
+
+    Every request gets a ticket; cancel()/cancel_all() withdraw tickets, so a job that
+    hasn't started yet is skipped, and one that finishes anyway has its result dropped
+    rather than landing on a cell that no longer exists (or now shows a different file)."""
+
+    loaded = pyqtSignal(object, object)  # Path, QImage | None
+    # Worker thread -> GUI thread hop; `loaded` is only emitted from _deliver.
+    _finished = pyqtSignal(object, int, object)  # Path, ticket, QImage | None
+
+    def __init__(self, cache=None, max_threads: int = THUMBNAIL_LOADER_MAX_THREADS, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._lock = threading.Lock()
+        self._wanted: dict[Path, int] = {}
+        self._next_ticket = 0
+        self._finished.connect(self._deliver)
+
+    def request(self, path, size: int):
+        path = Path(path)
+        with self._lock:
+            self._next_ticket += 1
+            ticket = self._next_ticket
+            self._wanted[path] = ticket
+        self._pool.start(_ThumbnailJob(self, path, size, ticket))
+
+    def is_pending(self, path) -> bool:
+        with self._lock:
+            return Path(path) in self._wanted
+
+    def cancel(self, paths):
+        with self._lock:
+            for path in paths:
+                self._wanted.pop(Path(path), None)
+
+    def cancel_all(self):
+        with self._lock:
+            self._wanted.clear()
+        self._pool.clear()  # drops queued jobs that haven't started
+
+    def shutdown(self):
+        """Cancels everything and waits for running jobs - call before the owner goes away."""
+        self.cancel_all()
+        self._pool.waitForDone()
+
+    def _is_wanted(self, path, ticket) -> bool:
+        with self._lock:
+            return self._wanted.get(path) == ticket
+
+    def _run_job(self, path, size, ticket):
+        """Runs on a pool thread."""
+        if not self._is_wanted(path, ticket):
+            return
+        image = self.cache.get(path, size) if self.cache is not None else None
+        if image is None:
+            image = render_thumbnail(path, size)
+            if image is not None and self.cache is not None:
+                self.cache.put(path, size, image)
+        if self._is_wanted(path, ticket):
+            self._finished.emit(path, ticket, image)
+
+    def _deliver(self, path, ticket, image):
+        with self._lock:
+            if self._wanted.get(path) != ticket:
+                return
+            del self._wanted[path]
+        self.loaded.emit(path, image)
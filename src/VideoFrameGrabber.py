@@ -0,0 +1,387 @@
+import random
+from collections import deque
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, Qt, QTimer, QUrl, pyqtSignal
+from PyQt6.QtMultimedia import QMediaMetaData, QMediaPlayer, QVideoSink
+
+from src import frame_scoring, media_metadata, mp4_boxes
+
+VIDEO_METADATA_WAIT_TIMEOUT_MS = 1000
+VIDEO_FRAME_WAIT_TIMEOUT_MS = 1000
+VIDEO_FRAME_GRAB_ATTEMPTS = 3
+# A frame counts as the one seeked to if its start time is at most this far from the
+# target - anything else is a frame still in the pipeline from before the seek, or
+# playback running on because the seek was dropped.
+VIDEO_FRAME_POSITION_TOLERANCE_MS = 500
+# setPosition() calls per position before giving up on it - a re-seek after a frame
+# timeout catches a seek the backend dropped.
+VIDEO_SEEK_ATTEMPTS = 2
+# Each grab is a live QMediaPlayer with its own demuxer/decoder - a few side by side keeps
+# the grid filling quickly without starting one per video in a large folder at once.
+MAX_CONCURRENT_GRABS = 3
+
+
+def seek_target_ms(duration_ms, mp4_info=None, slot=0, slots=1) -> int:
+    """A random position in the middle 80% of the clip - never frame 0, which is prone to
+    black leaders/fades. With `slots` > 1 that range is cut into equal segments and the
+    position falls in segment `slot`, so successive candidates sample different scenes
+    rather than possibly the same one twice. Snapped to the nearest keyframe when an
+    mp4_boxes.Mp4Info knows them (the frame the decoder has to start from anyway, so it
+    arrives soonest), as long as that keeps within the segment."""
+    margin = duration_ms * 0.1
+    span = max(0.0, duration_ms - 2 * margin) / slots
+    low = margin + span * slot
+    high = low + span
+    target_ms = int(random.uniform(low, high)) if high > low else int(duration_ms / 2)
+    if mp4_info is not None:
+        keyframe_ms = mp4_info.nearest_keyframe_us(target_ms * 1000) // 1000
+        if low <= keyframe_ms <= high:
+            target_ms = keyframe_ms
+    return target_ms
+
+
+def strip_positions_ms(duration_ms, frame_count, mp4_info=None) -> list[int]:
+    """`frame_count` positions spread evenly across the clip (the middle of each equal
+    slice, so neither the very first nor the very last frame), each snapped to its nearest
+    keyframe when an mp4_boxes.Mp4Info knows them."""
+    positions = []
+    for i in range(frame_count):
+        target_ms = int(duration_ms * (i + 0.5) / frame_count)
+        if mp4_info is not None:
+            target_ms = mp4_info.nearest_keyframe_us(target_ms * 1000) // 1000
+        positions.append(target_ms)
+    return positions
+
+
+class _FrameGrab(QObject):
+    """One video's grab, driven entirely by player/sink signals and a timeout QTimer:
+    wait for the media to load (a seek issued before that is silently dropped) and for a
+    duration (unless one is already known) -> seek -> wait for the frame at that position,
+    once in each of VIDEO_FRAME_GRAB_ATTEMPTS segments of the clip. Every candidate is
+    scored with frame_scoring and the best-ranked one - the sharpest that isn't a fade or a
+    flat card - is the result."""
+
+    finished = pyqtSignal(object)  # self
+
+    def __init__(self, path, duration_ms=None, mp4_info=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.duration_ms = duration_ms or 0
+        self.learned_duration = False
+        self.mp4_info = mp4_info
+        self.best_image = None
+        self._best_rank = None
+        self._attempts_left = VIDEO_FRAME_GRAB_ATTEMPTS
+        self._target_ms = None  # position of the current seek, None when not seeking
+        self._seeks_left = 0
+        self._state = "idle"
+
+        self.player = QMediaPlayer(self)
+        self._sink = QVideoSink(self)
+        self.player.setVideoSink(self._sink)
+        # The QVideoFrame must be converted to a QImage right inside videoFrameChanged -
+        # doing it later (even a moment after the signal fires) reliably yields a null image.
+        self._sink.videoFrameChanged.connect(self._on_frame)
+        self.player.durationChanged.connect(self._on_duration_changed)
+        self.player.mediaStatusChanged.connect(self._on_media_status_changed)
+        self.player.errorOccurred.connect(lambda *_args: self._finish())
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        self._state = "loading"
+        self._timer.start(VIDEO_METADATA_WAIT_TIMEOUT_MS)
+        self.player.setSource(QUrl.fromLocalFile(str(self.path)))
+        self.player.play()
+
+    def abort(self):
+        self._state = "done"
+        self._timer.stop()
+        self.player.setSource(QUrl())
+        self.player.stop()
+
+    def resolution(self):
+        return self.player.metaData().value(QMediaMetaData.Key.Resolution)
+
+    def _on_media_status_changed(self, status):
+        if self._state == "loading" and status in (
+            QMediaPlayer.MediaStatus.LoadedMedia,
+            QMediaPlayer.MediaStatus.BufferingMedia,
+            QMediaPlayer.MediaStatus.BufferedMedia,
+        ):
+            self._timer.stop()
+            self._on_loaded()
+
+    def _on_loaded(self):
+        if self.duration_ms <= 0 and self.player.duration() > 0:
+            self._learn_duration(self.player.duration())
+        if self.duration_ms > 0:
+            self._seek_next()
+        else:
+            self._state = "duration"
+            self._timer.start(VIDEO_METADATA_WAIT_TIMEOUT_MS)
+
+    def _on_duration_changed(self, duration_ms):
+        if duration_ms <= 0 or self.duration_ms > 0:
+            return
+        if self._state == "loading":
+            self._learn_duration(duration_ms)  # seeked to once loaded
+        elif self._state == "duration":
+            self._learn_duration(duration_ms)
+            self._seek_next()
+
+    def _learn_duration(self, duration_ms):
+        self.duration_ms = duration_ms
+        self.learned_duration = True
+
+    def _on_timeout(self):
+        if self._state == "loading":
+            # Never reported loaded - seek anyway, the re-seek after a frame timeout covers
+            # a seek that gets dropped.
+            self._on_loaded()
+        elif self._state == "duration":
+            self._on_no_duration()
+        elif self._state == "frame":
+            if self._seeks_left > 0 and self._target_ms is not None:
+                self._seek()
+            else:
+                self._attempt_done(None)
+
+    def _on_no_duration(self):
+        # No duration to seek within - take whatever frame playback shows first.
+        self._attempts_left = 1
+        self._seek_next()
+
+    def _seek_next(self):
+        self._state = "frame"
+        self._target_ms = self._next_position_ms()
+        self._seeks_left = VIDEO_SEEK_ATTEMPTS
+        self._seek()
+
+    def _seek(self):
+        self._seeks_left -= 1
+        if self._target_ms is not None:
+            self.player.setPosition(self._target_ms)
+        self._timer.start(VIDEO_FRAME_WAIT_TIMEOUT_MS)
+
+    def _next_position_ms(self):
+        self._attempts_left -= 1
+        if self.duration_ms <= 0:
+            return None
+        slot = VIDEO_FRAME_GRAB_ATTEMPTS - 1 - self._attempts_left
+        return seek_target_ms(self.duration_ms, self.mp4_info, slot, VIDEO_FRAME_GRAB_ATTEMPTS)
+
+    def _on_frame(self, frame):
+        if self._state != "frame" or not frame.isValid() or not self._is_at_target(frame):
+            return
+        image = frame.toImage()
+        if image.isNull():
+            return
+        self._timer.stop()
+        self._attempt_done(image)
+
+    def _is_at_target(self, frame):
+        start_us = frame.startTime()
+        # No target (no duration to seek within) takes any frame - and so does a backend
+        # that doesn't timestamp its frames (startTime() -1), rather than none at all.
+        if self._target_ms is None or start_us < 0:
+            return True
+        return abs(start_us // 1000 - self._target_ms) <= VIDEO_FRAME_POSITION_TOLERANCE_MS
+
+    def _attempt_done(self, image):
+        if image is not None:
+            # Every segment gets its candidate rather than stopping at the first usable
+            # frame - a later one may be just as bright but far less motion-blurred.
+            rank = frame_scoring.score_frame(image).rank()
+            if self._best_rank is None or rank > self._best_rank:
+                self.best_image = image
+                self._best_rank = rank
+        if self._attempts_left > 0 and self.duration_ms > 0:
+            self._seek_next()
+        else:
+            self._finish()
+
+    def _finish(self):
+        if self._state == "done":
+            return
+        self._state = "done"
+        self._timer.stop()
+        self.player.stop()
+        self.finished.emit(self)
+
+
+class _StripGrab(_FrameGrab):
+    """Samples `frame_count` frames spread evenly across one video for an animated preview,
+    each scaled to fit a `size` x `size` box as it arrives so a dozen full-resolution frames
+    are never held at once. A position that yields no frame in time is left as None - see
+    VideoFrameGrabber._on_grab_finished. With `snap_to_keyframes` off the positions stay at
+    their exact fractions of the clip, the same moments in every copy of it however it was
+    encoded."""
+
+    def __init__(self, path, frame_count, size, snap_to_keyframes=True, duration_ms=None, mp4_info=None, parent=None):
+        super().__init__(path, duration_ms, mp4_info, parent)
+        self.frames = []
+        self._frame_count = frame_count
+        self._size = size
+        self._snap_to_keyframes = snap_to_keyframes
+        self._positions = deque()
+
+    def _on_no_duration(self):
+        # Nothing to spread the frames across - a single frame is no animation.
+        self._finish()
+
+    def _seek_next(self):
+        if not self._positions:
+            mp4_info = self.mp4_info if self._snap_to_keyframes else None
+            self._positions.extend(strip_positions_ms(self.duration_ms, self._frame_count, mp4_info))
+        super()._seek_next()
+
+    def _next_position_ms(self):
+        return self._positions.popleft()
+
+    def _attempt_done(self, image):
+        if image is not None:
+            image = image.scaled(
+                self._size, self._size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+            )
+        self.frames.append(image)
+        if self._positions:
+            self._seek_next()
+        else:
+            self._finish()
+
+
+class VideoFrameGrabber(QObject):
+    """Grabs one representative frame per video without ever blocking the GUI thread -
+    every grab is a _FrameGrab state machine, at most `max_concurrent` of them at a time,
+    the rest queued in request order. Results arrive through `frame_grabbed(path, QImage |
+    None)`, None when no frame could be had within the timeouts.
+
+    request_strip() grabs a whole preview strip instead (see _StripGrab), delivered through
+    `strip_grabbed(path, list[QImage])` - empty when not even one frame could be had.
+
+    An MP4/MOV's duration and keyframes come from its moov box (see mp4_boxes); other
+    containers use a duration the MediaIndex already knows, or wait for the player to
+    report one - which is then stored in the index for next time.
+
+    With a `thumbnail_size`, every frame_grabbed image is scaled to fit that square and -
+    given a ThumbnailCache `cache` - stored there under that size before it's delivered,
+    even if whoever asked has lost interest meanwhile: the grab was the expensive part."""
+
+    frame_grabbed = pyqtSignal(object, object)  # Path, QImage | None
+    strip_grabbed = pyqtSignal(object, list)  # Path, list[QImage]
+
+    def __init__(
+        self,
+        index=None,
+        max_concurrent: int = MAX_CONCURRENT_GRABS,
+        thumbnail_size: int | None = None,
+        cache=None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.index = index
+        self.max_concurrent = max_concurrent
+        self.thumbnail_size = thumbnail_size
+        self.cache = cache
+        self._queue: deque[Path] = deque()
+        # What each queued path is waiting for - None for a single frame, (frame_count,
+        # size, snap_to_keyframes) for a strip.
+        self._strips: dict[Path, tuple[int, int, bool] | None] = {}
+        self._active: dict[Path, _FrameGrab] = {}
+
+    def request(self, path):
+        self._enqueue(Path(path), None)
+
+    def request_strip(self, path, frame_count: int, size: int, snap_to_keyframes: bool = True):
+        self._enqueue(Path(path), (frame_count, size, snap_to_keyframes))
+
+    def _enqueue(self, path, strip):
+        if path in self._active or path in self._queue:
+            return
+        self._queue.append(path)
+        self._strips[path] = strip
+        self._start_queued()
+
+    def is_pending(self, path) -> bool:
+        path = Path(path)
+        return path in self._active or path in self._queue
+
+    def cancel(self, paths):
+        paths = {Path(path) for path in paths}
+        self._queue = deque(path for path in self._queue if path not in paths)
+        for path in paths:
+            self._strips.pop(path, None)
+        for path in paths & self._active.keys():
+            self._discard(self._active.pop(path))
+        self._start_queued()
+
+    def cancel_all(self):
+        self._queue.clear()
+        self._strips.clear()
+        for grab in self._active.values():
+            self._discard(grab)
+        self._active.clear()
+
+    def _start_queued(self):
+        while self._queue and len(self._active) < self.max_concurrent:
+            path = self._queue.popleft()
+            mp4_info = mp4_boxes.parse(path)
+            duration_ms = mp4_info.duration_ms if mp4_info is not None else self._known_duration_ms(path)
+            strip = self._strips.pop(path)
+            if strip is None:
+                grab = _FrameGrab(path, duration_ms, mp4_info, parent=self)
+            else:
+                grab = _StripGrab(path, *strip, duration_ms, mp4_info, parent=self)
+            grab.finished.connect(self._on_grab_finished)
+            self._active[path] = grab
+            grab.start()
+
+    def _known_duration_ms(self, path):
+        if self.index is None:
+            return None
+        return self.index.metadata([path]).get(str(path), {}).get("duration_ms")
+
+    def _on_grab_finished(self, grab):
+        if self._active.get(grab.path) is not grab:
+            return
+        del self._active[grab.path]
+        if grab.learned_duration and self.index is not None:
+            media_metadata.store_video_metadata(self.index, grab.path, grab.duration_ms, grab.resolution())
+        self._discard(grab)
+        if isinstance(grab, _StripGrab):
+            self.strip_grabbed.emit(grab.path, self._fill_gaps(grab.frames))
+        else:
+            self.frame_grabbed.emit(grab.path, self._as_thumbnail(grab.path, grab.best_image))
+        self._start_queued()
+
+    def _as_thumbnail(self, path, image):
+        if image is None or self.thumbnail_size is None:
+            return image
+        size = self.thumbnail_size
+        image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        if self.cache is not None:
+            self.cache.put(path, size, image)
+        return image
+
+    @staticmethod
+    def _fill_gaps(frames):
+        """A position that produced no frame repeats the one before it (the first such
+        gaps take the first frame that did arrive), keeping the strip's frame count - and so
+        its spacing in time - intact."""
+        fallback = next((frame for frame in frames if frame is not None), None)
+        if fallback is None:
+            return []
+        filled = []
+        for frame in frames:
+            if frame is not None:
+                fallback = frame
+            filled.append(fallback)
+        return filled
+
+    @staticmethod
+    def _discard(grab):
+        grab.abort()
+        grab.deleteLater()
@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src import media_kinds, perceptual_hash
+from src.VideoFrameGrabber import VideoFrameGrabber
+
+# Frames hashed per video, at the middle of each equal slice of its duration (see
+# strip_positions_ms) - odd, so perceptual_hash.combine_hashes' majority vote never ties.
+VIDEO_HASH_FRAMES = 3
+# Frames only need to survive the squash to perceptual_hash's 9x8 grid.
+VIDEO_HASH_FRAME_SIZE = 64
+# Hashing is background work next to the grid's own grabs - one player at a time.
+VIDEO_HASH_MAX_CONCURRENT = 1
+
+
+class VideoHashScanner(QObject):
+    """PerceptualHashScanner's counterpart for videos, with the same results_found /
+    progress / finished signals. A video's frames can only be decoded by a QMediaPlayer on
+    the GUI thread, not on a process pool, so the frames come from a VideoFrameGrabber -
+    VIDEO_HASH_FRAMES of them at fixed fractions of the (cached) duration, never snapped to
+    keyframes, so a re-encode is sampled at the same moments - and their dHashes are
+    combined into one signature by perceptual_hash.dhash_frames. Cached in the MediaIndex
+    alongside the image hashes."""
+
+    results_found = pyqtSignal(dict)  # {Path: int | None}
+    progress = pyqtSignal(int, int)  # done so far, total
+    finished = pyqtSignal()
+
+    def __init__(self, files, index=None, parent=None):
+        super().__init__(parent)
+        self.files = [Path(path) for path in files]
+        self.index = index
+        self._grabber = VideoFrameGrabber(index, max_concurrent=VIDEO_HASH_MAX_CONCURRENT, parent=self)
+        self._grabber.strip_grabbed.connect(self._on_frames_grabbed)
+        # Path -> (size, mtime_ns) read when it was requested, like perceptual_hash.hash_files.
+        self._pending: dict[Path, tuple[int, int]] = {}
+        self._done = 0
+        self._total = 0
+
+    def start(self):
+        kinds = media_kinds.media_kinds_of(self.files, self.index)
+        files = [path for path in self.files if kinds[path] == "video"]
+        cached = self.index.perceptual_hashes(files) if self.index is not None else {}
+        if cached:
+            self.results_found.emit({Path(path): value for path, value in cached.items()})
+        for path in files:
+            if str(path) in cached:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self._pending[path] = (stat.st_size, stat.st_mtime_ns)
+        self._total = len(files)
+        self._done = self._total - len(self._pending)
+        self.progress.emit(self._done, self._total)
+        if not self._pending:
+            self.finished.emit()
+            return
+        for path in self._pending:
+            self._grabber.request_strip(path, VIDEO_HASH_FRAMES, VIDEO_HASH_FRAME_SIZE, snap_to_keyframes=False)
+
+    def stop(self):
+        self._pending.clear()
+        self._grabber.cancel_all()
+
+    def _on_frames_grabbed(self, path, frames):
+        stat = self._pending.pop(path, None)
+        if stat is None:
+            return
+        value = perceptual_hash.dhash_frames(frames)
+        if self.index is not None:
+            self.index.store_perceptual_hashes([(str(path), *stat, value)])
+        self.results_found.emit({path: value})
+        self._done += 1
+        self.progress.emit(self._done, self._total)
+        if not self._pending:
+            self.finished.emit()
@@ -0,0 +1,171 @@
+import hashlib
+import os
+from pathlib import Path
+
+# Head + tail is where containers keep their headers/indexes (mp4 moov, jpeg EXIF) and
+# where re-encodes/truncations differ first - two different files of the same size almost
+# never agree on both, so the full read below is reserved for true duplicates.
+PARTIAL_HASH_CHUNK_BYTES = 64 * 1024
+FULL_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=16)
+
+
+def partial_hash(path, size) -> bytes:
+    """Hash of the first and last PARTIAL_HASH_CHUNK_BYTES of the file. A file no bigger
+    than both chunks together is read whole, so for it this is already the full hash."""
+    digest = _new_hash()
+    with open(path, "rb") as file:
+        if size <= 2 * PARTIAL_HASH_CHUNK_BYTES:
+            digest.update(file.read())
+        else:
+            digest.update(file.read(PARTIAL_HASH_CHUNK_BYTES))
+            file.seek(-PARTIAL_HASH_CHUNK_BYTES, os.SEEK_END)
+            digest.update(file.read(PARTIAL_HASH_CHUNK_BYTES))
+    return digest.digest()
+
+
+def full_hash(path) -> bytes:
+    digest = _new_hash()
+    with open(path, "rb") as file:
+        while block := file.read(FULL_HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.digest()
+
+
+class _Candidate:
+    def __init__(self, path):
+        self.path = path
+        self.size = None
+        self.mtime_ns = None
+        self.partial = None
+        self.full = None
+
+
+class ContentDeduplicator:
+    """Drops files whose content is identical to one already let through - the same clip
+    sitting in several picked folders should only be in the playlist once.
+
+    Stateful, so it works incrementally: filter() can be fed the initial file list and then
+    every later batch (a streaming scan, watcher additions), and each file is only compared
+    against what came before it. Comparison is lazy and staged - files are grouped by size
+    (free, from the MediaIndex), a same-size group is compared by partial_hash, and only a
+    partial-hash match costs a full read. Every computed hash is cached in the index under
+    (path, size, mtime) - written in one transaction at the end of each filter() call - so
+    a second session over the same library reads no file content at all.
+
+    Reads files, so the picker and the session run it on a DuplicateFilter thread.
+
+    `index` is an optional MediaIndex (duck-typed, same as media_kinds) - without one,
+    sizes come from os.stat and nothing is cached across runs."""
+
+    def __init__(self, index=None):
+        self.index = index
+        self._seen_paths: set[Path] = set()
+        # size -> the files of that size let through so far, by path, in arrival order
+        self._kept_by_size: dict[int, dict[Path, _Candidate]] = {}
+        # path -> the size bucket it was kept in, so forget() touches that bucket only
+        self._kept_size_by_path: dict[Path, int] = {}
+        # str(path) -> hash row computed during the current filter() call, not stored yet
+        self._unstored: dict[str, tuple] = {}
+
+    def filter(self, files, interrupted=None) -> list[Path]:
+        """Returns `files` minus anything already seen (same path) or identical in content
+        to a file let through earlier - order preserved, first occurrence wins.
+
+        `interrupted` is polled between files; once it returns True the rest of `files` is
+        left unchecked (and out of the result) - see DuplicateFilter.stop."""
+        files = [Path(path) for path in files]
+        sizes = self.index.file_sizes(files) if self.index is not None else {}
+        unique = []
+        for path in files:
+            if interrupted is not None and interrupted():
+                break
+            if path in self._seen_paths:
+                continue
+            self._seen_paths.add(path)
+            size = sizes.get(str(path))
+            if size is None:
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    # Can't even stat it - let it through rather than guess; playback
+                    # skips unreadable files on its own.
+                    unique.append(path)
+                    continue
+            if not self._is_duplicate(path, size):
+                unique.append(path)
+        self._store_hashes()
+        return unique
+
+    def forget(self, files):
+        """Stops treating `files` as let through - e.g. after they were deleted from disk,
+        so a copy of one of them showing up later isn't dropped as its duplicate."""
+        for path in files:
+            path = Path(path)
+            self._seen_paths.discard(path)
+            size = self._kept_size_by_path.pop(path, None)
+            if size is not None:
+                kept = self._kept_by_size[size]
+                del kept[path]
+                if not kept:
+                    del self._kept_by_size[size]
+
+    def _is_duplicate(self, path, size):
+        kept = self._kept_by_size.setdefault(size, {})
+        candidate = _Candidate(path)
+        if kept and self._partial(candidate) is not None:
+            for other in kept.values():
+                if self._partial(other) == candidate.partial and self._full(other) == self._full(candidate):
+                    return True
+        kept[path] = candidate
+        self._kept_size_by_path[path] = size
+        return False
+
+    def _load(self, candidate):
+        """Reads the real size/mtime the hash cache is keyed by - the index's size is only
+        used for grouping, and may lag behind an in-place edit (see MediaIndex)."""
+        stat = os.stat(candidate.path)
+        candidate.size = stat.st_size
+        candidate.mtime_ns = stat.st_mtime_ns
+        if self.index is not None:
+            candidate.partial, candidate.full = self.index.content_hashes(
+                candidate.path, candidate.size, candidate.mtime_ns
+            )
+
+    def _store(self, candidate):
+        if self.index is not None:
+            self._unstored[str(candidate.path)] = (
+                candidate.path, candidate.size, candidate.mtime_ns, candidate.partial, candidate.full
+            )
+
+    def _store_hashes(self):
+        if self._unstored:
+            rows, self._unstored = list(self._unstored.values()), {}
+            self.index.store_content_hashes(rows)
+
+    def _partial(self, candidate):
+        """None if the file can't be read - which never compares equal to anything."""
+        if candidate.partial is None:
+            try:
+                if candidate.size is None:
+                    self._load(candidate)
+                if candidate.partial is None:
+                    candidate.partial = partial_hash(candidate.path, candidate.size)
+                    if candidate.size <= 2 * PARTIAL_HASH_CHUNK_BYTES:
+                        candidate.full = candidate.partial
+                    self._store(candidate)
+            except OSError:
+                return None
+        return candidate.partial
+
+    def _full(self, candidate):
+        if candidate.full is None:
+            try:
+                candidate.full = full_hash(candidate.path)
+            except OSError:
+                return None
+            self._store(candidate)
+        return candidate.full
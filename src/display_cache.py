@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DisplayCache:
+    """Display-ready images (QPixmaps, already scaled for the screen) keyed by (path,
+    target size in device pixels, device pixel ratio), least recently used dropped first
+    once their total size passes `max_bytes`. Sizes are the decoded QImage's real byte
+    count, passed in by whoever puts an entry in - a QPixmap can't report its own.
+
+    hits/misses/evictions count get() results and budget evictions since the cache was
+    made - what tells whether the budget is big enough for how a session navigates.
+    GUI-thread only, like the QPixmaps it holds."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()  # key -> (value, bytes)
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(path, size, dpr: float = 1.0) -> tuple:
+        """Accepts a QSize or a (width, height) tuple."""
+        if not isinstance(size, tuple):
+            size = (size.width(), size.height())
+        return Path(path), size, float(dpr)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = int(max_bytes)
+        self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, path, size, dpr: float = 1.0):
+        key = self.key(path, size, dpr)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, path, size, value, size_bytes: int, dpr: float = 1.0):
+        key = self.key(path, size, dpr)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= old[1]
+        self._entries[key] = (value, size_bytes)
+        self._total_bytes += size_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _evict(self):
+        while self._total_bytes > self._max_bytes and self._entries:
+            _key, (_value, size_bytes) = self._entries.popitem(last=False)
+            self._total_bytes -= size_bytes
+            self.evictions += 1
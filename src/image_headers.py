@@ -0,0 +1,122 @@
+import struct
+
+# Dimensions straight from the format headers - PNG's IHDR, GIF's logical screen
+# descriptor and BMP's DIB header all sit within the first 26 bytes; JPEG needs a walk over
+# the marker segments up to the first SOFn, which is usually within a few KB (only a big
+# embedded EXIF thumbnail pushes it further). No pixel data is touched and no Qt image
+# plugin is loaded.
+_HEAD_BYTES = 26
+
+# Largest JPEG segment walk before giving up - a SOFn further in than this is a malformed
+# or exotic file better left to QImageReader.
+_JPEG_MAX_SCAN_BYTES = 1024 * 1024
+
+# JPEG start-of-frame markers: C0-CF, minus DHT (C4), JPG (C8) and DAC (CC) which share
+# the range.
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_JPEG_SOS = 0xDA
+_JPEG_APP1 = 0xE1
+# Markers without a length field.
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01, 0xD8}
+
+_EXIF_ORIENTATION_TAG = 0x0112
+# EXIF orientation (1-8) -> QImageIOHandler.Transformation value, the same mapping Qt's
+# own JPEG handler applies - so `orientation` means the same as what QImageReader reports.
+_EXIF_TO_TRANSFORMATION = {1: 0, 2: 1, 3: 3, 4: 2, 5: 6, 6: 4, 7: 5, 8: 7}
+
+
+class ImageHeader:
+    """`width`/`height` as stored, before `orientation` (QImageIOHandler.Transformation
+    flags, 0 for "as stored" - only JPEG's EXIF ever says otherwise) is applied."""
+
+    def __init__(self, width: int, height: int, orientation: int = 0):
+        self.width = width
+        self.height = height
+        self.orientation = orientation
+
+
+def read_header(path) -> ImageHeader | None:
+    """Reads a PNG, JPEG, BMP or GIF file's dimensions from its header, or None for any
+    other format, a truncated header or an unreadable file - callers fall back to
+    QImageReader then."""
+    try:
+        with open(path, "rb") as file:
+            head = file.read(_HEAD_BYTES)
+            if head.startswith(b"\xff\xd8"):
+                file.seek(2)
+                return _read_jpeg(file)
+            return _read_head(head)
+    except (OSError, struct.error):
+        return None
+
+
+def _read_head(head) -> ImageHeader | None:
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+        width, height = struct.unpack_from(">II", head, 16)
+    elif head[:6] in (b"GIF87a", b"GIF89a"):
+        width, height = struct.unpack_from("<HH", head, 6)
+    elif head.startswith(b"BM"):
+        (dib_size,) = struct.unpack_from("<I", head, 14)
+        if dib_size == 12:  # OS/2 BITMAPCOREHEADER
+            width, height = struct.unpack_from("<HH", head, 18)
+        else:
+            width, height = struct.unpack_from("<ii", head, 18)
+            height = abs(height)  # negative means stored top-down
+    else:
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return ImageHeader(width, height)
+
+
+def _read_jpeg(file) -> ImageHeader | None:
+    orientation = 0
+    while file.tell() < _JPEG_MAX_SCAN_BYTES:
+        byte = file.read(1)
+        if byte != b"\xff":
+            return None
+        marker = file.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = file.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == _JPEG_SOS:
+            return None  # image data started without a frame header
+        (length,) = struct.unpack(">H", file.read(2))
+        if length < 2:
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            _precision, height, width = struct.unpack(">BHH", file.read(5))
+            if width <= 0 or height <= 0:
+                return None
+            return ImageHeader(width, height, orientation)
+        if marker == _JPEG_APP1 and not orientation:
+            segment = file.read(length - 2)
+            if segment.startswith(b"Exif\x00\x00"):
+                orientation = _exif_orientation(segment[6:])
+            continue
+        file.seek(length - 2, 1)
+    return None
+
+
+def _exif_orientation(tiff) -> int:
+    """Transformation value for the Orientation tag in IFD0 of an EXIF TIFF block."""
+    try:
+        if tiff[:2] == b"II":
+            endian = "<"
+        elif tiff[:2] == b"MM":
+            endian = ">"
+        else:
+            return 0
+        (ifd_offset,) = struct.unpack_from(endian + "I", tiff, 4)
+        (entry_count,) = struct.unpack_from(endian + "H", tiff, ifd_offset)
+        for i in range(entry_count):
+            tag, _type, _count, value = struct.unpack_from(endian + "HHIH", tiff, ifd_offset + 2 + 12 * i)
+            if tag == _EXIF_ORIENTATION_TAG:
+                return _EXIF_TO_TRANSFORMATION.get(value, 0)
+    except struct.error:
+        pass
+    return 0
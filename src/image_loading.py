@@ -0,0 +1,50 @@
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImage, QImageIOHandler, QImageReader
+
+# The JPEG reader can decode straight to 1/2, 1/4 or 1/8 of the full resolution by scaling
+# in the DCT domain - far less work and memory than decoding everything and throwing most
+# of it away. Asking it for any other size makes it decode at the nearest of those and
+# then resample, which costs more than it saves, so only these exact sizes are requested.
+_SCALE_DENOMINATORS = (8, 4, 2)
+
+
+def _decode_size(source_size: QSize, target: QSize) -> QSize | None:
+    """The smallest source_size / 2^n (n <= 3) still at least `target` in both directions,
+    or None if that's the full size. Floor division, because the reader picks its scale from
+    source // requested - a rounded-up request would land on the next coarser denominator."""
+    for denominator in _SCALE_DENOMINATORS:
+        size = QSize(source_size.width() // denominator, source_size.height() // denominator)
+        if size.width() >= target.width() and size.height() >= target.height():
+            return size
+    return None
+
+
+def read_scaled(path, box: QSize) -> QImage | None:
+    """`path` decoded and scaled to fit `box` (keeping aspect ratio, EXIF orientation
+    applied), or None if it can't be decoded.
+
+    Rather than decoding at full resolution and then scaling, a reader that can decode at a
+    reduced size (JPEG) is told to, and a smooth resample takes it the rest of the way - a
+    50-megapixel JPEG bound for a thumbnail cell never exists in memory at full size. Plain
+    QImage work, so it's safe on any thread (QPixmap is GUI-thread only)."""
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+    if (
+        source_size.isValid()
+        and not box.isEmpty()
+        and reader.supportsOption(QImageIOHandler.ImageOption.ScaledSize)
+    ):
+        # setScaledSize works in the file's stored orientation, before the EXIF transform.
+        stored_box = box
+        if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+            stored_box = box.transposed()
+        decode_size = _decode_size(source_size, source_size.scaled(stored_box, Qt.AspectRatioMode.KeepAspectRatio))
+        if decode_size is not None:
+            reader.setScaledSize(decode_size)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if box.isEmpty():
+        return image
+    return image.scaled(box, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
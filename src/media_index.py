@@ -0,0 +1,483 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from src import media_kinds, utils
+
+# Bumped whenever what the walk tables store changes meaning - an older database then has
+# its directories/files tables rebuilt (they're only a cache of the filesystem) instead of
+# serving rows of the old kind. 1: files.kind is sniffed from content, not the extension.
+_SCHEMA_VERSION = 1
+_WALK_TABLES = ("directories", "files")
+
+_SCHEMA = """
+-- every listed directory is its own small transaction - WAL with NORMAL sync keeps each
+-- of those commits from costing a full fsync
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+
+CREATE TABLE IF NOT EXISTS directories (
+    folder TEXT NOT NULL,
+    path TEXT NOT NULL,
+    parent TEXT,
+    mtime_ns INTEGER,
+    PRIMARY KEY (folder, path)
+);
+CREATE INDEX IF NOT EXISTS directories_by_parent ON directories (folder, parent);
+
+CREATE TABLE IF NOT EXISTS files (
+    folder TEXT NOT NULL,
+    path TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    PRIMARY KEY (folder, path)
+);
+CREATE INDEX IF NOT EXISTS files_by_directory ON files (folder, directory);
+CREATE INDEX IF NOT EXISTS files_by_path ON files (path);
+
+-- content_dedup's hashes, keyed by path and only trusted while size and mtime still match
+CREATE TABLE IF NOT EXISTS content_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial_hash BLOB,
+    full_hash BLOB
+);
+
+-- perceptual_hash dHashes (8 big-endian bytes; NULL for a file that couldn't be decoded,
+-- so it isn't retried every run), trusted while size/mtime match the files table's row
+CREATE TABLE IF NOT EXISTS perceptual_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash BLOB
+);
+
+-- media_metadata probe results, one column per media_metadata.FIELDS entry (NULL = unknown)
+CREATE TABLE IF NOT EXISTS media_metadata (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    duration_ms INTEGER,
+    frame_count INTEGER,
+    orientation INTEGER
+);
+"""
+
+_METADATA_COLUMNS = ("width", "height", "duration_ms", "frame_count", "orientation")
+
+# Stays well under SQLite's bound-parameter limit (999 on older builds) for IN (...) lookups.
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def _list_directory(directory, known=None):
+    """One os.scandir pass over `directory` - returns (file_records, subdirectories), where
+    each record is (path, size, mtime_ns, kind) for a file with a supported extension
+    directly inside it. `kind` is sniffed from the file's first bytes
+    (media_kinds.sniff_file_kind), and is "unknown" for a mislabeled or unreadable file -
+    those rows are kept, so the file isn't re-sniffed on every rescan, but never served.
+
+    `known` ({path: (size, mtime_ns, kind)}, the directory's stored rows) supplies the kind
+    of every file whose size and mtime haven't changed, so re-listing a directory after one
+    file was added opens just that file rather than every file in it.
+
+    Symlinked directories aren't descended into (same as Path.rglob), so a link cycle can't
+    turn a scan into an endless walk. A single unreadable entry is skipped, not fatal."""
+    records = []
+    subdirectories = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                    continue
+                if media_kinds.media_kind(entry.name) == "unknown" or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+                stored = known.get(entry.path) if known else None
+                if stored is not None and stored[:2] == (size, mtime_ns):
+                    kind = stored[2]
+                else:
+                    kind = media_kinds.sniff_file_kind(entry.path)
+                records.append((entry.path, size, mtime_ns, kind))
+            except OSError:
+                continue
+    return records, subdirectories
+
+
+class MediaIndex:
+    """Persistent SQLite index of every supported media file under each picked folder,
+    storing path, size, mtime and media kind - the kind sniffed from the file's content
+    once, when its directory is listed, so files that only *look* like media by extension
+    never come out of a scan at all.
+
+    Each scanned directory's own mtime is stored next to the files found directly inside it.
+    A directory's mtime only moves when an entry is added, removed or renamed in it, so a
+    rescan re-lists just the directories whose mtime changed and serves every other one
+    straight from the database - one stat per directory instead of a listing plus a stat
+    per file. The flip side: editing an existing file in place doesn't touch its
+    directory's mtime, so the size/mtime stored for it can lag until something else in
+    that directory changes.
+
+    The connection is opened lazily on first use and shared across threads behind a lock,
+    so constructing an index (e.g. GoonerApp's default one) never touches the disk."""
+
+    FILE_NAME = "media_index.sqlite3"
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return utils.get_app_data_dir() / cls.FILE_NAME
+
+    def _connect(self):
+        """Must be called with self._lock held."""
+        if self._connection is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._prepare(connection)
+            except (OSError, sqlite3.DatabaseError):
+                # An unwritable data dir or a corrupt database file must never take the
+                # folder picker down with it - an in-memory index still deduplicates work
+                # within this run, it just doesn't survive a restart.
+                connection = sqlite3.connect(":memory:", check_same_thread=False)
+                self._prepare(connection)
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _prepare(connection):
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            connection.executescript("".join(f"DROP TABLE IF EXISTS {table};" for table in _WALK_TABLES))
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def scan(self, folder) -> list[Path]:
+        return [path for batch in self.iter_scan(folder) for path in batch]
+
+    def iter_scan(self, folder, max_workers: int = media_kinds.WALK_MAX_WORKERS):
+        """Yields every supported file under `folder`, one directory's worth at a time,
+        re-listing only directories whose mtime changed since the last scan. Runs on
+        media_kinds.walk_directories, so an unreadable subtree (permissions, a broken
+        junction, ...) is skipped on its own rather than aborting the whole walk."""
+        folder = str(folder)
+        yield from media_kinds.walk_directories(folder, lambda directory: self._visit(folder, directory), max_workers)
+
+    def directories(self, folder) -> list[str]:
+        """Every directory under `folder` the index knows about (the folder itself included)."""
+        with self._lock:
+            return [
+                path
+                for (path,) in self._connect().execute("SELECT path FROM directories WHERE folder = ?", (str(folder),))
+            ]
+
+    def kinds(self, paths, include_unknown=False) -> dict[str, str]:
+        """Sniffed media kind of each of `paths` the index has a playable row for, keyed by
+        str(path) - what the session looks up instead of trusting the extension. With
+        `include_unknown`, files listed but found not to be media come back as "unknown"."""
+        return self._lookup_files(paths, "kind", "1" if include_unknown else "kind != 'unknown'")
+
+    def file_sizes(self, paths) -> dict[str, int]:
+        """Size of each of `paths` the index has a row for, keyed by str(path) - paths it
+        doesn't know are simply missing from the result."""
+        return self._lookup_files(paths, "size")
+
+    def _lookup_files(self, paths, column, condition="1"):
+        paths = [str(path) for path in paths]
+        values = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(paths), _LOOKUP_CHUNK_SIZE):
+                chunk = paths[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                values.update(
+                    connection.execute(
+                        f"SELECT path, {column} FROM files WHERE path IN ({placeholders}) AND {condition}", chunk
+                    )
+                )
+        return values
+
+    def content_hashes(self, path, size, mtime_ns):
+        """(partial_hash, full_hash) cached for `path` at exactly this size and mtime -
+        either can be None if it was never computed, and both are if the file changed since."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT partial_hash, full_hash FROM content_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (str(path), size, mtime_ns),
+                )
+                .fetchone()
+            )
+        return row if row is not None else (None, None)
+
+    def store_content_hashes(self, rows):
+        """`rows` of (path, size, mtime_ns, partial_hash, full_hash), in one transaction."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO content_hashes (path, size, mtime_ns, partial_hash, full_hash) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(str(path), size, mtime_ns, partial, full) for path, size, mtime_ns, partial, full in rows],
+                )
+
+    def perceptual_hashes(self, paths) -> dict[str, int | None]:
+        """Cached dHash per str(path), for those of `paths` whose cached entry still matches
+        the size/mtime the index has for the file - None values are files known to be
+        undecodable. Uses the index's stored stat, so a warm lookup costs no syscalls."""
+        paths = [str(path) for path in paths]
+        hashes = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(paths), _LOOKUP_CHUNK_SIZE):
+                chunk = paths[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = connection.execute(
+                    "SELECT DISTINCT p.path, p.hash FROM perceptual_hashes p JOIN files f "
+                    "ON f.path = p.path AND f.size = p.size AND f.mtime_ns = p.mtime_ns "
+                    f"WHERE p.path IN ({placeholders})",
+                    chunk,
+                )
+                hashes.update((path, None if value is None else int.from_bytes(value, "big")) for path, value in rows)
+        return hashes
+
+    def store_perceptual_hashes(self, rows):
+        """`rows` of (path, size, mtime_ns, hash_or_None), as perceptual_hash.hash_files returns them."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO perceptual_hashes (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                    [
+                        (str(path), size, mtime_ns, None if value is None else value.to_bytes(8, "big"))
+                        for path, size, mtime_ns, value in rows
+                    ],
+                )
+
+    def metadata(self, paths) -> dict[str, dict]:
+        """Probed media_metadata dict per str(path), for those of `paths` whose stored probe
+        still matches the size/mtime the index has for the file - same staleness rule as
+        perceptual_hashes."""
+        paths = [str(path) for path in paths]
+        columns = ", ".join(f"m.{column}" for column in _METADATA_COLUMNS)
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(paths), _LOOKUP_CHUNK_SIZE):
+                chunk = paths[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT DISTINCT m.path, {columns} FROM media_metadata m JOIN files f "
+                    "ON f.path = m.path AND f.size = m.size AND f.mtime_ns = m.mtime_ns "
+                    f"WHERE m.path IN ({placeholders})",
+                    chunk,
+                )
+                found.update((row[0], dict(zip(_METADATA_COLUMNS, row[1:], strict=True))) for row in rows)
+        return found
+
+    def store_metadata(self, rows):
+        """`rows` of (path, size, mtime_ns, metadata_dict), as media_metadata.probe_files
+        returns them. Replaces whatever was stored for each path."""
+        placeholders = ", ".join("?" * (3 + len(_METADATA_COLUMNS)))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO media_metadata (path, size, mtime_ns, {', '.join(_METADATA_COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    [
+                        (str(path), size, mtime_ns, *(metadata.get(column) for column in _METADATA_COLUMNS))
+                        for path, size, mtime_ns, metadata in rows
+                    ],
+                )
+
+    def rescan_directory(self, folder, directory) -> "IndexChanges":
+        """Re-lists one directory of an already-indexed folder, e.g. after a file watcher
+        reported it changed, and returns what that changed in the index.
+
+        Only `directory` itself and subdirectories that are new since the last look get
+        listed - unchanged existing subdirectories are left alone, their own changes show
+        up as their own watcher events. A directory that no longer exists has its whole
+        subtree reported as removed."""
+        folder = str(folder)
+        directory = str(directory)
+        changes = IndexChanges()
+        if not os.path.isdir(directory):
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    self._forget_subtree(connection, folder, directory, changes)
+            return changes
+        for _files in media_kinds.walk_directories(
+            directory, lambda subdirectory: self._visit(folder, subdirectory, changes)
+        ):
+            pass
+        return changes
+
+    def _visit(self, folder, directory, changes=None):
+        """Without `changes`, a full-scan step: returns this directory's files and all of
+        its subdirectories. With an IndexChanges to fill in (see rescan_directory), only
+        subdirectories that are new since the last look are returned for descending.
+
+        A database error (locked, disk full, corrupted mid-run, ...) doesn't end the walk:
+        a full scan lists the directory as if there were no index, and the next scan
+        stores it; a rescan has nothing to record it in, so it leaves the directory be."""
+        try:
+            return self._visit_indexed(folder, directory, changes)
+        except sqlite3.Error:
+            if changes is not None:
+                return [], []
+            records, subdirectories = _list_directory(directory)
+            return [Path(path) for path, _size, _mtime_ns, kind in records if kind != "unknown"], subdirectories
+
+    def _visit_indexed(self, folder, directory, changes):
+        mtime_ns = os.stat(directory).st_mtime_ns
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT mtime_ns FROM directories WHERE folder = ? AND path = ?", (folder, directory)
+            ).fetchone()
+            if row is not None and row[0] == mtime_ns:
+                files, subdirectories = self._cached_directory(connection, folder, directory)
+                return files, (subdirectories if changes is None else [])
+            known = {
+                path: (size, file_mtime_ns, kind)
+                for path, size, file_mtime_ns, kind in connection.execute(
+                    "SELECT path, size, mtime_ns, kind FROM files WHERE folder = ? AND directory = ?",
+                    (folder, directory),
+                )
+            }
+
+        # The listing itself runs outside the lock - it's the slow part, and the mtime read
+        # *before* it means a change racing the listing just leaves a stale mtime behind,
+        # which only makes the next scan re-list this directory once more.
+        records, subdirectories = _list_directory(directory, known)
+        with self._lock:
+            new_subdirectories = self._store_directory(
+                self._connect(), folder, directory, mtime_ns, records, subdirectories, changes
+            )
+        files = [Path(path) for path, _size, _mtime_ns, kind in records if kind != "unknown"]
+        return files, (subdirectories if changes is None else new_subdirectories)
+
+    @staticmethod
+    def _cached_directory(connection, folder, directory):
+        files = [
+            Path(path)
+            for (path,) in connection.execute(
+                "SELECT path FROM files WHERE folder = ? AND directory = ? AND kind != 'unknown'", (folder, directory)
+            )
+        ]
+        subdirectories = [
+            path
+            for (path,) in connection.execute(
+                "SELECT path FROM directories WHERE folder = ? AND parent = ?", (folder, directory)
+            )
+        ]
+        return files, subdirectories
+
+    def _store_directory(self, connection, folder, directory, mtime_ns, records, subdirectories, changes=None):
+        """Must be called with self._lock held. Returns the subdirectories that had no row
+        before this listing."""
+        # Only used if this directory has no row yet - an existing row keeps the parent its
+        # placeholder was created with, i.e. the exact string its parent's listing produced.
+        parent = None if directory == folder else os.path.dirname(directory)
+        with connection:
+            connection.execute(
+                "INSERT INTO directories (folder, path, parent, mtime_ns) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (folder, path) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+                (folder, directory, parent, mtime_ns),
+            )
+
+            known_subdirectories = {
+                path
+                for (path,) in connection.execute(
+                    "SELECT path FROM directories WHERE folder = ? AND parent = ?", (folder, directory)
+                )
+            }
+            for gone in known_subdirectories.difference(subdirectories):
+                self._forget_subtree(connection, folder, gone, changes)
+            new_subdirectories = [path for path in subdirectories if path not in known_subdirectories]
+            # Placeholder rows (NULL mtime never matches) for subdirectories seen for the
+            # first time - so even if this scan is cut short before reaching them, the next
+            # one still finds and lists them instead of trusting this directory's new mtime.
+            connection.executemany(
+                "INSERT OR IGNORE INTO directories (folder, path, parent, mtime_ns) VALUES (?, ?, ?, NULL)",
+                [(folder, path, directory) for path in new_subdirectories],
+            )
+
+            if changes is not None:
+                before = {
+                    path
+                    for (path,) in connection.execute(
+                        "SELECT path FROM files WHERE folder = ? AND directory = ? AND kind != 'unknown'",
+                        (folder, directory),
+                    )
+                }
+                after = {path for path, _size, _mtime_ns, kind in records if kind != "unknown"}
+                changes.added.extend(Path(path) for path in after - before)
+                changes.removed.extend(Path(path) for path in before - after)
+                changes.directories_added.extend(new_subdirectories)
+
+            connection.execute("DELETE FROM files WHERE folder = ? AND directory = ?", (folder, directory))
+            connection.executemany(
+                "INSERT INTO files (folder, path, directory, size, mtime_ns, kind) VALUES (?, ?, ?, ?, ?, ?)",
+                [(folder, path, directory, size, file_mtime_ns, kind) for path, size, file_mtime_ns, kind in records],
+            )
+        return new_subdirectories
+
+    @staticmethod
+    def _forget_subtree(connection, folder, directory, changes=None):
+        prefix = directory.rstrip("\\/") + os.sep
+        params = (folder, directory, len(prefix), prefix)
+        if changes is not None:
+            changes.removed.extend(
+                Path(path)
+                for (path,) in connection.execute(
+                    "SELECT path FROM files WHERE folder = ? AND kind != 'unknown' "
+                    "AND (directory = ? OR substr(directory, 1, ?) = ?)",
+                    params,
+                )
+            )
+            changes.directories_removed.extend(
+                path
+                for (path,) in connection.execute(
+                    "SELECT path FROM directories WHERE folder = ? AND (path = ? OR substr(path, 1, ?) = ?)", params
+                )
+            )
+        connection.execute("DELETE FROM directories WHERE folder = ? AND (path = ? OR substr(path, 1, ?) = ?)", params)
+        connection.execute(
+            "DELETE FROM files WHERE folder = ? AND (directory = ? OR substr(directory, 1, ?) = ?)", params
+        )
+
+
+class IndexChanges:
+    """What one MediaIndex.rescan_directory call changed. A rename shows up as the old path
+    in `removed` plus the new one in `added` - the index only ever sees directory listings,
+    not the rename event itself."""
+
+    def __init__(self):
+        self.added: list[Path] = []
+        self.removed: list[Path] = []
+        self.directories_added: list[str] = []
+        self.directories_removed: list[str] = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.directories_added or self.directories_removed)
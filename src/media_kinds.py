@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp'}
@@ -5,6 +7,12 @@ GIF_EXTENSIONS = {'.gif'}
 VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
 SUPPORTED_EXTENSIONS = IMAGE_EXTENSIONS | GIF_EXTENSIONS | VIDEO_EXTENSIONS
 
+# Listing a directory is I/O-bound and releases the GIL, so a few threads keep several
+# readdir/stat requests queued at once (what a spinning disk or a network share actually
+# benefits from) - bounded, so a tree with thousands of directories never means thousands
+# of threads.
+WALK_MAX_WORKERS = 8
+
 
 def media_kind(path) -> str:
     ext = Path(path).suffix.lower()
@@ -17,16 +25,101 @@ def media_kind(path) -> str:
     return "unknown"
 
 
-def find_supported_files(folder: str) -> list[Path]:
-    pfad = Path(folder)
-    gefundene_dateien = []
+def media_kinds_of(paths, index=None) -> dict:
+    """media_kind() of each of `paths`, keyed by the path as given - but sniffed from the
+    content wherever a MediaIndex has a row for it, so a PNG saved as .mp4 comes out an
+    image, and a file the index found isn't media at all (an HTML page saved as .jpg)
+    "unknown". The extension only decides for files the index hasn't listed."""
+    paths = list(paths)
+    sniffed = index.kinds(paths, include_unknown=True) if index is not None else {}
+    return {path: sniffed.get(str(path)) or media_kind(path) for path in paths}
+
+
+# Enough for every signature sniff_media_kind checks (the RIFF form type sits at 8-12).
+SNIFF_BYTES = 16
+_MP4_BOX_TYPES = (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip", b"pnot")
+
+
+def sniff_media_kind(head: bytes) -> str:
+    """Media kind from a file's first SNIFF_BYTES bytes - "unknown" for anything that isn't
+    a format this app plays, whatever its extension claims (an HTML error page saved as
+    .mp4, a truncated zero-byte download, ...). A .jpg that's really a PNG or WebP still
+    sniffs as "image" - Qt's image loaders go by content, not by name."""
+    if head.startswith((b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"BM")):
+        return "image"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "image"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if head[4:8] in _MP4_BOX_TYPES:  # ISO base media (mp4/mov/m4v): size, then box type
+        return "video"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):  # EBML - Matroska/WebM
+        return "video"
+    if head.startswith(b"RIFF") and head[8:12] == b"AVI ":
+        return "video"
+    return "unknown"
+
+
+def sniff_file_kind(path) -> str:
     try:
-        for datei in pfad.rglob('*'):
-            if datei.is_file() and datei.suffix.lower() in SUPPORTED_EXTENSIONS:
-                gefundene_dateien.append(datei)
+        with open(path, "rb") as file:
+            return sniff_media_kind(file.read(SNIFF_BYTES))
     except OSError:
-        # A restricted subdirectory (permissions, a broken junction, ...) anywhere under
-        # `folder` would otherwise abort the whole walk - better to return whatever was
-        # found before the error than crash the folder picker over one bad subtree.
-        pass
-    return gefundene_dateien
+        return "unknown"
+
+
+def walk_directories(root, visit, max_workers: int = WALK_MAX_WORKERS):
+    """Parallel directory walk: runs `visit(directory) -> (result, subdirectories)` on a
+    bounded thread pool, submits each directory's subdirectories as new jobs, and yields
+    every directory's `result` as soon as it's ready - in completion order, not tree order.
+
+    An OSError from `visit` (permissions, a broken junction, a directory deleted mid-walk,
+    ...) only drops that directory's own subtree - the rest of the walk carries on. Closing
+    the generator early cancels whatever hasn't started yet."""
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="media-walk")
+    try:
+        pending = {pool.submit(visit, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, subdirectories = future.result()
+                except OSError:
+                    continue
+                pending.update(pool.submit(visit, subdirectory) for subdirectory in subdirectories)
+                yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _scan_directory(directory):
+    """One os.scandir pass - the DirEntry type bits answer is_dir()/is_file() without the
+    extra stat per entry that Path.is_file() costs. Symlinked directories aren't descended
+    into (same as Path.rglob), so a link cycle can't turn the walk endless."""
+    files = []
+    subdirectories = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS and entry.is_file():
+                    files.append(Path(entry.path))
+            except OSError:
+                continue
+    return files, subdirectories
+
+
+def iter_supported_files(folder: str, index=None, max_workers: int = WALK_MAX_WORKERS):
+    """Yields the supported files under `folder` one directory's worth at a time, as each
+    directory finishes. `index` is an optional MediaIndex (duck-typed so this module stays
+    free of any SQLite dependency) - when given, the walk goes through it and only re-lists
+    directories that changed since it last saw `folder`."""
+    if index is not None:
+        yield from index.iter_scan(folder, max_workers=max_workers)
+    else:
+        yield from walk_directories(folder, _scan_directory, max_workers)
+
+
+def find_supported_files(folder: str, index=None) -> list[Path]:
+    return [path for batch in iter_supported_files(folder, index=index) for path in batch]
@@ -0,0 +1,118 @@
+import os
+import random
+
+from PyQt6.QtGui import QImageReader
+
+from src import image_headers, media_kinds, mp4_boxes
+
+# Every probe returns a dict with exactly these keys - None where a value is unknown (not
+# probed yet, not applicable to the kind, or the file didn't say).
+#   width/height  - pixels, as stored (before any orientation is applied)
+#   duration_ms   - videos only
+#   frame_count   - GIFs only
+#   orientation   - QImageIOHandler.Transformation flags from EXIF, 0 for "as stored"
+FIELDS = ("width", "height", "duration_ms", "frame_count", "orientation")
+
+
+def empty_metadata() -> dict:
+    return dict.fromkeys(FIELDS)
+
+
+def probe_image(path) -> dict:
+    """Size and EXIF orientation without decoding pixel data - from image_headers for the
+    formats it knows, otherwise from QImageReader's header read. A GIF's frame count walks
+    its frame headers, which is why this runs in MetadataProber's worker processes rather
+    than on the GUI thread."""
+    metadata = empty_metadata()
+    is_gif = media_kinds.media_kind(path) == "gif"
+    header = image_headers.read_header(path)
+    if header is not None and not is_gif:
+        metadata["width"], metadata["height"] = header.width, header.height
+        metadata["orientation"] = header.orientation
+        return metadata
+    reader = QImageReader(str(path))
+    size = reader.size()
+    if not size.isValid():
+        return metadata
+    metadata["width"], metadata["height"] = size.width(), size.height()
+    metadata["orientation"] = reader.transformation().value
+    if is_gif:
+        count = reader.imageCount()
+        if count > 0:
+            metadata["frame_count"] = count
+    return metadata
+
+
+def probe_video(path) -> dict:
+    """Duration and dimensions from an MP4/MOV's moov box (see mp4_boxes) - other
+    containers come back empty and are left to store_video_metadata."""
+    metadata = empty_metadata()
+    info = mp4_boxes.parse(path)
+    if info is not None:
+        metadata["duration_ms"] = info.duration_ms
+        metadata["width"], metadata["height"] = info.width, info.height
+    return metadata
+
+
+def probe_file(path) -> dict:
+    kind = media_kinds.media_kind(path)
+    if kind in ("image", "gif"):
+        return probe_image(path)
+    if kind == "video":
+        return probe_video(path)
+    return empty_metadata()
+
+
+def probe_files(paths):
+    """Process-pool entry point: (path, size, mtime_ns, metadata) per path - size/mtime read
+    before probing, same as perceptual_hash.hash_files."""
+    results = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        results.append((path, stat.st_size, stat.st_mtime_ns, probe_file(path)))
+    return results
+
+
+def loops_for_min_duration(duration_ms, min_duration_s) -> int:
+    """How many times a clip of `duration_ms` has to play back to back to last at least
+    `min_duration_s` - what GoonerApp hands QMediaPlayer.setLoops() up front when the
+    duration is already known, instead of restarting playback on each EndOfMedia."""
+    if not duration_ms or duration_ms <= 0:
+        return 1
+    min_duration_ms = min_duration_s * 1000
+    return max(1, -(-int(min_duration_ms) // int(duration_ms)))
+
+
+def clip_start_ms(duration_ms, clip_ms, mp4_info=None) -> int | None:
+    """A random start for a `clip_ms` window of a video `duration_ms` long, leaving the whole
+    window before the end - what GoonerApp seeks to in clip mode. Moved back to the
+    keyframe at or before it when an mp4_boxes.Mp4Info knows them, so the seek lands on a
+    decodable frame at once. None when the duration isn't known or the video is no longer
+    than the window - it's played whole then."""
+    if not duration_ms or duration_ms <= clip_ms:
+        return None
+    start_ms = random.randint(0, int(duration_ms - clip_ms))
+    if mp4_info is not None:
+        start_ms = mp4_info.keyframe_at_or_before_us(start_ms * 1000) // 1000
+    return start_ms
+
+
+def store_video_metadata(index, path, duration_ms, resolution=None):
+    """Records what a QMediaPlayer learned about a video while opening it anyway - for
+    containers probe_video can't read, this is how their duration gets into `index` (a
+    MediaIndex) for next time. Keyed by the file's current size/mtime like
+    every probe; a file that's gone by now is simply not recorded."""
+    if not duration_ms or duration_ms <= 0:
+        return
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    metadata = empty_metadata()
+    metadata["duration_ms"] = int(duration_ms)
+    if resolution is not None and resolution.isValid():
+        metadata["width"], metadata["height"] = resolution.width(), resolution.height()
+    index.store_metadata([(str(path), stat.st_size, stat.st_mtime_ns, metadata)])
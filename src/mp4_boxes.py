@@ -0,0 +1,172 @@
+import bisect
+import mmap
+import struct
+
+# Just enough of ISO-BMFF (MP4/MOV/M4V) to answer "how long, how big, where are the
+# keyframes" straight from the moov box - no decoder, no QMediaPlayer round trip. Only
+# the boxes on the path to those answers are visited; everything else is skipped by size.
+_VIDEO_HANDLER = b"vide"
+
+
+class Mp4Info:
+    """What parse() read from a file's moov box. Times are in microseconds.
+
+    `keyframes_us` holds the decode time of every sync sample of the first video track, in
+    order - None when the track has no stss box, which per the spec means every sample is
+    a keyframe (intra-only codecs), so any position is as good as any other."""
+
+    def __init__(self, duration_us: int, width: int | None, height: int | None, keyframes_us: list[int] | None):
+        self.duration_us = duration_us
+        self.width = width
+        self.height = height
+        self.keyframes_us = keyframes_us
+
+    @property
+    def duration_ms(self) -> int:
+        return self.duration_us // 1000
+
+    def nearest_keyframe_us(self, target_us: int) -> int:
+        """The keyframe closest to `target_us` - where a seek to `target_us` would have to
+        start decoding anyway, so landing on it directly shows a frame soonest."""
+        keyframes = self.keyframes_us
+        if not keyframes:
+            return target_us
+        i = bisect.bisect_left(keyframes, target_us)
+        candidates = keyframes[max(0, i - 1) : i + 1]
+        return min(candidates, key=lambda keyframe: abs(keyframe - target_us))
+
+    def keyframe_at_or_before_us(self, target_us: int) -> int:
+        """The last keyframe not after `target_us` - where playback started at `target_us`
+        really begins, with nothing to decode and throw away before the first frame shown."""
+        keyframes = self.keyframes_us
+        if not keyframes:
+            return target_us
+        i = bisect.bisect_right(keyframes, target_us)
+        return keyframes[i - 1] if i else keyframes[0]
+
+
+def parse(path) -> Mp4Info | None:
+    """Reads `path`'s duration, video dimensions and keyframe times, or None if it isn't an
+    MP4/MOV this parser understands (other containers, a moov-less fragment, truncation,
+    zero duration) - callers then fall back to asking QMediaPlayer."""
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _parse(data)
+    except (OSError, ValueError, IndexError, struct.error):
+        # ValueError: mmap of an empty file; IndexError/struct.error: a box shorter than
+        # its contents claim.
+        return None
+
+
+def _boxes(data, start, end):
+    """(type, payload_start, box_end) for each box in data[start:end]; stops at the first
+    header that doesn't fit, so garbage after the last good box is ignored."""
+    offset = start
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                return
+            (size,) = struct.unpack_from(">Q", data, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield box_type, offset + header, offset + size
+        offset += size
+
+
+def _child(data, start, end, box_type):
+    for child_type, payload, child_end in _boxes(data, start, end):
+        if child_type == box_type:
+            return payload, child_end
+    return None
+
+
+def _parse(data) -> Mp4Info | None:
+    moov = _child(data, 0, len(data), b"moov")
+    if moov is None:
+        return None
+    mvhd = _child(data, *moov, b"mvhd")
+    if mvhd is None:
+        return None
+    timescale, duration = _timescale_and_duration(data, mvhd[0])
+    if not timescale or not duration:
+        return None
+    info = Mp4Info(duration * 1_000_000 // timescale, None, None, None)
+    for box_type, payload, box_end in _boxes(data, *moov):
+        if box_type == b"trak" and _read_video_track(data, payload, box_end, info):
+            break
+    return info
+
+
+def _timescale_and_duration(data, payload):
+    """mvhd and mdhd share this layout up to the duration field."""
+    version = data[payload]
+    if version == 1:
+        return struct.unpack_from(">IQ", data, payload + 20)
+    return struct.unpack_from(">II", data, payload + 12)
+
+
+def _read_video_track(data, start, end, info) -> bool:
+    mdia = _child(data, start, end, b"mdia")
+    if mdia is None:
+        return False
+    hdlr = _child(data, *mdia, b"hdlr")
+    if hdlr is None or data[hdlr[0] + 8 : hdlr[0] + 12] != _VIDEO_HANDLER:
+        return False
+
+    tkhd = _child(data, start, end, b"tkhd")
+    if tkhd is not None:
+        # 16.16 fixed point, after the version-dependent times and the 3x3 matrix.
+        dimensions_offset = tkhd[0] + (88 if data[tkhd[0]] == 1 else 76)
+        width, height = struct.unpack_from(">II", data, dimensions_offset)
+        if width >> 16 and height >> 16:
+            info.width, info.height = width >> 16, height >> 16
+
+    mdhd = _child(data, *mdia, b"mdhd")
+    stbl = _descend(data, mdia, (b"minf", b"stbl"))
+    if mdhd is None or stbl is None:
+        return True
+    timescale, _duration = _timescale_and_duration(data, mdhd[0])
+    stss = _child(data, *stbl, b"stss")
+    stts = _child(data, *stbl, b"stts")
+    if timescale and stss is not None and stts is not None:
+        info.keyframes_us = _keyframe_times(data, stss[0], stts[0], timescale)
+    return True
+
+
+def _descend(data, box, path):
+    for box_type in path:
+        box = _child(data, *box, box_type)
+        if box is None:
+            return None
+    return box
+
+
+def _keyframe_times(data, stss, stts, timescale) -> list[int]:
+    """Decode time of each sync sample: stss lists 1-based sample numbers in increasing
+    order, stts run-length-encodes sample durations - one merge-style pass over both."""
+    (sync_count,) = struct.unpack_from(">I", data, stss + 4)
+    sync_samples = struct.unpack_from(f">{sync_count}I", data, stss + 8)
+    (run_count,) = struct.unpack_from(">I", data, stts + 4)
+    runs = struct.unpack_from(f">{2 * run_count}I", data, stts + 8)
+
+    times = []
+    run = 0
+    run_first_sample = 1  # sample number the current stts run starts at
+    run_start_time = 0  # its decode time, in track timescale units
+    for sample in sync_samples:
+        while run < run_count:
+            count, delta = runs[2 * run], runs[2 * run + 1]
+            if sample < run_first_sample + count:
+                break
+            run_first_sample += count
+            run_start_time += count * delta
+            run += 1
+        else:
+            break  # sync sample past the last stts entry - a broken table, stop here
+        times.append((run_start_time + (sample - run_first_sample) * delta) * 1_000_000 // timescale)
+    return times
@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader
+
+from src.frame_scoring import gray_view
+
+# dHash: the image squashed to (HASH_SIZE + 1) x HASH_SIZE grey pixels, one bit per pair of
+# horizontally adjacent pixels (is the left one brighter?). That survives re-encoding,
+# resizing and mild colour/brightness changes - all of which shift absolute pixel values
+# but rarely flip which of two neighbours is brighter.
+HASH_SIZE = 8
+
+# Two hashes at most this many bits apart (out of 64) count as the same picture. Re-encodes
+# and resizes typically land within 0-4; genuinely different images sit around 32.
+NEAR_DUPLICATE_MAX_DISTANCE = 6
+
+
+def dhash_pixels(gray) -> int:
+    """dHash of an already-downscaled (HASH_SIZE, HASH_SIZE + 1) greyscale array."""
+    bits = gray[:, 1:] < gray[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def dhash_image(image: QImage) -> int | None:
+    if image.isNull():
+        return None
+    # The hash only compares neighbouring pixels, so squashing the aspect ratio away costs
+    # nothing - and a copy resized to a slightly different aspect still hashes the same.
+    small = image.scaled(
+        HASH_SIZE + 1, HASH_SIZE, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+    ).convertToFormat(QImage.Format.Format_Grayscale8)
+    return dhash_pixels(gray_view(small))
+
+
+def dhash_file(path) -> int | None:
+    """dHash of an image file (a GIF's first frame), None if it can't be decoded.
+
+    QImageReader's scaled decode does the downscale while reading - JPEG even skips most of
+    the IDCT work at a reduced size - so this never holds a full-resolution frame."""
+    reader = QImageReader(str(path))
+    reader.setScaledSize(QSize(HASH_SIZE + 1, HASH_SIZE))
+    image = reader.read()
+    if image.isNull():
+        return None
+    # Kept in a local - gray_view is only a view onto the image's buffer.
+    gray = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    return dhash_pixels(gray_view(gray))
+
+
+def combine_hashes(hashes) -> int | None:
+    """One signature for several frames of a video: each bit is set if it's set in more
+    than half of the frames' dHashes. A re-encoded copy's frames hash within a few bits of
+    the original's, so the majority bits barely move - and a single odd frame (a cut
+    landing a little earlier in one copy) can't outvote the others. None if no frame was
+    hashed at all."""
+    hashes = [value for value in hashes if value is not None]
+    if not hashes:
+        return None
+    packed = np.frombuffer(b"".join(value.to_bytes(8, "big") for value in hashes), dtype=np.uint8)
+    votes = np.unpackbits(packed).reshape(len(hashes), HASH_SIZE * HASH_SIZE).sum(axis=0)
+    return int.from_bytes(np.packbits(votes * 2 > len(hashes)).tobytes(), "big")
+
+
+def dhash_frames(images) -> int | None:
+    """combine_hashes over a video's frames (QImages, any size or format)."""
+    return combine_hashes([dhash_image(image) for image in images])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def hash_files(paths):
+    """Process-pool entry point (so it's module-level and picklable): returns
+    (path, size, mtime_ns, hash_or_None) per path - size/mtime read before decoding, so a
+    file replaced mid-read is keyed by its old stat and simply rehashed next time."""
+    results = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        results.append((path, stat.st_size, stat.st_mtime_ns, dhash_file(path)))
+    return results
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance - a radius query only
+    descends into children whose edge distance lies within [d - radius, d + radius] of the
+    query's distance d to the node (triangle inequality), so looking for near-duplicates
+    among N hashes touches a small fraction of them instead of comparing against all N."""
+
+    def __init__(self):
+        self._root = None  # [hash, items, {distance: child}]
+
+    def add(self, value: int, item):
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list:
+        """(distance, item) for every item within `radius` of `value`, nearest first."""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+
+def group_near_duplicates(hashes, max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE) -> list[list]:
+    """Groups the keys of `hashes` ({item: hash}, in priority order) whose hashes lie within
+    `max_distance` of a group's first item. Greedy on purpose - each item joins the nearest
+    existing group *leader* rather than any member, so a chain of small differences can't
+    snowball unrelated pictures into one group. Returns only groups with 2+ items."""
+    leaders = BKTree()
+    groups = {}
+    for item, value in hashes.items():
+        if value is None:
+            continue
+        matches = leaders.search(value, max_distance)
+        if matches:
+            groups[matches[0][1]].append(item)
+        else:
+            leaders.add(value, item)
+            groups[item] = [item]
+    return [group for group in groups.values() if len(group) > 1]
@@ -0,0 +1,36 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPainter
+
+# An animated video preview is this many frames sampled evenly across the clip, stored in
+# the ThumbnailCache as one sprite sheet - the frames side by side, left to right.
+PREVIEW_STRIP_FRAMES = 12
+PREVIEW_FRAME_INTERVAL_MS = 400
+
+# The ThumbnailCache variant sheets are stored under. The frame count is part of it, since
+# split_sprite_sheet relies on it - a sheet cut for a different count is never served.
+SPRITE_SHEET_VARIANT = f"strip{PREVIEW_STRIP_FRAMES}"
+
+
+def make_sprite_sheet(frames: list[QImage]) -> QImage:
+    """`frames` side by side in one image, every one at the first frame's size (frames of
+    one video normally already match)."""
+    width, height = frames[0].width(), frames[0].height()
+    sheet = QImage(width * len(frames), height, QImage.Format.Format_RGB32)
+    sheet.fill(Qt.GlobalColor.black)
+    painter = QPainter(sheet)
+    for i, frame in enumerate(frames):
+        if frame.size() != frames[0].size():
+            frame = frame.scaled(
+                width, height, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+            )
+        painter.drawImage(i * width, 0, frame)
+    painter.end()
+    return sheet
+
+
+def split_sprite_sheet(sheet: QImage, frame_count: int = PREVIEW_STRIP_FRAMES) -> list[QImage]:
+    """The frames make_sprite_sheet put into `sheet`, or [] if it can't hold that many."""
+    width = sheet.width() // frame_count
+    if width <= 0 or sheet.height() <= 0:
+        return []
+    return [sheet.copy(i * width, 0, width, sheet.height()) for i in range(frame_count)]
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage
+
+from src import utils
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bumped whenever the thumbnails table's layout changes - an older cache is simply dropped
+# and re-rendered into. 1: variant column (still thumbnail vs. animated preview strip).
+_SCHEMA_VERSION = 1
+
+# Evicting down to a bit below the budget rather than exactly to it means a full cache
+# isn't back to evicting on every single put.
+_EVICTION_TARGET_RATIO = 0.9
+_JPEG_QUALITY = 85
+
+_SCHEMA = """
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+
+-- one encoded thumbnail per (source path, cell size, variant), only served while the
+-- source's size and mtime still match what it was rendered from. variant is '' for a
+-- plain still thumbnail; anything else names a different rendering, e.g. a sprite sheet
+CREATE TABLE IF NOT EXISTS thumbnails (
+    path TEXT NOT NULL,
+    cell_size INTEGER NOT NULL,
+    variant TEXT NOT NULL DEFAULT '',
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (path, cell_size, variant)
+);
+CREATE INDEX IF NOT EXISTS thumbnails_by_last_used ON thumbnails (last_used);
+"""
+
+
+def encode_image(image: QImage) -> bytes:
+    """PNG where there's transparency to keep, JPEG (much smaller for photos and video
+    frames) everywhere else."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if image.hasAlphaChannel():
+        image.save(buffer, "PNG")
+    else:
+        image.save(buffer, "JPEG", _JPEG_QUALITY)
+    buffer.close()
+    return bytes(data)
+
+
+class ThumbnailCache:
+    """Persistent SQLite store of rendered thumbnails, keyed by source path and cell size
+    and trusted only while the source's size/mtime match - so a hit costs one stat of the
+    source plus decoding a small JPEG/PNG, never a decode of the source itself (or, for a
+    video, a QMediaPlayer frame grab).
+
+    Bounded by `max_bytes` of encoded thumbnail data: once a put goes over it, the least
+    recently used thumbnails are evicted. Connection handling follows MediaIndex - lazy,
+    shared behind a lock, in-memory if the cache dir can't be used."""
+
+    FILE_NAME = "thumbnails.sqlite3"
+
+    def __init__(self, db_path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._connection = None
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        # last_used is a use counter rather than a timestamp - the clock's resolution (~16ms
+        # on Windows) would tie a whole grid's worth of puts and blur the LRU order.
+        self._use_counter = 0
+
+    @classmethod
+    def default_path(cls) -> Path:
+        return utils.get_app_cache_dir() / cls.FILE_NAME
+
+    def _connect(self):
+        """Must be called with self._lock held."""
+        if self._connection is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._prepare(connection)
+            except (OSError, sqlite3.DatabaseError):
+                connection = sqlite3.connect(":memory:", check_same_thread=False)
+                self._prepare(connection)
+            self._total_bytes, self._use_counter = connection.execute(
+                "SELECT COALESCE(SUM(length(data)), 0), COALESCE(MAX(last_used), 0) FROM thumbnails"
+            ).fetchone()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _prepare(connection):
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS thumbnails")
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._connect()
+            return self._total_bytes
+
+    def paths(self, cell_size: int, variant: str = "") -> set[str]:
+        """Every source path with a thumbnail at `cell_size` - as stored, without checking the
+        source is unchanged, so a hint for what's likely cached rather than a promise. The
+        cache holds a few thousand thumbnails at most, so this stays a small set."""
+        with self._lock:
+            return {
+                path
+                for (path,) in self._connect().execute(
+                    "SELECT path FROM thumbnails WHERE cell_size = ? AND variant = ?", (cell_size, variant)
+                )
+            }
+
+    def get(self, path, cell_size: int, variant: str = "") -> QImage | None:
+        """The cached thumbnail of `path` at `cell_size`, or None if there's none rendered
+        from the file as it is now."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT data FROM thumbnails WHERE path = ? AND cell_size = ? AND variant = ? "
+                "AND size = ? AND mtime_ns = ?",
+                (str(path), cell_size, variant, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+            if row is None:
+                return None
+            with connection:
+                connection.execute(
+                    "UPDATE thumbnails SET last_used = ? WHERE path = ? AND cell_size = ? AND variant = ?",
+                    (self._next_use(), str(path), cell_size, variant),
+                )
+        image = QImage.fromData(row[0])
+        return None if image.isNull() else image
+
+    def put(self, path, cell_size: int, image: QImage, variant: str = ""):
+        """Stores `image` as the thumbnail of `path` at `cell_size`, replacing one rendered
+        from an older version of the file."""
+        if image is None or image.isNull():
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        data = encode_image(image)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                row = connection.execute(
+                    "SELECT length(data) FROM thumbnails WHERE path = ? AND cell_size = ? AND variant = ?",
+                    (str(path), cell_size, variant),
+                ).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO thumbnails (path, cell_size, variant, size, mtime_ns, last_used, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (str(path), cell_size, variant, stat.st_size, stat.st_mtime_ns, self._next_use(), data),
+                )
+                self._total_bytes += len(data) - (row[0] if row else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(connection)
+
+    def _next_use(self) -> int:
+        """Must be called with self._lock held."""
+        self._use_counter += 1
+        return self._use_counter
+
+    def _evict(self, connection):
+        """Drops least recently used thumbnails until the total is back under the target.
+        Must be called with self._lock held, inside a transaction."""
+        target = int(self.max_bytes * _EVICTION_TARGET_RATIO)
+        evicted = []
+        for rowid, length in connection.execute("SELECT rowid, length(data) FROM thumbnails ORDER BY last_used"):
+            if self._total_bytes <= target:
+                break
+            evicted.append((rowid,))
+            self._total_bytes -= length
+        connection.executemany("DELETE FROM thumbnails WHERE rowid = ?", evicted)
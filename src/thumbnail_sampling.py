@@ -56,6 +56,121 @@ def sample_thumbnails_with_video_cap(
     return result
 
 
+class _Pool:
+    """A list with O(1) membership, append and removal (the last item is swapped into the
+    removed one's slot) - what makes drawing by random index possible while files come and go."""
+
+    def __init__(self):
+        self.items: list[Path] = []
+        self.positions: dict[Path, int] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, path):
+        if path not in self.positions:
+            self.positions[path] = len(self.items)
+            self.items.append(path)
+
+    def remove(self, path):
+        position = self.positions.pop(path, None)
+        if position is None:
+            return
+        last = self.items.pop()
+        if position < len(self.items):
+            self.items[position] = last
+            self.positions[last] = position
+
+    def sample(self, count, exclude, rng, prefer=None) -> list[Path]:
+        """Up to `count` distinct items not in `exclude`, in random order. Drawn by random
+        index, rejecting excluded/already-drawn ones - O(count) as long as most of the pool
+        is still available, which is the normal case (a grid's worth of a whole folder).
+
+        Items in `prefer` (a set) are drawn first, the rest only makes up the shortfall."""
+        if prefer:
+            preferred = [path for path in prefer if path in self.positions and path not in exclude]
+            if preferred:
+                chosen = rng.sample(preferred, min(count, len(preferred)))
+                if len(chosen) < count:
+                    chosen += self.sample(count - len(chosen), set(exclude).union(chosen), rng)
+                return chosen
+        excluded = sum(1 for path in exclude if path in self.positions) if exclude else 0
+        available = len(self.items) - excluded
+        count = min(count, available)
+        if count <= 0:
+            return []
+        if count * 2 > available:
+            # Nearly exhausted - rejection would mostly hit taken slots; filter once instead.
+            return rng.sample([path for path in self.items if path not in exclude], count)
+        chosen: dict[int, Path] = {}
+        while len(chosen) < count:
+            index = rng.randrange(len(self.items))
+            if index not in chosen and self.items[index] not in exclude:
+                chosen[index] = self.items[index]
+        return list(chosen.values())
+
+
+class SamplingIndex:
+    """The files of every folder split by folder and by kind (video or not), kept up to
+    date as files are added and removed, so sample() costs O(sample size) - not a pass over
+    the whole library classifying every file, on every grid refresh and resize.
+
+    Sampling follows sample_thumbnails_with_video_cap: at most `max_video_count` videos in
+    total, each kind split as evenly as possible across the folders that have any left."""
+
+    def __init__(self, is_video):
+        self._is_video = is_video
+        self._pools: dict[str, tuple[_Pool, _Pool]] = {}  # folder -> (videos, everything else)
+
+    def folders(self) -> list[str]:
+        return list(self._pools)
+
+    def set_folder(self, folder, files):
+        self._pools[folder] = (_Pool(), _Pool())
+        self.add(folder, files)
+
+    def drop_folder(self, folder):
+        self._pools.pop(folder, None)
+
+    def add(self, folder, files):
+        videos, others = self._pools.setdefault(folder, (_Pool(), _Pool()))
+        for path in files:
+            (videos if self._is_video(path) else others).add(path)
+
+    def remove(self, folder, files):
+        pools = self._pools.get(folder)
+        if pools is None:
+            return
+        for path in files:
+            pools[0].remove(path)
+            pools[1].remove(path)
+
+    def sample(
+        self, total_count, max_video_count, exclude=(), rng: random.Random | None = None, prefer=None
+    ) -> list[Path]:
+        """Up to `total_count` files not in `exclude` (a set), in random order. Within each
+        folder's share, files in `prefer` (a set) are drawn before any others."""
+        rng = rng or random.Random()
+        exclude = exclude or set()
+        videos = self._sample_kind(0, min(max_video_count, total_count), exclude, rng, prefer)
+        others = self._sample_kind(1, total_count - len(videos), exclude, rng, prefer)
+        result = videos + others
+        rng.shuffle(result)
+        return result
+
+    def _sample_kind(self, kind, count, exclude, rng, prefer=None):
+        pools = [pools[kind] for pools in self._pools.values()]
+        pools = [pool for pool in pools if len(pool) > sum(1 for path in exclude if path in pool.positions)]
+        if not pools or count <= 0:
+            return []
+        base_share, remainder = divmod(count, len(pools))
+        result = []
+        for i, pool in enumerate(pools):
+            share = base_share + (1 if i < remainder else 0)
+            result.extend(pool.sample(share, exclude, rng, prefer))
+        return result
+
+
 def compute_thumbnail_grid(
     viewport_width: int,
     viewport_height: int,
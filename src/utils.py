@@ -1,6 +1,13 @@
 import sys
 from pathlib import Path
 
+from PyQt6.QtCore import QStandardPaths
+
+# Same organization/application pair GoonerApp hands to QSettings, so everything the app
+# persists per user ends up side by side.
+APP_ORGANIZATION = "GoonerCock"
+APP_NAME = "GoonerApp"
+
 
 def get_project_root() -> Path:
     """
@@ -31,6 +38,21 @@ def get_current_version() -> str:
     return (get_project_root() / "VERSION").read_text(encoding="utf-8").strip()
 
 
+def get_app_data_dir() -> Path:
+    """Per-user writable data directory (e.g. %LOCALAPPDATA%/GoonerCock/GoonerApp on
+    Windows). Built from the generic location rather than AppDataLocation, which depends on
+    QCoreApplication's organization/application names - main.py never sets those."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    return Path(base) / APP_ORGANIZATION / APP_NAME
+
+
+def get_app_cache_dir() -> Path:
+    """Per-user cache directory - for data that's only ever a speed-up and may be deleted
+    by the OS or the user at any time (same naming scheme as get_app_data_dir)."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return Path(base) / APP_ORGANIZATION / APP_NAME
+
+
 def format_duration(seconds: float) -> str:
     if seconds is None:
         return "N/A"
@@ -4,10 +4,21 @@ os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
 import pytest  # noqa: E402
 from PyQt6.QtCore import QSettings  # noqa: E402
+from PyQt6.QtGui import QColor, QImage  # noqa: E402
 from PyQt6.QtWidgets import QDialog, QMessageBox  # noqa: E402
 
 from src.BeatHandler import BeatHandler  # noqa: E402
 from src.GoonerApp import GoonerApp  # noqa: E402
+from src.media_index import MediaIndex  # noqa: E402
+from src.thumbnail_cache import ThumbnailCache  # noqa: E402
+
+# Files have to start like real media - the index sniffs content, not just the extension.
+MEDIA_HEADERS = {
+    ".png": b"\x89PNG\r\n\x1a\n",
+    ".jpg": b"\xff\xd8\xff\xe0",
+    ".gif": b"GIF89a",
+    ".mp4": b"\x00\x00\x00\x18ftypisom",
+}
 
 
 class _FakeSoundEffect:
@@ -53,7 +64,72 @@ def qsettings(tmp_path):
 
 
 @pytest.fixture
-def app(qtbot, qsettings):
-    window = GoonerApp(settings=qsettings)
+def media_index(tmp_path):
+    # In a folder of its own, so the database never turns up in a scan of tmp_path.
+    index = MediaIndex(tmp_path / "index" / MediaIndex.FILE_NAME)
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def media_bytes():
+    """media_bytes(name, extra=b"") - file contents the index sniffs as the kind `name`'s
+    extension says, followed by `extra`."""
+
+    def media_bytes(name, extra=b""):
+        return MEDIA_HEADERS[os.path.splitext(str(name))[1]] + extra
+
+    return media_bytes
+
+
+@pytest.fixture
+def make_images():
+    """make_images(folder, count) - saves `count` PNGs in `folder`, img<i>.png at 10+i x 20
+    pixels, no two alike, and returns their paths."""
+
+    def make_images(folder, count):
+        folder.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for i in range(count):
+            image = QImage(10 + i, 20, QImage.Format.Format_RGB32)
+            image.fill(QColor(i * 10, 0, 0))
+            image.setPixelColor(i, i, QColor(255, 255, 255))
+            path = folder / f"img{i}.png"
+            image.save(str(path))
+            paths.append(path)
+        return paths
+
+    return make_images
+
+
+@pytest.fixture
+def run_scanner(qtbot):
+    """run_scanner(scanner, signal="results_found") - starts a scanner thread, waits for its
+    `finished` and returns what it reported: the merged {Path: value} of a FilePoolScanner's
+    results_found, or for any other signal the argument tuples of each emission in order."""
+
+    def run_scanner(scanner, signal="results_found"):
+        emitted = []
+        getattr(scanner, signal).connect(lambda *args: emitted.append(args))
+        with qtbot.waitSignal(scanner.finished, timeout=60000):
+            scanner.start()
+        qtbot.wait(10)  # let the queued deliveries land
+        if signal == "results_found":
+            return {path: value for (found,) in emitted for path, value in found.items()}
+        return emitted
+
+    return run_scanner
+
+
+@pytest.fixture
+def thumbnail_cache(tmp_path):
+    cache = ThumbnailCache(tmp_path / ThumbnailCache.FILE_NAME)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def app(qtbot, qsettings, media_index, thumbnail_cache):
+    window = GoonerApp(settings=qsettings, media_index=media_index, thumbnail_cache=thumbnail_cache)
     qtbot.addWidget(window)
     return window
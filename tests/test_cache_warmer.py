@@ -0,0 +1,97 @@
+import pytest
+from PyQt6.QtCore import QEvent, Qt
+from PyQt6.QtGui import QColor, QImage, QKeyEvent
+from PyQt6.QtWidgets import QApplication
+
+from src import CacheWarmer as warmer_module
+from src.CacheWarmer import CacheWarmer
+
+# Only images here - a video in the folders would start a real QMediaPlayer grab, see
+# test_video_frame_grabber.py.
+
+
+@pytest.fixture
+def make_warmer(qtbot, media_index, thumbnail_cache):
+    warmers = []
+
+    def make(folders):
+        warmer = CacheWarmer(folders, media_index, thumbnail_cache, 64)
+        warmers.append(warmer)
+        return warmer
+
+    yield make
+    for warmer in warmers:
+        warmer.stop()
+
+
+def _save_images(folder, count):
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        image = QImage(200, 100, QImage.Format.Format_RGB32)
+        image.fill(QColor(20 * i, 120, 60))
+        path = folder / f"{i}.png"
+        assert image.save(str(path))
+        paths.append(path)
+    return paths
+
+
+def _press_key():
+    event = QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_A, Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(QApplication.instance(), event)
+
+
+def test_warm_up_fills_index_and_thumbnail_cache(qtbot, tmp_path, make_warmer, media_index, thumbnail_cache):
+    paths = _save_images(tmp_path / "a", 3) + _save_images(tmp_path / "b", 2)
+    warmer = make_warmer([str(tmp_path / "a"), str(tmp_path / "b")])
+
+    with qtbot.waitSignal(warmer.finished, timeout=20000):
+        warmer.start()
+
+    assert set(media_index.kinds(paths)) == {str(path) for path in paths}
+    assert set(media_index.metadata(paths)) == {str(path) for path in paths}
+    for path in paths:
+        assert thumbnail_cache.get(path, 64).size().width() == 64
+    assert not warmer.is_running()
+
+
+def test_walk_runs_on_a_single_listing_thread(qtbot, tmp_path, make_warmer):
+    _save_images(tmp_path / "a", 1)
+    warmer = make_warmer([str(tmp_path / "a")])
+
+    warmer.start()
+
+    assert warmer._worker.max_workers == warmer_module.PREWARM_WALK_WORKERS == 1
+
+
+def test_missing_folders_are_skipped(tmp_path, make_warmer):
+    warmer = make_warmer([str(tmp_path / "gone")])
+
+    assert warmer.folders == []
+
+
+def test_input_pauses_until_things_are_quiet_again(qtbot, tmp_path, make_warmer, monkeypatch, thumbnail_cache):
+    monkeypatch.setattr(warmer_module, "PREWARM_RESUME_IDLE_MS", 200)
+    paths = _save_images(tmp_path / "a", 2)
+    warmer = make_warmer([str(tmp_path / "a")])
+    warmer.start()
+
+    _press_key()
+
+    assert warmer.is_paused()
+    assert warmer._worker is None
+    qtbot.waitUntil(lambda: not warmer.is_paused(), timeout=5000)
+    qtbot.waitUntil(lambda: not warmer.is_running(), timeout=20000)
+    assert all(thumbnail_cache.get(path, 64) is not None for path in paths)
+
+
+def test_stop_is_final(qtbot, tmp_path, make_warmer):
+    _save_images(tmp_path / "a", 1)
+    warmer = make_warmer([str(tmp_path / "a")])
+    warmer.start()
+
+    warmer.stop()
+    _press_key()
+
+    assert not warmer.is_running()
+    assert not warmer.is_paused()
@@ -0,0 +1,132 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtMultimedia import QMediaPlayer
+
+from src import ClipSeeker as clip_seeker_module
+from src.ClipSeeker import CLIP_SEEK_ATTEMPTS, ClipSeeker
+
+Status = QMediaPlayer.MediaStatus
+
+
+class SeekablePlayer(QObject):
+    """The parts of a QMediaPlayer a ClipSeeker uses, behaving like the real backends: a
+    setPosition() is dropped while the media is loading - and, with `drop_seeks`, that many
+    more times after that."""
+
+    mediaStatusChanged = pyqtSignal(QMediaPlayer.MediaStatus)
+    positionChanged = pyqtSignal("qint64")
+
+    def __init__(self, status=Status.LoadingMedia, drop_seeks=0):
+        super().__init__()
+        self.status = status
+        self.drop_seeks = drop_seeks
+        self.seeks = []
+        self._position = 0
+
+    def mediaStatus(self):
+        return self.status
+
+    def set_status(self, status):
+        self.status = status
+        self.mediaStatusChanged.emit(status)
+
+    def position(self):
+        return self._position
+
+    def setPosition(self, position_ms):
+        self.seeks.append(position_ms)
+        if self.status == Status.LoadingMedia:
+            return
+        if self.drop_seeks > 0:
+            self.drop_seeks -= 1
+            return
+        self._position = position_ms
+        self.positionChanged.emit(position_ms)
+
+
+def _seeker(player):
+    seeker = ClipSeeker(player)
+    ready = []
+    seeker.ready.connect(lambda: ready.append(player.position()))
+    return seeker, ready
+
+
+def test_seek_waits_until_the_media_is_loaded(qtbot):
+    player = SeekablePlayer()
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    assert player.seeks == []
+    assert seeker.is_seeking()
+
+    player.set_status(Status.LoadedMedia)
+
+    assert player.seeks == [42_000]
+    assert ready == [42_000]
+    assert not seeker.is_seeking()
+
+
+def test_loaded_media_is_seeked_at_once(qtbot):
+    player = SeekablePlayer(Status.BufferedMedia)
+    seeker, ready = _seeker(player)
+
+    seeker.seek(7000)
+
+    assert ready == [7000]
+
+
+def test_a_dropped_seek_is_issued_again_until_it_sticks(qtbot, monkeypatch):
+    monkeypatch.setattr(clip_seeker_module, "CLIP_SEEK_WAIT_TIMEOUT_MS", 10)
+    player = SeekablePlayer(Status.LoadedMedia, drop_seeks=1)
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    qtbot.waitUntil(lambda: ready, timeout=2000)
+
+    assert player.seeks == [42_000, 42_000]
+    assert ready == [42_000]
+
+
+def test_a_seek_that_never_sticks_still_lets_the_clip_start(qtbot, monkeypatch):
+    monkeypatch.setattr(clip_seeker_module, "CLIP_SEEK_WAIT_TIMEOUT_MS", 10)
+    player = SeekablePlayer(Status.LoadedMedia, drop_seeks=CLIP_SEEK_ATTEMPTS)
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    qtbot.waitUntil(lambda: ready, timeout=2000)
+
+    assert player.seeks == [42_000] * CLIP_SEEK_ATTEMPTS
+    assert ready == [0]
+
+
+def test_media_that_never_reports_loaded_is_seeked_after_the_timeout(qtbot, monkeypatch):
+    monkeypatch.setattr(clip_seeker_module, "CLIP_LOAD_WAIT_TIMEOUT_MS", 10)
+    player = SeekablePlayer(Status.NoMedia)
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    qtbot.waitUntil(lambda: ready, timeout=2000)
+
+    assert ready == [42_000]
+
+
+def test_invalid_media_lets_the_clip_start_without_seeking(qtbot):
+    player = SeekablePlayer()
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    player.set_status(Status.InvalidMedia)
+
+    assert player.seeks == []
+    assert ready == [0]
+
+
+def test_cancelled_seek_is_never_issued(qtbot):
+    player = SeekablePlayer()
+    seeker, ready = _seeker(player)
+
+    seeker.seek(42_000)
+    seeker.cancel()
+    player.set_status(Status.LoadedMedia)
+
+    assert player.seeks == []
+    assert ready == []
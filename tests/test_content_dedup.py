@@ -0,0 +1,153 @@
+from src import content_dedup
+from src.content_dedup import PARTIAL_HASH_CHUNK_BYTES, ContentDeduplicator
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def _count_reads(monkeypatch):
+    reads = {"partial": 0, "full": 0}
+    original_partial, original_full = content_dedup.partial_hash, content_dedup.full_hash
+
+    def partial(path, size):
+        reads["partial"] += 1
+        return original_partial(path, size)
+
+    def full(path):
+        reads["full"] += 1
+        return original_full(path)
+
+    monkeypatch.setattr(content_dedup, "partial_hash", partial)
+    monkeypatch.setattr(content_dedup, "full_hash", full)
+    return reads
+
+
+def test_identical_content_in_two_folders_is_kept_once(tmp_path):
+    first = _write(tmp_path / "a" / "clip.mp4", b"same bytes")
+    copy = _write(tmp_path / "b" / "renamed.mp4", b"same bytes")
+    other = _write(tmp_path / "b" / "other.mp4", b"other byte")
+
+    assert ContentDeduplicator().filter([first, copy, other]) == [first, other]
+
+
+def test_same_path_listed_twice_is_kept_once(tmp_path):
+    clip = _write(tmp_path / "clip.mp4", b"x")
+
+    assert ContentDeduplicator().filter([clip, clip]) == [clip]
+
+
+def test_files_with_unique_sizes_are_never_read(tmp_path, monkeypatch):
+    files = [_write(tmp_path / f"{i}.png", b"x" * (i + 1)) for i in range(5)]
+    reads = _count_reads(monkeypatch)
+
+    assert ContentDeduplicator().filter(files) == files
+    assert reads == {"partial": 0, "full": 0}
+
+
+def test_same_size_files_differing_at_the_head_need_no_full_hash(tmp_path, monkeypatch):
+    size = 4 * PARTIAL_HASH_CHUNK_BYTES
+    first = _write(tmp_path / "a.mp4", b"a" + b"x" * (size - 1))
+    second = _write(tmp_path / "b.mp4", b"b" + b"x" * (size - 1))
+    reads = _count_reads(monkeypatch)
+
+    assert ContentDeduplicator().filter([first, second]) == [first, second]
+    assert reads == {"partial": 2, "full": 0}
+
+
+def test_files_differing_only_in_the_middle_are_told_apart_by_the_full_hash(tmp_path, monkeypatch):
+    size = 4 * PARTIAL_HASH_CHUNK_BYTES
+    middle = size // 2
+    first = _write(tmp_path / "a.mp4", b"x" * middle + b"a" + b"x" * (size - middle - 1))
+    second = _write(tmp_path / "b.mp4", b"x" * middle + b"b" + b"x" * (size - middle - 1))
+    reads = _count_reads(monkeypatch)
+
+    assert ContentDeduplicator().filter([first, second]) == [first, second]
+    assert reads == {"partial": 2, "full": 2}
+
+
+def test_small_files_reuse_the_partial_hash_as_the_full_hash(tmp_path, monkeypatch):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    reads = _count_reads(monkeypatch)
+
+    assert ContentDeduplicator().filter([first, copy]) == [first]
+    assert reads == {"partial": 2, "full": 0}
+
+
+def test_filter_is_incremental_across_batches(tmp_path):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    deduplicator = ContentDeduplicator()
+
+    assert deduplicator.filter([first]) == [first]
+    assert deduplicator.filter([copy]) == []
+
+
+def test_forget_lets_a_later_copy_through(tmp_path):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    deduplicator = ContentDeduplicator()
+    deduplicator.filter([first])
+
+    deduplicator.forget([first])
+
+    assert deduplicator.filter([copy]) == [copy]
+
+
+def test_forget_leaves_other_files_of_the_same_size_kept(tmp_path):
+    first = _write(tmp_path / "a.png", b"same")
+    other = _write(tmp_path / "b.png", b"diff")
+    copy_of_other = _write(tmp_path / "c.png", b"diff")
+    deduplicator = ContentDeduplicator()
+    deduplicator.filter([first, other])
+
+    deduplicator.forget([first, tmp_path / "never_seen.png"])
+
+    assert deduplicator.filter([copy_of_other]) == []
+    assert deduplicator._kept_size_by_path == {other: 4}
+
+
+def test_unreadable_file_is_let_through(tmp_path):
+    first = _write(tmp_path / "a.png", b"same")
+    missing = tmp_path / "missing.png"
+
+    assert ContentDeduplicator().filter([first, missing]) == [first, missing]
+
+
+def test_second_run_reads_no_content_thanks_to_the_index_cache(tmp_path, media_index, monkeypatch):
+    size = 4 * PARTIAL_HASH_CHUNK_BYTES
+    first = _write(tmp_path / "lib" / "a.mp4", b"x" * size)
+    copy = _write(tmp_path / "lib" / "b.mp4", b"x" * size)
+    media_index.scan(str(tmp_path / "lib"))
+    assert ContentDeduplicator(media_index).filter([first, copy]) == [first]
+
+    reads = _count_reads(monkeypatch)
+    assert ContentDeduplicator(media_index).filter([first, copy]) == [first]
+    assert reads == {"partial": 0, "full": 0}
+
+
+def test_cached_hash_is_ignored_once_the_file_changed(tmp_path, media_index):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    ContentDeduplicator(media_index).filter([first, copy])
+
+    copy.write_bytes(b"diff")
+
+    assert ContentDeduplicator(media_index).filter([first, copy]) == [first, copy]
+
+
+def test_hashes_are_stored_in_one_transaction_per_call(tmp_path, media_index, monkeypatch):
+    files = [
+        _write(tmp_path / "lib" / f"{name}.png", content)
+        for name, content in [("a", b"same"), ("b", b"same"), ("c", b"diff"), ("d", b"diff")]
+    ]
+    media_index.scan(str(tmp_path / "lib"))
+    stored = []
+    monkeypatch.setattr(media_index, "store_content_hashes", lambda rows: stored.append(len(rows)))
+
+    ContentDeduplicator(media_index).filter(files)
+
+    assert stored == [4]
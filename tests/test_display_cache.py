@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from PyQt6.QtCore import QSize
+
+from src.display_cache import DisplayCache
+
+
+def test_entries_are_keyed_by_path_and_size():
+    cache = DisplayCache(max_bytes=1000)
+    cache.put("a.png", QSize(10, 10), "small", 100)
+    cache.put("a.png", (20, 20), "big", 400)
+
+    assert cache.get(Path("a.png"), (10, 10)) == "small"
+    assert cache.get("a.png", QSize(20, 20)) == "big"
+    assert cache.get("a.png", QSize(30, 30)) is None
+    assert DisplayCache.key("a.png", QSize(10, 10)) in cache
+
+
+def test_least_recently_used_entries_go_first_once_over_budget():
+    cache = DisplayCache(max_bytes=300)
+    for name in "abc":
+        cache.put(name, (1, 1), name, 100)
+    cache.get("a", (1, 1))
+
+    cache.put("d", (1, 1), "d", 100)
+
+    assert cache.get("b", (1, 1)) is None
+    assert [cache.get(name, (1, 1)) for name in "acd"] == ["a", "c", "d"]
+    assert cache.total_bytes == 300
+
+
+def test_counters():
+    cache = DisplayCache(max_bytes=200)
+    cache.put("a", (1, 1), "a", 150)
+    cache.get("a", (1, 1))
+    cache.get("b", (1, 1))
+    cache.put("b", (1, 1), "b", 150)
+
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 150,
+        "max_bytes": 200,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_replacing_an_entry_replaces_its_size():
+    cache = DisplayCache(max_bytes=1000)
+    cache.put("a", (1, 1), "old", 600)
+    cache.put("a", (1, 1), "new", 200)
+
+    assert cache.total_bytes == 200
+    assert len(cache) == 1
+    assert cache.evictions == 0
+
+
+def test_shrinking_the_budget_evicts_right_away():
+    cache = DisplayCache(max_bytes=1000)
+    for name in "abcd":
+        cache.put(name, (1, 1), name, 200)
+
+    cache.max_bytes = 450
+
+    assert len(cache) == 2
+    assert cache.get("d", (1, 1)) == "d"
+    assert cache.evictions == 2
+
+
+def test_an_entry_bigger_than_the_whole_budget_is_not_kept():
+    cache = DisplayCache(max_bytes=100)
+
+    cache.put("huge", (1, 1), "huge", 500)
+
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_the_same_box_at_another_pixel_ratio_is_another_entry():
+    cache = DisplayCache(max_bytes=1000)
+    cache.put("a.png", (20, 20), "hidpi", 100, dpr=2.0)
+
+    assert cache.get("a.png", (20, 20)) is None
+    assert cache.get("a.png", (20, 20), 2.0) == "hidpi"
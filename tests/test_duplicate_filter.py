@@ -0,0 +1,74 @@
+import pytest
+
+from src.content_dedup import ContentDeduplicator
+from src.DuplicateFilter import DuplicateFilter
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return path
+
+
+@pytest.fixture
+def duplicate_filter(qtbot):
+    duplicate_filter = DuplicateFilter(ContentDeduplicator())
+    yield duplicate_filter
+    duplicate_filter.stop()
+
+
+def test_batches_come_back_in_submission_order(qtbot, tmp_path, duplicate_filter):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    other = _write(tmp_path / "c.png", b"diff")
+    results = []
+    duplicate_filter.filtered.connect(lambda tag, kept: results.append((tag, kept)))
+
+    duplicate_filter.submit([first], tag="start")
+    duplicate_filter.submit([copy, other], tag="late")
+
+    qtbot.waitUntil(lambda: len(results) == 2, timeout=5000)
+    assert results == [("start", [first]), ("late", [other])]
+    assert not duplicate_filter.is_busy()
+
+
+def test_forget_is_queued_behind_earlier_work(qtbot, tmp_path, duplicate_filter):
+    first = _write(tmp_path / "a.png", b"same")
+    copy = _write(tmp_path / "b.png", b"same")
+    results = []
+    duplicate_filter.filtered.connect(lambda tag, kept: results.append(kept))
+
+    duplicate_filter.submit([first])
+    duplicate_filter.forget([first])
+    duplicate_filter.submit([copy])
+
+    qtbot.waitUntil(lambda: len(results) == 2, timeout=5000)
+    assert results == [[first], [copy]]
+
+
+def test_busy_until_the_result_is_delivered(qtbot, tmp_path, duplicate_filter):
+    path = _write(tmp_path / "a.png", b"same")
+
+    with qtbot.waitSignal(duplicate_filter.filtered, timeout=5000):
+        duplicate_filter.submit([path])
+        assert duplicate_filter.is_busy()
+
+    assert not duplicate_filter.is_busy()
+
+
+def test_thread_only_runs_while_there_is_work(qtbot, tmp_path, duplicate_filter):
+    with qtbot.waitSignal(duplicate_filter.filtered, timeout=5000):
+        duplicate_filter.submit([_write(tmp_path / "a.png", b"same")])
+    qtbot.waitUntil(lambda: not duplicate_filter.isRunning(), timeout=5000)
+
+    with qtbot.waitSignal(duplicate_filter.filtered, timeout=5000) as blocker:
+        duplicate_filter.submit([_write(tmp_path / "b.png", b"same")])
+
+    assert blocker.args[1] == []
+
+
+def test_stop_drops_queued_work(qtbot, tmp_path):
+    duplicate_filter = DuplicateFilter(ContentDeduplicator())
+    duplicate_filter.stop()
+
+    with qtbot.assertNotEmitted(duplicate_filter.filtered, wait=200):
+        duplicate_filter.submit([_write(tmp_path / "a.png", b"same")])
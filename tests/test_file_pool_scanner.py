@@ -0,0 +1,17 @@
+import pytest
+
+from src.FilePoolScanner import FilePoolScanner
+
+
+class _NoStore(FilePoolScanner):
+    worker = staticmethod(lambda paths: [])
+
+    def _cached(self, files):
+        return {}
+
+
+def test_scanner_missing_part_of_its_contract_cannot_be_created():
+    with pytest.raises(TypeError, match="_store"):
+        _NoStore([])
+    with pytest.raises(TypeError, match="worker"):
+        FilePoolScanner([])
@@ -0,0 +1,65 @@
+from src import media_kinds
+from src.FolderScanner import FolderScanner
+
+
+def _make_files(folder, count):
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (folder / f"img{i}.png").write_bytes(b"x")
+
+
+def test_scanner_reports_every_supported_file_once(qtbot, tmp_path, run_scanner):
+    _make_files(tmp_path / "a", 7)
+    _make_files(tmp_path / "a" / "sub", 5)
+    (tmp_path / "a" / "notes.txt").write_bytes(b"x")
+
+    batches = run_scanner(FolderScanner(str(tmp_path / "a"), batch_size=3), "batch_found")
+
+    found = [path for _folder, batch in batches for path in batch]
+    assert sorted(p.name for p in found) == sorted(p.name for p in media_kinds.find_supported_files(tmp_path / "a"))
+    assert len(found) == len(set(found)) == 12
+    assert all(folder == str(tmp_path / "a") for folder, _batch in batches)
+
+
+def test_first_file_found_is_flushed_in_its_own_batch(qtbot, tmp_path, run_scanner):
+    _make_files(tmp_path / "a", 10)
+
+    batches = run_scanner(FolderScanner(str(tmp_path / "a"), batch_size=1000), "batch_found")
+
+    # A single directory arrives as one walk result, so it's all in the first flush - the
+    # point is that it doesn't wait for batch_size (1000) files to accumulate.
+    assert len(batches) == 1
+    assert len(batches[0][1]) == 10
+
+
+def test_empty_folder_emits_no_batches(qtbot, tmp_path, run_scanner):
+    (tmp_path / "empty").mkdir()
+
+    assert run_scanner(FolderScanner(str(tmp_path / "empty")), "batch_found") == []
+
+
+def test_stop_interrupts_and_joins_the_thread(qtbot, tmp_path):
+    for i in range(50):
+        _make_files(tmp_path / "a" / f"d{i}", 2)
+    scanner = FolderScanner(str(tmp_path / "a"), batch_size=1)
+
+    scanner.start()
+    scanner.stop()
+
+    assert scanner.isFinished()
+
+
+def test_walk_uses_the_requested_number_of_workers(qtbot, tmp_path, monkeypatch, run_scanner):
+    _make_files(tmp_path / "a", 2)
+    used = []
+    original = media_kinds.iter_supported_files
+
+    def spy(folder, index=None, max_workers=media_kinds.WALK_MAX_WORKERS):
+        used.append(max_workers)
+        return original(folder, index=index, max_workers=max_workers)
+
+    monkeypatch.setattr(media_kinds, "iter_supported_files", spy)
+
+    run_scanner(FolderScanner(str(tmp_path / "a"), max_workers=1), "batch_found")
+
+    assert used == [1]
@@ -0,0 +1,87 @@
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QImage, QPainter
+
+from src.frame_scoring import SCORING_WIDTH, FrameScore, gray_view, score_frame, score_gray
+
+
+def _solid(level, width=320, height=180):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(level, level, level))
+    return image
+
+
+def _checkerboard(width=320, height=180, square=8):
+    image = _solid(40, width, height)
+    painter = QPainter(image)
+    for y in range(0, height, square):
+        for x in range((y // square) % 2 * square, width, 2 * square):
+            painter.fillRect(x, y, square, square, QColor(220, 220, 220))
+    painter.end()
+    return image
+
+
+def _blurred(image):
+    smooth = Qt.TransformationMode.SmoothTransformation
+    small = image.scaled(image.width() // 16, image.height() // 16, transformMode=smooth)
+    return small.scaled(image.width(), image.height(), transformMode=smooth)
+
+
+def test_fades_and_flat_frames_are_unusable():
+    assert not score_frame(_solid(0)).usable
+    assert not score_frame(_solid(255)).usable
+    assert not score_frame(_solid(128)).usable  # bright enough, but no contrast
+
+
+def test_detailed_frame_is_usable():
+    score = score_frame(_checkerboard())
+
+    assert score.usable
+    assert 40 < score.brightness < 220
+    assert score.sharpness > 0
+
+
+def test_sharp_frame_outranks_a_blurred_copy():
+    sharp = _checkerboard(1920, 1080, 64)
+
+    assert score_frame(sharp).rank() > score_frame(_blurred(sharp)).rank()
+
+
+def test_any_usable_frame_outranks_an_unusable_one():
+    blurry = FrameScore(brightness=120, contrast=30, sharpness=0.5)
+    black = FrameScore(brightness=5, contrast=0, sharpness=0)
+    dark = FrameScore(brightness=15, contrast=2, sharpness=0)
+
+    assert blurry.rank() > dark.rank() > black.rank()
+
+
+def test_gray_view_skips_row_padding():
+    image = QImage(5, 3, QImage.Format.Format_Grayscale8)  # 5-byte rows padded to 8
+    image.fill(0)
+    image.setPixelColor(4, 2, QColor(255, 255, 255))
+
+    gray = gray_view(image)
+
+    assert gray.shape == (3, 5)
+    assert gray[2, 4] == 255
+    assert int(gray.sum()) == 255
+
+
+def test_score_gray_of_a_single_edge():
+    gray = np.zeros((10, 10), dtype=np.uint8)
+    gray[:, 5:] = 200
+
+    score = score_gray(gray)
+
+    assert score.brightness == 100
+    assert score.contrast == 100
+    assert score.sharpness > 0
+
+
+def test_frames_are_scored_on_a_small_copy(monkeypatch):
+    seen = []
+    monkeypatch.setattr("src.frame_scoring.score_gray", lambda gray: seen.append(gray.shape))
+
+    score_frame(_checkerboard(1920, 1080))
+
+    assert seen == [(54, SCORING_WIDTH)]
@@ -0,0 +1,152 @@
+import struct
+
+import pytest
+from PyQt6.QtWidgets import QLabel
+
+from src import GifAnimator as animator_module
+from src.GifAnimator import GIF_DEFAULT_FRAME_DELAY_MS, GifAnimator, decode_gif_frames
+
+PALETTE = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255)]
+
+
+def _write_gif(path, frame_colors, width=40, height=20, delay_cs=10):
+    """An animated GIF with one solid frame per entry of `frame_colors` (indices into
+    PALETTE). The LZW data sends a clear code before every pixel, so every code stays 3
+    bits wide - valid, just uncompressed."""
+    data = b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF1, 0, 0)
+    data += b"".join(bytes(color) for color in PALETTE)
+    data += b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"  # loop forever
+    for color in frame_colors:
+        data += b"\x21\xf9\x04\x00" + struct.pack("<H", delay_cs) + b"\x00\x00"
+        data += b"\x2c" + struct.pack("<HHHHB", 0, 0, width, height, 0)
+        bits, bit_count, packed = 0, 0, bytearray()
+        for code in [4, color] * (width * height) + [5]:
+            bits |= code << bit_count
+            bit_count += 3
+            while bit_count >= 8:
+                packed.append(bits & 0xFF)
+                bits >>= 8
+                bit_count -= 8
+        if bit_count:
+            packed.append(bits)
+        data += b"\x02"
+        for start in range(0, len(packed), 255):
+            chunk = packed[start : start + 255]
+            data += bytes([len(chunk)]) + chunk
+        data += b"\x00"
+    path.write_bytes(data + b"\x3b")
+    return path
+
+
+@pytest.fixture
+def animator(qtbot):
+    animator = GifAnimator(32, tick_ms=10)
+    yield animator
+    animator.shutdown()
+
+
+def _color(label):
+    color = label.pixmap().toImage().pixelColor(0, 0)
+    return color.red(), color.green(), color.blue()
+
+
+def test_frames_are_decoded_at_cell_size_with_their_delays(tmp_path):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1, 2], delay_cs=5)
+
+    frames, delays = decode_gif_frames(path, 32)
+
+    assert [(frame.width(), frame.height()) for frame in frames] == [(32, 16)] * 3
+    assert delays == [50, 50, 50]
+
+
+def test_tiny_delays_fall_back_to_the_browser_default(tmp_path):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1], delay_cs=0)
+
+    _frames, delays = decode_gif_frames(path, 32)
+
+    assert delays == [GIF_DEFAULT_FRAME_DELAY_MS] * 2
+
+
+def test_decoding_stops_at_the_per_file_budget(tmp_path):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1, 2, 3])
+
+    frames, _delays = decode_gif_frames(path, 32, max_bytes=1)
+
+    assert len(frames) == 1
+
+
+def test_cells_play_through_the_frames_off_the_shared_clock(qtbot, tmp_path, animator):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1], delay_cs=2)
+    labels = [QLabel(), QLabel()]
+    for label in labels:
+        animator.add(label, path)
+
+    qtbot.waitUntil(lambda: all(label.pixmap() is not None and not label.pixmap().isNull() for label in labels))
+    assert [_color(label) for label in labels] == [(255, 0, 0)] * 2
+    qtbot.waitUntil(lambda: all(_color(label) == (0, 255, 0) for label in labels), timeout=2000)
+    assert animator._timer.isActive()
+
+
+def test_a_file_is_decoded_once_and_then_served_from_the_cache(qtbot, tmp_path, animator, monkeypatch):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1])
+    first = QLabel()
+    animator.add(first, path)
+    qtbot.waitUntil(lambda: animator.cache_bytes() > 0)
+
+    monkeypatch.setattr(animator_module, "decode_gif_frames", lambda *args: pytest.fail("should be cached"))
+    second = QLabel()
+    animator.add(second, path)
+
+    assert animator.is_animating(second)
+    assert _color(second) == (255, 0, 0)
+
+
+def test_cache_drops_least_recently_shown_files_over_budget(qtbot, tmp_path, animator):
+    paths = [_write_gif(tmp_path / f"{i}.gif", [i, 3]) for i in range(3)]
+    frame_bytes = 32 * 16 * 4
+    animator.max_bytes = 2 * 2 * frame_bytes  # two 2-frame files
+
+    for path in paths:
+        animator.add(QLabel(), path)
+        qtbot.waitUntil(lambda path=path: path in animator._cache)
+
+    assert list(animator._cache) == paths[1:]
+    assert animator.cache_bytes() == 2 * 2 * frame_bytes
+
+
+def test_undecodable_file_shows_its_name(qtbot, tmp_path, animator):
+    path = tmp_path / "broken.gif"
+    path.write_bytes(b"GIF89a")
+    label = QLabel()
+
+    animator.add(label, path)
+
+    qtbot.waitUntil(lambda: label.text() == "broken.gif")
+    assert not animator.is_animating(label)
+
+
+def test_removed_and_paused_cells_stop_the_clock(qtbot, tmp_path, animator):
+    path = _write_gif(tmp_path / "clip.gif", [0, 1])
+    label = QLabel()
+    animator.add(label, path)
+    qtbot.waitUntil(lambda: animator._timer.isActive())
+
+    animator.set_paused(True)
+    assert not animator._timer.isActive()
+    animator.set_paused(False)
+    assert animator._timer.isActive()
+
+    animator.remove(label)
+    assert not animator._timer.isActive()
+    assert not animator.is_animating(label)
+
+
+def test_single_frame_gifs_are_shown_but_not_ticked(qtbot, tmp_path, animator):
+    path = _write_gif(tmp_path / "still.gif", [2])
+    label = QLabel()
+
+    animator.add(label, path)
+
+    qtbot.waitUntil(lambda: label.pixmap() is not None and not label.pixmap().isNull())
+    assert _color(label) == (0, 0, 255)
+    assert not animator._timer.isActive()
@@ -1,10 +1,17 @@
+import json
 import time
 from unittest.mock import MagicMock
 
 import pytest
+from PyQt6.QtCore import QEvent, QObject, QSize, QUrl, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QMovie, QPixmap
 from PyQt6.QtMultimedia import QMediaPlayer
 from PyQt6.QtWidgets import QDialog
 
+from src import KeyframeReader as keyframe_reader_module
+from src import image_loading, media_metadata
+from src.content_dedup import ContentDeduplicator
+from src.DuplicateFilter import DuplicateFilter
 from src.GoonerApp import GoonerApp
 
 # --- fullscreen ---
@@ -52,6 +59,7 @@ def test_set_muted_mutes_video_and_beat_audio(app):
     app.set_muted(True)
     assert app.is_muted is True
     assert app.audio_output.isMuted() is True
+    assert app._standby_audio_output.isMuted() is True
     assert app.beat_handler.is_muted is True
     assert app.btn_mute.isChecked() is True
     assert app.btn_mute.text() == "Unmute"
@@ -124,32 +132,56 @@ def test_control_buttons_are_not_keyboard_focusable(app):
 # --- folder scanning ---
 
 
+# Scans go through the media index, which sniffs content - so each sample starts with a
+# real signature for its format.
+MEDIA_HEADERS = {
+    "a.mp4": b"\x00\x00\x00\x18ftypisom",
+    "b.avi": b"RIFF\x00\x00\x00\x00AVI LIST",
+    "c.mov": b"\x00\x00\x00\x14ftypqt  ",
+    "d.mkv": b"\x1a\x45\xdf\xa3",
+    "e.gif": b"GIF89a",
+    "f.png": b"\x89PNG\r\n\x1a\n",
+    "g.jpg": b"\xff\xd8\xff\xe0",
+    "h.jpeg": b"\xff\xd8\xff\xe1",
+    "i.bmp": b"BM",
+    "j.txt": b"",
+}
+
+
 def test_finde_unterstuetzte_dateien_finds_all_supported_extensions(app, tmp_path):
-    names = ["a.mp4", "b.avi", "c.mov", "d.mkv", "e.gif", "f.png", "g.jpg", "h.jpeg", "i.bmp", "j.txt"]
-    for name in names:
-        (tmp_path / name).write_bytes(b"")
+    for name, header in MEDIA_HEADERS.items():
+        (tmp_path / name).write_bytes(header)
 
     found = app.finde_unterstützte_dateien(str(tmp_path))
 
-    assert {f.name for f in found} == set(names) - {"j.txt"}
+    assert {f.name for f in found} == set(MEDIA_HEADERS) - {"j.txt"}
 
 
 def test_finde_unterstuetzte_dateien_searches_recursively(app, tmp_path):
     nested = tmp_path / "sub"
     nested.mkdir()
-    (nested / "deep.png").write_bytes(b"")
+    (nested / "deep.png").write_bytes(MEDIA_HEADERS["f.png"])
 
     found = app.finde_unterstützte_dateien(str(tmp_path))
 
     assert [f.name for f in found] == ["deep.png"]
 
 
+def test_finde_unterstuetzte_dateien_skips_files_whose_content_is_not_media(app, tmp_path):
+    (tmp_path / "real.mp4").write_bytes(MEDIA_HEADERS["a.mp4"])
+    (tmp_path / "error_page.mp4").write_bytes(b"<!DOCTYPE html><html>404</html>")
+
+    found = app.finde_unterstützte_dateien(str(tmp_path))
+
+    assert [f.name for f in found] == ["real.mp4"]
+
+
 # --- open_folder ---
 
 
 def _fake_picker_dialog(exec_result, selected_files=None):
     class FakeDialog:
-        def __init__(self, parent=None):
+        def __init__(self, parent=None, **kwargs):
             self.selected_files = selected_files or []
 
         def exec(self):
@@ -224,6 +256,284 @@ def test_open_folder_no_supported_files_hides_climax_banner(app, monkeypatch, tm
     assert not app.climax_blink_timer.isActive()
 
 
+def test_cache_warmer_needs_remembered_folders(app, monkeypatch):
+    monkeypatch.setattr("src.GoonerApp.CacheWarmer.start", lambda self: pytest.fail("nothing to warm"))
+
+    app.start_cache_warmer()
+
+    assert app._cache_warmer is None
+
+
+def test_cache_warmer_respects_the_setting(app, monkeypatch, tmp_path):
+    monkeypatch.setattr("src.GoonerApp.CacheWarmer.start", lambda self: pytest.fail("warming is off"))
+    app.settings.setValue("GoonerApp/last_selected_folders", json.dumps([str(tmp_path)]))
+    app.prewarm_caches = False
+
+    app.start_cache_warmer()
+
+    assert app._cache_warmer is None
+
+
+def test_opening_the_picker_ends_the_warm_up(app, monkeypatch, tmp_path):
+    started = []
+    monkeypatch.setattr("src.GoonerApp.CacheWarmer.start", lambda self: started.append(self.folders))
+    monkeypatch.setattr(
+        "src.GoonerApp.MediaFolderPickerDialog", _fake_picker_dialog(QDialog.DialogCode.Rejected)
+    )
+    app.settings.setValue("GoonerApp/last_selected_folders", json.dumps([str(tmp_path)]))
+
+    app.start_cache_warmer()
+    assert started == [[str(tmp_path)]]
+    assert app._cache_warmer is not None
+
+    app.open_folder()
+
+    assert app._cache_warmer is None
+
+
+def test_open_folder_passes_stream_and_duplicate_settings_to_picker(app, monkeypatch):
+    seen = {}
+
+    class FakeDialog:
+        def __init__(self, parent=None, stream_scan=None, skip_duplicates=None):
+            seen["stream_scan"] = stream_scan
+            seen["skip_duplicates"] = skip_duplicates
+            self.selected_files = []
+
+        def exec(self):
+            return QDialog.DialogCode.Rejected
+
+    monkeypatch.setattr("src.GoonerApp.MediaFolderPickerDialog", FakeDialog)
+    app.stream_folder_scan = False
+    app.skip_duplicate_files = False
+
+    app.open_folder()
+
+    assert seen == {"stream_scan": False, "skip_duplicates": False}
+
+
+class _FakeStreamingPicker(QObject):
+    files_discovered = pyqtSignal(list)
+    scan_finished = pyqtSignal()
+
+    def __init__(self, selected_files, late_files, scanning=True):
+        super().__init__()
+        self.selected_files = selected_files
+        self.late_files = late_files
+        self.scanning = scanning
+        self.stopped = False
+
+    def is_scanning(self):
+        return self.scanning
+
+    def stop_scans(self):
+        self.stopped = True
+
+
+def test_open_folder_with_no_files_stops_what_the_picker_handed_over(app, monkeypatch):
+    picker = _FakeStreamingPicker([], [])
+    picker.duplicate_filter = DuplicateFilter(ContentDeduplicator())
+    picker._on_duplicates_filtered = MagicMock()
+    picker.duplicate_filter.filtered.connect(picker._on_duplicates_filtered)
+    picker.duplicate_filter.submit([], tag="late")
+    picker.exec = lambda: QDialog.DialogCode.Accepted
+    monkeypatch.setattr("src.GoonerApp.MediaFolderPickerDialog", lambda parent=None, **kwargs: picker)
+
+    app.open_folder()
+
+    assert picker.stopped is True
+    assert not picker.duplicate_filter.isRunning()
+    picker.duplicate_filter.filtered.emit("late", [])
+    picker._on_duplicates_filtered.assert_not_called()
+
+
+def test_follow_streaming_picker_splices_late_and_future_batches(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    app.current_index = 0
+    picker = _FakeStreamingPicker([], [tmp_path / "late.png"])
+
+    app._follow_streaming_picker(picker)
+    picker.files_discovered.emit([tmp_path / "future.png"])
+
+    assert app.playlist[0] == tmp_path / "first.png"
+    assert set(app.playlist) == {tmp_path / "first.png", tmp_path / "late.png", tmp_path / "future.png"}
+
+
+def test_streaming_picker_is_released_once_its_scan_finishes(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    picker = _FakeStreamingPicker([], [])
+
+    app._follow_streaming_picker(picker)
+    assert app._streaming_picker is picker
+    picker.scan_finished.emit()
+
+    assert app._streaming_picker is None
+    assert picker.stopped is True
+
+
+def test_follow_streaming_picker_ignores_a_finished_scan(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    picker = _FakeStreamingPicker([], [tmp_path / "late.png"], scanning=False)
+
+    app._follow_streaming_picker(picker)
+
+    assert app._streaming_picker is None
+    assert len(app.playlist) == 2
+
+
+def test_splice_into_playlist_never_touches_already_played_items(app, tmp_path):
+    played = [tmp_path / f"played{i}.png" for i in range(5)]
+    queued = [tmp_path / f"queued{i}.png" for i in range(5)]
+    app.playlist = played + queued
+    app.current_index = 4
+
+    new = [tmp_path / f"new{i}.png" for i in range(50)]
+    app.splice_into_playlist(new)
+
+    assert app.playlist[:5] == played
+    assert set(app.playlist[5:]) == set(queued) | set(new)
+    assert len(app.playlist) == 60
+
+
+def test_splice_into_playlist_mixes_new_files_in_rather_than_appending(app, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.GoonerApp.random.randint", lambda low, high: low)
+    app.playlist = [tmp_path / "current.png", tmp_path / "next.png"]
+    app.current_index = 0
+
+    app.splice_into_playlist([tmp_path / "new.png"])
+
+    assert app.playlist == [tmp_path / "current.png", tmp_path / "new.png", tmp_path / "next.png"]
+
+
+def test_splice_into_playlist_at_end_of_playlist_appends(app, tmp_path):
+    app.playlist = [tmp_path / "only.png"]
+    app.current_index = 0
+
+    app.splice_into_playlist([tmp_path / "new.png"])
+
+    assert app.playlist == [tmp_path / "only.png", tmp_path / "new.png"]
+
+
+def test_watcher_changes_to_folders_outside_the_session_are_ignored(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    app.current_index = 0
+    app.folder_watcher.watch(str(tmp_path / "session"), owner=app)
+
+    app.folder_watcher.files_changed.emit(str(tmp_path / "picker_only"), [tmp_path / "picker_only" / "x.png"], [])
+    app.folder_watcher.files_changed.emit(str(tmp_path / "session"), [tmp_path / "session" / "y.png"], [])
+
+    assert app.playlist == [tmp_path / "first.png", tmp_path / "session" / "y.png"]
+
+
+def test_streaming_picker_starts_the_folder_watcher_once_its_scan_finishes(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    picker = _FakeStreamingPicker([], [])
+    picker.folders = [str(tmp_path)]
+
+    app._follow_streaming_picker(picker)
+    app._watch_session_folders(picker)
+    assert app.folder_watcher.folders() == set()
+    picker.scan_finished.emit()
+
+    assert app.folder_watcher.folders() == {str(tmp_path)}
+
+
+def test_replaced_streaming_picker_no_longer_reaches_the_playlist(app, tmp_path):
+    app.playlist = [tmp_path / "first.png"]
+    picker = _FakeStreamingPicker([], [])
+    app._follow_streaming_picker(picker)
+
+    app._stop_streaming_picker()
+    picker.files_discovered.emit([tmp_path / "stale.png"])
+
+    assert app.playlist == [tmp_path / "first.png"]
+
+
+def test_folder_change_drops_deleted_files_and_keeps_the_current_one(app, tmp_path):
+    files = [tmp_path / f"{i}.png" for i in range(5)]
+    app.playlist = list(files)
+    app.current_index = 3
+
+    app._apply_folder_changes(str(tmp_path), [], [files[0], files[4]])
+
+    assert app.playlist == files[1:4]
+    assert app.playlist[app.current_index] == files[3]
+
+
+def test_folder_change_removing_the_current_file_steps_back_to_its_predecessor(app, tmp_path):
+    files = [tmp_path / f"{i}.png" for i in range(4)]
+    app.playlist = list(files)
+    app.current_index = 2
+
+    app._apply_folder_changes(str(tmp_path), [], [files[2]])
+
+    assert app.playlist == [files[0], files[1], files[3]]
+    assert app.playlist[(app.current_index + 1) % len(app.playlist)] == files[3]
+
+
+def test_folder_change_splices_added_files_into_the_unplayed_part(app, tmp_path):
+    played = [tmp_path / f"played{i}.png" for i in range(3)]
+    app.playlist = list(played)
+    app.current_index = 2
+    renamed_from, renamed_to = played[0], tmp_path / "renamed.png"
+
+    app._apply_folder_changes(str(tmp_path), [renamed_to], [renamed_from])
+
+    assert app.playlist == [played[1], played[2], renamed_to]
+    assert app.current_index == 1
+
+
+def test_folder_change_runs_added_files_through_the_session_duplicate_filter(app, qtbot, tmp_path):
+    original = tmp_path / "clip.png"
+    original.write_bytes(b"same")
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(b"same")
+    unique = tmp_path / "unique.png"
+    unique.write_bytes(b"diff")
+    app.playlist = [original]
+    app.current_index = 0
+    deduplicator = ContentDeduplicator()
+    deduplicator.filter([original])
+    app._adopt_duplicate_filter(DuplicateFilter(deduplicator))
+
+    with qtbot.waitSignal(app._duplicate_filter.filtered, timeout=5000):
+        app._apply_folder_changes(str(tmp_path), [copy, unique], [])
+        assert app.playlist == [original]  # nothing is hashed on the GUI thread
+
+    assert app.playlist == [original, unique]
+    app._stop_duplicate_filter()
+
+
+def test_folder_change_emptying_the_playlist_waits_for_additions_being_checked(app, qtbot, tmp_path):
+    gone, added = tmp_path / "gone.png", tmp_path / "added.png"
+    added.write_bytes(b"new")
+    app.playlist = [gone]
+    app.current_index = 0
+    app.is_running = True
+    app.stop = MagicMock()
+    app._adopt_duplicate_filter(DuplicateFilter(ContentDeduplicator()))
+
+    with qtbot.waitSignal(app._duplicate_filter.filtered, timeout=5000):
+        app._apply_folder_changes(str(tmp_path), [added], [gone])
+        app.stop.assert_not_called()
+
+    assert app.playlist == [added]
+    app.stop.assert_not_called()
+    app._stop_duplicate_filter()
+
+
+def test_folder_change_emptying_the_playlist_stops_the_session(app, tmp_path):
+    app.playlist = [tmp_path / "only.png"]
+    app.current_index = 0
+    app.is_running = True
+    app.stop = MagicMock()
+
+    app._apply_folder_changes(str(tmp_path), [], [tmp_path / "only.png"])
+
+    assert app.playlist == []
+    app.stop.assert_called_once()
+
+
 # --- playlist navigation ---
 
 
@@ -263,6 +573,126 @@ def test_load_current_index_noop_on_empty_playlist(app):
     app.load_current_index()
 
 
+def test_loading_an_entry_prefetches_the_images_around_it(app, tmp_path, monkeypatch):
+    files = [tmp_path / f"{i}.png" for i in range(6)] + [tmp_path / "clip.mp4"]
+    app.playlist = files
+    app.current_index = 6
+    monkeypatch.setattr(app, "load_media", lambda path: None)
+    requested = []
+    monkeypatch.setattr(app.prefetcher, "prefetch", lambda paths, box, dpr: requested.extend(paths))
+
+    app.load_current_index()
+
+    # three ahead (wrapping round), one behind, and the current video is none of them
+    assert requested == [str(files[0]), str(files[1]), str(files[2]), str(files[5])]
+
+
+def test_load_media_shows_the_prefetched_image(app, tmp_path, monkeypatch):
+    img = tmp_path / "pic.png"
+    img.write_bytes(b"")  # undecodable - only the prefetched image can show
+    app.image_label.resize(200, 100)
+    prefetched = QPixmap(200, 100)
+    prefetched.fill(QColor(10, 200, 10))
+    app.prefetcher.cache.put(img, QSize(200, 100), prefetched, 200 * 100 * 4)
+
+    app.load_media(str(img))
+
+    assert app.image_label.pixmap().size() == QSize(200, 100)
+    assert app.prefetcher.cache.hits == 1
+
+
+def test_load_media_waits_for_the_prefetch_of_the_same_image_in_flight(app, tmp_path, monkeypatch):
+    img = tmp_path / "pic.png"
+    img.write_bytes(b"")  # undecodable - only the prefetched image can show
+    app.image_label.resize(200, 100)
+    prefetched = QPixmap(200, 100)
+    waited = []
+    monkeypatch.setattr(app.prefetcher, "wait_for", lambda path, box, dpr: waited.append(path) or prefetched)
+    monkeypatch.setattr(image_loading, "read_scaled", lambda *args: pytest.fail("decoded alongside the prefetch"))
+
+    app.load_media(str(img))
+
+    assert waited == [str(img)]
+    assert app.image_label.pixmap().size() == QSize(200, 100)
+
+
+def test_load_media_caches_what_it_had_to_decode_itself(app, tmp_path):
+    img = tmp_path / "pic.png"
+    image = QImage(400, 200, QImage.Format.Format_RGB32)
+    image.fill(QColor(10, 200, 10))
+    image.save(str(img))
+    app.image_label.resize(200, 200)
+
+    app.load_media(str(img))
+    app.load_media(str(img))
+
+    cache = app.prefetcher.cache
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def _save_image(path, width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(10, 200, 10))
+    image.save(str(path))
+    return path
+
+
+def test_resize_events_on_the_image_label_are_debounced(app):
+    app.eventFilter(app.image_label, QEvent(QEvent.Type.Resize))
+    app.eventFilter(app.image_label, QEvent(QEvent.Type.Resize))
+
+    assert app._rescale_timer.isActive()
+    assert app._rescale_timer.isSingleShot()
+
+
+def test_a_resize_rescales_the_current_image_on_a_worker(app, qtbot, tmp_path):
+    img = _save_image(tmp_path / "pic.png", 400, 200)
+    app.image_label.resize(200, 200)
+    app.load_media(str(img))
+    assert app.image_label.pixmap().size() == QSize(200, 100)
+
+    app.image_label.resize(100, 100)
+    app._rescale_current()
+
+    qtbot.waitUntil(lambda: app.image_label.pixmap().size() == QSize(100, 50), timeout=5000)
+    assert app._shown_image == (str(img), QSize(100, 100), 1.0)
+
+
+def test_a_rescale_back_to_a_cached_size_is_immediate(app, tmp_path):
+    img = _save_image(tmp_path / "pic.png", 400, 200)
+    app.image_label.resize(100, 100)
+    app.load_media(str(img))
+    app.image_label.resize(200, 200)
+    app.load_media(str(img))
+
+    app.image_label.resize(100, 100)
+    app._rescale_current()
+
+    assert app.image_label.pixmap().size() == QSize(100, 50)
+
+
+def test_a_decode_for_an_outdated_size_is_not_shown(app, tmp_path):
+    img = _save_image(tmp_path / "pic.png", 400, 200)
+    app.image_label.resize(200, 200)
+    app.load_media(str(img))
+    app.prefetcher.store(img, QSize(100, 100), QImage(100, 50, QImage.Format.Format_RGB32))
+
+    app._on_prefetched(img, QSize(100, 100), 1.0)  # the label is 200x200 again by now
+
+    assert app.image_label.pixmap().size() == QSize(200, 100)
+
+
+def test_a_resize_rescales_the_current_gif(app, tmp_path):
+    movie = QMovie()
+    app.current_movie = movie
+    app._current_movie_size = QSize(400, 200)
+    app.image_label.resize(100, 100)
+
+    app._rescale_current()
+
+    assert movie.scaledSize() == QSize(100, 50)
+
+
 # --- load_media dispatch ---
 
 
@@ -275,6 +705,18 @@ def test_load_media_image_extension_shows_image_label(app, tmp_path):
     assert app.media_stack.currentWidget() is app.image_label
 
 
+def test_load_media_image_is_fitted_to_the_label(app, tmp_path):
+    img = tmp_path / "big.jpg"
+    image = QImage(4000, 2000, QImage.Format.Format_RGB32)
+    image.fill(QColor(40, 120, 200))
+    image.save(str(img))
+    app.image_label.resize(400, 300)
+
+    app.load_media(str(img))
+
+    assert app.image_label.pixmap().size() == QSize(400, 200)
+
+
 def test_load_media_gif_extension_shows_image_label_and_sets_movie(app, tmp_path):
     gif = tmp_path / "clip.gif"
     gif.write_bytes(b"")
@@ -300,6 +742,354 @@ def test_load_media_video_extension_switches_to_video_widget(app, monkeypatch, t
     fake_player.play.assert_called_once()
 
 
+def test_load_media_prefers_the_sniffed_kind_over_the_extension(app, monkeypatch, tmp_path):
+    fake_player = MagicMock()
+    monkeypatch.setattr(app, "media_player", fake_player)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    mislabeled = tmp_path / "really_a_clip.png"
+    mislabeled.write_bytes(b"")
+    app._media_kinds = {str(mislabeled): "video"}
+
+    app.load_media(str(mislabeled))
+
+    assert app.media_stack.currentWidget() is app.video_widget
+
+
+def test_splice_into_playlist_looks_up_sniffed_kinds(app, tmp_path):
+    folder = tmp_path / "lib"
+    folder.mkdir()
+    clip = folder / "clip.png"
+    clip.write_bytes(MEDIA_HEADERS["a.mp4"])
+    app.media_index.scan(str(folder))
+    app.playlist = [tmp_path / "first.png"]
+    app.current_index = 0
+
+    app.splice_into_playlist([clip])
+
+    assert app._media_kinds[str(clip)] == "video"
+
+
+def test_load_media_loops_a_short_video_with_known_duration(app, monkeypatch, tmp_path):
+    fake_player = MagicMock()
+    monkeypatch.setattr(app, "media_player", fake_player)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    app.video_min_dur = 1.5
+    clip = tmp_path / "clip.mp4"
+    app._metadata = {str(clip): {**media_metadata.empty_metadata(), "duration_ms": 400}}
+
+    app.load_media(str(clip))
+
+    fake_player.setLoops.assert_called_once_with(4)
+
+
+def test_load_media_plays_a_video_of_unknown_duration_once(app, monkeypatch, tmp_path):
+    fake_player = MagicMock()
+    monkeypatch.setattr(app, "media_player", fake_player)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+
+    app.load_media(str(tmp_path / "clip.mp4"))
+
+    fake_player.setLoops.assert_called_once_with(1)
+
+
+def test_next_video_is_preloaded_paused_in_the_standby_player(app, monkeypatch, tmp_path):
+    standby = MagicMock()
+    monkeypatch.setattr(app, "_standby_player", standby)
+    clip = tmp_path / "clip.mp4"
+    app.playlist = [tmp_path / "a.png", clip]
+    app.current_index = 0
+
+    app._preload_next_video()
+    app._preload_next_video()  # already there - not loaded again
+
+    standby.setSource.assert_called_once_with(QUrl.fromLocalFile(str(clip)))
+    standby.pause.assert_called_once()
+    assert app._standby_path == str(clip)
+
+
+def test_standby_player_is_emptied_when_the_next_entry_is_no_video(app, monkeypatch, tmp_path):
+    standby = MagicMock()
+    monkeypatch.setattr(app, "_standby_player", standby)
+    monkeypatch.setattr(app, "_standby_path", str(tmp_path / "old.mp4"))
+    app.playlist = [tmp_path / "a.png", tmp_path / "b.png"]
+    app.current_index = 0
+
+    app._preload_next_video()
+
+    standby.setSource.assert_called_once_with(QUrl())
+    assert app._standby_path is None
+
+
+def test_load_media_swaps_in_the_preloaded_player(app, monkeypatch, tmp_path):
+    active, standby = MagicMock(), MagicMock()
+    standby.duration.return_value = 0
+    active_widget, standby_widget = app.video_widget, app._standby_video_widget
+    monkeypatch.setattr(app, "media_player", active)
+    monkeypatch.setattr(app, "_standby_player", standby)
+    clip = tmp_path / "clip.mp4"
+    monkeypatch.setattr(app, "_standby_path", str(clip))
+
+    app.load_media(str(clip))
+
+    assert app.media_player is standby
+    assert app._standby_player is active
+    assert app.video_widget is standby_widget
+    assert app._standby_video_widget is active_widget
+    assert app.media_stack.currentWidget() is standby_widget
+    standby.setSource.assert_not_called()
+    standby.play.assert_called_once()
+    active.stop.assert_called_once()
+    active.setSource.assert_called_once_with(QUrl())  # the old video isn't kept open
+
+
+def test_swapped_out_player_stays_empty_while_no_video_is_next(app, monkeypatch, tmp_path):
+    active, standby = MagicMock(), MagicMock()
+    standby.duration.return_value = 0
+    monkeypatch.setattr(app, "media_player", active)
+    monkeypatch.setattr(app, "_standby_player", standby)
+    clip = tmp_path / "clip.mp4"
+    monkeypatch.setattr(app, "_standby_path", str(clip))
+    app.playlist = [clip, tmp_path / "a.png"]
+    app.current_index = 0
+
+    app.load_media(str(clip))
+    app._preload_next_video()
+
+    assert app._standby_player is active
+    active.setSource.assert_called_once_with(QUrl())
+    assert app._standby_path is None
+
+
+class _LoadingPlayer(QObject):
+    """A QMediaPlayer stand-in that's still loading its media, and - like the real backends
+    - drops a setPosition() until finish_loading()."""
+
+    mediaStatusChanged = pyqtSignal(QMediaPlayer.MediaStatus)
+    positionChanged = pyqtSignal("qint64")
+
+    def __init__(self):
+        super().__init__()
+        self.status = QMediaPlayer.MediaStatus.LoadingMedia
+        self.seeks = []
+        self.playing = False
+        self._position = 0
+
+    def finish_loading(self):
+        self.status = QMediaPlayer.MediaStatus.LoadedMedia
+        self.mediaStatusChanged.emit(self.status)
+
+    def mediaStatus(self):
+        return self.status
+
+    def position(self):
+        return self._position
+
+    def setPosition(self, position_ms):
+        if self.status == QMediaPlayer.MediaStatus.LoadingMedia:
+            return
+        self.seeks.append(position_ms)
+        self._position = position_ms
+        self.positionChanged.emit(position_ms)
+
+    def setSource(self, _url):
+        self.status = QMediaPlayer.MediaStatus.LoadingMedia
+
+    def setLoops(self, _loops):
+        pass
+
+    def play(self):
+        self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def stop(self):
+        self.playing = False
+
+    def duration(self):
+        return 0
+
+
+def _use_loading_player(app, monkeypatch, standby=False):
+    player = _LoadingPlayer()
+    if standby:
+        monkeypatch.setattr(app, "_standby_player", player)
+        monkeypatch.setattr(app, "_standby_clip_seeker", app._make_clip_seeker(player))
+    else:
+        monkeypatch.setattr(app, "media_player", player)
+        monkeypatch.setattr(app, "_clip_seeker", app._make_clip_seeker(player))
+    return player
+
+
+def _count_moov_reads(monkeypatch):
+    reads = []
+    monkeypatch.setattr(keyframe_reader_module.mp4_boxes, "parse", lambda path: reads.append(path))
+    return reads
+
+
+def _long_clip_in_clip_mode(app, monkeypatch, tmp_path, start_ms):
+    monkeypatch.setattr(media_metadata, "clip_start_ms", lambda duration_ms, clip_ms, mp4_info: start_ms)
+    app.video_clip_mode = True
+    app.video_clip_dur = 4.0
+    clip = tmp_path / "long.mp4"
+    app._metadata = {str(clip): {**media_metadata.empty_metadata(), "duration_ms": 600_000}}
+    return clip
+
+
+def test_clip_mode_plays_one_window_from_the_clip_start_once_the_seek_sticks(app, monkeypatch, tmp_path):
+    player = _use_loading_player(app, monkeypatch)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    clip = _long_clip_in_clip_mode(app, monkeypatch, tmp_path, 42_000)
+
+    app.load_media(str(clip))
+
+    assert not player.playing  # not from 0 while the media is still loading
+    assert not app.auto_play_timer.isActive()
+
+    player.finish_loading()
+
+    assert player.seeks == [42_000]
+    assert player.playing
+    assert app.auto_play_timer.isActive()
+    assert app.auto_play_timer.interval() == 4000
+
+
+def test_clip_mode_plays_short_videos_whole(app, monkeypatch, tmp_path):
+    player = _use_loading_player(app, monkeypatch)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    app.video_clip_mode = True
+    app.video_clip_dur = 6.0
+    clip = tmp_path / "short.mp4"
+    app._metadata = {str(clip): {**media_metadata.empty_metadata(), "duration_ms": 3000}}
+
+    app.load_media(str(clip))
+    player.finish_loading()
+
+    assert player.seeks == []
+    assert player.playing
+    assert not app.auto_play_timer.isActive()
+
+
+def test_starting_on_a_clip_times_it_by_the_clip_length(app, monkeypatch, tmp_path):
+    player = _use_loading_player(app, monkeypatch)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    clip = _long_clip_in_clip_mode(app, monkeypatch, tmp_path, 42_000)
+    app.min_dur, app.max_dur = 20.0, 30.0
+    app.playlist = [clip]
+    app.current_index = 0
+
+    app.start()
+
+    assert not app.auto_play_timer.isActive()  # not an image's duration while the seek is pending
+
+    player.finish_loading()
+
+    assert app.auto_play_timer.interval() == 4000
+
+
+def test_clip_mode_preloads_the_standby_player_at_the_clip_start(app, qtbot, monkeypatch, tmp_path):
+    standby = _use_loading_player(app, monkeypatch, standby=True)
+    reads = _count_moov_reads(monkeypatch)
+    clip = _long_clip_in_clip_mode(app, monkeypatch, tmp_path, 7000)
+    app.playlist = [tmp_path / "a.png", clip]
+    app.current_index = 0
+
+    app._preload_next_video()
+    qtbot.waitUntil(lambda: app._standby_start_ms == 7000, timeout=5000)
+    standby.finish_loading()
+
+    assert standby.seeks == [7000]
+    assert not standby.playing
+    assert reads == [str(clip)]
+
+
+def test_swapped_in_clip_starts_once_its_seek_sticks(app, qtbot, monkeypatch, tmp_path):
+    standby = _use_loading_player(app, monkeypatch, standby=True)
+    monkeypatch.setattr(app, "audio_output", MagicMock())
+    monkeypatch.setattr(app, "_standby_audio_output", MagicMock())
+    reads = _count_moov_reads(monkeypatch)
+    clip = _long_clip_in_clip_mode(app, monkeypatch, tmp_path, 7000)
+    app.playlist = [tmp_path / "a.png", clip]
+    app.current_index = 0
+    app._preload_next_video()
+    qtbot.waitUntil(lambda: app._standby_start_ms == 7000, timeout=5000)
+
+    app.load_media(str(clip))
+
+    assert app.media_player is standby
+    assert not standby.playing
+    assert not app.auto_play_timer.isActive()
+
+    standby.finish_loading()
+
+    assert standby.seeks == [7000]
+    assert standby.playing
+    assert app.auto_play_timer.isActive()
+    assert reads == [str(clip)]  # the keyframes read during the preload, not again
+
+
+def test_only_the_active_player_drives_the_slideshow(app, monkeypatch):
+    advanced = []
+    monkeypatch.setattr(app, "video_status_changed", advanced.append)
+
+    app._on_player_status_changed(app._standby_player, QMediaPlayer.MediaStatus.EndOfMedia)
+    app._on_player_status_changed(app.media_player, QMediaPlayer.MediaStatus.EndOfMedia)
+
+    assert advanced == [QMediaPlayer.MediaStatus.EndOfMedia]
+
+
+def test_open_folder_seeds_metadata_from_the_index_and_probes_the_rest(app, monkeypatch, tmp_path):
+    folder = tmp_path / "lib"
+    folder.mkdir()
+    clip = folder / "clip.mp4"
+    clip.write_bytes(MEDIA_HEADERS["a.mp4"])
+    app.media_index.scan(str(folder))
+    stat = clip.stat()
+    known = {**media_metadata.empty_metadata(), "duration_ms": 900}
+    app.media_index.store_metadata([(str(clip), stat.st_size, stat.st_mtime_ns, known)])
+    probed = []
+
+    class FakeProber(QObject):
+        results_found = pyqtSignal(dict)
+
+        def __init__(self, files, index=None, parent=None):
+            super().__init__(parent)
+            probed.append(list(files))
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr("src.GoonerApp.MetadataProber", FakeProber)
+    monkeypatch.setattr(
+        "src.GoonerApp.MediaFolderPickerDialog", _fake_picker_dialog(QDialog.DialogCode.Accepted, [clip])
+    )
+
+    app.open_folder()
+    app._metadata_prober.results_found.emit({folder / "a.png": {**media_metadata.empty_metadata(), "width": 3}})
+
+    assert probed == [[clip]]
+    assert app._metadata[str(clip)] == known
+    assert app._metadata[str(folder / "a.png")]["width"] == 3
+
+
+def test_learned_video_duration_is_stored_for_next_time(app, tmp_path):
+    folder = tmp_path / "lib"
+    folder.mkdir()
+    clip = folder / "clip.mp4"
+    clip.write_bytes(MEDIA_HEADERS["a.mp4"])
+    app.media_index.scan(str(folder))
+    app.playlist = [clip]
+    app.current_index = 0
+
+    app._on_video_duration_changed(2500)
+
+    assert app._metadata[str(clip)]["duration_ms"] == 2500
+    assert app.media_index.metadata([clip])[str(clip)]["duration_ms"] == 2500
+
+
 # --- video_status_changed ---
 
 
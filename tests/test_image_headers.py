@@ -0,0 +1,85 @@
+import struct
+
+import pytest
+from PyQt6.QtGui import QColor, QImage, QImageReader
+
+from src import image_headers
+
+
+def _save(path, width=37, height=21):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(10, 200, 30))
+    assert image.save(str(path))
+    return path
+
+
+def _exif_app1(orientation, byte_order=b"MM"):
+    endian = ">" if byte_order == b"MM" else "<"
+    tiff = byte_order + struct.pack(endian + "HI", 42, 8)
+    tiff += struct.pack(endian + "H", 1) + struct.pack(endian + "HHIHH", 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack(endian + "I", 0)
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+
+@pytest.mark.parametrize("suffix", [".png", ".jpg", ".bmp"])
+def test_dimensions_match_what_qt_reads(tmp_path, suffix):
+    path = _save(tmp_path / f"a{suffix}")
+
+    header = image_headers.read_header(path)
+
+    assert (header.width, header.height, header.orientation) == (37, 21, 0)
+    assert QImageReader(str(path)).size().width() == header.width
+
+
+def test_gif_logical_screen_size(tmp_path):
+    path = tmp_path / "a.gif"
+    path.write_bytes(b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00\x00\x00" + b"\x3b")
+
+    header = image_headers.read_header(path)
+
+    assert (header.width, header.height) == (320, 200)
+
+
+def test_jpeg_frame_header_is_found_past_other_segments(tmp_path):
+    path = _save(tmp_path / "a.jpg", 640, 480)
+    data = path.read_bytes()
+    padding = b"\xff\xe2" + struct.pack(">H", 5002) + bytes(5000)
+    path.write_bytes(data[:2] + padding + data[2:])
+
+    header = image_headers.read_header(path)
+
+    assert (header.width, header.height) == (640, 480)
+
+
+@pytest.mark.parametrize("byte_order", [b"MM", b"II"])
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_jpeg_exif_orientation_matches_qt(tmp_path, orientation, byte_order):
+    path = _save(tmp_path / "a.jpg")
+    data = path.read_bytes()
+    path.write_bytes(data[:2] + _exif_app1(orientation, byte_order) + data[2:])
+
+    header = image_headers.read_header(path)
+
+    assert header.orientation == QImageReader(str(path)).transformation().value
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"\x89PNG\r\n\x1a\n",  # truncated before IHDR
+        b"GIF89a",
+        b"\xff\xd8\xff\xda\x00\x08" + bytes(6),  # scan data before any frame header
+        b"RIFF\x00\x00\x00\x00WEBPVP8 ",  # a format this module doesn't read
+    ],
+)
+def test_unreadable_headers_return_none(tmp_path, content):
+    path = tmp_path / "a.img"
+    path.write_bytes(content)
+
+    assert image_headers.read_header(path) is None
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert image_headers.read_header(tmp_path / "gone.png") is None
@@ -0,0 +1,62 @@
+import struct
+
+import pytest
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage, QPainter
+
+from src.image_loading import read_scaled
+
+
+def _save(path, width, height):
+    """Left half blue, right half red - enough to tell a rotation from a mirror."""
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(220, 30, 30))
+    painter = QPainter(image)
+    painter.fillRect(0, 0, width // 2, height, QColor(30, 30, 220))
+    painter.end()
+    assert image.save(str(path), quality=90)
+    return path
+
+
+def _with_exif_orientation(path, orientation):
+    tiff = b"MM" + struct.pack(">HI", 42, 8) + struct.pack(">H", 1)
+    tiff += struct.pack(">HHIHH", 0x0112, 3, 1, orientation, 0) + struct.pack(">I", 0)
+    payload = b"Exif\x00\x00" + tiff
+    data = path.read_bytes()
+    path.write_bytes(data[:2] + b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload + data[2:])
+    return path
+
+
+@pytest.mark.parametrize("suffix", [".jpg", ".png"])
+def test_large_images_are_decoded_to_fit_the_box(tmp_path, suffix):
+    path = _save(tmp_path / f"big{suffix}", 3000, 2000)
+
+    image = read_scaled(path, QSize(150, 150))
+
+    assert (image.width(), image.height()) == (150, 100)
+    assert image.pixelColor(20, 50).blue() > 150
+    assert image.pixelColor(130, 50).red() > 150
+
+
+def test_exif_rotation_is_applied(tmp_path):
+    path = _with_exif_orientation(_save(tmp_path / "big.jpg", 3000, 2000), 6)  # 90 degrees clockwise
+
+    image = read_scaled(path, QSize(150, 300))
+
+    assert (image.width(), image.height()) == (150, 225)
+    assert image.pixelColor(75, 20).blue() > 150  # the left half is now on top
+
+
+def test_small_images_are_scaled_up_to_the_box(tmp_path):
+    path = _save(tmp_path / "small.png", 40, 20)
+
+    image = read_scaled(path, QSize(200, 200))
+
+    assert (image.width(), image.height()) == (200, 100)
+
+
+def test_undecodable_file_returns_none(tmp_path):
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(b"\xff\xd8\xff")
+
+    assert read_scaled(path, QSize(100, 100)) is None
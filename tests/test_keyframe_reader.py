@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from src import KeyframeReader as reader_module
+from src.KeyframeReader import KeyframeReader
+from src.mp4_boxes import Mp4Info
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Stands in for mp4_boxes.parse: every file is a 10s MP4; records the thread of every read."""
+    reads = []
+
+    def parse(path):
+        reads.append((path, threading.current_thread()))
+        return Mp4Info(10_000_000, 640, 360, [0, 2_000_000])
+
+    monkeypatch.setattr(reader_module.mp4_boxes, "parse", parse)
+    return reads
+
+
+@pytest.fixture
+def reader(qtbot):
+    reader = KeyframeReader(max_entries=2)
+    yield reader
+    reader.shutdown()
+
+
+def test_requested_files_are_read_off_the_gui_thread(qtbot, reader, parsed):
+    with qtbot.waitSignal(reader.read, timeout=5000) as blocker:
+        reader.request("a.mp4")
+        assert reader.is_pending("a.mp4")
+
+    assert blocker.args == ["a.mp4"]
+    assert not reader.is_pending("a.mp4")
+    [(_path, thread)] = parsed
+    assert thread is not threading.main_thread()
+    assert reader.info("a.mp4").keyframes_us == [0, 2_000_000]
+    assert len(parsed) == 1  # from the cache
+
+
+def test_cached_file_is_announced_at_once_without_reading_it_again(qtbot, reader, parsed):
+    reader.info("a.mp4")
+    announced = []
+    reader.read.connect(announced.append)
+
+    reader.request("a.mp4")
+
+    assert announced == ["a.mp4"]
+    assert len(parsed) == 1
+
+
+def test_info_reads_an_uncached_file_right_away(reader, parsed):
+    assert reader.info("a.mp4").duration_ms == 10_000
+    assert parsed == [("a.mp4", threading.main_thread())]
+
+
+def test_least_recently_used_entries_are_dropped_beyond_max_entries(reader, parsed):
+    reader.info("a.mp4")
+    reader.info("b.mp4")
+    reader.info("a.mp4")
+    reader.info("c.mp4")  # drops b, not a
+
+    reader.info("a.mp4")
+    reader.info("b.mp4")
+
+    assert [path for path, _thread in parsed] == ["a.mp4", "b.mp4", "c.mp4", "b.mp4"]
@@ -1,25 +1,34 @@
 import json
 import shutil
+from pathlib import Path
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QColor, QImage, QPixmap
 from PyQt6.QtWidgets import QApplication, QDialog, QFileDialog, QLabel
 
-from src import media_kinds
+from src import media_kinds, preview_strips
 from src.MediaFolderPickerDialog import (
     BUSY_INDICATOR_DELAY_MS,
     GRID_MARGIN,
     GRID_SPACING,
+    MAX_VIDEO_THUMBNAILS,
     THUMBNAIL_CELL_SIZE,
+    THUMBNAIL_IMAGE_SIZE,
     MediaFolderPickerDialog,
 )
+from src.VideoHashScanner import VideoHashScanner
+
+# The media index sniffs content, so sample files need a real signature, not just a name.
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+MP4_HEADER = b"\x00\x00\x00\x18ftypisom"
+GIF_HEADER = b"GIF89a"
 
 
 def _make_folder_with_files(tmp_path, name, count):
     folder = tmp_path / name
     folder.mkdir()
     for i in range(count):
-        (folder / f"img{i}.png").write_bytes(b"x")
+        (folder / f"img{i}.png").write_bytes(PNG_HEADER)
     return str(folder)
 
 
@@ -27,7 +36,7 @@ def _make_folder_with_videos(tmp_path, name, count):
     folder = tmp_path / name
     folder.mkdir()
     for i in range(count):
-        (folder / f"clip{i}.mp4").write_bytes(b"x")
+        (folder / f"clip{i}.mp4").write_bytes(MP4_HEADER)
     return str(folder)
 
 
@@ -157,18 +166,13 @@ def test_cancel_does_not_persist_folders(app, qtbot, tmp_path):
     assert app.settings.value("GoonerApp/last_selected_folders") is None
 
 
-def _attach_fake_movie(widget):
-    stopped = []
-    widget._movie = type("FakeMovie", (), {"stop": lambda self: stopped.append(True)})()
-    return stopped
+def _animate_gif(dialog, widget):
+    # Never decoded (there's no such file) - the cell just stays registered as waiting.
+    dialog._gif_animator.add(widget, "never-written.gif")
 
 
-def _attach_fake_player(widget):
-    stopped = []
-    widget._player = type(
-        "FakePlayer", (), {"setSource": lambda self, url: None, "stop": lambda self: stopped.append(True)}
-    )()
-    return stopped
+def _animate(dialog, widget):
+    dialog._preview_animator.add(widget, [QPixmap(4, 4), QPixmap(4, 4)])
 
 
 def test_accept_stops_live_cells(app, qtbot, tmp_path):
@@ -176,13 +180,14 @@ def test_accept_stops_live_cells(app, qtbot, tmp_path):
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
     qtbot.addWidget(dialog)
 
-    movie_stopped = _attach_fake_movie(dialog._thumbnail_cells[0])
-    player_stopped = _attach_fake_player(dialog._thumbnail_cells[0])
+    cell = dialog._thumbnail_cells[0]
+    _animate_gif(dialog, cell)
+    _animate(dialog, cell)
 
     dialog._on_start()
 
-    assert movie_stopped == [True]
-    assert player_stopped == [True]
+    assert not dialog._gif_animator.is_animating(cell)
+    assert not dialog._preview_animator.is_animating(cell)
 
 
 def test_reject_stops_live_cells(app, qtbot, tmp_path):
@@ -190,13 +195,14 @@ def test_reject_stops_live_cells(app, qtbot, tmp_path):
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
     qtbot.addWidget(dialog)
 
-    movie_stopped = _attach_fake_movie(dialog._thumbnail_cells[0])
-    player_stopped = _attach_fake_player(dialog._thumbnail_cells[0])
+    cell = dialog._thumbnail_cells[0]
+    _animate_gif(dialog, cell)
+    _animate(dialog, cell)
 
     dialog.reject()
 
-    assert movie_stopped == [True]
-    assert player_stopped == [True]
+    assert not dialog._gif_animator.is_animating(cell)
+    assert not dialog._preview_animator.is_animating(cell)
 
 
 def test_closing_via_done_directly_stops_live_cells(app, qtbot, tmp_path):
@@ -206,11 +212,12 @@ def test_closing_via_done_directly_stops_live_cells(app, qtbot, tmp_path):
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
     qtbot.addWidget(dialog)
 
-    movie_stopped = _attach_fake_movie(dialog._thumbnail_cells[0])
+    cell = dialog._thumbnail_cells[0]
+    _animate_gif(dialog, cell)
 
     dialog.done(QDialog.DialogCode.Rejected)
 
-    assert movie_stopped == [True]
+    assert not dialog._gif_animator.is_animating(cell)
 
 
 def test_thumbnail_grid_count_matches_computed_grid_size(app, qtbot, tmp_path):
@@ -362,9 +369,9 @@ def test_grid_footprint_never_exceeds_viewport_width(app, qtbot, monkeypatch):
 
 # --- animated thumbnails ---
 #
-# None of these tests may construct a real QMovie/QMediaPlayer against a real media file -
+# None of these tests may construct a real QMediaPlayer against a real media file -
 # same reasoning as never touching a real QSoundEffect/QMediaPlayer elsewhere in this suite.
-# _grab_video_frame and _make_video_loop_cell are always monkeypatched away before any
+# _grab_video_frame and _grab_preview_strip are always monkeypatched away before any
 # folder containing a (fake, garbage-bytes) .mp4 file gets scanned.
 
 
@@ -379,7 +386,7 @@ def test_gif_kind_dispatches_to_make_gif_cell(app, qtbot, monkeypatch, tmp_path)
     monkeypatch.setattr(MediaFolderPickerDialog, "_make_gif_cell", lambda self, path: QLabel("gif-stub"))
     folder = tmp_path / "a"
     folder.mkdir()
-    (folder / "clip.gif").write_bytes(b"x")
+    (folder / "clip.gif").write_bytes(GIF_HEADER)
 
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[str(folder)])
     qtbot.addWidget(dialog)
@@ -388,6 +395,20 @@ def test_gif_kind_dispatches_to_make_gif_cell(app, qtbot, monkeypatch, tmp_path)
     assert dialog._thumbnail_cells[0].text() == "gif-stub"
 
 
+def test_cells_are_chosen_by_sniffed_kind_not_extension(app, qtbot, monkeypatch, tmp_path):
+    monkeypatch.setattr(MediaFolderPickerDialog, "_make_gif_cell", lambda self, path: QLabel("gif-stub"))
+    monkeypatch.setattr(MediaFolderPickerDialog, "_make_video_frame_cell", lambda self, path: QLabel("video-stub"))
+    folder = tmp_path / "a"
+    folder.mkdir()
+    (folder / "really_a_gif.mp4").write_bytes(GIF_HEADER)
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[str(folder)])
+    qtbot.addWidget(dialog)
+
+    assert [cell.text() for cell in dialog._thumbnail_cells] == ["gif-stub"]
+    assert not dialog._is_video(folder / "really_a_gif.mp4")
+
+
 def test_video_kind_uses_grab_video_frame_when_checkbox_unchecked(app, qtbot, monkeypatch, tmp_path):
     calls = []
     monkeypatch.setattr(
@@ -395,7 +416,7 @@ def test_video_kind_uses_grab_video_frame_when_checkbox_unchecked(app, qtbot, mo
     )
     monkeypatch.setattr(
         MediaFolderPickerDialog,
-        "_make_video_loop_cell",
+        "_make_video_preview_cell",
         lambda self, path: (_ for _ in ()).throw(AssertionError("should not animate when unchecked")),
     )
     folder = _make_folder_with_videos(tmp_path, "a", 1)
@@ -406,16 +427,108 @@ def test_video_kind_uses_grab_video_frame_when_checkbox_unchecked(app, qtbot, mo
     assert len(calls) == 1
 
 
-def test_video_kind_uses_video_loop_cell_when_checkbox_checked(app, qtbot, monkeypatch, tmp_path):
+def _make_folder_with_real_images(tmp_path, name, count):
+    folder = tmp_path / name
+    folder.mkdir()
+    for i in range(count):
+        image = QImage(300, 200, QImage.Format.Format_RGB32)
+        image.fill(Qt.GlobalColor.blue)
+        image.save(str(folder / f"img{i}.png"))
+    return str(folder)
+
+
+def test_first_grid_is_drawn_from_already_cached_thumbnails(app, qtbot, tmp_path, monkeypatch):
+    folder = _make_folder_with_real_images(tmp_path, "a", 60)
+    cached = Path(folder) / "img7.png"
+    app.thumbnail_cache.put(cached, THUMBNAIL_IMAGE_SIZE, QImage(8, 8, QImage.Format.Format_RGB32))
+    monkeypatch.setattr(MediaFolderPickerDialog, "_current_grid_dimensions", lambda self: (2, 1, 2))
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    assert cached in dialog._current_thumbnails
+    assert dialog._prefer_cached_thumbnails is False  # later resamples draw from everything
+
+
+def test_image_cells_start_as_placeholders_and_fill_in_off_the_gui_thread(app, qtbot, tmp_path):
+    folder = _make_folder_with_real_images(tmp_path, "a", 3)
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    assert len(dialog._thumbnail_cells) == 3
+    qtbot.waitUntil(lambda: not dialog._pending_cells, timeout=5000)
+    assert all(not cell.pixmap().isNull() for cell in dialog._thumbnail_cells)
+
+
+def test_undecodable_image_cell_falls_back_to_the_file_name(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 1)
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    qtbot.waitUntil(lambda: not dialog._pending_cells, timeout=5000)
+    assert dialog._thumbnail_cells[0].text() == "img0.png"
+
+
+def test_discarded_cells_cancel_their_pending_thumbnail(app, qtbot, tmp_path):
+    folder = _make_folder_with_real_images(tmp_path, "a", 3)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    pending = list(dialog._pending_cells)
+
+    dialog.folder_list.setCurrentRow(0)
+    dialog._on_remove_folder()
+
+    assert dialog._pending_cells == {}
+    assert not any(dialog._thumbnail_loader.is_pending(path) for path in pending)
+
+
+def test_video_thumbnail_is_grabbed_once_and_then_served_from_the_cache(app, qtbot, monkeypatch, tmp_path):
+    calls = []
+
+    def grab(self, path):
+        calls.append(path)
+        image = QImage(40, 30, QImage.Format.Format_RGB32)
+        image.fill(Qt.GlobalColor.red)
+        self._frame_grabber.frame_grabbed.emit(Path(path), self._frame_grabber._as_thumbnail(Path(path), image))
+
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", grab)
+    folder = _make_folder_with_videos(tmp_path, "a", 1)
+
+    for _ in range(2):
+        dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+        qtbot.addWidget(dialog)
+
+    assert len(calls) == 1
+    assert dialog._thumbnail_cells[0].pixmap().size() == QSize(40, 30)
+
+
+def test_video_cell_is_a_placeholder_until_its_frame_is_grabbed(app, qtbot, monkeypatch, tmp_path):
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", lambda self, path: None)
+    folder = _make_folder_with_videos(tmp_path, "a", 1)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    [video] = dialog._pending_cells
+    cell = dialog._thumbnail_cells[0]
+    assert cell.pixmap().isNull()
+
+    dialog._on_video_frame_grabbed(video, None)
+
+    assert dialog._pending_cells == {}
+    assert cell.text() == video.name
+
+
+def test_video_kind_uses_video_preview_cell_when_checkbox_checked(app, qtbot, monkeypatch, tmp_path):
     # Construction happens with the checkbox at its unchecked default, so
     # _grab_video_frame legitimately fires once during initial build - only assert on
-    # _make_video_loop_cell, which must fire once the checkbox is then switched on.
+    # _make_video_preview_cell, which must fire once the checkbox is then switched on.
     monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", lambda self, path: None)
     calls = []
     monkeypatch.setattr(
         MediaFolderPickerDialog,
-        "_make_video_loop_cell",
-        lambda self, path: (calls.append(path), QLabel("video-loop-stub"))[1],
+        "_make_video_preview_cell",
+        lambda self, path: (calls.append(path), QLabel("video-preview-stub"))[1],
     )
     folder = _make_folder_with_videos(tmp_path, "a", 1)
 
@@ -428,7 +541,7 @@ def test_video_kind_uses_video_loop_cell_when_checkbox_checked(app, qtbot, monke
 
 def test_toggling_animate_videos_rebuilds_cells_without_resampling(app, qtbot, monkeypatch, tmp_path):
     monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", lambda self, path: None)
-    monkeypatch.setattr(MediaFolderPickerDialog, "_make_video_loop_cell", lambda self, path: QLabel("loop"))
+    monkeypatch.setattr(MediaFolderPickerDialog, "_make_video_preview_cell", lambda self, path: QLabel("preview"))
     folder = _make_folder_with_videos(tmp_path, "a", 1)
 
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
@@ -440,56 +553,100 @@ def test_toggling_animate_videos_rebuilds_cells_without_resampling(app, qtbot, m
     assert dialog._current_thumbnails == thumbnails_before
 
 
-def test_discard_cell_stops_movie_if_present(app, qtbot):
-    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[])
+def _strip_frames(count):
+    frames = []
+    for i in range(count):
+        frame = QImage(40, 30, QImage.Format.Format_RGB32)
+        frame.fill(QColor(i * 20, 100, 100))
+        frames.append(frame)
+    return frames
+
+
+def test_preview_strip_animates_and_is_then_served_from_the_cache(app, qtbot, monkeypatch, tmp_path):
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", lambda self, path: None)
+    strip_calls = []
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_preview_strip", lambda self, path: strip_calls.append(path))
+    folder = _make_folder_with_videos(tmp_path, "a", 1)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
     qtbot.addWidget(dialog)
+    dialog.animate_videos_checkbox.setChecked(True)
+    [video] = strip_calls
 
-    widget = QLabel()
-    stopped = []
-    widget._movie = type("FakeMovie", (), {"stop": lambda self: stopped.append(True)})()
+    dialog._on_preview_strip_grabbed(video, _strip_frames(preview_strips.PREVIEW_STRIP_FRAMES))
 
-    dialog._discard_cell(widget)
+    assert dialog._preview_animator.is_animating(dialog._thumbnail_cells[0])
+    assert dialog._pending_cells == {}
 
-    assert stopped == [True]
+    again = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(again)
+    again.animate_videos_checkbox.setChecked(True)
+
+    assert strip_calls == [video]
+    assert again._preview_animator.is_animating(again._thumbnail_cells[0])
+    assert again._thumbnail_cells[0].pixmap().size() == QSize(40, 30)
+
+
+def test_failed_preview_strip_falls_back_to_a_still_frame(app, qtbot, monkeypatch, tmp_path):
+    still_calls = []
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_video_frame", lambda self, path: still_calls.append(path))
+    monkeypatch.setattr(MediaFolderPickerDialog, "_grab_preview_strip", lambda self, path: None)
+    folder = _make_folder_with_videos(tmp_path, "a", 1)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    dialog.animate_videos_checkbox.setChecked(True)
+    [video] = dialog._pending_cells
+    still_calls.clear()
+
+    dialog._on_preview_strip_grabbed(video, [])
+
+    assert still_calls == [video]
+    assert video in dialog._pending_cells
+
+
+def test_browse_all_lists_every_file_and_follows_scans(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 300)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    model = dialog.thumbnail_browser.browser_model
+    assert model.rowCount() == 0
+
+    dialog.browse_all_checkbox.setChecked(True)
 
+    assert dialog.preview_stack.currentWidget() is dialog.thumbnail_browser
+    assert model.rowCount() == 300
 
-def test_discard_cell_stops_player_if_present(app, qtbot):
+    extra = Path(folder) / "late.png"
+    extra.write_bytes(PNG_HEADER)
+    dialog._on_folder_files_changed(folder, [extra], [])
+    assert model.rowCount() == 301
+
+    dialog.browse_all_checkbox.setChecked(False)
+
+    assert dialog.preview_stack.currentWidget() is dialog.thumbnail_scroll
+    assert model.rowCount() == 0
+
+
+def test_discard_cell_stops_animating_a_gif(app, qtbot):
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[])
     qtbot.addWidget(dialog)
 
     widget = QLabel()
-    stopped = []
-    widget._player = type(
-        "FakePlayer", (), {"setSource": lambda self, url: None, "stop": lambda self: stopped.append(True)}
-    )()
+    _animate_gif(dialog, widget)
 
     dialog._discard_cell(widget)
 
-    assert stopped == [True]
+    assert not dialog._gif_animator.is_animating(widget)
 
 
-def test_discard_cell_clears_source_before_stopping_player(app, qtbot):
-    """Regression guard: measured against a real file, calling player.stop() while a
-    QVideoWidget output is still attached to an actively-playing source hangs
-    indefinitely - clearing the source first avoids that, but only if it happens
-    strictly BEFORE stop()."""
+def test_discard_cell_stops_animating_a_preview(app, qtbot):
     dialog = MediaFolderPickerDialog(parent=app, initial_folders=[])
     qtbot.addWidget(dialog)
-
     widget = QLabel()
-    calls = []
-    widget._player = type(
-        "FakePlayer",
-        (),
-        {
-            "setSource": lambda self, url: calls.append(("setSource", url)),
-            "stop": lambda self: calls.append(("stop",)),
-        },
-    )()
+    _animate(dialog, widget)
 
     dialog._discard_cell(widget)
 
-    assert [c[0] for c in calls] == ["setSource", "stop"]
+    assert not dialog._preview_animator.is_animating(widget)
 
 
 def test_discard_cell_handles_plain_widget_without_error(app, qtbot):
@@ -508,7 +665,7 @@ def test_video_cap_enforced_on_initial_refresh(app, qtbot, monkeypatch, tmp_path
     qtbot.addWidget(dialog)
 
     video_count = sum(1 for p in dialog._current_thumbnails if dialog._is_video(p))
-    assert video_count <= 4
+    assert video_count <= MAX_VIDEO_THUMBNAILS
 
 
 def test_video_cap_enforced_after_growing_via_resize(app, qtbot, monkeypatch, tmp_path):
@@ -522,46 +679,14 @@ def test_video_cap_enforced_after_growing_via_resize(app, qtbot, monkeypatch, tm
     dialog._adjust_thumbnail_count(40, columns=6)
 
     video_count = sum(1 for p in dialog._current_thumbnails if dialog._is_video(p))
-    assert video_count <= 4
-
-
-# --- black-frame detection (real QImage objects - no multimedia backend involved) ---
-
-
-def _solid_image(color):
-    image = QImage(16, 16, QImage.Format.Format_RGB32)
-    image.fill(color)
-    return image
-
-
-def test_is_mostly_black_detects_a_black_frame():
-    assert MediaFolderPickerDialog._is_mostly_black(_solid_image(0x000000)) is True
-
-
-def test_is_mostly_black_rejects_a_bright_frame():
-    assert MediaFolderPickerDialog._is_mostly_black(_solid_image(0xFF00BF)) is False
-
-
-def test_is_mostly_black_respects_custom_threshold():
-    dark_gray = _solid_image(0x101010)  # average channel value 16
-    assert MediaFolderPickerDialog._is_mostly_black(dark_gray, threshold=10) is False
-    assert MediaFolderPickerDialog._is_mostly_black(dark_gray, threshold=20) is True
-
-
-def test_average_brightness_orders_dark_to_bright():
-    black = _solid_image(0x000000)
-    dark_gray = _solid_image(0x101010)
-    bright = _solid_image(0xFF00BF)
-
-    assert MediaFolderPickerDialog._average_brightness(black) < MediaFolderPickerDialog._average_brightness(dark_gray)
-    assert MediaFolderPickerDialog._average_brightness(dark_gray) < MediaFolderPickerDialog._average_brightness(bright)
+    assert video_count <= MAX_VIDEO_THUMBNAILS
 
 
 # --- reentrancy guard ---
 #
-# _grab_video_frame blocks for up to several seconds pumping app.processEvents(), which can
-# let a pending resize-debounce timeout (or a button click) dispatch *while* a rebuild is
-# still mid-flight, mutating the same _thumbnail_cells/_current_thumbnails lists. These tests
+# Anything that pumps the event loop mid-rebuild can let a pending resize-debounce timeout
+# (or a button click) dispatch *while* a rebuild is still mid-flight, mutating the same
+# _thumbnail_cells/_current_thumbnails lists. These tests
 # simulate "already mid-rebuild" directly rather than trying to time a real reentrant call.
 
 
@@ -680,9 +805,9 @@ def test_adding_a_folder_does_not_rewalk_previously_scanned_folders(app, qtbot,
     calls = []
     original = media_kinds.find_supported_files
 
-    def spy(folder):
+    def spy(folder, **kwargs):
         calls.append(folder)
-        return original(folder)
+        return original(folder, **kwargs)
 
     monkeypatch.setattr(media_kinds, "find_supported_files", spy)
     monkeypatch.setattr(QFileDialog, "getExistingDirectory", lambda *a, **k: folder_b)
@@ -702,7 +827,7 @@ def test_removing_a_folder_does_not_rescan_remaining_folders(app, qtbot, monkeyp
     qtbot.addWidget(dialog)
 
     calls = []
-    monkeypatch.setattr(media_kinds, "find_supported_files", lambda folder: calls.append(folder) or [])
+    monkeypatch.setattr(media_kinds, "find_supported_files", lambda folder, **kwargs: calls.append(folder) or [])
 
     dialog.folder_list.setCurrentRow(0)
     dialog._on_remove_folder()
@@ -722,3 +847,306 @@ def test_rescan_invalidates_cache_for_a_folder_that_disappeared(app, qtbot, tmp_
     dialog._rescan_and_refresh()
 
     assert dialog._per_folder_files[folder_a] == []
+
+
+def test_folder_scans_go_through_the_app_media_index(app, qtbot, monkeypatch, tmp_path):
+    folder_a = _make_folder_with_files(tmp_path, "a", 3)
+    scanned = []
+    original = app.media_index.scan
+    monkeypatch.setattr(app.media_index, "scan", lambda folder: scanned.append(folder) or original(folder))
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder_a])
+    qtbot.addWidget(dialog)
+
+    assert scanned == [folder_a]
+    assert len(dialog._per_folder_files[folder_a]) == 3
+
+
+def test_on_start_skips_files_duplicated_across_folders(app, qtbot, tmp_path):
+    folder_a = _make_folder_with_files(tmp_path, "a", 2)
+    folder_b = tmp_path / "b"
+    folder_b.mkdir()
+    (folder_b / "copy.png").write_bytes(PNG_HEADER)  # same bytes as a/img0.png and a/img1.png
+    (folder_b / "other.png").write_bytes(PNG_HEADER + b"different")
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder_a, str(folder_b)], skip_duplicates=True)
+    qtbot.addWidget(dialog)
+
+    with qtbot.waitSignal(dialog.accepted, timeout=5000):
+        dialog._on_start()
+        assert dialog.btn_start.isEnabled() is False  # hashing runs on the DuplicateFilter thread
+
+    assert sorted(p.name for p in dialog.selected_files) in (["img0.png", "other.png"], ["img1.png", "other.png"])
+
+
+def test_on_start_keeps_duplicates_when_not_asked_to_skip_them(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 3)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    dialog._on_start()
+
+    assert len(dialog.selected_files) == 3
+    assert dialog.deduplicator is None
+    assert dialog.duplicate_filter is None
+
+
+# --- near-duplicate collapsing ---
+
+
+def test_collapse_near_duplicates_defaults_to_unchecked(app, qtbot):
+    dialog = MediaFolderPickerDialog(parent=app)
+    qtbot.addWidget(dialog)
+
+    assert dialog.collapse_near_duplicates_checkbox.isChecked() is False
+    assert dialog._hash_scanners == []
+
+
+def test_ticking_collapse_hashes_the_folder_images_in_the_background(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    dialog.collapse_near_duplicates_checkbox.setChecked(True)
+    qtbot.waitUntil(lambda: not dialog._hash_scanners, timeout=60000)
+
+    assert set(dialog._perceptual_hashes) == set(dialog._per_folder_files[folder])
+
+
+def test_ticking_collapse_hands_videos_to_the_video_hash_scanner(app, qtbot, tmp_path, monkeypatch):
+    folder = _make_folder_with_files(tmp_path, "a", 1)
+    clip = tmp_path / "a" / "clip.mp4"
+    clip.write_bytes(b"\x00\x00\x00\x18ftypisom")
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    handed = []
+    monkeypatch.setattr(VideoHashScanner, "start", lambda scanner: handed.append(list(scanner.files)))
+
+    dialog.collapse_near_duplicates_checkbox.setChecked(True)
+    qtbot.waitUntil(lambda: len(dialog._hash_scanners) == 1, timeout=60000)
+
+    assert handed == [[clip]]
+    assert isinstance(dialog._hash_scanners[0], VideoHashScanner)
+    assert clip not in dialog._perceptual_hashes  # still waiting on its frames
+
+
+def test_near_duplicates_to_skip_keeps_the_largest_copy(app, qtbot, tmp_path):
+    folder = tmp_path / "a"
+    folder.mkdir()
+    small, large, other = folder / "small.png", folder / "large.png", folder / "other.png"
+    small.write_bytes(PNG_HEADER + b"x")
+    large.write_bytes(PNG_HEADER + b"xxxx")
+    other.write_bytes(PNG_HEADER + b"xx")
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[str(folder)])
+    qtbot.addWidget(dialog)
+    dialog._perceptual_hashes = {small: 0b1, large: 0b11, other: (1 << 64) - 1}
+
+    assert dialog._near_duplicates_to_skip([small, large, other]) == {small}
+
+
+def test_on_start_collapses_near_duplicates_and_persists_the_choice(app, qtbot, tmp_path):
+    folder = tmp_path / "a"
+    folder.mkdir()
+    small, large = folder / "small.png", folder / "large.png"
+    small.write_bytes(PNG_HEADER + b"x")
+    large.write_bytes(PNG_HEADER + b"xxxx")
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[str(folder)])
+    qtbot.addWidget(dialog)
+    dialog.collapse_near_duplicates_checkbox.blockSignals(True)
+    dialog.collapse_near_duplicates_checkbox.setChecked(True)
+    dialog._perceptual_hashes = {small: 0, large: 0}
+
+    dialog._on_start()
+
+    assert dialog.selected_files == [large]
+    assert app.settings.value("GoonerApp/collapse_near_duplicates", type=bool) is True
+
+
+def test_reject_stops_a_running_hash_scan(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    stopped = []
+    dialog._hash_scanners = [type("FakeHashScanner", (), {"stop": lambda self: stopped.append(True)})()]
+
+    dialog.reject()
+
+    assert stopped == [True]
+    assert dialog._hash_scanners == []
+
+
+# --- streaming scan ---
+
+
+def test_stream_scan_fills_folder_files_in_the_background(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 5)
+
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True)
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: not dialog.is_scanning(), timeout=5000)
+
+    assert len(dialog._per_folder_files[folder]) == 5
+    assert dialog.folder_list.item(0).text().endswith("(5 files)")
+    assert dialog.btn_start.isEnabled() is True
+    assert len(dialog._current_thumbnails) == min(dialog._current_grid_count(), 5)
+
+
+def test_stream_scan_batch_from_a_stopped_scanner_is_ignored(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True)
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: not dialog.is_scanning(), timeout=5000)
+    stale_scanner = type("StaleScanner", (), {"folder": folder})()
+
+    dialog._on_batch_found(stale_scanner, [tmp_path / "a" / "ghost.png"])
+
+    assert len(dialog._per_folder_files[folder]) == 2
+
+
+def test_start_while_scanning_hands_the_scan_over(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True)
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: not dialog.is_scanning(), timeout=5000)
+    scanner = type("FakeScanner", (), {"folder": folder, "stop": lambda self: None})()
+    dialog._scanners[folder] = scanner
+
+    dialog._on_start()
+    discovered = []
+    dialog.files_discovered.connect(discovered.append)
+    late = tmp_path / "a" / "late.png"
+    dialog._on_batch_found(scanner, [late])
+
+    assert dialog.is_scanning() is True  # done() left the handed-over scan running
+    assert dialog.late_files == [late]
+    assert discovered == [[late]]
+
+
+def test_handed_over_batches_skip_duplicates_of_started_files(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 1)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True, skip_duplicates=True)
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: not dialog.is_scanning(), timeout=5000)
+    scanner = type("FakeScanner", (), {"folder": folder, "stop": lambda self: None})()
+    dialog._scanners[folder] = scanner
+
+    with qtbot.waitSignal(dialog.accepted, timeout=5000):
+        dialog._on_start()
+    discovered = []
+    dialog.files_discovered.connect(discovered.append)
+    copy = tmp_path / "a" / "copy.png"
+    copy.write_bytes(PNG_HEADER)
+    unique = tmp_path / "a" / "unique.png"
+    unique.write_bytes(PNG_HEADER + b"unique")
+    with qtbot.waitSignal(dialog.files_discovered, timeout=5000):
+        dialog._on_batch_found(scanner, [copy, unique])
+
+    assert dialog.late_files == [unique]
+    assert discovered == [[unique]]
+
+    del dialog._scanners[folder]
+    with qtbot.waitSignal(dialog.scan_finished, timeout=5000):
+        dialog._on_scan_finished(scanner)  # queued behind the batches still being checked
+    assert dialog.is_scanning() is False
+
+
+def test_cancelling_while_checking_for_duplicates_accepts_nothing(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], skip_duplicates=True)
+    qtbot.addWidget(dialog)
+    accepted = []
+    dialog.accepted.connect(lambda: accepted.append(True))
+
+    dialog._on_start()
+    dialog.reject()
+    qtbot.wait(50)
+
+    assert accepted == []
+    assert dialog.duplicate_filter.isRunning() is False
+
+
+def test_rejecting_stops_running_scans(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True)
+    qtbot.addWidget(dialog)
+    stopped = []
+    dialog._scanners[folder] = type("FakeScanner", (), {"folder": folder, "stop": lambda self: stopped.append(True)})()
+
+    dialog.reject()
+
+    assert stopped == [True]
+    assert dialog.is_scanning() is False
+
+
+# --- live folder watching ---
+
+
+def test_scanned_folder_is_watched_and_removed_folder_unwatched(app, qtbot, tmp_path):
+    folder_a = _make_folder_with_files(tmp_path, "a", 2)
+    folder_b = _make_folder_with_files(tmp_path, "b", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder_a, folder_b])
+    qtbot.addWidget(dialog)
+
+    assert dialog._watcher.folders(dialog) == {folder_a, folder_b}
+
+    dialog.folders.remove(folder_a)
+    dialog._rescan_and_refresh()
+
+    assert dialog._watcher.folders(dialog) == {folder_b}
+
+
+def test_stream_scanned_folder_is_watched_once_its_scan_finishes(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder], stream_scan=True)
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: not dialog.is_scanning(), timeout=5000)
+
+    assert dialog._watcher.folders(dialog) == {folder}
+
+
+def test_folder_change_updates_cached_files_label_and_grid(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+    removed = tmp_path / "a" / "img0.png"
+    added = tmp_path / "a" / "renamed.png"
+
+    dialog._on_folder_files_changed(folder, [added], [removed])
+
+    assert set(dialog._per_folder_files[folder]) == {tmp_path / "a" / "img1.png", added}
+    assert dialog.folder_list.item(0).text().endswith("(2 files)")
+    assert removed not in dialog._current_thumbnails
+    assert set(dialog._current_thumbnails) == set(dialog._per_folder_files[folder])
+
+
+def test_external_file_deletion_is_picked_up_live(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 3)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    with qtbot.waitSignal(dialog._watcher.files_changed, timeout=5000):
+        (tmp_path / "a" / "img0.png").unlink()
+
+    assert len(dialog._per_folder_files[folder]) == 2
+    assert dialog.folder_list.item(0).text().endswith("(2 files)")
+
+
+def test_closing_stops_the_watcher(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    dialog.reject()
+
+    assert dialog._watcher.folders() == set()
+
+
+def test_picker_shares_the_sessions_watcher_and_leaves_its_folders_alone(app, qtbot, tmp_path):
+    folder = _make_folder_with_files(tmp_path, "a", 2)
+    app.folder_watcher.watch(folder, owner=app)
+    dialog = MediaFolderPickerDialog(parent=app, initial_folders=[folder])
+    qtbot.addWidget(dialog)
+
+    assert dialog._watcher is app.folder_watcher
+    dialog.reject()
+
+    assert app.folder_watcher.folders(app) == {folder}
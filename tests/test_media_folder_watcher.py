@@ -0,0 +1,108 @@
+import shutil
+
+import pytest
+
+from src.MediaFolderWatcher import MediaFolderWatcher
+
+
+@pytest.fixture
+def library(tmp_path, media_bytes):
+    root = tmp_path / "library"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.png").write_bytes(media_bytes("a.png"))
+    (root / "sub" / "b.mp4").write_bytes(media_bytes("b.mp4"))
+    return root
+
+
+@pytest.fixture
+def watcher(qtbot, media_index, library):
+    media_index.scan(str(library))
+    watcher = MediaFolderWatcher(media_index, debounce_ms=50)
+    watcher.watch(str(library))
+    yield watcher
+    watcher.stop()
+
+
+def test_watch_covers_every_indexed_directory(watcher, library):
+    assert sorted(watcher._watcher.directories()) == [str(library), str(library / "sub")]
+    assert watcher.folders() == {str(library)}
+
+
+def test_added_file_is_reported(qtbot, watcher, library, media_bytes):
+    with qtbot.waitSignal(watcher.files_changed, timeout=5000) as blocker:
+        (library / "sub" / "new.png").write_bytes(media_bytes("new.png"))
+
+    folder, added, removed = blocker.args
+    assert folder == str(library)
+    assert [p.name for p in added] == ["new.png"]
+    assert removed == []
+
+
+def test_rename_is_reported_as_remove_plus_add(qtbot, watcher, library):
+    with qtbot.waitSignal(watcher.files_changed, timeout=5000) as blocker:
+        (library / "a.png").rename(library / "z.png")
+
+    _folder, added, removed = blocker.args
+    assert [p.name for p in added] == ["z.png"]
+    assert [p.name for p in removed] == ["a.png"]
+
+
+def test_burst_of_changes_is_coalesced_into_one_signal(qtbot, watcher, library, media_bytes):
+    emitted = []
+    watcher.files_changed.connect(lambda folder, added, removed: emitted.append(added))
+
+    for i in range(20):
+        (library / f"burst{i}.png").write_bytes(media_bytes("burst.png"))
+    qtbot.waitUntil(lambda: bool(emitted), timeout=5000)
+    qtbot.wait(200)
+
+    assert len(emitted) == 1
+    assert len(emitted[0]) == 20
+
+
+def test_new_subdirectory_is_watched_and_deleted_one_dropped(qtbot, watcher, library, media_bytes):
+    with qtbot.waitSignal(watcher.files_changed, timeout=5000):
+        (library / "fresh").mkdir()
+        (library / "fresh" / "c.png").write_bytes(media_bytes("c.png"))
+    assert str(library / "fresh") in watcher._watcher.directories()
+
+    with qtbot.waitSignal(watcher.files_changed, timeout=5000) as blocker:
+        shutil.rmtree(library / "sub")
+
+    assert [p.name for p in blocker.args[2]] == ["b.mp4"]
+    assert str(library / "sub") not in watcher._watcher.directories()
+
+
+def test_unwatch_stops_reporting(qtbot, watcher, library, media_bytes):
+    watcher.unwatch(str(library))
+
+    assert watcher._watcher.directories() == []
+    with qtbot.assertNotEmitted(watcher.files_changed, wait=300):
+        (library / "new.png").write_bytes(media_bytes("new.png"))
+
+
+def test_a_folder_stays_watched_until_its_last_owner_lets_go(watcher, library):
+    watcher.watch(str(library), owner="picker")
+
+    watcher.unwatch(str(library))
+    assert watcher.folders() == {str(library)}
+    assert watcher.folders("picker") == {str(library)}
+    assert watcher._watcher.directories()
+
+    watcher.release("picker")
+    assert watcher.folders() == set()
+    assert watcher._watcher.directories() == []
+
+
+def test_every_subscriber_hears_about_the_same_change(qtbot, watcher, library):
+    # Two consumers of one index used to race for rescan_directory's diff - whoever
+    # flushed first got the change, the other an empty one.
+    watcher.watch(str(library), owner="picker")
+    heard = {"session": [], "picker": []}
+    watcher.files_changed.connect(lambda folder, added, removed: heard["session"].extend(removed))
+    watcher.files_changed.connect(lambda folder, added, removed: heard["picker"].extend(removed))
+
+    with qtbot.waitSignal(watcher.files_changed, timeout=5000):
+        (library / "a.png").unlink()
+
+    assert heard == {"session": [library / "a.png"], "picker": [library / "a.png"]}
@@ -0,0 +1,294 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from src import media_index as media_index_module
+from src import media_kinds
+from src.media_index import MediaIndex
+
+
+@pytest.fixture
+def library(tmp_path, media_bytes):
+    root = tmp_path / "library"
+    (root / "sub" / "deeper").mkdir(parents=True)
+    (root / "other").mkdir()
+    (root / "a.png").write_bytes(media_bytes("a.png"))
+    (root / "notes.txt").write_bytes(b"x")
+    (root / "sub" / "b.mp4").write_bytes(media_bytes("b.mp4"))
+    (root / "sub" / "deeper" / "c.gif").write_bytes(media_bytes("c.gif"))
+    (root / "other" / "d.jpg").write_bytes(media_bytes("d.jpg"))
+    return root
+
+
+def _names(paths):
+    return sorted(p.name for p in paths)
+
+
+def _bump_mtime(directory):
+    """Forces a visible directory mtime change even on filesystems with coarse timestamps."""
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _count_listings(monkeypatch):
+    listed = []
+    original = media_index_module._list_directory
+
+    def spy(directory, known=None):
+        listed.append(directory)
+        return original(directory, known)
+
+    monkeypatch.setattr(media_index_module, "_list_directory", spy)
+    return listed
+
+
+def test_scan_finds_supported_files_recursively(media_index, library):
+    assert _names(media_index.scan(str(library))) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+
+
+def test_rescan_of_unchanged_folder_lists_no_directory(media_index, library, monkeypatch):
+    media_index.scan(str(library))
+    listed = _count_listings(monkeypatch)
+
+    found = media_index.scan(str(library))
+
+    assert listed == []
+    assert _names(found) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+
+
+def test_rescan_only_relists_the_directory_whose_mtime_changed(media_index, library, monkeypatch, media_bytes):
+    media_index.scan(str(library))
+    (library / "sub" / "new.png").write_bytes(media_bytes("new.png"))
+    _bump_mtime(library / "sub")
+    listed = _count_listings(monkeypatch)
+
+    found = media_index.scan(str(library))
+
+    assert listed == [str(library / "sub")]
+    assert "new.png" in _names(found)
+
+
+def test_removed_subdirectory_drops_its_whole_subtree(media_index, library):
+    media_index.scan(str(library))
+    shutil.rmtree(library / "sub")
+    _bump_mtime(library)
+
+    assert _names(media_index.scan(str(library))) == ["a.png", "d.jpg"]
+
+
+def test_index_survives_a_restart(tmp_path, library, monkeypatch):
+    db_path = tmp_path / "persisted.sqlite3"
+    first = MediaIndex(db_path)
+    first.scan(str(library))
+    first.close()
+
+    listed = _count_listings(monkeypatch)
+    second = MediaIndex(db_path)
+    found = second.scan(str(library))
+    second.close()
+
+    assert listed == []
+    assert _names(found) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+
+
+def test_unreadable_subtree_is_skipped_without_aborting_the_scan(media_index, library, monkeypatch):
+    original = media_index_module._list_directory
+
+    def flaky(directory, known=None):
+        if directory == str(library / "sub"):
+            raise PermissionError("no access")
+        return original(directory, known)
+
+    monkeypatch.setattr(media_index_module, "_list_directory", flaky)
+
+    assert _names(media_index.scan(str(library))) == ["a.png", "d.jpg"]
+
+
+def test_database_errors_fall_back_to_a_plain_listing(media_index, library, monkeypatch):
+    def broken(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(media_index, "_store_directory", broken)
+
+    assert _names(media_index.scan(str(library))) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+
+
+def test_folders_are_indexed_independently(media_index, library):
+    media_index.scan(str(library))
+
+    assert _names(media_index.scan(str(library / "other"))) == ["d.jpg"]
+
+
+def test_unopenable_database_falls_back_to_memory(tmp_path, library):
+    not_a_database = tmp_path / "broken.sqlite3"
+    not_a_database.write_bytes(b"this is not a sqlite file" * 100)
+    index = MediaIndex(not_a_database)
+
+    assert _names(index.scan(str(library))) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+    index.close()
+
+
+def test_find_supported_files_delegates_to_the_index(media_index, library):
+    found = media_kinds.find_supported_files(str(library), index=media_index)
+
+    assert _names(found) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+
+
+def test_rescan_directory_reports_added_and_removed_files(media_index, library, media_bytes):
+    folder = str(library)
+    media_index.scan(folder)
+    (library / "sub" / "b.mp4").rename(library / "sub" / "renamed.mp4")
+    (library / "sub" / "new.png").write_bytes(media_bytes("new.png"))
+    _bump_mtime(library / "sub")
+
+    changes = media_index.rescan_directory(folder, str(library / "sub"))
+
+    assert _names(changes.added) == ["new.png", "renamed.mp4"]
+    assert _names(changes.removed) == ["b.mp4"]
+    assert _names(media_index.scan(folder)) == ["a.png", "c.gif", "d.jpg", "new.png", "renamed.mp4"]
+
+
+def test_relisting_a_directory_only_sniffs_new_or_changed_files(media_index, library, monkeypatch, media_bytes):
+    folder = str(library)
+    (library / "sub" / "kept.jpg").write_bytes(media_bytes("kept.jpg"))
+    media_index.scan(folder)
+    (library / "sub" / "new.png").write_bytes(media_bytes("new.png"))
+    (library / "sub" / "b.mp4").write_bytes(media_bytes("x.gif"))  # now a gif inside
+    _bump_mtime(library / "sub")
+    sniffed = []
+    original = media_kinds.sniff_file_kind
+    monkeypatch.setattr(media_kinds, "sniff_file_kind", lambda path: sniffed.append(path) or original(path))
+
+    changes = media_index.rescan_directory(folder, str(library / "sub"))
+
+    assert sorted(sniffed) == [str(library / "sub" / "b.mp4"), str(library / "sub" / "new.png")]
+    assert _names(changes.added) == ["new.png"]
+    assert media_index.kinds([library / "sub" / "b.mp4"]) == {str(library / "sub" / "b.mp4"): "gif"}
+
+
+def test_rescan_directory_walks_new_subdirectories_but_not_unchanged_ones(
+    media_index, library, monkeypatch, media_bytes
+):
+    folder = str(library)
+    media_index.scan(folder)
+    (library / "fresh" / "nested").mkdir(parents=True)
+    (library / "fresh" / "nested" / "e.png").write_bytes(media_bytes("e.png"))
+    _bump_mtime(library)
+    listed = _count_listings(monkeypatch)
+
+    changes = media_index.rescan_directory(folder, folder)
+
+    assert _names(changes.added) == ["e.png"]
+    assert sorted(changes.directories_added) == [str(library / "fresh"), str(library / "fresh" / "nested")]
+    assert sorted(listed) == [folder, str(library / "fresh"), str(library / "fresh" / "nested")]
+
+
+def test_rescan_directory_of_deleted_directory_reports_its_subtree(media_index, library):
+    folder = str(library)
+    media_index.scan(folder)
+    shutil.rmtree(library / "sub")
+
+    changes = media_index.rescan_directory(folder, str(library / "sub"))
+
+    assert _names(changes.removed) == ["b.mp4", "c.gif"]
+    assert sorted(changes.directories_removed) == [str(library / "sub"), str(library / "sub" / "deeper")]
+    assert str(library / "sub") not in media_index.directories(folder)
+
+
+def test_rescan_directory_of_unchanged_directory_reports_nothing(media_index, library):
+    folder = str(library)
+    media_index.scan(folder)
+
+    assert not media_index.rescan_directory(folder, folder)
+
+
+def test_file_sizes_returns_indexed_sizes_only(media_index, library, media_bytes):
+    media_index.scan(str(library))
+
+    sizes = media_index.file_sizes([library / "sub" / "b.mp4", library / "notes.txt"])
+
+    assert sizes == {str(library / "sub" / "b.mp4"): len(media_bytes("b.mp4"))}
+
+
+def test_content_hashes_only_match_the_same_size_and_mtime(media_index, library):
+    media_index.store_content_hashes([(library / "a.png", 1, 100, b"partial", None)])
+
+    assert media_index.content_hashes(library / "a.png", 1, 100) == (b"partial", None)
+    assert media_index.content_hashes(library / "a.png", 1, 101) == (None, None)
+
+
+def test_perceptual_hashes_round_trip_while_the_file_is_unchanged(media_index, library, media_bytes):
+    media_index.scan(str(library))
+    path = library / "a.png"
+    stat = path.stat()
+    media_index.store_perceptual_hashes([(str(path), stat.st_size, stat.st_mtime_ns, (1 << 64) - 1)])
+    media_index.store_perceptual_hashes([(str(library / "sub" / "b.mp4"), 2, 0, None)])
+
+    assert media_index.perceptual_hashes([path, library / "sub" / "b.mp4"]) == {str(path): (1 << 64) - 1}
+
+    path.write_bytes(media_bytes("a.png", b"changed"))
+    _bump_mtime(library)
+    media_index.scan(str(library))
+
+    assert media_index.perceptual_hashes([path]) == {}
+
+
+def test_scan_skips_files_whose_content_is_not_media(media_index, library):
+    (library / "error_page.mp4").write_bytes(b"<html>Not Found</html>")
+
+    assert "error_page.mp4" not in _names(media_index.scan(str(library)))
+
+
+def test_kinds_are_sniffed_from_content_not_the_extension(media_index, library, media_bytes):
+    (library / "actually_a_gif.png").write_bytes(media_bytes("x.gif"))
+    media_index.scan(str(library))
+
+    kinds = media_index.kinds([library / "actually_a_gif.png", library / "sub" / "b.mp4"])
+
+    assert kinds == {str(library / "actually_a_gif.png"): "gif", str(library / "sub" / "b.mp4"): "video"}
+
+
+def test_kinds_can_include_files_that_turned_out_not_to_be_media(media_index, library):
+    (library / "error_page.mp4").write_bytes(b"<html>Not Found</html>")
+    media_index.scan(str(library))
+
+    assert media_index.kinds([library / "error_page.mp4"]) == {}
+    assert media_index.kinds([library / "error_page.mp4"], include_unknown=True) == {
+        str(library / "error_page.mp4"): "unknown"
+    }
+
+
+def test_database_from_before_content_sniffing_is_rebuilt(tmp_path, library):
+    db_path = tmp_path / "old" / MediaIndex.FILE_NAME
+    db_path.parent.mkdir()
+    connection = sqlite3.connect(str(db_path))
+    connection.executescript(
+        "CREATE TABLE files (folder TEXT, path TEXT, directory TEXT, size INTEGER, mtime_ns INTEGER, kind TEXT);"
+        "INSERT INTO files VALUES ('f', 'stale', 'f', 1, 1, 'image');"
+    )
+    connection.close()
+
+    index = MediaIndex(db_path)
+    try:
+        assert index.kinds(["stale"]) == {}
+        assert _names(index.scan(str(library))) == ["a.png", "b.mp4", "c.gif", "d.jpg"]
+    finally:
+        index.close()
+
+
+def test_metadata_round_trips_while_the_file_is_unchanged(media_index, library, media_bytes):
+    media_index.scan(str(library))
+    path = library / "sub" / "b.mp4"
+    stat = path.stat()
+    metadata = {"width": 640, "height": 360, "duration_ms": 1500, "frame_count": None, "orientation": None}
+    media_index.store_metadata([(str(path), stat.st_size, stat.st_mtime_ns, metadata)])
+
+    assert media_index.metadata([path, library / "a.png"]) == {str(path): metadata}
+
+    path.write_bytes(media_bytes("b.mp4", b"changed"))
+    _bump_mtime(library / "sub")
+    media_index.scan(str(library))
+
+    assert media_index.metadata([path]) == {}
@@ -1,5 +1,10 @@
+import os
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
 from src import media_kinds
 
 
@@ -62,13 +67,114 @@ def test_find_supported_files_empty_folder(tmp_path):
     assert media_kinds.find_supported_files(str(tmp_path)) == []
 
 
-def test_find_supported_files_survives_permission_error(tmp_path, monkeypatch):
+def test_find_supported_files_survives_permission_error_in_one_subtree(tmp_path, monkeypatch):
     (tmp_path / "a.png").write_bytes(b"x")
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "hidden.png").write_bytes(b"x")
+    sibling = tmp_path / "sibling"
+    sibling.mkdir()
+    (sibling / "b.png").write_bytes(b"x")
+    original = media_kinds._scan_directory
 
-    def raising_rglob(self, pattern):
-        raise PermissionError("no access")
-        yield  # pragma: no cover - makes this a generator, matching rglob's real shape
+    def raising_for_locked(directory):
+        if directory == str(locked):
+            raise PermissionError("no access")
+        return original(directory)
 
-    monkeypatch.setattr(Path, "rglob", raising_rglob)
+    monkeypatch.setattr(media_kinds, "_scan_directory", raising_for_locked)
 
-    assert media_kinds.find_supported_files(str(tmp_path)) == []
+    found = media_kinds.find_supported_files(str(tmp_path))
+
+    assert sorted(f.name for f in found) == ["a.png", "b.png"]
+
+
+def test_find_supported_files_missing_folder_returns_empty(tmp_path):
+    assert media_kinds.find_supported_files(str(tmp_path / "does-not-exist")) == []
+
+
+def test_find_supported_files_skips_symlinked_directories(tmp_path):
+    real = tmp_path / "real"
+    real.mkdir()
+    (real / "a.png").write_bytes(b"x")
+    try:
+        os.symlink(real, tmp_path / "link", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not available here")
+
+    found = media_kinds.find_supported_files(str(tmp_path))
+
+    assert [f.parent.name for f in found] == ["real"]
+
+
+def test_iter_supported_files_yields_one_batch_per_directory(tmp_path):
+    for name in ("x", "y"):
+        sub = tmp_path / name
+        sub.mkdir()
+        (sub / "1.png").write_bytes(b"x")
+        (sub / "2.png").write_bytes(b"x")
+
+    batches = [batch for batch in media_kinds.iter_supported_files(str(tmp_path)) if batch]
+
+    assert sorted(len(batch) for batch in batches) == [2, 2]
+
+
+def test_walk_directories_respects_max_workers(tmp_path):
+    for i in range(20):
+        (tmp_path / f"d{i}").mkdir()
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def visit(directory):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.01)
+        with lock:
+            active["now"] -= 1
+        return directory, [entry.path for entry in os.scandir(directory) if entry.is_dir()]
+
+    visited = list(media_kinds.walk_directories(str(tmp_path), visit, max_workers=3))
+
+    assert len(visited) == 21
+    assert active["peak"] <= 3
+
+
+@pytest.mark.parametrize(
+    ("head", "kind"),
+    [
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF", "image"),
+        (b"\x89PNG\r\n\x1a\n", "image"),
+        (b"RIFF\x10\x00\x00\x00WEBPVP8 ", "image"),
+        (b"GIF87a", "gif"),
+        (b"\x00\x00\x00\x18ftypmp42", "video"),
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", "video"),
+        (b"RIFF\x10\x00\x00\x00AVI LIST", "video"),
+        (b"<!DOCTYPE html>", "unknown"),
+        (b"", "unknown"),
+    ],
+)
+def test_sniff_media_kind(head, kind):
+    assert media_kinds.sniff_media_kind(head) == kind
+
+
+def test_sniff_file_kind_of_missing_file_is_unknown(tmp_path):
+    assert media_kinds.sniff_file_kind(tmp_path / "missing.mp4") == "unknown"
+
+
+def test_media_kinds_of_prefers_the_kind_the_index_sniffed(tmp_path, media_index, media_bytes):
+    (tmp_path / "lib").mkdir()
+    png_as_mp4 = tmp_path / "lib" / "still.mp4"
+    png_as_mp4.write_bytes(media_bytes("x.png"))
+    page_as_jpg = tmp_path / "lib" / "error_page.jpg"
+    page_as_jpg.write_bytes(b"<!DOCTYPE html>")
+    media_index.scan(str(tmp_path / "lib"))
+    unlisted = tmp_path / "elsewhere.gif"
+
+    kinds = media_kinds.media_kinds_of([png_as_mp4, page_as_jpg, unlisted], media_index)
+
+    assert kinds == {png_as_mp4: "image", page_as_jpg: "unknown", unlisted: "gif"}
+
+
+def test_media_kinds_of_without_an_index_goes_by_extension(tmp_path):
+    assert media_kinds.media_kinds_of([tmp_path / "a.mp4"]) == {tmp_path / "a.mp4": "video"}
@@ -0,0 +1,96 @@
+import pytest
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+
+from src import media_metadata, mp4_boxes
+
+
+def _save_image(path, width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(40, 80, 120))
+    assert image.save(str(path))
+    return path
+
+
+def test_probe_image_reads_size_without_decoding(tmp_path):
+    path = _save_image(tmp_path / "a.png", 48, 30)
+
+    metadata = media_metadata.probe_file(path)
+
+    assert metadata == {"width": 48, "height": 30, "duration_ms": None, "frame_count": None, "orientation": 0}
+
+
+def _gif_bytes(frames):
+    """A 1x1 GIF with `frames` frames - Qt has no GIF writer."""
+    header = b"GIF89a" + b"\x01\x00\x01\x00" + b"\x80\x00\x00" + b"\x00\x00\x00\xff\xff\xff"
+    frame = b"\x21\xf9\x04\x00\x0a\x00\x00\x00" + b"\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00" + b"\x02\x02\x44\x01\x00"
+    return header + frame * frames + b"\x3b"
+
+
+def test_probe_gif_counts_frames(tmp_path):
+    path = tmp_path / "a.gif"
+    path.write_bytes(_gif_bytes(3))
+
+    metadata = media_metadata.probe_file(path)
+
+    assert (metadata["width"], metadata["height"], metadata["frame_count"]) == (1, 1, 3)
+
+
+def test_unreadable_and_video_files_probe_empty(tmp_path):
+    (tmp_path / "broken.png").write_bytes(b"\x89PNG\r\n\x1a\nnot really")
+    (tmp_path / "clip.mp4").write_bytes(b"\x00\x00\x00\x18ftypisom")
+
+    assert media_metadata.probe_file(tmp_path / "broken.png") == media_metadata.empty_metadata()
+    assert media_metadata.probe_file(tmp_path / "clip.mp4") == media_metadata.empty_metadata()
+
+
+def test_probe_files_keys_results_by_stat_and_skips_missing_files(tmp_path):
+    path = _save_image(tmp_path / "a.png", 8, 4)
+    stat = path.stat()
+
+    rows = media_metadata.probe_files([str(path), str(tmp_path / "gone.png")])
+
+    assert rows == [(str(path), stat.st_size, stat.st_mtime_ns, media_metadata.probe_file(path))]
+
+
+@pytest.mark.parametrize(
+    ("duration_ms", "min_duration_s", "expected"),
+    [(2000, 1.5, 1), (500, 1.5, 3), (400, 1.5, 4), (1500, 1.5, 1), (None, 1.5, 1), (0, 1.5, 1), (1000, 0, 1)],
+)
+def test_loops_for_min_duration(duration_ms, min_duration_s, expected):
+    assert media_metadata.loops_for_min_duration(duration_ms, min_duration_s) == expected
+
+
+@pytest.mark.parametrize(("duration_ms", "clip_ms"), [(None, 5000), (0, 5000), (5000, 5000), (3000, 5000)])
+def test_clip_start_is_none_for_unknown_or_short_videos(duration_ms, clip_ms):
+    assert media_metadata.clip_start_ms(duration_ms, clip_ms) is None
+
+
+def test_clip_start_leaves_a_whole_window_before_the_end():
+    starts = {media_metadata.clip_start_ms(10_000, 4000) for _ in range(200)}
+
+    assert min(starts) >= 0
+    assert max(starts) <= 6000
+    assert len(starts) > 1
+
+
+def test_clip_start_moves_back_to_a_keyframe():
+    info = mp4_boxes.Mp4Info(60_000_000, None, None, [0, 2_000_000, 4_000_000, 30_000_000])
+
+    starts = {media_metadata.clip_start_ms(60_000, 5000, info) for _ in range(200)}
+
+    assert starts <= {0, 2000, 4000, 30_000}
+
+
+def test_store_video_metadata_records_duration_and_resolution(tmp_path, media_index):
+    clip = tmp_path / "lib" / "clip.mp4"
+    clip.parent.mkdir()
+    clip.write_bytes(b"\x00\x00\x00\x18ftypisom")
+    media_index.scan(str(tmp_path / "lib"))
+
+    media_metadata.store_video_metadata(media_index, clip, 2500, QSize(1280, 720))
+    media_metadata.store_video_metadata(media_index, tmp_path / "lib" / "gone.mp4", 2500)
+
+    assert media_index.metadata([clip]) == {
+        str(clip): {"width": 1280, "height": 720, "duration_ms": 2500, "frame_count": None, "orientation": None}
+    }
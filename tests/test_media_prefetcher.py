@@ -0,0 +1,188 @@
+import threading
+
+import pytest
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+
+from src import MediaPrefetcher as prefetcher_module
+from src.display_cache import DisplayCache
+from src.MediaPrefetcher import MediaPrefetcher
+
+
+@pytest.fixture
+def prefetcher(qtbot):
+    prefetcher = MediaPrefetcher(max_threads=2)
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+def _save_image(path, width=400, height=200):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(200, 40, 90))
+    assert image.save(str(path))
+    return path
+
+
+def test_prefetched_images_are_decoded_at_display_size(qtbot, tmp_path, prefetcher):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(3)]
+    box = QSize(100, 100)
+
+    prefetcher.prefetch(paths, box)
+    qtbot.waitUntil(lambda: all(prefetcher.is_ready(path, box) for path in paths), timeout=5000)
+
+    pixmap = prefetcher.take(str(paths[1]), box)
+    assert (pixmap.width(), pixmap.height()) == (100, 50)
+    assert prefetcher.cache.total_bytes == 3 * 100 * 50 * 4
+
+
+def test_results_are_keyed_by_box(qtbot, tmp_path, prefetcher):
+    path = _save_image(tmp_path / "a.png")
+    prefetcher.prefetch([path], QSize(100, 100))
+    qtbot.waitUntil(lambda: prefetcher.is_ready(path, QSize(100, 100)), timeout=5000)
+
+    assert prefetcher.take(path, QSize(300, 300)) is None
+
+
+def test_moving_the_window_only_queues_what_is_not_cached(qtbot, tmp_path, prefetcher):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(3)]
+    box = QSize(100, 100)
+    prefetcher.prefetch(paths[:2], box)
+    qtbot.waitUntil(lambda: all(prefetcher.is_ready(path, box) for path in paths[:2]), timeout=5000)
+
+    prefetcher.prefetch(paths[1:], box)
+
+    assert not prefetcher.is_pending(paths[1], box)  # cached, not decoded again
+    assert prefetcher.is_pending(paths[2], box)
+    qtbot.waitUntil(lambda: prefetcher.is_ready(paths[2], box), timeout=5000)
+    assert prefetcher.is_ready(paths[0], box)  # left the window, but still in the cache
+
+
+def test_going_back_and_forth_never_decodes_twice(qtbot, tmp_path, prefetcher, monkeypatch):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(2)]
+    box = QSize(100, 100)
+    prefetcher.prefetch(paths, box)
+    qtbot.waitUntil(lambda: all(prefetcher.is_ready(path, box) for path in paths), timeout=5000)
+    monkeypatch.setattr(prefetcher_module.image_loading, "read_scaled", lambda *args: pytest.fail("decoded twice"))
+
+    for _ in range(3):
+        for path in paths:
+            prefetcher.prefetch(paths, box)
+            assert prefetcher.take(path, box) is not None
+
+    assert prefetcher.cache.hits == 6
+    assert prefetcher.cache.misses == 0
+
+
+def test_a_decode_finishing_after_its_file_left_the_window_is_dropped(qtbot, tmp_path, prefetcher):
+    path = _save_image(tmp_path / "a.png")
+    box = QSize(100, 100)
+    prefetcher.prefetch([path], box)
+    job = prefetcher._wanted[DisplayCache.key(path, box)]
+
+    prefetcher.prefetch([], box)
+    job.image = QImage(10, 10, QImage.Format.Format_RGB32)
+    prefetcher._deliver(job)
+
+    assert not prefetcher.is_ready(path, box)
+
+
+def test_ready_is_announced_per_file_with_its_size_and_ratio(qtbot, tmp_path, prefetcher):
+    path = _save_image(tmp_path / "a.png")
+    box = QSize(200, 200)
+
+    with qtbot.waitSignal(prefetcher.ready, timeout=5000) as blocker:
+        prefetcher.prefetch([path], box, 2.0)
+
+    assert blocker.args == [path, box, 2.0]
+    pixmap = prefetcher.take(path, box, 2.0)
+    assert (pixmap.width(), pixmap.height()) == (200, 100)
+    assert pixmap.devicePixelRatio() == 2.0
+    assert not prefetcher.is_ready(path, box)  # the same pixels at ratio 1 are another entry
+
+
+def test_undecodable_file_is_not_queued_again(qtbot, tmp_path, prefetcher):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    box = QSize(100, 100)
+
+    prefetcher.prefetch([path], box)
+    qtbot.waitUntil(lambda: prefetcher.is_ready(path, box), timeout=5000)
+    prefetcher.prefetch([path], box)
+
+    assert not prefetcher.is_pending(path, box)
+    assert prefetcher.take(path, box) is None
+
+
+def test_cancel_all_withdraws_queued_decodes(qtbot, tmp_path, prefetcher):
+    path = _save_image(tmp_path / "a.png")
+    box = QSize(100, 100)
+    prefetcher.prefetch([path], box)
+
+    prefetcher.cancel_all()
+
+    assert not prefetcher.is_pending(path, box)
+
+
+def test_cancel_all_forgets_undecodable_files(qtbot, tmp_path, prefetcher):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    box = QSize(100, 100)
+    prefetcher.prefetch([path], box)
+    qtbot.waitUntil(lambda: prefetcher.is_ready(path, box), timeout=5000)
+
+    prefetcher.cancel_all()  # a new playlist
+    prefetcher.prefetch([path], box)
+
+    assert prefetcher.is_pending(path, box)
+
+
+def _hold_decodes(monkeypatch):
+    """Makes every decode wait for the returned `release` event; `started` lists the files
+    whose decode began."""
+    started, release = [], threading.Event()
+    original = prefetcher_module.image_loading.read_scaled
+
+    def held(path, box):
+        started.append(path)
+        release.wait(5)
+        return original(path, box)
+
+    monkeypatch.setattr(prefetcher_module.image_loading, "read_scaled", held)
+    return started, release
+
+
+def test_wait_for_takes_the_result_of_the_decode_already_running(qtbot, tmp_path, prefetcher, monkeypatch):
+    path = _save_image(tmp_path / "a.png")
+    box = QSize(100, 100)
+    started, release = _hold_decodes(monkeypatch)
+    prefetcher.prefetch([path], box)
+    qtbot.waitUntil(lambda: started == [path], timeout=5000)
+    threading.Timer(0.05, release.set).start()
+
+    pixmap = prefetcher.wait_for(path, box)
+
+    assert (pixmap.width(), pixmap.height()) == (100, 50)
+    assert started == [path]
+    assert not prefetcher.is_pending(path, box)
+    assert prefetcher.take(path, box) is not None
+
+
+def test_wait_for_withdraws_a_decode_that_has_not_started(qtbot, tmp_path, monkeypatch):
+    prefetcher = MediaPrefetcher(max_threads=1)
+    first, second = (_save_image(tmp_path / f"{i}.png") for i in range(2))
+    box = QSize(100, 100)
+    started, release = _hold_decodes(monkeypatch)
+    prefetcher.prefetch([first, second], box)
+    qtbot.waitUntil(lambda: started == [first], timeout=5000)
+
+    assert prefetcher.wait_for(second, box) is None  # decode it directly instead
+    assert not prefetcher.is_pending(second, box)
+
+    release.set()
+    qtbot.waitUntil(lambda: prefetcher.is_ready(first, box), timeout=5000)
+    prefetcher.shutdown()
+    assert started == [first]
+
+
+def test_wait_for_without_a_decode_in_flight_returns_none(tmp_path, prefetcher):
+    assert prefetcher.wait_for(tmp_path / "a.png", QSize(100, 100)) is None
@@ -0,0 +1,28 @@
+from src import media_metadata
+from src.MetadataProber import MetadataProber
+
+
+def test_prober_probes_files_in_worker_processes(qtbot, tmp_path, make_images, run_scanner):
+    images = make_images(tmp_path / "lib", 3)
+    clip = tmp_path / "lib" / "clip.mp4"
+    clip.write_bytes(b"\x00\x00\x00\x18ftypisom")
+    (tmp_path / "lib" / "notes.txt").write_bytes(b"")
+
+    found = run_scanner(MetadataProber([*images, clip, tmp_path / "lib" / "notes.txt"], max_workers=2))
+
+    assert found == {path: media_metadata.probe_file(path) for path in [*images, clip]}
+    assert [found[path]["width"] for path in images] == [10, 11, 12]
+
+
+def test_cached_metadata_is_not_probed_again(qtbot, tmp_path, media_index, monkeypatch, make_images, run_scanner):
+    images = make_images(tmp_path / "lib", 3)
+    media_index.scan(str(tmp_path / "lib"))
+    first = run_scanner(MetadataProber(images, index=media_index, max_workers=1))
+
+    def no_pool(*_args, **_kwargs):
+        raise AssertionError("all metadata should have come from the index")
+
+    monkeypatch.setattr("src.FilePoolScanner.ProcessPoolExecutor", no_pool)
+    second = run_scanner(MetadataProber(images, index=media_index))
+
+    assert second == first
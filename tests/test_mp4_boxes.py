@@ -0,0 +1,133 @@
+import struct
+
+import pytest
+
+from src import media_metadata, mp4_boxes
+
+
+def _box(box_type, *payloads):
+    payload = b"".join(payloads)
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _full_box(box_type, version, body):
+    return _box(box_type, bytes([version, 0, 0, 0]), body)
+
+
+def _mvhd(timescale, duration, version=0):
+    if version == 1:
+        return _full_box(b"mvhd", 1, struct.pack(">QQIQ", 0, 0, timescale, duration) + bytes(80))
+    return _full_box(b"mvhd", 0, struct.pack(">IIII", 0, 0, timescale, duration) + bytes(80))
+
+
+def _tkhd(width, height, version=0):
+    times = struct.pack(">QQIIQ", 0, 0, 1, 0, 0) if version == 1 else struct.pack(">IIIII", 0, 0, 1, 0, 0)
+    return _full_box(b"tkhd", version, times + bytes(16) + bytes(36) + struct.pack(">II", width << 16, height << 16))
+
+
+def _video_trak(width, height, timescale, stts, stss=None, handler=b"vide"):
+    stbl = [_full_box(b"stts", 0, struct.pack(f">I{2 * len(stts)}I", len(stts), *sum(stts, ())))]
+    if stss is not None:
+        stbl.append(_full_box(b"stss", 0, struct.pack(f">I{len(stss)}I", len(stss), *stss)))
+    mdia = _box(
+        b"mdia",
+        _full_box(b"mdhd", 0, struct.pack(">IIII", 0, 0, timescale, 0) + bytes(4)),
+        _full_box(b"hdlr", 0, bytes(4) + handler + bytes(13)),
+        _box(b"minf", _box(b"stbl", *stbl)),
+    )
+    return _box(b"trak", _tkhd(width, height), mdia)
+
+
+def _mp4(*moov_children, mdat_first=False):
+    ftyp = _box(b"ftyp", b"isom", bytes(4), b"isommp41")
+    mdat = _box(b"mdat", bytes(64))
+    moov = _box(b"moov", *moov_children)
+    return ftyp + (mdat + moov if mdat_first else moov + mdat)
+
+
+@pytest.fixture
+def clip(tmp_path):
+    # 10s at 25fps in a 12800 timescale: 250 samples of 512 ticks, a keyframe every 50.
+    audio = _video_trak(0, 0, 48000, [(10, 1024)], handler=b"soun")
+    video = _video_trak(1920, 1080, 12800, [(250, 512)], stss=[1, 51, 101, 151, 201])
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(_mp4(_mvhd(1000, 10_000), audio, video, mdat_first=True))
+    return path
+
+
+def test_parse_reads_duration_dimensions_and_keyframes(clip):
+    info = mp4_boxes.parse(clip)
+
+    assert info.duration_ms == 10_000
+    assert (info.width, info.height) == (1920, 1080)
+    assert info.keyframes_us == [0, 2_000_000, 4_000_000, 6_000_000, 8_000_000]
+
+
+def test_keyframe_times_follow_variable_sample_durations(tmp_path):
+    # 3 samples of 100 ticks, then 2 of 300 (timescale 1000 -> ms).
+    video = _video_trak(64, 48, 1000, [(3, 100), (2, 300)], stss=[1, 4, 5])
+    path = tmp_path / "clip.mov"
+    path.write_bytes(_mp4(_mvhd(600, 540), video))
+
+    assert mp4_boxes.parse(path).keyframes_us == [0, 300_000, 600_000]
+
+
+def test_version_1_headers_are_understood(tmp_path):
+    video = _box(b"trak", _tkhd(320, 240, version=1))
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(_mp4(_mvhd(90000, 90000 * 3, version=1), video))
+
+    info = mp4_boxes.parse(path)
+
+    assert info.duration_ms == 3000
+    # No mdia/hdlr, so the track can't be told to be video - dimensions stay unknown.
+    assert (info.width, info.height) == (None, None)
+
+
+def test_missing_stss_means_every_frame_is_a_keyframe(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(_mp4(_mvhd(1000, 2000), _video_trak(8, 8, 1000, [(50, 40)])))
+
+    info = mp4_boxes.parse(path)
+
+    assert info.keyframes_us is None
+    assert info.nearest_keyframe_us(1_234_000) == 1_234_000
+
+
+def test_nearest_keyframe_picks_the_closest_one(clip):
+    info = mp4_boxes.parse(clip)
+
+    assert info.nearest_keyframe_us(4_900_000) == 4_000_000
+    assert info.nearest_keyframe_us(5_100_000) == 6_000_000
+    assert info.nearest_keyframe_us(99_000_000) == 8_000_000
+
+
+def test_keyframe_at_or_before_never_moves_forward(clip):
+    info = mp4_boxes.parse(clip)
+
+    assert info.keyframe_at_or_before_us(5_900_000) == 4_000_000
+    assert info.keyframe_at_or_before_us(6_000_000) == 6_000_000
+    assert info.keyframe_at_or_before_us(0) == 0
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"\x1a\x45\xdf\xa3" + bytes(60),  # Matroska
+        _box(b"ftyp", b"isom") + _box(b"mdat", bytes(16)),  # no moov
+        _mp4(_mvhd(1000, 0)),  # zero duration
+        _mp4(_mvhd(1000, 5000))[:40],  # truncated inside moov
+    ],
+)
+def test_unparseable_files_return_none(tmp_path, content):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(content)
+
+    assert mp4_boxes.parse(path) is None
+
+
+def test_probe_video_fills_metadata_from_the_moov_box(clip):
+    metadata = media_metadata.probe_file(clip)
+
+    assert (metadata["width"], metadata["height"], metadata["duration_ms"]) == (1920, 1080, 10_000)
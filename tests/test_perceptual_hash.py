@@ -0,0 +1,134 @@
+import random
+
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QImage
+
+from src.perceptual_hash import (
+    HASH_SIZE,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    BKTree,
+    combine_hashes,
+    dhash_file,
+    dhash_frames,
+    dhash_image,
+    dhash_pixels,
+    group_near_duplicates,
+    hamming_distance,
+    hash_files,
+)
+
+
+def _pattern_image(seed, width=320, height=240):
+    """Blocky random greyscale pattern - plenty of structure for dHash to latch onto."""
+    rng = random.Random(seed)
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    block_w, block_h = width // 16, height // 12
+    for by in range(12):
+        for bx in range(16):
+            level = rng.randrange(256)
+            color = QColor(level, level, level)
+            for y in range(by * block_h, (by + 1) * block_h):
+                for x in range(bx * block_w, (bx + 1) * block_w):
+                    image.setPixelColor(x, y, color)
+    return image
+
+
+def test_dhash_pixels_sets_a_bit_where_the_left_neighbour_is_brighter():
+    gray = np.zeros((HASH_SIZE, HASH_SIZE + 1), dtype=np.uint8)
+    gray[0, 0] = 255  # only the very first pair decreases left-to-right
+
+    assert dhash_pixels(gray) == 1 << 63
+
+
+def test_dhash_of_flat_image_is_zero():
+    image = QImage(50, 40, QImage.Format.Format_RGB32)
+    image.fill(QColor(120, 30, 200))
+
+    assert dhash_image(image) == 0
+
+
+def test_resized_and_reencoded_copy_stays_within_near_duplicate_distance(tmp_path):
+    original = _pattern_image(1)
+    original.save(str(tmp_path / "original.png"))
+    original.scaled(160, 120, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation).save(
+        str(tmp_path / "small.jpg"), quality=70
+    )
+
+    a, b = dhash_file(tmp_path / "original.png"), dhash_file(tmp_path / "small.jpg")
+
+    assert hamming_distance(a, b) <= NEAR_DUPLICATE_MAX_DISTANCE
+
+
+def test_different_images_are_far_apart():
+    distance = hamming_distance(dhash_image(_pattern_image(1)), dhash_image(_pattern_image(2)))
+
+    assert distance > 2 * NEAR_DUPLICATE_MAX_DISTANCE
+
+
+def test_dhash_file_returns_none_for_undecodable_file(tmp_path):
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+
+    assert dhash_file(tmp_path / "broken.png") is None
+
+
+def test_hash_files_reports_stat_and_skips_missing_files(tmp_path):
+    _pattern_image(1).save(str(tmp_path / "a.png"))
+
+    rows = hash_files([str(tmp_path / "a.png"), str(tmp_path / "missing.png")])
+
+    assert len(rows) == 1
+    path, size, _mtime_ns, value = rows[0]
+    assert path == str(tmp_path / "a.png")
+    assert size == (tmp_path / "a.png").stat().st_size
+    assert value == dhash_file(tmp_path / "a.png")
+
+
+def test_combine_hashes_keeps_the_bits_most_frames_agree_on():
+    assert combine_hashes([0b0111, 0b0101, 0b1001]) == 0b0101
+    assert combine_hashes([None, 1 << 63, None]) == 1 << 63
+    assert combine_hashes([None]) is None
+
+
+def test_video_signature_survives_a_resized_copy_of_every_frame():
+    frames = [_pattern_image(seed) for seed in range(3)]
+    resized = [frame.scaled(160, 120, transformMode=Qt.TransformationMode.SmoothTransformation) for frame in frames]
+    other = [_pattern_image(seed) for seed in range(3, 6)]
+
+    assert hamming_distance(dhash_frames(frames), dhash_frames(resized)) <= NEAR_DUPLICATE_MAX_DISTANCE
+    assert hamming_distance(dhash_frames(frames), dhash_frames(other)) > 2 * NEAR_DUPLICATE_MAX_DISTANCE
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(7)
+    values = [rng.getrandbits(64) for _ in range(500)]
+    # a few near neighbours of the first value, so the radius query has something to find
+    values += [values[0] ^ (1 << bit) ^ (1 << (bit + 7)) for bit in range(5)]
+    tree = BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, i)
+
+    for query in values[:20]:
+        expected = sorted(i for i, value in enumerate(values) if hamming_distance(query, value) <= 6)
+        assert sorted(item for _distance, item in tree.search(query, 6)) == expected
+
+
+def test_bk_tree_search_returns_nearest_first():
+    tree = BKTree()
+    tree.add(0b1111, "far")
+    tree.add(0b0001, "near")
+
+    assert [item for _distance, item in tree.search(0, 4)] == ["near", "far"]
+
+
+def test_group_near_duplicates_joins_items_close_to_a_leader():
+    hashes = {"a": 0, "b": 0b11, "c": (1 << 64) - 1, "d": None}
+
+    assert group_near_duplicates(hashes, max_distance=2) == [["a", "b"]]
+
+
+def test_group_near_duplicates_does_not_chain_through_members():
+    # b is within 3 of a, c is within 3 of b but 6 away from the leader a
+    hashes = {"a": 0, "b": 0b111, "c": 0b111111}
+
+    assert group_near_duplicates(hashes, max_distance=3) == [["a", "b"]]
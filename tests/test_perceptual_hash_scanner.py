@@ -0,0 +1,37 @@
+from src import perceptual_hash
+from src.PerceptualHashScanner import PerceptualHashScanner
+
+
+def test_scanner_hashes_images_in_worker_processes(qtbot, tmp_path, make_images, run_scanner):
+    images = make_images(tmp_path / "lib", 3)
+    (tmp_path / "lib" / "clip.mp4").write_bytes(b"x")
+
+    found = run_scanner(PerceptualHashScanner([*images, tmp_path / "lib" / "clip.mp4"], max_workers=2))
+
+    assert found == {path: perceptual_hash.dhash_file(path) for path in images}
+
+
+def test_files_are_routed_by_their_sniffed_kind(qtbot, tmp_path, media_index, make_images, run_scanner):
+    [image] = make_images(tmp_path / "lib", 1)
+    mislabeled = image.rename(tmp_path / "lib" / "still.mp4")
+    page = tmp_path / "lib" / "error_page.png"
+    page.write_bytes(b"<!DOCTYPE html>")
+    media_index.scan(str(tmp_path / "lib"))
+
+    found = run_scanner(PerceptualHashScanner([mislabeled, page], index=media_index, max_workers=1))
+
+    assert found == {mislabeled: perceptual_hash.dhash_file(mislabeled)}
+
+
+def test_cached_hashes_are_not_recomputed(qtbot, tmp_path, media_index, monkeypatch, make_images, run_scanner):
+    images = make_images(tmp_path / "lib", 3)
+    media_index.scan(str(tmp_path / "lib"))
+    first = run_scanner(PerceptualHashScanner(images, index=media_index, max_workers=1))
+
+    def no_pool(*_args, **_kwargs):
+        raise AssertionError("every hash should have come from the index")
+
+    monkeypatch.setattr("src.FilePoolScanner.ProcessPoolExecutor", no_pool)
+    second = run_scanner(PerceptualHashScanner(images, index=media_index))
+
+    assert second == first
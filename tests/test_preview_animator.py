@@ -0,0 +1,51 @@
+from PyQt6.QtGui import QColor, QPixmap
+from PyQt6.QtWidgets import QLabel
+
+from src.PreviewAnimator import PreviewAnimator
+
+
+def _pixmaps(count):
+    pixmaps = []
+    for i in range(count):
+        pixmap = QPixmap(4, 4)
+        pixmap.fill(QColor(i * 40, 0, 0))
+        pixmaps.append(pixmap)
+    return pixmaps
+
+
+def _red(label):
+    return label.pixmap().toImage().pixelColor(0, 0).red()
+
+
+def test_every_label_advances_on_the_shared_tick(qtbot):
+    animator = PreviewAnimator(interval_ms=10)
+    labels = [QLabel(), QLabel()]
+    for label in labels:
+        animator.add(label, _pixmaps(3))
+    before = [_red(label) for label in labels]
+
+    animator._tick()
+
+    assert [_red(label) for label in labels] == [(red + 40) % 120 for red in before]
+
+
+def test_timer_only_runs_while_something_is_animating(qtbot):
+    animator = PreviewAnimator()
+    label = QLabel()
+
+    animator.add(label, _pixmaps(2))
+    assert animator._timer.isActive()
+
+    animator.remove(label)
+    assert not animator._timer.isActive()
+    assert not animator.is_animating(label)
+
+
+def test_frames_flip_in_real_time(qtbot):
+    animator = PreviewAnimator(interval_ms=10)
+    label = QLabel()
+    animator.add(label, _pixmaps(2))
+    first = _red(label)
+
+    qtbot.waitUntil(lambda: _red(label) != first, timeout=1000)
+    animator.clear()
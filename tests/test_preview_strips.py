@@ -0,0 +1,31 @@
+from PyQt6.QtGui import QColor, QImage
+
+from src.preview_strips import make_sprite_sheet, split_sprite_sheet
+
+
+def _frame(red, width=40, height=30):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(red, 0, 0))
+    return image
+
+
+def test_sprite_sheet_round_trips_its_frames():
+    frames = [_frame(red) for red in (0, 100, 200)]
+
+    sheet = make_sprite_sheet(frames)
+    split = split_sprite_sheet(sheet, 3)
+
+    assert (sheet.width(), sheet.height()) == (120, 30)
+    assert [frame.pixelColor(5, 5).red() for frame in split] == [0, 100, 200]
+    assert all((frame.width(), frame.height()) == (40, 30) for frame in split)
+
+
+def test_odd_sized_frames_are_fitted_to_the_first():
+    sheet = make_sprite_sheet([_frame(0), _frame(200, 80, 60)])
+
+    assert (sheet.width(), sheet.height()) == (80, 30)
+    assert split_sprite_sheet(sheet, 2)[1].pixelColor(39, 29).red() == 200
+
+
+def test_a_sheet_too_small_for_the_frame_count_splits_to_nothing():
+    assert split_sprite_sheet(_frame(0, width=5), 12) == []
@@ -157,6 +157,78 @@ def test_record_chase_checkbox_initialized_from_app(app, dialog):
     assert dialog.show_record_chase_checkbox.isChecked() == app.show_record_chase
 
 
+def test_stream_folder_scan_checkbox_initialized_from_app(app, dialog):
+    assert dialog.stream_folder_scan_checkbox.isChecked() == app.stream_folder_scan
+
+
+def test_accept_settings_updates_stream_folder_scan(app, dialog):
+    dialog.stream_folder_scan_checkbox.setChecked(not app.stream_folder_scan)
+    expected = dialog.stream_folder_scan_checkbox.isChecked()
+
+    dialog.accept_settings()
+
+    assert app.stream_folder_scan == expected
+    assert app.settings.value("GoonerApp/stream_folder_scan", type=bool) == expected
+
+
+def test_skip_duplicate_files_checkbox_initialized_from_app(app, dialog):
+    assert dialog.skip_duplicate_files_checkbox.isChecked() == app.skip_duplicate_files
+
+
+def test_accept_settings_updates_skip_duplicate_files(app, dialog):
+    dialog.skip_duplicate_files_checkbox.setChecked(not app.skip_duplicate_files)
+    expected = dialog.skip_duplicate_files_checkbox.isChecked()
+
+    dialog.accept_settings()
+
+    assert app.skip_duplicate_files == expected
+    assert app.settings.value("GoonerApp/skip_duplicate_files", type=bool) == expected
+
+
+def test_accept_settings_updates_video_clip_mode(app, dialog):
+    dialog.video_clip_mode_checkbox.setChecked(not app.video_clip_mode)
+    expected = dialog.video_clip_mode_checkbox.isChecked()
+    dialog.settings_fields["video_clip_dur"]["widget"].setValue(12.5)
+
+    dialog.accept_settings()
+
+    assert app.video_clip_mode == expected
+    assert app.video_clip_dur == pytest.approx(12.5)
+    assert app.settings.value("GoonerApp/video_clip_mode", type=bool) == expected
+
+
+def test_prewarm_caches_checkbox_initialized_from_app(app, dialog):
+    assert dialog.prewarm_caches_checkbox.isChecked() == app.prewarm_caches
+
+
+def test_accept_settings_updates_prewarm_caches(app, dialog):
+    dialog.prewarm_caches_checkbox.setChecked(not app.prewarm_caches)
+    expected = dialog.prewarm_caches_checkbox.isChecked()
+
+    dialog.accept_settings()
+
+    assert app.prewarm_caches == expected
+    assert app.settings.value("GoonerApp/prewarm_caches", type=bool) == expected
+
+
+def test_accept_settings_applies_thumbnail_cache_budget(app, dialog):
+    dialog.settings_fields["thumbnail_cache_mb"]["widget"].setValue(64)
+
+    dialog.accept_settings()
+
+    assert app.thumbnail_cache.max_bytes == 64 * 1024 * 1024
+    assert int(float(app.settings.value("GoonerApp/thumbnail_cache_mb"))) == 64
+
+
+def test_accept_settings_applies_display_cache_budget(app, dialog):
+    dialog.settings_fields["display_cache_mb"]["widget"].setValue(512)
+
+    dialog.accept_settings()
+
+    assert app.prefetcher.cache.max_bytes == 512 * 1024 * 1024
+    assert int(float(app.settings.value("GoonerApp/display_cache_mb"))) == 512
+
+
 def test_accept_settings_updates_show_record_chase(app, dialog, monkeypatch):
     called = {}
     monkeypatch.setattr(app, "_update_record_chase", lambda: called.setdefault("called", True))
@@ -237,10 +309,17 @@ def test_playback_reset_button_resets_fields(app, dialog):
     dialog.settings_fields["min_dur"]["widget"].setValue(9.9)
     dialog.settings_fields["max_dur"]["widget"].setValue(9.9)
     dialog.settings_fields["video_min_dur"]["widget"].setValue(9.9)
+    dialog.settings_fields["video_clip_dur"]["widget"].setValue(99.0)
+    dialog.video_clip_mode_checkbox.setChecked(not app.DEFAULTS["video_clip_mode"])
     dialog.settings_fields["beat_loudness"]["widget"].setValue(0.0)
     dialog.settings_fields["vid_loudness"]["widget"].setValue(0.0)
+    dialog.settings_fields["thumbnail_cache_mb"]["widget"].setValue(16)
+    dialog.settings_fields["display_cache_mb"]["widget"].setValue(32)
     dialog.show_startup_splash_checkbox.setChecked(not app.DEFAULTS["show_startup_splash"])
     dialog.show_record_chase_checkbox.setChecked(not app.DEFAULTS["show_record_chase"])
+    dialog.stream_folder_scan_checkbox.setChecked(not app.DEFAULTS["stream_folder_scan"])
+    dialog.skip_duplicate_files_checkbox.setChecked(not app.DEFAULTS["skip_duplicate_files"])
+    dialog.prewarm_caches_checkbox.setChecked(not app.DEFAULTS["prewarm_caches"])
 
     dialog.playback_reset_button.click()
 
@@ -249,12 +328,21 @@ def test_playback_reset_button_resets_fields(app, dialog):
     assert dialog.settings_fields["video_min_dur"]["widget"].value() == pytest.approx(
         app.DEFAULTS["video_min_dur"]
     )
+    assert dialog.settings_fields["video_clip_dur"]["widget"].value() == pytest.approx(
+        app.DEFAULTS["video_clip_dur"]
+    )
+    assert dialog.video_clip_mode_checkbox.isChecked() == app.DEFAULTS["video_clip_mode"]
     assert dialog.settings_fields["beat_loudness"]["widget"].value() == pytest.approx(
         app.beat_handler.DEFAULTS["beat_loudness"]
     )
     assert dialog.settings_fields["vid_loudness"]["widget"].value() == pytest.approx(app.DEFAULTS["vid_loudness"])
+    assert dialog.settings_fields["thumbnail_cache_mb"]["widget"].value() == app.DEFAULTS["thumbnail_cache_mb"]
+    assert dialog.settings_fields["display_cache_mb"]["widget"].value() == app.DEFAULTS["display_cache_mb"]
     assert dialog.show_startup_splash_checkbox.isChecked() == app.DEFAULTS["show_startup_splash"]
     assert dialog.show_record_chase_checkbox.isChecked() == app.DEFAULTS["show_record_chase"]
+    assert dialog.stream_folder_scan_checkbox.isChecked() == app.DEFAULTS["stream_folder_scan"]
+    assert dialog.skip_duplicate_files_checkbox.isChecked() == app.DEFAULTS["skip_duplicate_files"]
+    assert dialog.prewarm_caches_checkbox.isChecked() == app.DEFAULTS["prewarm_caches"]
 
 
 def test_beat_reset_button_resets_fields(app, dialog):
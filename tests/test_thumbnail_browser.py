@@ -0,0 +1,141 @@
+import pytest
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QColor, QImage
+
+from src import ThumbnailBrowser as browser_module
+from src.ThumbnailBrowser import PENDING_ROLE, ThumbnailBrowser, ThumbnailListModel
+
+# No test here may start a real video grab - same reasoning as test_video_frame_grabber.py.
+
+
+@pytest.fixture
+def model(qtbot, thumbnail_cache, media_index):
+    model = ThumbnailListModel(64, thumbnail_cache, media_index)
+    yield model
+    model.shutdown()
+
+
+def _save_image(path, color=None):
+    image = QImage(200, 100, QImage.Format.Format_RGB32)
+    image.fill(color if color is not None else QColor(30, 160, 90))
+    assert image.save(str(path))
+    return path
+
+
+def _decoration(model, row):
+    return model.data(model.index(row), Qt.ItemDataRole.DecorationRole)
+
+
+def test_thumbnails_are_only_requested_for_rows_asked_about(qtbot, tmp_path, model):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(5)]
+    model.set_files(paths)
+
+    assert model.rowCount() == 5
+    assert not any(model.is_pending(path) for path in paths)
+
+    assert _decoration(model, 2) is None
+    assert model.data(model.index(2), PENDING_ROLE) is True
+    qtbot.waitUntil(lambda: not model.is_pending(paths[2]), timeout=5000)
+
+    pixmap = _decoration(model, 2)
+    assert (pixmap.width(), pixmap.height()) == (64, 32)
+    assert not any(model.is_pending(path) for path in paths)
+
+
+def test_undecodable_files_show_their_name(qtbot, tmp_path, model):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    model.set_files([path])
+
+    _decoration(model, 0)
+    qtbot.waitUntil(lambda: not model.is_pending(path), timeout=5000)
+
+    assert _decoration(model, 0) is None
+    assert model.data(model.index(0), PENDING_ROLE) is False
+    assert model.data(model.index(0), Qt.ItemDataRole.DisplayRole) == "broken.png"
+
+
+def test_cached_video_frames_skip_the_grabber(qtbot, tmp_path, model, monkeypatch, thumbnail_cache):
+    monkeypatch.setattr(model._grabber, "request", lambda path: pytest.fail("should come from the cache"))
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"\x00\x00\x00\x18ftypisom")
+    frame = QImage(64, 36, QImage.Format.Format_RGB32)
+    frame.fill(QColor(200, 20, 20))
+    thumbnail_cache.put(video, 64, frame)
+    model.set_files([video])
+
+    _decoration(model, 0)
+    qtbot.waitUntil(lambda: not model.is_pending(video), timeout=5000)
+
+    assert _decoration(model, 0).size() == QSize(64, 36)
+
+
+def test_replacing_the_files_withdraws_outstanding_requests(qtbot, tmp_path, model):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(3)]
+    model.set_files(paths)
+    for row in range(3):
+        _decoration(model, row)
+
+    model.set_files(paths[:1])
+
+    assert not any(model.is_pending(path) for path in paths)
+
+
+def test_appended_files_keep_earlier_rows(tmp_path, model):
+    paths = [tmp_path / f"{i}.png" for i in range(4)]
+    model.set_files(paths[:2])
+
+    model.append_files(paths[1:])
+
+    assert model.files() == paths
+
+
+def test_memory_cache_drops_least_recently_shown_pixmaps(qtbot, tmp_path, model, monkeypatch):
+    monkeypatch.setattr(browser_module, "BROWSER_PIXMAP_CACHE_ENTRIES", 2)
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(3)]
+    model.set_files(paths)
+
+    for row, path in enumerate(paths):
+        _decoration(model, row)
+        qtbot.waitUntil(lambda path=path: not model.is_pending(path), timeout=5000)
+
+    assert _decoration(model, 0) is None  # evicted - asked for again
+    assert model.is_pending(paths[0])
+
+
+def test_browser_only_keeps_requests_for_rows_in_view(qtbot, tmp_path, thumbnail_cache):
+    browser = ThumbnailBrowser(QSize(132, 132), 8, thumbnail_cache)
+    qtbot.addWidget(browser)
+    browser.resize(300, 300)
+    browser.show()
+    paths = [tmp_path / f"{i}.png" for i in range(200)]  # never decoded - rows stay pending
+    browser.browser_model.set_files(paths)
+    qtbot.waitUntil(lambda: browser.visible_files(), timeout=5000)
+
+    browser.verticalScrollBar().setValue(browser.verticalScrollBar().maximum())
+    browser._cancel_offscreen_requests()
+
+    visible = browser.visible_files()
+    assert paths[-1] in visible
+    assert not browser.browser_model.is_pending(paths[0])
+    browser.shutdown()
+
+
+def test_visible_files_reads_only_the_visible_rows(qtbot, tmp_path, thumbnail_cache, monkeypatch):
+    browser = ThumbnailBrowser(QSize(132, 132), 8, thumbnail_cache)
+    qtbot.addWidget(browser)
+    browser.resize(300, 300)
+    browser.show()
+    paths = [tmp_path / f"{i}.png" for i in range(200)]
+    browser.browser_model.set_files(paths)
+    qtbot.waitUntil(lambda: browser.visible_files(), timeout=5000)
+    monkeypatch.setattr(browser.browser_model, "files", lambda: pytest.fail("copied the whole file list"))
+    read = []
+    original = browser.browser_model.file_at
+    monkeypatch.setattr(browser.browser_model, "file_at", lambda row: read.append(row) or original(row))
+
+    visible = browser.visible_files()
+
+    assert visible == paths[: len(visible)]
+    assert len(read) == len(visible) < len(paths)
+    browser.shutdown()
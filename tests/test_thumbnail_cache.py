@@ -0,0 +1,146 @@
+import os
+import sqlite3
+
+import pytest
+from PyQt6.QtGui import QColor, QImage
+
+from src.thumbnail_cache import ThumbnailCache, encode_image
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ThumbnailCache(tmp_path / "cache" / ThumbnailCache.FILE_NAME)
+    yield cache
+    cache.close()
+
+
+def _thumbnail(color=None, size=32, alpha=False):
+    image = QImage(size, size, QImage.Format.Format_ARGB32 if alpha else QImage.Format.Format_RGB32)
+    image.fill(color if color is not None else QColor(200, 40, 40))
+    return image
+
+
+def _source(tmp_path, name="a.png", content=b"source"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_put_then_get_round_trips(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail())
+
+    image = cache.get(source, 132)
+
+    assert image is not None
+    assert (image.width(), image.height()) == (32, 32)
+    assert image.pixelColor(5, 5).red() > 150
+
+
+def test_other_cell_size_or_changed_source_misses(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail())
+
+    assert cache.get(source, 64) is None
+
+    source.write_bytes(b"edited source")
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(source, 132) is None
+    assert cache.get(tmp_path / "gone.png", 132) is None
+
+
+def test_variants_are_cached_separately(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail(QColor(200, 0, 0)))
+    cache.put(source, 132, _thumbnail(QColor(0, 0, 200), size=64), variant="strip12")
+
+    assert cache.get(source, 132).width() == 32
+    assert cache.get(source, 132, variant="strip12").width() == 64
+    assert cache.get(source, 132, variant="strip6") is None
+
+
+def test_a_cache_from_before_variants_is_dropped(tmp_path):
+    db_path = tmp_path / ThumbnailCache.FILE_NAME
+    connection = sqlite3.connect(str(db_path))
+    connection.execute(
+        "CREATE TABLE thumbnails (path TEXT, cell_size INTEGER, size INTEGER, mtime_ns INTEGER, "
+        "last_used INTEGER, data BLOB, PRIMARY KEY (path, cell_size))"
+    )
+    connection.execute("INSERT INTO thumbnails VALUES ('a.png', 132, 1, 1, 1, x'00')")
+    connection.commit()
+    connection.close()
+
+    cache = ThumbnailCache(db_path)
+    try:
+        source = _source(tmp_path)
+        cache.put(source, 132, _thumbnail(), variant="strip12")
+        assert cache.get(source, 132, variant="strip12") is not None
+        assert cache.total_bytes() == len(encode_image(_thumbnail()))
+    finally:
+        cache.close()
+
+
+def test_paths_lists_what_is_cached_at_one_size(tmp_path, cache):
+    first, second = _source(tmp_path, "a.png"), _source(tmp_path, "b.png")
+    cache.put(first, 64, _thumbnail())
+    cache.put(second, 128, _thumbnail())
+    cache.put(second, 64, _thumbnail(), variant="sheet")
+
+    assert cache.paths(64) == {str(first)}
+
+
+def test_thumbnails_survive_a_restart(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail())
+    cache.close()
+
+    reopened = ThumbnailCache(cache.db_path)
+    try:
+        assert reopened.get(source, 132) is not None
+        assert reopened.total_bytes() == cache.total_bytes()
+    finally:
+        reopened.close()
+
+
+def test_least_recently_used_thumbnails_are_evicted_over_budget(tmp_path, cache):
+    sources = [_source(tmp_path, f"{i}.png") for i in range(4)]
+    one_thumbnail = len(encode_image(_thumbnail()))
+    cache.max_bytes = 3 * one_thumbnail
+    for source in sources[:3]:
+        cache.put(source, 132, _thumbnail())
+    cache.get(sources[0], 132)  # now more recently used than sources[1]
+
+    cache.put(sources[3], 132, _thumbnail())
+
+    assert cache.get(sources[1], 132) is None
+    assert cache.get(sources[0], 132) is not None
+    assert cache.get(sources[3], 132) is not None
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_replacing_a_thumbnail_keeps_the_byte_count_exact(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail(size=64))
+    cache.put(source, 132, _thumbnail(size=16))
+
+    assert cache.total_bytes() == len(encode_image(_thumbnail(size=16)))
+
+
+def test_transparency_is_kept(tmp_path, cache):
+    source = _source(tmp_path)
+    cache.put(source, 132, _thumbnail(QColor(0, 0, 255, 0), alpha=True))
+
+    assert cache.get(source, 132).pixelColor(0, 0).alpha() == 0
+
+
+def test_unusable_cache_dir_falls_back_to_memory(tmp_path):
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_bytes(b"")
+    cache = ThumbnailCache(blocker / ThumbnailCache.FILE_NAME)
+    try:
+        source = _source(tmp_path)
+        cache.put(source, 132, _thumbnail())
+        assert cache.get(source, 132) is not None
+    finally:
+        cache.close()
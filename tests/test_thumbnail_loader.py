@@ -0,0 +1,87 @@
+import pytest
+from PyQt6.QtGui import QColor, QImage
+
+from src.thumbnail_cache import ThumbnailCache
+from src.ThumbnailLoader import ThumbnailLoader, render_thumbnail
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ThumbnailCache(tmp_path / "cache" / ThumbnailCache.FILE_NAME)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def loader(qtbot, cache):
+    loader = ThumbnailLoader(cache, max_threads=2)
+    yield loader
+    loader.shutdown()
+
+
+def _save_image(path, width=200, height=100):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(30, 160, 90))
+    assert image.save(str(path))
+    return path
+
+
+def _collect(loader):
+    results = {}
+    loader.loaded.connect(results.__setitem__)
+    return results
+
+
+def test_render_thumbnail_fits_the_box_keeping_aspect(tmp_path):
+    image = render_thumbnail(_save_image(tmp_path / "a.png"), 50)
+
+    assert (image.width(), image.height()) == (50, 25)
+
+
+def test_loaded_images_arrive_on_the_gui_thread_and_are_cached(qtbot, tmp_path, loader, cache):
+    path = _save_image(tmp_path / "a.png")
+    results = _collect(loader)
+
+    loader.request(path, 50)
+    qtbot.waitUntil(lambda: path in results, timeout=5000)
+
+    assert results[path].width() == 50
+    assert cache.get(path, 50) is not None
+    assert not loader.is_pending(path)
+
+
+def test_undecodable_file_reports_none(qtbot, tmp_path, loader):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n")
+    results = _collect(loader)
+
+    loader.request(path, 50)
+    qtbot.waitUntil(lambda: path in results, timeout=5000)
+
+    assert results[path] is None
+
+
+def test_cancelled_requests_are_never_delivered(qtbot, tmp_path, loader):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(6)]
+    results = _collect(loader)
+
+    for path in paths:
+        loader.request(path, 50)
+    loader.cancel(paths[:3])
+    qtbot.waitUntil(lambda: len(results) == 3, timeout=5000)
+    qtbot.wait(50)
+
+    assert set(results) == set(paths[3:])
+
+
+def test_cancel_all_drops_everything_in_flight(qtbot, tmp_path, loader):
+    paths = [_save_image(tmp_path / f"{i}.png") for i in range(6)]
+    results = _collect(loader)
+
+    for path in paths:
+        loader.request(path, 50)
+    loader.cancel_all()
+    loader.shutdown()
+    qtbot.wait(50)
+
+    assert results == {}
@@ -2,6 +2,7 @@ import random
 from pathlib import Path
 
 from src.thumbnail_sampling import (
+    SamplingIndex,
     compute_thumbnail_grid,
     sample_thumbnails_per_folder,
     sample_thumbnails_with_video_cap,
@@ -234,3 +235,89 @@ def test_video_cap_result_is_shuffled_not_videos_first():
 
     is_video_sequence = [_is_video(p) for p in result]
     assert is_video_sequence != sorted(is_video_sequence, reverse=True)
+
+
+# --- SamplingIndex ---
+
+
+def _index(**folders):
+    index = SamplingIndex(_is_video)
+    for folder, files in folders.items():
+        index.set_folder(folder, files)
+    return index
+
+
+def test_index_sample_splits_evenly_and_caps_videos():
+    index = _index(a=_files("a", 10) + _files("a", 10, "mp4"), b=_files("b", 10) + _files("b", 10, "mp4"))
+
+    result = index.sample(12, 4, rng=random.Random(0))
+
+    assert len(result) == len(set(result)) == 12
+    assert sum(1 for p in result if _is_video(p)) == 4
+    by_folder = {name: sum(1 for p in result if p.parent.name == name) for name in ("a", "b")}
+    assert by_folder == {"a": 6, "b": 6}
+
+
+def test_index_sample_never_returns_excluded_files():
+    files = _files("a", 50)
+    index = _index(a=files)
+    exclude = set(files[:45])
+
+    for seed in range(10):
+        result = index.sample(10, 0, exclude, rng=random.Random(seed))
+        assert sorted(result) == sorted(files[45:])
+
+
+def test_index_sample_skips_folders_with_nothing_left():
+    index = _index(a=_files("a", 2), b=_files("b", 10))
+
+    result = index.sample(6, 0, set(_files("a", 2)), rng=random.Random(0))
+
+    assert len(result) == 6
+    assert all(p.parent.name == "b" for p in result)
+
+
+def test_index_sample_draws_preferred_files_first_within_each_folder_share():
+    a, b = _files("a", 20), _files("b", 20)
+    index = _index(a=a, b=b)
+    prefer = {*a[:2], *b[:5], Path("elsewhere/cached.png")}
+
+    for seed in range(10):
+        result = index.sample(8, 0, {b[0]}, rng=random.Random(seed), prefer=prefer)
+        assert set(a[:2]) | set(b[1:5]) <= set(result)
+        assert b[0] not in result
+        assert sum(1 for p in result if p.parent.name == "a") == 4
+
+
+def test_index_follows_added_and_removed_files():
+    files = _files("a", 5)
+    index = _index(a=files[:3])
+
+    index.add("a", files[3:])
+    index.remove("a", [files[0], files[4], Path("a/never-added.png")])
+
+    assert sorted(index.sample(10, 0, rng=random.Random(0))) == sorted(files[1:4])
+
+
+def test_index_dropped_folder_is_no_longer_sampled():
+    index = _index(a=_files("a", 3), b=_files("b", 3))
+
+    index.drop_folder("a")
+
+    assert index.folders() == ["b"]
+    assert all(p.parent.name == "b" for p in index.sample(10, 0, rng=random.Random(0)))
+
+
+def test_index_sample_does_not_scan_the_library(monkeypatch):
+    """A grid-sized draw from a huge pool only ever touches about as many slots as it
+    returns - no per-file work proportional to the library."""
+    index = _index(a=_files("a", 100_000))
+    drawn = []
+    rng = random.Random(0)
+    original = rng.randrange
+    monkeypatch.setattr(rng, "randrange", lambda n: drawn.append(n) or original(n))
+
+    result = index.sample(40, 0, set(_files("a", 40)), rng=rng)
+
+    assert len(result) == 40
+    assert len(drawn) < 60
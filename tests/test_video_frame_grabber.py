@@ -0,0 +1,226 @@
+from unittest.mock import MagicMock
+
+import pytest
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QImage
+from PyQt6.QtMultimedia import QMediaPlayer
+
+from src import VideoFrameGrabber as grabber_module
+from src.mp4_boxes import Mp4Info
+from src.VideoFrameGrabber import (
+    VideoFrameGrabber,
+    seek_target_ms,
+    strip_positions_ms,
+)
+
+# No test here may start a real grab - a _FrameGrab's start() would point a live
+# QMediaPlayer at a (fake, garbage-bytes) file. The `grabber` fixture swaps it out.
+
+
+@pytest.fixture
+def grabber(qtbot, monkeypatch, media_index):
+    started = []
+    monkeypatch.setattr(grabber_module._FrameGrab, "start", lambda self: started.append(self.path))
+    grabber = VideoFrameGrabber(media_index, max_concurrent=2)
+    grabber.started = started
+    yield grabber
+    grabber.cancel_all()
+
+
+def _videos(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"clip{i}.mp4"
+        path.write_bytes(b"\x00\x00\x00\x18ftypisom")
+        paths.append(path)
+    return paths
+
+
+def _solid_image(color):
+    image = QImage(16, 16, QImage.Format.Format_RGB32)
+    image.fill(color)
+    return image
+
+
+class _FakeFrame:
+    def __init__(self, start_ms, image=None):
+        self._start_us = start_ms * 1000
+        self._image = image if image is not None else _solid_image(0x808080)
+
+    def isValid(self):
+        return True
+
+    def startTime(self):
+        return self._start_us
+
+    def toImage(self):
+        return self._image
+
+
+def _offline(grab):
+    """Swaps the grab's live QMediaPlayer for a mock, so the test drives every step."""
+    grab.player = MagicMock()
+    grab.player.duration.return_value = 0
+    return grab
+
+
+def test_seek_target_stays_clear_of_leader_and_trailer():
+    for _ in range(50):
+        assert 1000 <= seek_target_ms(10_000) <= 9000
+
+
+def test_seek_target_snaps_to_a_keyframe_inside_the_margin():
+    info = Mp4Info(10_000_000, 640, 480, [0, 5_000_000, 9_900_000])
+
+    for _ in range(50):
+        target = seek_target_ms(10_000, info)
+        # 0s and 9.9s sit in the leader/trailer margin, so targets nearest those keep their own position
+        assert target == 5000 or not 2500 <= target <= 7500
+
+
+def test_seek_target_slots_split_the_middle_of_the_clip():
+    for _ in range(50):
+        assert 1000 <= seek_target_ms(10_000, slot=0, slots=4) <= 3000
+        assert 7000 <= seek_target_ms(10_000, slot=3, slots=4) <= 9000
+
+
+def test_seek_target_only_snaps_to_keyframes_within_its_slot():
+    info = Mp4Info(10_000_000, 640, 480, [0, 5_000_000])
+
+    for _ in range(50):
+        assert 1000 <= seek_target_ms(10_000, info, slot=0, slots=2) <= 5000
+        assert 5000 <= seek_target_ms(10_000, info, slot=1, slots=2) <= 9000
+
+
+def test_strip_positions_spread_evenly_and_snap_to_keyframes():
+    assert strip_positions_ms(12_000, 4) == [1500, 4500, 7500, 10_500]
+
+    info = Mp4Info(12_000_000, 640, 480, [0, 4_000_000, 8_000_000])
+    assert strip_positions_ms(12_000, 4, info) == [0, 4000, 8000, 8000]
+
+
+def test_strip_gaps_repeat_the_frame_before_them():
+    a, b = _solid_image(0x202020), _solid_image(0xFFFFFF)
+
+    assert VideoFrameGrabber._fill_gaps([None, a, None, b, None]) == [a, a, a, b, b]
+    assert VideoFrameGrabber._fill_gaps([None, None]) == []
+
+
+def test_strip_requests_start_a_strip_grab(grabber, tmp_path):
+    [path] = _videos(tmp_path, 1)
+
+    grabber.request_strip(path, 12, 124)
+
+    assert isinstance(grabber._active[path], grabber_module._StripGrab)
+    results = []
+    grabber.strip_grabbed.connect(lambda path, frames: results.append((path, frames)))
+    grabber._active[path].finished.emit(grabber._active[path])
+    assert results == [(path, [])]
+
+
+def test_thumbnail_grabber_scales_and_caches_its_frames(qtbot, tmp_path, monkeypatch, media_index, thumbnail_cache):
+    monkeypatch.setattr(grabber_module._FrameGrab, "start", lambda self: None)
+    grabber = VideoFrameGrabber(media_index, thumbnail_size=32, cache=thumbnail_cache)
+    [path] = _videos(tmp_path, 1)
+    grabber.request(path)
+    results = []
+    grabber.frame_grabbed.connect(lambda path, image: results.append(image))
+    grab = grabber._active[path]
+    grab.best_image = QImage(128, 64, QImage.Format.Format_RGB32)
+    grab.best_image.fill(0x336699)
+
+    grab.finished.emit(grab)
+
+    assert results[0].size() == QSize(32, 16)
+    assert thumbnail_cache.get(path, 32).size() == QSize(32, 16)
+
+
+def test_known_duration_comes_from_the_media_index(grabber, media_index, tmp_path):
+    known, unknown = _videos(tmp_path, 2)
+    stat = known.stat()
+    media_index.store_metadata([(str(known), stat.st_size, stat.st_mtime_ns, {"duration_ms": 3000})])
+
+    assert grabber._known_duration_ms(known) == 3000
+    assert grabber._known_duration_ms(unknown) is None
+
+
+def test_grabs_beyond_the_concurrency_cap_wait_their_turn(grabber, tmp_path):
+    paths = _videos(tmp_path, 3)
+    for path in paths:
+        grabber.request(path)
+
+    assert grabber.started == paths[:2]
+    assert all(grabber.is_pending(path) for path in paths)
+
+    results = []
+    grabber.frame_grabbed.connect(lambda path, image: results.append((path, image)))
+    grabber._active[paths[0]].finished.emit(grabber._active[paths[0]])
+
+    assert results == [(paths[0], None)]
+    assert grabber.started == paths
+    assert not grabber.is_pending(paths[0])
+
+
+def test_cancelled_grabs_never_report(grabber, tmp_path):
+    paths = _videos(tmp_path, 3)
+    for path in paths:
+        grabber.request(path)
+    results = []
+    grabber.frame_grabbed.connect(lambda path, image: results.append(path))
+    first = grabber._active[paths[0]]
+
+    grabber.cancel([paths[0], paths[2]])
+    first.finished.emit(first)
+
+    assert results == []
+    assert grabber.started == paths[:2]
+    assert not grabber.is_pending(paths[2])
+
+
+def test_grab_only_seeks_once_the_media_has_loaded(qtbot, tmp_path):
+    [path] = _videos(tmp_path, 1)
+    grab = _offline(grabber_module._FrameGrab(path, duration_ms=10_000))
+
+    grab.start()
+    grab.player.setPosition.assert_not_called()
+    grab._on_media_status_changed(QMediaPlayer.MediaStatus.LoadedMedia)
+
+    grab.player.setPosition.assert_called_once_with(grab._target_ms)
+    grab.abort()
+
+
+def test_grab_ignores_frames_away_from_the_seek_target(qtbot, tmp_path):
+    [path] = _videos(tmp_path, 1)
+    grab = _offline(grabber_module._FrameGrab(path, duration_ms=10_000))
+    grab.start()
+    grab._on_media_status_changed(QMediaPlayer.MediaStatus.LoadedMedia)
+    target_ms = grab._target_ms
+
+    grab._on_frame(_FakeFrame(0))  # decoded before the seek landed
+    assert grab.best_image is None
+
+    grab._on_frame(_FakeFrame(target_ms + 40))
+    assert grab.best_image is not None
+    grab.abort()
+
+
+def test_strip_positions_whose_frames_never_match_are_reseeked_then_left_empty(qtbot, tmp_path):
+    [path] = _videos(tmp_path, 1)
+    grab = _offline(grabber_module._StripGrab(path, 3, 16, duration_ms=12_000))
+    wanted = _solid_image(0xFFFFFF)
+    grab.start()
+    grab._on_media_status_changed(QMediaPlayer.MediaStatus.BufferedMedia)
+
+    grab._on_frame(_FakeFrame(8000))  # wrong position for the first target (2000)
+    grab._on_frame(_FakeFrame(2000, wanted))
+    grab._on_frame(_FakeFrame(0))  # second target is 6000
+    grab._on_timeout()
+    grab._on_frame(_FakeFrame(100))
+    grab._on_timeout()
+    grab._on_frame(_FakeFrame(10_000, wanted))
+
+    assert [call.args[0] for call in grab.player.setPosition.call_args_list] == [2000, 6000, 6000, 10_000]
+    assert len(grab.frames) == 3
+    assert grab.frames[1] is None
+    assert grab.frames[0] is not None and grab.frames[2] is not None
+    assert grab._state == "done"
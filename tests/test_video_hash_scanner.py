@@ -0,0 +1,88 @@
+import pytest
+from PyQt6.QtGui import QColor, QImage
+
+from src import perceptual_hash
+from src.VideoHashScanner import VIDEO_HASH_FRAMES, VideoHashScanner
+
+# No test here may start a real grab - requests are recorded instead, and the grabber's
+# strip_grabbed is emitted by hand.
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    requested = []
+    monkeypatch.setattr(
+        "src.VideoFrameGrabber.VideoFrameGrabber.request_strip",
+        lambda self, path, frame_count, size, snap_to_keyframes=True: requested.append(
+            (path, frame_count, snap_to_keyframes)
+        ),
+    )
+    return requested
+
+
+def _videos(folder, count):
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = folder / f"clip{i}.mp4"
+        path.write_bytes(b"\x00\x00\x00\x18ftypisom" + bytes([i]))
+        paths.append(path)
+    return paths
+
+
+def _frame(level):
+    image = QImage(32, 24, QImage.Format.Format_RGB32)
+    image.fill(QColor(level, level, level))
+    image.setPixelColor(5, 5, QColor(255 - level, 0, 0))
+    return image
+
+
+def _run(scanner):
+    found = {}
+    finished = []
+    scanner.results_found.connect(found.update)
+    scanner.finished.connect(lambda: finished.append(True))
+    scanner.start()
+    return found, finished
+
+
+def test_videos_are_hashed_from_unsnapped_frames_at_fixed_fractions(qtbot, tmp_path, media_index, requests):
+    [clip] = _videos(tmp_path / "lib", 1)
+    (tmp_path / "lib" / "still.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    media_index.scan(str(tmp_path / "lib"))
+    scanner = VideoHashScanner([clip, tmp_path / "lib" / "still.png"], index=media_index)
+
+    found, finished = _run(scanner)
+    assert requests == [(clip, VIDEO_HASH_FRAMES, False)]
+    frames = [_frame(level) for level in (10, 20, 30)]
+    scanner._grabber.strip_grabbed.emit(clip, frames)
+
+    assert found == {clip: perceptual_hash.dhash_frames(frames)}
+    assert finished == [True]
+    assert media_index.perceptual_hashes([clip]) == {str(clip): found[clip]}
+
+
+def test_cached_video_hashes_are_not_grabbed_again(qtbot, tmp_path, media_index, requests):
+    cached, fresh = _videos(tmp_path / "lib", 2)
+    media_index.scan(str(tmp_path / "lib"))
+    stat = cached.stat()
+    media_index.store_perceptual_hashes([(str(cached), stat.st_size, stat.st_mtime_ns, 42)])
+
+    found, finished = _run(VideoHashScanner([cached, fresh], index=media_index))
+
+    assert found == {cached: 42}
+    assert [path for path, _count, _snap in requests] == [fresh]
+    assert finished == []
+
+
+def test_video_without_any_frame_is_remembered_as_unhashable(qtbot, tmp_path, media_index, requests):
+    [clip] = _videos(tmp_path / "lib", 1)
+    media_index.scan(str(tmp_path / "lib"))
+    scanner = VideoHashScanner([clip], index=media_index)
+
+    found, finished = _run(scanner)
+    scanner._grabber.strip_grabbed.emit(clip, [])
+
+    assert found == {clip: None}
+    assert finished == [True]
+    assert media_index.perceptual_hashes([clip]) == {str(clip): None}